@@ -34,9 +34,11 @@ setup(
     extras_require={
         "openai": ["openai>=1.0.0"],
         "gemini": ["google-generativeai"],
+        "fast": ["numpy>=1.17"],  # Vectorized batch corpus metrics
         "all": [
             "openai>=1.0.0", 
-            "google-generativeai"
+            "google-generativeai",
+            "numpy>=1.17"
         ]
     },
     entry_points={
@@ -3,21 +3,392 @@ Core analysis engine for Style Transfer AI.
 Orchestrates the stylometry analysis workflow.
 """
 
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
-from .prompts import create_enhanced_deep_prompt
-from .metrics import calculate_readability_metrics, analyze_text_statistics
-from ..models.ollama_client import analyze_with_ollama
-from ..models.openai_client import analyze_with_openai
-from ..models.gemini_client import analyze_with_gemini
-from ..utils.text_processing import read_text_file, extract_basic_stats
+from .prompts import (
+    ANALYSIS_PARTS, create_enhanced_deep_prompt, create_reduce_prompt, create_consolidation_prompt,
+    create_part_refine_prompt, create_style_fields_prompt, create_section_prompt
+)
+from .confidence import split_analysis_parts, join_analysis_parts, score_part, score_analysis
+from .style_fields import STYLE_FIELDS_SCHEMA, StyleFieldsError, parse_style_fields
+from .metrics import TextStatsAccumulator, describe_statistics
+from .ingestion import iter_file_summaries
+from ..models.dispatch import generate_text, is_error_response, backend_capacity
+from ..models.resilience import ModelError, ModelRequestError, analysis_targets, get_resilient_dispatcher
+from ..models.token_budget import max_prompt_tokens
+from ..utils.text_processing import read_text_file, iter_text_chunks, split_text_for_budget, estimate_tokens
 from ..utils.user_profile import get_user_profile
-from ..config.settings import TIMESTAMP_FORMAT
+from ..config.settings import (
+    TIMESTAMP_FORMAT, PARALLEL_INGESTION, CHUNKED_ANALYSIS,
+    ANALYSIS_CHUNK_TOKENS, DEFAULT_ANALYSIS_CHUNK_TOKENS, REDUCE_FAN_IN, SECTIONED_ANALYSIS, CONSOLIDATION_STRATEGIES,
+    CONSOLIDATION_STRATEGY, TIERED_DRAFT_MODEL, TIERED_REFINE_MODEL, TIERED_REFINE_SCOPES, TIERED_REFINE_SCOPE,
+    TIERED_CONFIDENCE_THRESHOLD, STYLE_FIELDS_ENABLED, STYLE_FIELDS_SECTIONS
+)
 
 
-def analyze_style(text_to_analyze, use_local=True, model_name=None, api_type=None, api_client=None, user_profile=None, processing_mode="enhanced"):
+def get_chunk_token_budget(use_local, model_name, api_type, processing_mode="enhanced", user_profile=None):
+    """
+    Return the estimated token budget for the sample text in one analysis prompt.
+    
+    The configured ANALYSIS_CHUNK_TOKENS value is lowered when the model's
+    context window could not hold a chunk, the prompt template and the
+    planned response together.
+    
+    Args:
+        use_local (bool): Whether the local Ollama model is used
+        model_name (str): Ollama model name
+        api_type (str): 'openai' or 'gemini'
+        processing_mode (str): Key of PROCESSING_MODES
+        user_profile (dict): User background included in the prompt
+        
+    Returns:
+        int: Maximum estimated tokens of text per prompt
+    """
+    key = model_name if use_local else api_type
+    configured = ANALYSIS_CHUNK_TOKENS.get(key, DEFAULT_ANALYSIS_CHUNK_TOKENS)
+    
+    backend = "ollama" if use_local else api_type
+    template_tokens = estimate_tokens(create_enhanced_deep_prompt("", user_profile))
+    context_limit = max_prompt_tokens(backend, model_name, processing_mode) - template_tokens
+    return max(1, min(configured, context_limit))
+
+
+def _group_for_merge(partials, token_limit):
+    """Group consecutive analyses, at most REDUCE_FAN_IN per group and within token_limit."""
+    groups = []
+    group_tokens = 0
+    for partial in partials:
+        partial_tokens = estimate_tokens(partial)
+        if groups and len(groups[-1]) < REDUCE_FAN_IN and group_tokens + partial_tokens <= token_limit:
+            groups[-1].append(partial)
+            group_tokens += partial_tokens
+        else:
+            groups.append([partial])
+            group_tokens = partial_tokens
+    
+    if len(groups) > 1 and all(len(group) == 1 for group in groups):
+        # Nothing fits two at a time; merge pairs anyway and let the budget check report it
+        groups = [partials[start:start + 2] for start in range(0, len(partials), 2)]
+    return groups
+
+
+def _generate(prompt, use_local, model_name, api_type, api_client, processing_mode, on_token=None, cancel_event=None, fallbacks=None, **options):
+    """Send one prompt with retry and failover (see ResilientDispatcher); raises ModelError."""
+    return get_resilient_dispatcher().generate(
+        prompt, analysis_targets(use_local, model_name, api_type, api_client, fallbacks), processing_mode,
+        on_token=on_token, cancel_event=cancel_event, generate=generate_text, **options
+    )
+
+
+def _run_cancellable(work, items, max_workers, cancel_event=None):
+    """
+    Run work(item, call_cancel_event) for each item in a thread pool.
+    
+    Worker threads never see Ctrl+C, so when ``cancel_event`` is given the
+    waiting thread handles it: Ctrl+C (or setting the event) stops the calls
+    in progress, which keep their partial output, and the event is cleared
+    again so queued calls and later steps run as usual. Without an event
+    Ctrl+C propagates once the running calls have finished.
+    
+    Args:
+        work (callable): Called with an item and its own threading.Event
+            (None when cancel_event is None)
+        items (list): Work items
+        max_workers (int): Maximum calls in progress at once
+        cancel_event (threading.Event): Set to stop the calls in progress
+        
+    Yields:
+        tuple: (index of the item, result of work) as each call finishes
+    """
+    call_events = [threading.Event() if cancel_event is not None else None for _ in items]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(work, item, call_events[index]): index for index, item in enumerate(items)}
+        pending = set(futures)
+        while pending:
+            try:
+                done, pending = wait(
+                    pending, timeout=None if cancel_event is None else 0.1, return_when=FIRST_COMPLETED
+                )
+            except KeyboardInterrupt:
+                if cancel_event is None:
+                    raise
+                print("\nStopping the response(s) in progress; their partial output is kept...")
+                cancel_event.set()
+                done = set()
+            if cancel_event is not None and cancel_event.is_set():
+                cancel_event.clear()
+                for future in pending:
+                    if future.running():
+                        call_events[futures[future]].set()
+            for future in done:
+                yield futures[future], future.result()
+
+
+def _generate_all(prompts, use_local, model_name, api_type, api_client, processing_mode, fallbacks=None, cancel_event=None, **options):
+    """Send independent prompts concurrently; return responses (or ModelErrors) in prompt order."""
+    def generate_one(prompt, call_cancel_event):
+        try:
+            return _generate(
+                prompt, use_local, model_name, api_type, api_client, processing_mode,
+                cancel_event=call_cancel_event, fallbacks=fallbacks, **options
+            )
+        except ModelError as e:
+            return e
+    
+    if len(prompts) == 1:
+        return [generate_one(prompts[0], cancel_event)]
+    
+    backend = "ollama" if use_local else api_type
+    max_workers = max(1, min(backend_capacity(backend), len(prompts)))
+    responses = [None] * len(prompts)
+    for index, response in _run_cancellable(generate_one, prompts, max_workers, cancel_event):
+        responses[index] = response
+    return responses
+
+
+def _section_points(part_number):
+    """Return how many of the 25 points a PART covers."""
+    _, first_point, last_point = ANALYSIS_PARTS[part_number]
+    return last_point - first_point + 1
+
+
+def _assemble_sections(responses):
+    """
+    Join the per-PART responses for one text into a 25-point analysis.
+    
+    A missing heading is added, and a failed PART is kept as a note so the
+    analysis keeps all 7 parts (and scores 0 for that part).
+    
+    Raises:
+        ModelError: If every PART failed
+    """
+    failures = [response for response in responses.values() if isinstance(response, ModelError)]
+    if len(failures) == len(responses):
+        raise failures[0]
+    
+    parts = {}
+    for part, response in responses.items():
+        title = ANALYSIS_PARTS[part][0]
+        if isinstance(response, ModelError):
+            parts[part] = f"**PART {part}: {title}**\nSection analysis failed: {response}"
+            continue
+        _, found = split_analysis_parts(response)
+        parts[part] = found.get(part) or f"**PART {part}: {title}**\n{response.strip()}"
+    return join_analysis_parts("", parts)
+
+
+def _sectioned_analysis(texts, use_local, model_name, api_type, api_client, user_profile, processing_mode, cancel_event=None, fallbacks=None):
+    """
+    Analyze texts with one prompt per PART of the framework, all sent concurrently.
+    
+    Every PART gets its own output budget, so a long response can no longer
+    be cut off before the last parts, and every PART is cached on its own:
+    after a failure only the failed PARTs are generated again. Each prompt
+    carries the full text, so prompt processing grows with the number of
+    PARTs while generation runs in parallel.
+    
+    Args:
+        texts (list): Texts that each fit in one prompt (e.g. the chunks of one text)
+        use_local (bool): Whether to use local Ollama model or cloud APIs
+        model_name (str): The specific model to use (for local models)
+        api_type (str): 'openai' or 'gemini' for cloud APIs
+        api_client: Pre-initialized API client (for OpenAI or Gemini)
+        user_profile (dict): User background information for context
+        processing_mode (str): 'enhanced' or 'statistical'
+        cancel_event (threading.Event): Set to stop the calls early
+        fallbacks (list): Fallback targets (see resilience.analysis_targets)
+        
+    Returns:
+        list: Assembled analysis per text, in order; the ModelError for a
+            text none of whose PARTs could be analyzed
+    """
+    requests = [(index, part) for index in range(len(texts)) for part in ANALYSIS_PARTS]
+    # The longest PART sets the output budget of every section prompt
+    sections = max(_section_points(part) for part in ANALYSIS_PARTS)
+    responses = _generate_all(
+        [create_section_prompt(part, texts[index], user_profile) for index, part in requests],
+        use_local, model_name, api_type, api_client, processing_mode, fallbacks,
+        cancel_event=cancel_event, sections=sections
+    )
+    
+    by_text = [{} for _ in texts]
+    for (index, part), response in zip(requests, responses):
+        by_text[index][part] = response
+    
+    analyses = []
+    for responses_by_part in by_text:
+        failed = sorted(part for part, response in responses_by_part.items() if isinstance(response, ModelError))
+        if failed and len(failed) < len(responses_by_part):
+            print(f"  Warning: PART(s) {', '.join(map(str, failed))} failed; run the analysis again to retry only those")
+        try:
+            analyses.append(_assemble_sections(responses_by_part))
+        except ModelError as e:
+            analyses.append(e)
+    return analyses
+
+
+def _map_reduce_analysis(chunks, use_local, model_name, api_type, api_client, user_profile, processing_mode, on_token=None, cancel_event=None, fallbacks=None, sectioned=False):
+    """
+    Analyze a long text chunk by chunk, then merge the partial analyses.
+    
+    The map step runs the 25-point prompt on every chunk concurrently. The
+    reduce step merges up to REDUCE_FAN_IN partial analyses per prompt and
+    repeats on the merged results until one analysis remains, so no prompt
+    grows with the size of the input. Only the final merge is streamed.
+    
+    Args:
+        chunks (list): Consecutive excerpts of the text, each within the budget
+        use_local (bool): Whether to use local Ollama model or cloud APIs
+        model_name (str): The specific model to use (for local models)
+        api_type (str): 'openai' or 'gemini' for cloud APIs
+        api_client: Pre-initialized API client (for OpenAI or Gemini)
+        user_profile (dict): User background information for context
+        processing_mode (str): 'enhanced' or 'statistical'
+        on_token (callable): Receives the final merge's Ollama output as it streams in
+        cancel_event (threading.Event): Set to stop before or during the final merge
+        fallbacks (list): Fallback targets (see resilience.analysis_targets)
+        sectioned (bool): Analyze each chunk PART by PART (see _sectioned_analysis)
+        
+    Returns:
+        str: Merged analysis
+        
+    Raises:
+        ModelError: If no chunk could be analyzed or a merge failed
+    """
+    print(f"  Text exceeds one prompt; analyzing {len(chunks)} chunks and merging the results...")
+    if sectioned:
+        responses = _sectioned_analysis(
+            chunks, use_local, model_name, api_type, api_client, user_profile, processing_mode, fallbacks=fallbacks
+        )
+    else:
+        map_prompts = [create_enhanced_deep_prompt(chunk, user_profile) for chunk in chunks]
+        responses = _generate_all(map_prompts, use_local, model_name, api_type, api_client, processing_mode, fallbacks)
+    
+    partials = [response for response in responses if not isinstance(response, ModelError)]
+    if not partials:
+        raise responses[0]
+    if len(partials) < len(responses):
+        print(f"  Warning: {len(responses) - len(partials)} of {len(responses)} chunk analyses failed; merging the rest")
+    
+    return _reduce_in_tree(
+        partials, lambda group, final: create_reduce_prompt(group, user_profile),
+        use_local, model_name, api_type, api_client, processing_mode, on_token, cancel_event, fallbacks
+    )
+
+
+def _reduce_in_tree(partials, build_prompt, use_local, model_name, api_type, api_client, processing_mode, on_token=None, cancel_event=None, fallbacks=None):
+    """
+    Merge analyses REDUCE_FAN_IN at a time, round after round, until one remains.
+    
+    Groups are also kept small enough for the merge prompt to fit the
+    model's context window. Each round's merges run concurrently. An
+    analysis left alone in its group passes through to the next round
+    unchanged. Only the final merge is streamed.
+    
+    Args:
+        partials (list): Analyses to merge (at least one)
+        build_prompt (callable): build_prompt(group, final) returns the merge prompt
+        use_local (bool): Whether to use local Ollama model or cloud APIs
+        model_name (str): The specific model to use (for local models)
+        api_type (str): 'openai' or 'gemini' for cloud APIs
+        api_client: Pre-initialized API client (for OpenAI or Gemini)
+        processing_mode (str): 'enhanced' or 'statistical'
+        on_token (callable): Receives the final merge's Ollama output as it streams in
+        cancel_event (threading.Event): Set to stop before or during the final merge
+        fallbacks (list): Fallback targets (see resilience.analysis_targets)
+        
+    Returns:
+        str: Merged analysis
+        
+    Raises:
+        ModelError: If a merge failed
+    """
+    backend = "ollama" if use_local else api_type
+    token_limit = max_prompt_tokens(backend, model_name, processing_mode) - estimate_tokens(build_prompt([], True))
+    
+    while True:
+        if cancel_event is not None and cancel_event.is_set():
+            print("  Merge cancelled; keeping the unmerged partial analyses.")
+            return "\n\n".join(partials)
+        
+        groups = _group_for_merge(partials, token_limit)
+        if len(groups) == 1:
+            return _generate(
+                build_prompt(groups[0], True), use_local, model_name, api_type,
+                api_client, processing_mode, on_token=on_token, cancel_event=cancel_event, fallbacks=fallbacks
+            )
+        
+        print(f"  Merging {len(partials)} partial analyses in {len(groups)} groups...")
+        merge_groups = [group for group in groups if len(group) > 1]
+        merged = iter(_generate_all(
+            [build_prompt(group, False) for group in merge_groups],
+            use_local, model_name, api_type, api_client, processing_mode, fallbacks
+        ))
+        partials = [next(merged) if len(group) > 1 else group[0] for group in groups]
+        
+        failed = [partial for partial in partials if isinstance(partial, ModelError)]
+        if failed:
+            raise failed[0]
+
+
+def consolidate_from_analyses(individual_analyses, text_statistics, readability_metrics, use_local=True, model_name=None, api_type=None, api_client=None, user_profile=None, processing_mode="enhanced", on_token=None, cancel_event=None, fallbacks=None):
+    """
+    Build the consolidated analysis from per-file analyses and corpus statistics.
+    
+    Unlike the full-text strategy, no sample text is sent again: the per-file
+    analyses are merged in a tree (REDUCE_FAN_IN per prompt) and the final
+    merge also receives the locally computed statistics.
+    
+    Args:
+        individual_analyses (list): Entries with 'filename' and 'analysis'
+        text_statistics (dict): Corpus statistics from TextStatsAccumulator
+        readability_metrics (dict): Corpus readability scores
+        use_local (bool): Whether to use local Ollama model or cloud APIs
+        model_name (str): The specific model to use (for local models)
+        api_type (str): 'openai' or 'gemini' for cloud APIs
+        api_client: Pre-initialized API client (for OpenAI or Gemini)
+        user_profile (dict): User background information for context
+        processing_mode (str): 'enhanced' or 'statistical'
+        on_token (callable): Receives the final merge's Ollama output as it streams in
+        cancel_event (threading.Event): Set to stop before or during the final merge
+        fallbacks (list): Fallback targets (see resilience.analysis_targets)
+        
+    Returns:
+        str: Consolidated analysis
+        
+    Raises:
+        ModelError: If no file analysis succeeded or a merge failed
+    """
+    # Profiles saved before analyses raised errors may hold error text instead of an analysis
+    partials = [
+        f"Source: {entry['filename']}\n{entry['analysis']}"
+        for entry in individual_analyses if not is_error_response(entry['analysis'])
+    ]
+    if not partials:
+        raise ModelError("Error: No individual analyses succeeded, nothing to consolidate")
+    
+    def build_prompt(group, final):
+        if final:
+            return create_consolidation_prompt(group, text_statistics, readability_metrics, user_profile)
+        return create_consolidation_prompt(group, user_profile=user_profile)
+    
+    return _reduce_in_tree(
+        partials, build_prompt, use_local, model_name, api_type, api_client, processing_mode,
+        on_token, cancel_event, fallbacks
+    )
+
+
+def analyze_style(text_to_analyze, use_local=True, model_name=None, api_type=None, api_client=None, user_profile=None, processing_mode="enhanced", on_token=None, cancel_event=None, chunked=None, fallbacks=None, sectioned=None):
     """
     Performs enhanced deep stylometry analysis using specified AI model.
     
+    Texts larger than the model's chunk budget (see get_chunk_token_budget)
+    are split on paragraph boundaries and analyzed map-reduce style. Failed
+    calls are retried, hedged or failed over by the resilient dispatcher.
+    Sectioned analysis asks for each PART in its own concurrent prompt and
+    returns the same 25-point layout; its output is not streamed.
+    
     Args:
         text_to_analyze (str): The text to be analyzed
         use_local (bool): Whether to use local Ollama model or cloud APIs
@@ -26,9 +397,19 @@ def analyze_style(text_to_analyze, use_local=True, model_name=None, api_type=Non
         api_client: Pre-initialized API client (for OpenAI or Gemini)
         user_profile (dict): User background information for context
         processing_mode (str): 'enhanced' for thorough analysis, 'statistical' for faster processing
+        on_token (callable): Receives Ollama output fragments as they stream in
+        cancel_event (threading.Event): Set to stop a streamed Ollama call early
+        chunked (bool): Split oversized texts (defaults to CHUNKED_ANALYSIS)
+        fallbacks (list): Targets from resilience.make_target to fail over
+            or hedge to (defaults to the FALLBACK_MODELS entry)
+        sectioned (bool): One prompt per PART (defaults to SECTIONED_ANALYSIS)
         
     Returns:
         str: Structured deep stylometric analysis for style profiling
+        
+    Raises:
+        ModelError: If the analysis failed on every target (ModelTimeoutError,
+            ModelUnavailableError, ModelRequestError or CircuitOpenError)
     """
     # Validate model parameters
     if use_local and not model_name:
@@ -36,19 +417,213 @@ def analyze_style(text_to_analyze, use_local=True, model_name=None, api_type=Non
     if not use_local and (not api_type or not api_client):
         raise ValueError("api_type and api_client are required when use_local=False")
     
+    if not use_local and api_type not in ("openai", "gemini"):
+        raise ModelRequestError("Error: Unknown API type or configuration", api_type)
+    
+    if chunked is None:
+        chunked = CHUNKED_ANALYSIS
+    if sectioned is None:
+        sectioned = SECTIONED_ANALYSIS
+    if chunked:
+        chunk_tokens = get_chunk_token_budget(use_local, model_name, api_type, processing_mode, user_profile)
+        chunks = split_text_for_budget(text_to_analyze, chunk_tokens)
+        if len(chunks) > 1:
+            return _map_reduce_analysis(
+                chunks, use_local, model_name, api_type, api_client, user_profile, processing_mode,
+                on_token=on_token, cancel_event=cancel_event, fallbacks=fallbacks, sectioned=sectioned
+            )
+    
+    if sectioned:
+        analysis, = _sectioned_analysis(
+            [text_to_analyze], use_local, model_name, api_type, api_client, user_profile, processing_mode,
+            cancel_event=cancel_event, fallbacks=fallbacks
+        )
+        if isinstance(analysis, ModelError):
+            raise analysis
+        return analysis
+    
     prompt = create_enhanced_deep_prompt(text_to_analyze, user_profile)
     
-    if use_local:
-        return analyze_with_ollama(prompt, model_name, processing_mode)
-    elif api_type == "openai":
-        return analyze_with_openai(api_client, prompt)
-    elif api_type == "gemini":
-        return analyze_with_gemini(api_client, prompt)
-    else:
-        return "Error: Unknown API type or configuration"
+    # Identical requests are answered from the response cache
+    return _generate(
+        prompt, use_local, model_name, api_type, api_client, processing_mode,
+        on_token=on_token, cancel_event=cancel_event, fallbacks=fallbacks
+    )
+
+
+def _analyze_files_concurrently(summaries, use_local, model_name, api_type, api_client, user_profile, processing_mode, on_token=None, fallbacks=None, cancel_event=None, keep_text=True):
+    """
+    Run the per-file deep analyses concurrently, bounded per backend.
+    
+    At most backend_capacity(backend) requests are outstanding at once.
+    Status is printed as each call finishes, but results are returned in the
+    order of ``summaries``. Streamed output is only shown live when calls run
+    one at a time, so fragments of different files never interleave. The
+    analyses run in worker threads; with ``cancel_event`` Ctrl+C stops the
+    analyses in progress (see _run_cancellable).
+    
+    Args:
+        summaries (list): File summaries from the ingestion stage
+        use_local (bool): Whether to use local Ollama model or cloud APIs
+        model_name (str): The specific model to use (for local models)
+        api_type (str): 'openai' or 'gemini' for cloud APIs
+        api_client: Pre-initialized API client (for OpenAI or Gemini)
+        user_profile (dict): User background information for context
+        processing_mode (str): 'enhanced' or 'statistical'
+        on_token (callable): Receives Ollama output fragments as they stream in
+        fallbacks (list): Fallback targets (see resilience.analysis_targets)
+        cancel_event (threading.Event): Set to stop the analyses in progress early
+        keep_text (bool): Return each file's content; otherwise it is dropped
+            as soon as the file's analysis finishes
+        
+    Returns:
+        list: (summary, file content or None, analysis) tuples in input order;
+            the analysis is the ModelError for a file that could not be analyzed
+    """
+    if not summaries:
+        return []
+    
+    backend = "ollama" if use_local else api_type
+    max_in_flight = max(1, min(backend_capacity(backend), len(summaries)))
+    live_output = on_token if max_in_flight == 1 else None
+    
+    def analyze_file(summary, file_cancel_event):
+        # Parallel ingestion returns statistics only; read the text back for the model
+        file_content = summary['text'] if 'text' in summary else read_text_file(summary['filename'])
+        try:
+            analysis = analyze_style(
+                file_content, use_local, model_name, api_type, api_client, user_profile, processing_mode,
+                on_token=live_output, cancel_event=file_cancel_event, fallbacks=fallbacks
+            )
+        except ModelError as e:
+            analysis = e
+        return (file_content if keep_text else None), analysis
+    
+    print(f"  Performing deep analysis of {len(summaries)} file(s), up to {max_in_flight} at a time...")
+    
+    results = [None] * len(summaries)
+    finished = _run_cancellable(analyze_file, summaries, max_in_flight, cancel_event)
+    for completed, (index, (file_content, individual_analysis)) in enumerate(finished, 1):
+        summary = summaries[index]
+        results[index] = (summary, file_content, individual_analysis)
+        
+        if isinstance(individual_analysis, ModelError):
+            print(f"  [{completed}/{len(summaries)}] Analysis failed for {summary['filename']}: {individual_analysis}")
+        else:
+            print(f"  [{completed}/{len(summaries)}] Analysis completed for {summary['filename']}")
+    
+    return results
+
+
+def extract_style_fields(analysis, use_local=True, model_name=None, api_type=None, api_client=None, processing_mode="enhanced", fallbacks=None):
+    """
+    Summarize an analysis as typed style fields (see style_fields.STYLE_FIELDS_SCHEMA).
+    
+    The backend is asked for JSON: Ollama is held to the schema, OpenAI and
+    Gemini run in JSON mode. The response is validated once here, so the
+    generators can read the saved fields instead of parsing analysis text.
+    
+    Args:
+        analysis (str): Consolidated 25-point analysis
+        use_local (bool): Whether to use local Ollama model or cloud APIs
+        model_name (str): The specific model to use (for local models)
+        api_type (str): 'openai' or 'gemini' for cloud APIs
+        api_client: Pre-initialized API client (for OpenAI or Gemini)
+        processing_mode (str): Key of PROCESSING_MODES
+        fallbacks (list): Fallback targets (see resilience.analysis_targets)
+        
+    Returns:
+        tuple: (style fields dict or None, error message or None)
+    """
+    print("Extracting structured style fields...")
+    try:
+        response = _generate(
+            create_style_fields_prompt(analysis, STYLE_FIELDS_SCHEMA), use_local, model_name, api_type, api_client,
+            processing_mode, fallbacks=fallbacks, sections=STYLE_FIELDS_SECTIONS, json_schema=STYLE_FIELDS_SCHEMA
+        )
+        return parse_style_fields(response), None
+    except (ModelError, StyleFieldsError) as e:
+        print(f"  Warning: Could not extract style fields: {e}")
+        return None, str(e)
 
 
-def create_enhanced_style_profile(file_paths, use_local=True, model_name=None, api_type=None, api_client=None, processing_mode="enhanced"):
+def create_statistical_style_profile(file_paths, user_profile=None, parallel_ingestion=None):
+    """
+    Creates a style profile from local metrics alone.
+    
+    No model is selected or called: every file is scored by the ingestion
+    stage and the analysis texts are generated from the statistics, so a
+    profile takes milliseconds per file and works without a network.
+    
+    Args:
+        file_paths (list): List of file paths containing user's writing samples
+        user_profile (dict): User background information, if collected
+        parallel_ingestion (bool): Read and score files in a process pool
+            (defaults to PARALLEL_INGESTION)
+        
+    Returns:
+        dict: Style profile in the same layout as create_enhanced_style_profile
+    """
+    if parallel_ingestion is None:
+        parallel_ingestion = PARALLEL_INGESTION
+    
+    all_analyses = []
+    file_info = []
+    corpus_statistics = TextStatsAccumulator()
+    
+    print(f"\nFound {len(file_paths)} text sample(s) for statistical analysis")
+    
+    for summary in iter_file_summaries(file_paths, parallel=parallel_ingestion):
+        file_path = summary['filename']
+        if 'error' in summary:
+            print(f"  Error with {file_path}: {summary['error']}")
+            continue
+        
+        print(f"  Processing: {file_path}")
+        statistics = summary['statistics']
+        corpus_statistics.merge(statistics)
+        
+        file_info.append({
+            'filename': file_path,
+            'word_count': summary['word_count'],
+            'character_count': summary['character_count']
+        })
+        all_analyses.append({
+            'filename': file_path,
+            'word_count': summary['word_count'],
+            'character_count': summary['character_count'],
+            'analysis': describe_statistics(statistics.text_statistics(), statistics.readability_metrics())
+        })
+    
+    if not all_analyses:
+        return {
+            'profile_created': False,
+            'error': 'No valid files could be analyzed'
+        }
+    
+    text_statistics = corpus_statistics.text_statistics()
+    readability_metrics = corpus_statistics.readability_metrics()
+    
+    return {
+        'profile_created': True,
+        'user_profile': user_profile or {},
+        'metadata': {
+            'analysis_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'analysis_method': "Local statistics",
+            'model_used': "None (statistical mode)",
+            'processing_mode': "statistical",
+            'total_samples': len(all_analyses),
+            'combined_text_length': corpus_statistics.character_count,
+            'file_info': file_info
+        },
+        'text_statistics': text_statistics,
+        'readability_metrics': readability_metrics,
+        'individual_analyses': all_analyses,
+        'consolidated_analysis': describe_statistics(text_statistics, readability_metrics)
+    }
+
+
+def create_enhanced_style_profile(file_paths, use_local=True, model_name=None, api_type=None, api_client=None, processing_mode="enhanced", parallel_ingestion=None, on_token=None, consolidation=None, user_profile=None, fallbacks=None, consolidation_model=None, style_fields=None, cancel_event=None):
     """
     Creates an enhanced comprehensive style profile from multiple text samples.
     
@@ -58,74 +633,152 @@ def create_enhanced_style_profile(file_paths, use_local=True, model_name=None, a
         model_name (str): The specific model to use (for local models)
         api_type (str): 'openai' or 'gemini' for cloud APIs
         api_client: Pre-initialized API client (for OpenAI or Gemini)
-        processing_mode (str): 'enhanced' for thorough analysis, 'statistical' for faster processing
+        processing_mode (str): 'enhanced' for thorough analysis, 'statistical' for a
+            local-only profile without model calls (see create_statistical_style_profile)
+        parallel_ingestion (bool): Read and score files in a process pool
+            (defaults to PARALLEL_INGESTION)
+        on_token (callable): Receives Ollama output fragments as they stream in
+        consolidation (str): Key of CONSOLIDATION_STRATEGIES (defaults to
+            CONSOLIDATION_STRATEGY)
+        user_profile (dict): Writer background; asked for interactively when omitted
+        fallbacks (list): Targets from resilience.make_target to fail over
+            or hedge to (defaults to the FALLBACK_MODELS entry)
+        consolidation_model (str): Ollama model for the consolidated analysis
+            (defaults to model_name)
+        style_fields (bool): Extract 'style_fields' from the consolidated
+            analysis (defaults to STYLE_FIELDS_ENABLED)
+        cancel_event (threading.Event): Set, or press Ctrl+C, to stop the
+            streamed Ollama responses in progress; their partial text is kept
         
     Returns:
-        dict: Enhanced consolidated style profile with deep analysis
+        dict: Enhanced consolidated style profile with deep analysis; if no
+            file or the consolidated analysis could not be analyzed,
+            'profile_created' is False and 'error' says why
     """
+    # Statistical mode is computed locally; no model parameters are needed
+    if processing_mode == "statistical":
+        return create_statistical_style_profile(file_paths, user_profile or get_user_profile(), parallel_ingestion)
+    
     # Validate model parameters
     if use_local and not model_name:
         raise ValueError("model_name is required when use_local=True")
     if not use_local and (not api_type or not api_client):
         raise ValueError("api_type and api_client are required when use_local=False")
     
+    if consolidation is None:
+        consolidation = CONSOLIDATION_STRATEGY
+    if consolidation not in CONSOLIDATION_STRATEGIES:
+        raise ValueError(f"Unknown consolidation strategy: {consolidation}")
+    
     # Collect user profile information first
-    user_profile = get_user_profile()
+    if user_profile is None:
+        user_profile = get_user_profile()
+    
+    if not use_local or consolidation_model is None:
+        consolidation_model = model_name
     
     all_analyses = []
-    combined_text = ""
+    combined_parts = []
+    corpus_statistics = TextStatsAccumulator()
     file_info = []
     
     print(f"\nFound {len(file_paths)} text sample(s) for enhanced deep analysis")
     
-    for file_path in file_paths:
-        file_content = read_text_file(file_path)
+    if parallel_ingestion is None:
+        parallel_ingestion = PARALLEL_INGESTION
+    if parallel_ingestion:
+        print("Reading files and computing statistics in parallel...")
+    
+    # Statistics are streamed; each text is read again only while its own analysis runs
+    readable_files = []
+    for summary in iter_file_summaries(file_paths, parallel=parallel_ingestion):
+        file_path = summary['filename']
         
-        if "Error" not in file_content:
+        if 'error' not in summary:
             print(f"  Processing: {file_path}")
             
-            # Calculate basic statistics for this file
-            stats = extract_basic_stats(file_content)
+            # Fold this file's statistics into the corpus totals
+            corpus_statistics.merge(summary['statistics'])
             
             file_info.append({
                 'filename': file_path,
-                'word_count': stats['word_count'],
-                'character_count': stats['character_count']
+                'word_count': summary['word_count'],
+                'character_count': summary['character_count']
             })
-            
-            # Individual analysis
-            print(f"  Performing deep analysis...")
-            individual_analysis = analyze_style(file_content, use_local, model_name, api_type, api_client, user_profile, processing_mode)
-            
-            all_analyses.append({
-                'filename': file_path,
-                'word_count': stats['word_count'],
-                'character_count': stats['character_count'],
-                'analysis': individual_analysis
-            })
-            
-            combined_text += f"\n\n--- From {file_path} ---\n{file_content}"
-            print(f"  Analysis completed for {file_path}")
+            readable_files.append(summary)
         else:
-            print(f"  Error with {file_path}: {file_content}")
+            print(f"  Error with {file_path}: {summary['error']}")
+    
+    # Individual analyses run concurrently; results keep the input file order. Only the
+    # full-text consolidation needs the texts afterwards
+    full_text = consolidation != "hierarchical"
+    analysis_errors = []
+    for summary, file_content, individual_analysis in _analyze_files_concurrently(
+        readable_files, use_local, model_name, api_type, api_client, user_profile, processing_mode, on_token,
+        fallbacks, cancel_event, keep_text=full_text
+    ):
+        if full_text:
+            combined_parts.append(f"\n\n--- From {summary['filename']} ---\n{file_content}")
+        if isinstance(individual_analysis, ModelError):
+            # The file still counts towards the statistics and the full-text consolidation
+            analysis_errors.append(individual_analysis)
+            next(info for info in file_info if info['filename'] == summary['filename'])['analysis_error'] = str(individual_analysis)
+            continue
+        all_analyses.append({
+            'filename': summary['filename'],
+            'word_count': summary['word_count'],
+            'character_count': summary['character_count'],
+            'analysis': individual_analysis
+        })
     
     if not all_analyses:
         return {
             'profile_created': False,
-            'error': 'No valid files could be analyzed'
+            'error': f"No file could be analyzed: {analysis_errors[0]}" if analysis_errors else 'No valid files could be analyzed'
         }
     
-    # Perform enhanced statistical analysis on combined text
+    # Corpus statistics come from the merged per-file totals, not a re-scan of the corpus
     print("Calculating comprehensive statistics...")
-    text_statistics = analyze_text_statistics(combined_text)
+    text_statistics = corpus_statistics.text_statistics()
     
     # Calculate readability metrics
     print("Computing readability metrics...")
-    readability_metrics = calculate_readability_metrics(combined_text)
+    readability_metrics = corpus_statistics.readability_metrics()
+    
+    combined_text_length = sum(info['character_count'] for info in file_info)
+    try:
+        if consolidation == "hierarchical":
+            # Merge the per-file analyses; the sample text is not sent again
+            print("Consolidating individual analyses with corpus statistics...")
+            del combined_parts
+            consolidated_analysis = consolidate_from_analyses(
+                all_analyses, text_statistics, readability_metrics, use_local, consolidation_model, api_type,
+                api_client, user_profile, processing_mode, on_token=on_token, cancel_event=cancel_event,
+                fallbacks=fallbacks
+            )
+        else:
+            # Consolidated analysis of all texts combined (joined once, only for the prompt)
+            print("Generating consolidated deep analysis...")
+            combined_text = "".join(combined_parts)
+            del combined_parts
+            consolidated_analysis = analyze_style(
+                combined_text, use_local, consolidation_model, api_type, api_client, user_profile, processing_mode,
+                on_token=on_token, cancel_event=cancel_event, fallbacks=fallbacks
+            )
+    except ModelError as e:
+        # The individual analyses stay in the response cache, so a retry only repeats this step
+        return {
+            'profile_created': False,
+            'error': f"Consolidated analysis failed: {e}"
+        }
     
-    # Consolidated analysis of all texts combined
-    print("Generating consolidated deep analysis...")
-    consolidated_analysis = analyze_style(combined_text, use_local, model_name, api_type, api_client, user_profile, processing_mode)
+    if style_fields is None:
+        style_fields = STYLE_FIELDS_ENABLED
+    fields, fields_error = (None, None)
+    if style_fields:
+        fields, fields_error = extract_style_fields(
+            consolidated_analysis, use_local, consolidation_model, api_type, api_client, processing_mode, fallbacks
+        )
     
     # Create comprehensive metadata
     analysis_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -141,19 +794,179 @@ def create_enhanced_style_profile(file_paths, use_local=True, model_name=None, a
             'analysis_method': analysis_method,
             'model_used': model_used,
             'processing_mode': processing_mode,
+            'consolidation_strategy': consolidation,
             'total_samples': len(all_analyses),
-            'combined_text_length': len(combined_text),
-            'file_info': file_info
+            'combined_text_length': combined_text_length,
+            'file_info': file_info,
+            'style_fields_error': fields_error
         },
         'text_statistics': text_statistics,
         'readability_metrics': readability_metrics,
         'individual_analyses': all_analyses,
-        'consolidated_analysis': consolidated_analysis
+        'consolidated_analysis': consolidated_analysis,
+        'style_fields': fields
     }
     
     return style_profile
 
 
+def _refinement_excerpt(file_info, token_budget):
+    """Return the samples for a refinement prompt, each file cut to its share of the budget."""
+    file_budget = max(1, token_budget // max(1, len(file_info)))
+    excerpts = []
+    for info in file_info:
+        # Stream only as much of the file as its share of the budget needs
+        text = ""
+        try:
+            for chunk in iter_text_chunks(info['filename']):
+                text += chunk
+                if estimate_tokens(text) >= file_budget:
+                    break
+        except (OSError, UnicodeDecodeError):
+            continue
+        if text.strip():
+            excerpts.append(f"--- From {info['filename']} ---\n{split_text_for_budget(text, file_budget)[0]}")
+    return "\n\n".join(excerpts)
+
+
+def refine_low_confidence_parts(analysis, sample_text, text_statistics, readability_metrics, refine_model, user_profile=None, processing_mode="enhanced", confidence_threshold=TIERED_CONFIDENCE_THRESHOLD, cancel_event=None):
+    """
+    Have a larger model rewrite the weak parts of a draft analysis.
+    
+    Every part is scored locally (see confidence.score_part); the parts
+    scoring below the threshold are refined concurrently, one prompt per
+    part. A part whose refinement fails keeps its draft text.
+    
+    Args:
+        analysis (str): Draft 25-point analysis
+        sample_text (str): Writing samples the refine model checks the draft against
+        text_statistics (dict): Corpus statistics from TextStatsAccumulator
+        readability_metrics (dict): Corpus readability scores
+        refine_model (str): Ollama model that refines
+        user_profile (dict): User background information for context
+        processing_mode (str): Key of PROCESSING_MODES
+        confidence_threshold (float): Parts scoring below this are refined
+        cancel_event (threading.Event): Set, or press Ctrl+C, to stop the
+            refinements in progress (see _run_cancellable)
+        
+    Returns:
+        tuple: (analysis with the refined parts, draft confidence per part
+            number, part numbers that were refined)
+    """
+    preamble, parts = split_analysis_parts(analysis)
+    confidence = {part: score_part(part, parts.get(part, "")) for part in ANALYSIS_PARTS}
+    weak_parts = [part for part, score in confidence.items() if score < confidence_threshold]
+    if not weak_parts:
+        print("All parts of the draft are confident; nothing to refine.")
+        return analysis, confidence, []
+    
+    print(f"Refining {len(weak_parts)} low-confidence part(s) with {refine_model}...")
+    prompts = [
+        create_part_refine_prompt(
+            part, parts.get(part, "(missing from the draft)"), sample_text, text_statistics, readability_metrics,
+            user_profile
+        )
+        for part in weak_parts
+    ]
+    # Output is sized for one part, not the whole 25-point analysis
+    sections = max(_section_points(part) for part in weak_parts)
+    responses = _generate_all(
+        prompts, True, refine_model, None, None, processing_mode, cancel_event=cancel_event, sections=sections
+    )
+    
+    refined_parts = []
+    for part, response in zip(weak_parts, responses):
+        if isinstance(response, ModelError):
+            print(f"  Keeping the draft of PART {part}; refinement failed: {response}")
+            continue
+        parts[part] = response.strip()
+        refined_parts.append(part)
+    return join_analysis_parts(preamble, parts), confidence, refined_parts
+
+
+def create_tiered_style_profile(file_paths, draft_model=TIERED_DRAFT_MODEL, refine_model=TIERED_REFINE_MODEL, refine_scope=None, processing_mode="enhanced", parallel_ingestion=None, on_token=None, user_profile=None, confidence_threshold=TIERED_CONFIDENCE_THRESHOLD, cancel_event=None):
+    """
+    Creates a style profile drafted by a small model and refined by a large one.
+    
+    The draft model analyzes every file concurrently and the analyses are
+    consolidated hierarchically. In the 'profile' scope the refine model
+    does that consolidation; in the 'sections' scope the draft model does,
+    and the refine model only rewrites the parts of the consolidated draft
+    that score below confidence_threshold.
+    
+    Args:
+        file_paths (list): List of file paths containing user's writing samples
+        draft_model (str): Ollama model for the per-file analyses
+        refine_model (str): Ollama model for the refinement
+        refine_scope (str): Key of TIERED_REFINE_SCOPES (defaults to TIERED_REFINE_SCOPE)
+        processing_mode (str): Key of PROCESSING_MODES
+        parallel_ingestion (bool): Read and score files in a process pool
+            (defaults to PARALLEL_INGESTION)
+        on_token (callable): Receives Ollama output fragments as they stream in
+        user_profile (dict): Writer background; asked for interactively when omitted
+        confidence_threshold (float): Parts scoring below this are refined
+            in the 'sections' scope
+        cancel_event (threading.Event): Set, or press Ctrl+C, to stop the
+            draft, consolidation and refinement responses in progress
+        
+    Returns:
+        dict: Style profile as from create_enhanced_style_profile, with
+            metadata['tiered'] holding the models and scope, the
+            'draft_confidence' per part ('sections' scope only), the final
+            'confidence' per part and the 'refined_parts'
+    """
+    if refine_scope is None:
+        refine_scope = TIERED_REFINE_SCOPE
+    if refine_scope not in TIERED_REFINE_SCOPES:
+        raise ValueError(f"Unknown refine scope: {refine_scope}")
+    if processing_mode == "statistical":
+        return create_statistical_style_profile(file_paths, user_profile or get_user_profile(), parallel_ingestion)
+    
+    if user_profile is None:
+        user_profile = get_user_profile()
+    
+    print(f"\nTiered analysis: {draft_model} drafts, {refine_model} refines the {refine_scope}")
+    style_profile = create_enhanced_style_profile(
+        file_paths, True, draft_model, processing_mode=processing_mode, parallel_ingestion=parallel_ingestion,
+        on_token=on_token, consolidation="hierarchical", user_profile=user_profile,
+        consolidation_model=refine_model if refine_scope == "profile" else draft_model,
+        style_fields=STYLE_FIELDS_ENABLED and refine_scope == "profile", cancel_event=cancel_event
+    )
+    if not style_profile.get('profile_created'):
+        return style_profile
+    
+    metadata = style_profile['metadata']
+    if refine_scope == "sections":
+        token_budget = get_chunk_token_budget(True, refine_model, None, processing_mode, user_profile)
+        style_profile['consolidated_analysis'], draft_confidence, refined_parts = refine_low_confidence_parts(
+            style_profile['consolidated_analysis'], _refinement_excerpt(metadata['file_info'], token_budget),
+            style_profile['text_statistics'], style_profile['readability_metrics'], refine_model,
+            user_profile, processing_mode, confidence_threshold, cancel_event
+        )
+        if STYLE_FIELDS_ENABLED:
+            # Read the fields from the refined analysis, not the draft
+            style_profile['style_fields'], metadata['style_fields_error'] = extract_style_fields(
+                style_profile['consolidated_analysis'], True, refine_model, processing_mode=processing_mode
+            )
+    else:
+        # The refine model wrote the whole consolidated analysis; there is no draft of it
+        draft_confidence = None
+        refined_parts = list(ANALYSIS_PARTS)
+    
+    metadata['analysis_method'] = "Local Ollama (tiered)"
+    metadata['model_used'] = f"{draft_model} + {refine_model}"
+    metadata['tiered'] = {
+        'draft_model': draft_model,
+        'refine_model': refine_model,
+        'refine_scope': refine_scope,
+        'confidence_threshold': confidence_threshold,
+        'draft_confidence': draft_confidence,
+        'confidence': score_analysis(style_profile['consolidated_analysis']),
+        'refined_parts': refined_parts
+    }
+    return style_profile
+
+
 def display_enhanced_results(style_profile):
     """Display a summary of the analysis results."""
     print("\n" + "="*60)
@@ -168,6 +981,11 @@ def display_enhanced_results(style_profile):
     print(f"Model used: {style_profile['metadata']['model_used']}")
     print(f"Processing mode: {style_profile['metadata']['processing_mode']}")
     
+    tiered = style_profile['metadata'].get('tiered')
+    if tiered:
+        refined = ", ".join(str(part) for part in tiered['refined_parts']) or "none"
+        print(f"Tiered: {tiered['refine_model']} refined the {tiered['refine_scope']} (parts refined: {refined})")
+    
     if 'text_statistics' in style_profile:
         stats = style_profile['text_statistics']
         print(f"Word count: {stats.get('word_count', 'N/A')}")
@@ -0,0 +1,126 @@
+"""
+Draft confidence scoring for Style Transfer AI.
+Splits a 25-point analysis into its 7 parts and scores how complete and
+specific each part is, so tiered analysis can send only the weak parts of a
+small model's draft to a larger model.
+"""
+
+import re
+
+from .prompts import ANALYSIS_PARTS
+
+_PART_HEADING_RE = re.compile(r'^[#*>\s-]*PART\s+([1-7])\b', re.IGNORECASE | re.MULTILINE)
+_POINT_RE = re.compile(r'^[#*>\s-]*(?:Point\s+)?(\d{1,2})[.):]', re.IGNORECASE | re.MULTILINE)
+_NUMBER_RE = re.compile(r'\d')
+_EXAMPLE_RE = re.compile(r'["“‘][^"“”‘’\n]{3,}["”’]|\be\.g\.|\bfor example\b', re.IGNORECASE)
+
+# Share of the score from point coverage, measurements, quoted examples and length
+_WEIGHTS = {'coverage': 0.4, 'quantified': 0.3, 'exemplified': 0.2, 'detail': 0.1}
+_MIN_WORDS_PER_POINT = 25
+
+_PART_OF_POINT = {
+    point: part
+    for part, (_, first_point, last_point) in ANALYSIS_PARTS.items()
+    for point in range(first_point, last_point + 1)
+}
+
+
+def split_analysis_parts(analysis):
+    """
+    Split an analysis into the text before PART 1 and the text of each part.
+    
+    Parts are found by their "PART n" headings; an analysis without headings
+    is split where the first point of each part begins.
+    
+    Args:
+        analysis (str): 25-point analysis text
+    
+    Returns:
+        tuple: (preamble, dict of part number to part text); parts the
+            analysis does not contain are missing from the dict
+    """
+    starts = {}
+    for match in _PART_HEADING_RE.finditer(analysis):
+        starts.setdefault(int(match.group(1)), match.start())
+    if not starts:
+        for match in _POINT_RE.finditer(analysis):
+            part = _PART_OF_POINT.get(int(match.group(1)))
+            if part is not None:
+                starts.setdefault(part, match.start())
+    if not starts:
+        return analysis.strip(), {}
+    
+    ordered = sorted(starts.items(), key=lambda item: item[1])
+    parts = {}
+    for index, (part, start) in enumerate(ordered):
+        end = ordered[index + 1][1] if index + 1 < len(ordered) else len(analysis)
+        parts[part] = analysis[start:end].strip()
+    return analysis[:ordered[0][1]].strip(), parts
+
+
+def join_analysis_parts(preamble, parts):
+    """Reassemble an analysis from split_analysis_parts output, parts in order."""
+    sections = [preamble] if preamble else []
+    sections += [parts[part] for part in sorted(parts) if parts[part]]
+    return "\n\n".join(sections)
+
+
+def _point_bodies(part_number, text):
+    """Return the text of each expected point of a part, keyed by point number."""
+    _, first_point, last_point = ANALYSIS_PARTS[part_number]
+    # Nested numbered lists inside a point are not point boundaries
+    matches = []
+    for match in _POINT_RE.finditer(text):
+        point = int(match.group(1))
+        if first_point <= point <= last_point and all(point != seen for seen, _ in matches):
+            matches.append((point, match))
+    
+    bodies = {}
+    for index, (point, match) in enumerate(matches):
+        end = matches[index + 1][1].start() if index + 1 < len(matches) else len(text)
+        bodies[point] = text[match.end():end]
+    return bodies
+
+
+def score_part(part_number, text):
+    """
+    Score how complete and specific one part of an analysis is.
+    
+    The score combines the share of the part's points present, the share
+    with a measurement (any number), the share with a quoted example and
+    whether the part has some substance in length.
+    
+    Args:
+        part_number (int): Key of ANALYSIS_PARTS
+        text (str): The part's text
+    
+    Returns:
+        float: Confidence between 0 and 1
+    """
+    _, first_point, last_point = ANALYSIS_PARTS[part_number]
+    expected = last_point - first_point + 1
+    bodies = _point_bodies(part_number, text or "")
+    if not bodies:
+        return 0.0
+    
+    signals = {
+        'coverage': len(bodies) / expected,
+        'quantified': sum(1 for body in bodies.values() if _NUMBER_RE.search(body)) / expected,
+        'exemplified': sum(1 for body in bodies.values() if _EXAMPLE_RE.search(body)) / expected,
+        'detail': min(1.0, len(text.split()) / (_MIN_WORDS_PER_POINT * expected))
+    }
+    return round(sum(_WEIGHTS[name] * value for name, value in signals.items()), 2)
+
+
+def score_analysis(analysis):
+    """
+    Score every part of an analysis.
+    
+    Args:
+        analysis (str): 25-point analysis text
+    
+    Returns:
+        dict: Part number to confidence (0.0 for a missing part)
+    """
+    _, parts = split_analysis_parts(analysis or "")
+    return {part: score_part(part, parts.get(part, "")) for part in ANALYSIS_PARTS}
@@ -0,0 +1,110 @@
+"""
+Parallel ingestion stage for Style Transfer AI.
+Reads, decodes and computes local statistics for many input files at once.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from .metrics import TextStatsAccumulator
+from ..utils.text_processing import read_text_file, TextFeatures
+from ..config.settings import INGESTION_MAX_WORKERS, INGESTION_CHUNK_SIZE
+
+
+def summarize_file(file_path, keep_text=False):
+    """
+    Read one file and reduce it to a compact, mergeable summary.
+
+    Without ``keep_text`` the statistics are built by streaming the file in
+    paragraph-aligned chunks (see TextStatsAccumulator.from_file), so memory
+    use does not grow with the file size. This runs inside worker processes,
+    so it must stay a picklable top-level function.
+
+    Args:
+        file_path (str): Path to the text file
+        keep_text (bool): Include the decoded text in the summary
+
+    Returns:
+        dict: 'filename', 'word_count', 'character_count' and a
+            TextStatsAccumulator under 'statistics', or 'filename' and
+            'error' if the file could not be read
+    """
+    if keep_text:
+        file_content = read_text_file(file_path)
+        if "Error" in file_content:
+            return {'filename': file_path, 'error': file_content}
+        statistics = TextStatsAccumulator.from_text(TextFeatures(file_content))
+    else:
+        try:
+            statistics = TextStatsAccumulator.from_file(file_path)
+        except FileNotFoundError:
+            return {'filename': file_path, 'error': f"Error: File '{file_path}' not found"}
+        except UnicodeDecodeError:
+            return {'filename': file_path, 'error': f"Error: Cannot read file '{file_path}' with any supported encoding"}
+        except OSError as e:
+            return {'filename': file_path, 'error': f"Error: Cannot read file '{file_path}' - {e}"}
+        if not statistics.word_count:
+            return {'filename': file_path, 'error': f"Error: File '{file_path}' is empty"}
+
+    summary = {
+        'filename': file_path,
+        'word_count': statistics.word_count,
+        'character_count': statistics.character_count,
+        'statistics': statistics
+    }
+    if keep_text:
+        summary['text'] = file_content
+    return summary
+
+
+def iter_file_summaries(file_paths, parallel=False, max_workers=None, chunksize=None, keep_text=False):
+    """
+    Yield a summary for each file, in input order.
+
+    Serial ingestion keeps the decoded text in each summary when asked to,
+    for callers that send it to a model. Parallel ingestion spreads the work
+    across a process pool and returns only the statistics, so full texts
+    never cross the process boundary.
+
+    Args:
+        file_paths (list): Paths of the files to ingest
+        parallel (bool): Use a ProcessPoolExecutor instead of the current process
+        max_workers (int): Worker processes (defaults to INGESTION_MAX_WORKERS)
+        chunksize (int): Files handed to a worker per task (defaults to INGESTION_CHUNK_SIZE)
+        keep_text (bool): Include the decoded text in serial summaries
+
+    Yields:
+        dict: File summaries as returned by summarize_file
+    """
+    if not parallel or len(file_paths) < 2:
+        for file_path in file_paths:
+            yield summarize_file(file_path, keep_text=keep_text)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers or INGESTION_MAX_WORKERS) as executor:
+        yield from executor.map(
+            summarize_file, file_paths, chunksize=chunksize or INGESTION_CHUNK_SIZE
+        )
+
+
+def ingest_files(file_paths, parallel=True, max_workers=None, chunksize=None):
+    """
+    Ingest files and merge their statistics into a single corpus summary.
+
+    Args:
+        file_paths (list): Paths of the files to ingest
+        parallel (bool): Use a process pool
+        max_workers (int): Worker processes (defaults to INGESTION_MAX_WORKERS)
+        chunksize (int): Files handed to a worker per task (defaults to INGESTION_CHUNK_SIZE)
+
+    Returns:
+        tuple: (TextStatsAccumulator for all readable files, list of file summaries)
+    """
+    corpus_statistics = TextStatsAccumulator()
+    summaries = []
+
+    for summary in iter_file_summaries(file_paths, parallel, max_workers, chunksize):
+        summary.pop('text', None)
+        if 'statistics' in summary:
+            corpus_statistics.merge(summary['statistics'])
+        summaries.append(summary)
+
+    return corpus_statistics, summaries
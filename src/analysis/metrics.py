@@ -5,30 +5,27 @@ Handles readability metrics and statistical text analysis.
 
 import re
 import math
+from array import array
 from collections import Counter
-from ..utils.text_processing import count_syllables
+from itertools import accumulate, chain
+from ..utils.text_processing import as_text_features, iter_text_chunks, count_syllables
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; batch metrics fall back to pure Python
+    np = None
 
-def calculate_readability_metrics(text):
-    """Calculate various readability and complexity metrics."""
-    # Input validation
-    if not text or not text.strip():
-        return {}
-    
-    # Basic text statistics
-    sentences = re.split(r'[.!?]+', text)
-    sentences = [s.strip() for s in sentences if s.strip()]
-    words = text.split()
-    
-    # Additional validation
-    if not words or not sentences:
-        return {}
-    
-    syllables = sum([count_syllables(word) for word in words])
-    
-    # Readability scores
-    avg_sentence_length = len(words) / len(sentences)
-    avg_syllables_per_word = syllables / len(words)
+# One match per non-empty sentence, matching how TextFeatures splits sentences
+_SENTENCE_RE = re.compile(r'[^.!?\s][^.!?]*')
+# Sentence starts inside a whitespace-free token: a terminator followed by anything else
+_INNER_SENTENCE_START_RE = re.compile(r'[.!?](?=[^.!?])')
+_SENTENCE_TERMINATORS = ('.', '!', '?')
+
+
+def _readability_scores(word_count, sentence_count, syllable_count, letter_count):
+    """Compute rounded readability scores from raw counts (all must be non-zero)."""
+    avg_sentence_length = word_count / sentence_count
+    avg_syllables_per_word = syllable_count / word_count
     
     # Flesch Reading Ease
     flesch_score = 206.835 - (1.015 * avg_sentence_length) - (84.6 * avg_syllables_per_word)
@@ -37,8 +34,8 @@ def calculate_readability_metrics(text):
     fk_grade = (0.39 * avg_sentence_length) + (11.8 * avg_syllables_per_word) - 15.59
     
     # Coleman-Liau Index
-    avg_letters_per_100_words = (sum(len(word) for word in words) / len(words)) * 100
-    avg_sentences_per_100_words = (len(sentences) / len(words)) * 100
+    avg_letters_per_100_words = (letter_count / word_count) * 100
+    avg_sentences_per_100_words = (sentence_count / word_count) * 100
     coleman_liau = (0.0588 * avg_letters_per_100_words) - (0.296 * avg_sentences_per_100_words) - 15.8
     
     return {
@@ -50,10 +47,42 @@ def calculate_readability_metrics(text):
     }
 
 
+def calculate_readability_metrics(text):
+    """
+    Calculate various readability and complexity metrics.
+    
+    Args:
+        text (str | TextFeatures): Raw text or pre-extracted features
+        
+    Returns:
+        dict: Readability scores, or an empty dict for unusable input
+    """
+    features = as_text_features(text)
+    
+    # Input validation
+    if features.is_empty() or not features.sentences:
+        return {}
+    
+    return _readability_scores(
+        features.word_count, features.sentence_count,
+        features.syllable_count, features.letter_count
+    )
+
+
 def analyze_text_statistics(text):
-    """Perform detailed statistical analysis of text."""
+    """
+    Perform detailed statistical analysis of text.
+    
+    Args:
+        text (str | TextFeatures): Raw text or pre-extracted features
+        
+    Returns:
+        dict: Counts, averages, frequencies and lexical diversity
+    """
+    features = as_text_features(text)
+    
     # Input validation
-    if not text or not text.strip():
+    if features.is_empty():
         return {
             'word_count': 0,
             'sentence_count': 0,
@@ -68,26 +97,10 @@ def analyze_text_statistics(text):
             'lexical_diversity': 0
         }
     
-    words = text.split()
-    sentences = re.split(r'[.!?]+', text)
-    sentences = [s.strip() for s in sentences if s.strip()]
-    paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-    
-    # Additional validation for empty results
-    if not words:
-        return {
-            'word_count': 0,
-            'sentence_count': len(sentences),
-            'paragraph_count': len(paragraphs),
-            'character_count': len(text),
-            'avg_words_per_sentence': 0,
-            'avg_sentences_per_paragraph': 0,
-            'word_frequency': {},
-            'punctuation_counts': {},
-            'sentence_types': {},
-            'unique_words': 0,
-            'lexical_diversity': 0
-        }
+    text = features.text
+    words = features.tokens
+    sentences = features.sentences
+    paragraphs = features.paragraphs
     
     # Word frequency analysis
     word_freq = Counter(word.lower().strip('.,!?";:()[]{}') for word in words)
@@ -127,4 +140,475 @@ def analyze_text_statistics(text):
         'sentence_types': sentence_types,
         'unique_words': unique_words_count,
         'lexical_diversity': round(unique_words_count / len(words), 3) if words else 0
-    }
\ No newline at end of file
+    }
+
+
+class TextStatsAccumulator:
+    """
+    Mergeable running totals for text statistics and readability metrics.
+    
+    Build one accumulator per text (or per chunk of a text), merge them, and
+    read the corpus-level ``text_statistics``/``readability_metrics`` without
+    ever holding the concatenated corpus in memory. For a single text the
+    results are identical to analyze_text_statistics and
+    calculate_readability_metrics.
+    """
+    
+    PUNCTUATION_KEYS = (
+        'commas', 'periods', 'semicolons', 'colons',
+        'exclamations', 'questions', 'dashes', 'parentheses'
+    )
+    
+    def __init__(self):
+        self.word_count = 0
+        self.sentence_count = 0
+        self.paragraph_count = 0
+        self.character_count = 0
+        self.letter_count = 0
+        self.syllable_count = 0
+        self.punctuation_counts = Counter({key: 0 for key in self.PUNCTUATION_KEYS})
+        self.sentence_types = Counter({'declarative': 0, 'interrogative': 0, 'exclamatory': 0})
+        self.word_frequency = Counter()
+        self.vocabulary = set()
+    
+    @classmethod
+    def from_text(cls, text):
+        """Create an accumulator holding the statistics of a single text."""
+        accumulator = cls()
+        accumulator.add(text)
+        return accumulator
+    
+    @classmethod
+    def from_file(cls, file_path, chunk_size=None):
+        """
+        Create an accumulator by streaming a file in paragraph-aligned chunks.
+        
+        Memory use is bounded by the chunk size rather than the file size.
+        
+        Args:
+            file_path (str): Path to the text file
+            chunk_size (int): Bytes to read per step (defaults to STREAM_CHUNK_SIZE)
+            
+        Returns:
+            TextStatsAccumulator: Statistics of the whole file
+        """
+        accumulator = cls()
+        chunks = iter_text_chunks(file_path, chunk_size) if chunk_size else iter_text_chunks(file_path)
+        for chunk in chunks:
+            accumulator.add(chunk)
+        return accumulator
+    
+    def add(self, text):
+        """
+        Add the statistics of a text to the running totals.
+        
+        Args:
+            text (str | TextFeatures): Raw text or pre-extracted features
+            
+        Returns:
+            TextStatsAccumulator: self, for chaining
+        """
+        features = as_text_features(text)
+        if features.is_empty():
+            return self
+        
+        raw = features.text
+        words = features.tokens
+        
+        self.word_count += features.word_count
+        self.sentence_count += features.sentence_count
+        self.paragraph_count += features.paragraph_count
+        self.character_count += features.character_count
+        self.letter_count += features.letter_count
+        self.syllable_count += features.syllable_count
+        
+        self.punctuation_counts.update({
+            'commas': raw.count(','),
+            'periods': raw.count('.'),
+            'semicolons': raw.count(';'),
+            'colons': raw.count(':'),
+            'exclamations': raw.count('!'),
+            'questions': raw.count('?'),
+            'dashes': raw.count('—') + raw.count('--'),
+            'parentheses': raw.count('(')
+        })
+        
+        sentences = features.sentences
+        self.sentence_types.update({
+            'declarative': len([s for s in sentences if s.endswith('.')]),
+            'interrogative': len([s for s in sentences if s.endswith('?')]),
+            'exclamatory': len([s for s in sentences if s.endswith('!')])
+        })
+        
+        self.word_frequency.update(word.lower().strip('.,!?";:()[]{}') for word in words)
+        self.vocabulary.update(word.lower() for word in words)
+        return self
+    
+    def merge(self, other):
+        """
+        Merge another accumulator into this one.
+        
+        Args:
+            other (TextStatsAccumulator): Accumulator to fold in
+            
+        Returns:
+            TextStatsAccumulator: self, for chaining
+        """
+        self.word_count += other.word_count
+        self.sentence_count += other.sentence_count
+        self.paragraph_count += other.paragraph_count
+        self.character_count += other.character_count
+        self.letter_count += other.letter_count
+        self.syllable_count += other.syllable_count
+        self.punctuation_counts.update(other.punctuation_counts)
+        self.sentence_types.update(other.sentence_types)
+        self.word_frequency.update(other.word_frequency)
+        self.vocabulary.update(other.vocabulary)
+        return self
+    
+    def text_statistics(self):
+        """Return statistics in the analyze_text_statistics format."""
+        if not self.word_count:
+            return analyze_text_statistics("")
+        
+        words = self.word_count
+        sentences = self.sentence_count
+        paragraphs = self.paragraph_count
+        unique_words_count = len(self.vocabulary)
+        
+        return {
+            'word_count': words,
+            'sentence_count': sentences,
+            'paragraph_count': paragraphs,
+            'character_count': self.character_count,
+            'avg_words_per_sentence': round(words / sentences, 2) if sentences else 0,
+            'avg_sentences_per_paragraph': round(sentences / paragraphs, 2) if paragraphs else 0,
+            'word_frequency': dict(self.word_frequency.most_common(20)),
+            'punctuation_counts': {key: self.punctuation_counts[key] for key in self.PUNCTUATION_KEYS},
+            'sentence_types': {
+                'declarative': self.sentence_types['declarative'],
+                'interrogative': self.sentence_types['interrogative'],
+                'exclamatory': self.sentence_types['exclamatory'],
+                'imperative': 0  # Would need more sophisticated analysis
+            },
+            'unique_words': unique_words_count,
+            'lexical_diversity': round(unique_words_count / words, 3)
+        }
+    
+    def readability_metrics(self):
+        """Return readability scores in the calculate_readability_metrics format."""
+        if not self.word_count or not self.sentence_count:
+            return {}
+        
+        return _readability_scores(
+            self.word_count, self.sentence_count, self.syllable_count, self.letter_count
+        )
+
+
+class CorpusBuffers:
+    """
+    Flat, array-backed token buffers for a batch of documents.
+    
+    Tokens of all documents are laid end to end; ``document_offsets`` marks
+    where each document starts. Buffers are NumPy arrays when NumPy is
+    installed and ``array.array`` instances otherwise.
+    
+    Attributes:
+        document_count (int): Number of documents in the batch
+        document_offsets: Start index of each document's tokens, plus the total
+        token_lengths: Characters per token
+        token_syllables: Syllables per token
+        token_word_ids: Id of each token's lowercased form
+        sentence_counts: Non-empty sentences per document
+        character_counts: Characters per document
+    """
+    
+    __slots__ = ('document_count', 'document_offsets', 'token_lengths', 'token_syllables',
+                 'token_word_ids', 'sentence_counts', 'character_counts')
+    
+    def __init__(self, document_offsets, token_lengths, token_syllables,
+                 token_word_ids, sentence_counts, character_counts):
+        self.document_count = len(sentence_counts)
+        self.document_offsets = document_offsets
+        self.token_lengths = token_lengths
+        self.token_syllables = token_syllables
+        self.token_word_ids = token_word_ids
+        self.sentence_counts = sentence_counts
+        self.character_counts = character_counts
+
+
+def tokenize_corpus(documents):
+    """
+    Tokenize a batch of documents into flat per-token buffers.
+    
+    Word forms are interned first, so syllables, case folding and sentence
+    boundaries are computed once per distinct form rather than once per
+    token; with NumPy, per-token values are then gathered from those
+    per-form arrays without a Python loop.
+    
+    Args:
+        documents (list): Document texts (None is treated as empty)
+        
+    Returns:
+        CorpusBuffers: Token and per-document buffers for the batch
+    """
+    documents = [document or "" for document in documents]
+    token_lists = [document.split() for document in documents]
+    tokens = list(chain.from_iterable(token_lists))
+    
+    forms = list(dict.fromkeys(tokens))
+    form_ids = {form: index for index, form in enumerate(forms)}
+    folded_ids = {}
+    form_word_ids = [folded_ids.setdefault(form.lower(), len(folded_ids)) for form in forms]
+    form_syllables = list(map(count_syllables, forms))
+    
+    offsets = [0] + list(accumulate(map(len, token_lists)))
+    character_counts = list(map(len, documents))
+    
+    if np is not None:
+        token_forms = np.fromiter(map(form_ids.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+        document_offsets = np.array(offsets, dtype=np.int64)
+        return CorpusBuffers(
+            document_offsets,
+            np.fromiter(map(len, forms), dtype=np.int64, count=len(forms))[token_forms],
+            np.array(form_syllables, dtype=np.int64)[token_forms],
+            np.array(form_word_ids, dtype=np.int64)[token_forms],
+            _token_sentence_counts(forms, token_forms, document_offsets),
+            np.array(character_counts, dtype=np.int64)
+        )
+    
+    token_forms = list(map(form_ids.__getitem__, tokens))
+    return CorpusBuffers(
+        array('q', offsets),
+        array('q', map(len, tokens)),
+        array('q', [form_syllables[form] for form in token_forms]),
+        array('q', [form_word_ids[form] for form in token_forms]),
+        array('q', [len(_SENTENCE_RE.findall(document)) for document in documents]),
+        array('q', character_counts)
+    )
+
+
+def _token_sentence_counts(forms, token_forms, document_offsets):
+    """
+    Count each document's sentences from its tokens, as _SENTENCE_RE would.
+    
+    A sentence starts at a non-terminator whose previous non-space character
+    is a terminator or the start of the document. Tokens hold no whitespace,
+    so this only needs three flags per distinct form: the starts inside it,
+    whether it opens with a non-terminator and whether it ends with a
+    terminator. Starts are then summed per document with NumPy.
+    """
+    form_count = len(forms)
+    inner_starts = np.fromiter((len(_INNER_SENTENCE_START_RE.findall(form)) for form in forms),
+                               dtype=np.int64, count=form_count)
+    opens = np.fromiter((not form.startswith(_SENTENCE_TERMINATORS) for form in forms),
+                        dtype=bool, count=form_count)
+    closes = np.fromiter((form.endswith(_SENTENCE_TERMINATORS) for form in forms),
+                         dtype=bool, count=form_count)
+    
+    token_count = len(token_forms)
+    after_boundary = np.ones(token_count, dtype=bool)
+    after_boundary[1:] = closes[token_forms[:-1]]
+    document_starts = document_offsets[:-1]
+    after_boundary[document_starts[document_starts < token_count]] = True
+    
+    sentence_starts = inner_starts[token_forms] + (opens[token_forms] & after_boundary)
+    return _document_sums(sentence_starts, document_offsets)
+
+
+def _document_sums(token_values, document_offsets):
+    """Sum a NumPy token buffer per document (differences of its running total)."""
+    running_total = np.concatenate(([0], np.cumsum(token_values)))
+    return np.diff(running_total[document_offsets])
+
+
+def _document_totals(buffers):
+    """Reduce token buffers to per-document word, letter, syllable and vocabulary totals."""
+    offsets = buffers.document_offsets
+    
+    if np is not None:
+        count = buffers.document_count
+        word_counts = np.diff(offsets)
+        document_ids = np.repeat(np.arange(count), word_counts)
+        letter_counts = _document_sums(buffers.token_lengths, offsets)
+        syllable_counts = _document_sums(buffers.token_syllables, offsets)
+        
+        # Distinct (document, word) pairs give each document's vocabulary size;
+        # sorting the pair keys and keeping the first of each run finds them
+        vocabulary_size = int(buffers.token_word_ids.max()) + 1 if len(buffers.token_word_ids) else 1
+        pairs = np.sort(document_ids * vocabulary_size + buffers.token_word_ids)
+        first_of_run = np.ones(len(pairs), dtype=bool)
+        first_of_run[1:] = pairs[1:] != pairs[:-1]
+        unique_counts = np.bincount(pairs[first_of_run] // vocabulary_size, minlength=count)
+        return word_counts, letter_counts, syllable_counts, unique_counts
+    
+    word_counts, letter_counts, syllable_counts, unique_counts = [], [], [], []
+    for start, end in zip(offsets, offsets[1:]):
+        word_counts.append(end - start)
+        letter_counts.append(sum(buffers.token_lengths[start:end]))
+        syllable_counts.append(sum(buffers.token_syllables[start:end]))
+        unique_counts.append(len(set(buffers.token_word_ids[start:end])))
+    return word_counts, letter_counts, syllable_counts, unique_counts
+
+
+def analyze_corpus_batch(documents):
+    """
+    Compute readability and sentence statistics for many documents at once.
+    
+    Per-document totals come from vectorized reductions over flat token
+    buffers (see tokenize_corpus). Every value equals what
+    analyze_text_statistics and calculate_readability_metrics return for the
+    same document; word frequency and punctuation counts are not included.
+    
+    Args:
+        documents (list): Document texts
+        
+    Returns:
+        list: One dict per document with word, sentence and character counts,
+            avg_words_per_sentence, unique_words, lexical_diversity and
+            readability_metrics (empty when the document has no sentences)
+    """
+    buffers = tokenize_corpus(documents)
+    word_counts, letter_counts, syllable_counts, unique_counts = _document_totals(buffers)
+    sentence_counts = buffers.sentence_counts
+    
+    if np is not None:
+        # Scores are evaluated element-wise in the same order as the scalar
+        # formulas, so the float results are bit-for-bit identical
+        with np.errstate(divide='ignore', invalid='ignore'):
+            avg_sentence_length = word_counts / sentence_counts
+            avg_syllables_per_word = syllable_counts / word_counts
+            flesch_score = 206.835 - (1.015 * avg_sentence_length) - (84.6 * avg_syllables_per_word)
+            fk_grade = (0.39 * avg_sentence_length) + (11.8 * avg_syllables_per_word) - 15.59
+            avg_letters_per_100_words = (letter_counts / word_counts) * 100
+            avg_sentences_per_100_words = (sentence_counts / word_counts) * 100
+            coleman_liau = (0.0588 * avg_letters_per_100_words) - (0.296 * avg_sentences_per_100_words) - 15.8
+        
+        readability = [
+            {
+                "flesch_reading_ease": round(flesch, 2),
+                "flesch_kincaid_grade": round(grade, 2),
+                "coleman_liau_index": round(index, 2),
+                "avg_sentence_length": round(length, 2),
+                "avg_syllables_per_word": round(syllables, 2)
+            } if words and sentences else {}
+            for words, sentences, flesch, grade, index, length, syllables in zip(
+                word_counts.tolist(), sentence_counts.tolist(), flesch_score.tolist(),
+                fk_grade.tolist(), coleman_liau.tolist(), avg_sentence_length.tolist(),
+                avg_syllables_per_word.tolist()
+            )
+        ]
+        word_counts = word_counts.tolist()
+        sentence_counts = sentence_counts.tolist()
+        unique_counts = unique_counts.tolist()
+    else:
+        readability = [
+            _readability_scores(words, sentences, syllables, letters) if words and sentences else {}
+            for words, sentences, syllables, letters in zip(
+                word_counts, sentence_counts, syllable_counts, letter_counts
+            )
+        ]
+    
+    results = []
+    for words, sentences, characters, unique, scores in zip(
+        word_counts, sentence_counts, buffers.character_counts, unique_counts, readability
+    ):
+        if not words:
+            # Whitespace-only documents report zeros, as analyze_text_statistics does
+            sentences = characters = 0
+        results.append({
+            'word_count': words,
+            'sentence_count': sentences,
+            'character_count': int(characters),
+            'avg_words_per_sentence': round(words / sentences, 2) if sentences else 0,
+            'unique_words': unique,
+            'lexical_diversity': round(unique / words, 3) if words else 0,
+            'readability_metrics': scores
+        })
+    return results
+
+
+def _flesch_band(score):
+    if score >= 80:
+        return "easy"
+    if score >= 60:
+        return "standard"
+    if score >= 30:
+        return "difficult"
+    return "very difficult"
+
+
+def describe_statistics(text_statistics, readability_metrics):
+    """
+    Describe local metrics in the plain-text form used for profile analyses.
+    
+    Statistical profiles have no model output, so this summary stands in
+    for the analysis text in reports and generation prompts.
+    
+    Args:
+        text_statistics (dict): Output of analyze_text_statistics
+        readability_metrics (dict): Output of calculate_readability_metrics
+        
+    Returns:
+        str: Multi-line description of the writing statistics
+    """
+    words = text_statistics.get('word_count', 0)
+    if not words:
+        return "No measurable text."
+    
+    avg_sentence = text_statistics.get('avg_words_per_sentence', 0)
+    sentence_style = "short" if avg_sentence < 12 else "long" if avg_sentence > 22 else "moderate"
+    lines = [
+        "LOCAL STATISTICAL PROFILE (computed without a language model)",
+        f"Sentence Structure: {avg_sentence} words per sentence on average ({sentence_style} sentences), "
+        f"{text_statistics.get('avg_sentences_per_paragraph', 0)} sentences per paragraph",
+        f"Vocabulary: lexical diversity {text_statistics.get('lexical_diversity', 0)} "
+        f"({text_statistics.get('unique_words', 0)} unique of {words} words)"
+    ]
+    
+    punctuation = text_statistics.get('punctuation_counts', {})
+    if punctuation:
+        rates = ", ".join(f"{name} {count * 100 / words:.1f}" for name, count in punctuation.items() if count)
+        lines.append(f"Punctuation per 100 words: {rates or 'none'}")
+    
+    if readability_metrics:
+        reading_ease = readability_metrics.get('flesch_reading_ease', 0)
+        lines.append(
+            f"Readability: Flesch Reading Ease {reading_ease} ({_flesch_band(reading_ease)}), "
+            f"grade level {readability_metrics.get('flesch_kincaid_grade', 'N/A')}, "
+            f"{readability_metrics.get('avg_syllables_per_word', 'N/A')} syllables per word"
+        )
+    
+    frequent_words = list(text_statistics.get('word_frequency', {}))[:10]
+    if frequent_words:
+        lines.append(f"Most frequent words: {', '.join(frequent_words)}")
+    return "\n".join(lines)
+
+
+def profile_statistics(style_profile):
+    """
+    Return a profile's statistics in the 'statistical_analysis' layout.
+    
+    Generation and style transfer read 'statistical_analysis'; profiles
+    saved by the analyzer store 'text_statistics' and 'readability_metrics'
+    instead, so those are mapped onto the same keys.
+    
+    Args:
+        style_profile (dict): Loaded style profile
+        
+    Returns:
+        dict: 'average_sentence_length', 'lexical_diversity',
+            'readability_scores' and 'punctuation_analysis' (empty if unknown)
+    """
+    if 'statistical_analysis' in style_profile:
+        return style_profile['statistical_analysis']
+    
+    text_statistics = style_profile.get('text_statistics')
+    if not text_statistics:
+        return {}
+    return {
+        'average_sentence_length': text_statistics.get('avg_words_per_sentence', 15),
+        'lexical_diversity': text_statistics.get('lexical_diversity', 0.5),
+        'readability_scores': style_profile.get('readability_metrics', {}),
+        'punctuation_analysis': text_statistics.get('punctuation_counts', {})
+    }
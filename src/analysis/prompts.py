@@ -3,38 +3,21 @@ Analysis prompt templates for Style Transfer AI.
 Contains the enhanced 25-point deep stylometry analysis framework.
 """
 
+import json
 
-def create_enhanced_deep_prompt(text_to_analyze, user_profile=None):
-    """Create the enhanced 25-point deep stylometry analysis prompt with user context."""
-    
-    # Build user context section if profile is provided
-    user_context = ""
-    if user_profile and user_profile.get('native_language', 'Not provided') != 'Not provided':
-        user_context = f"""
-**WRITER BACKGROUND CONTEXT:**
-Consider this writer's background when analyzing their style:
-- Native Language: {user_profile.get('native_language', 'Unknown')}
-- English Fluency: {user_profile.get('english_fluency', 'Unknown')}
-- Other Languages: {user_profile.get('other_languages', 'None specified')}
-- Nationality/Culture: {user_profile.get('nationality', 'Unknown')}
-- Cultural Background: {user_profile.get('cultural_background', 'Not specified')}
-- Education Level: {user_profile.get('education_level', 'Unknown')}
-- Field of Study: {user_profile.get('field_of_study', 'Unknown')}
-- Writing Experience: {user_profile.get('writing_experience', 'Unknown')}
-- Writing Frequency: {user_profile.get('writing_frequency', 'Unknown')}
+# The 7 parts of the deep analysis with their first and last point numbers
+ANALYSIS_PARTS = {
+    1: ("LINGUISTIC ARCHITECTURE", 1, 4),
+    2: ("LEXICAL INTELLIGENCE", 5, 8),
+    3: ("STYLISTIC DNA", 9, 12),
+    4: ("COGNITIVE PATTERNS", 13, 16),
+    5: ("PSYCHOLOGICAL MARKERS", 17, 20),
+    6: ("STRUCTURAL GENIUS", 21, 24),
+    7: ("UNIQUE FINGERPRINT", 25, 25)
+}
 
-Use this background to:
-1. Interpret language transfer patterns from their native language
-2. Understand cultural influences on writing style
-3. Consider educational and professional writing conventions
-4. Recognize multilingual writing characteristics
-5. Account for non-native English patterns (if applicable)
-
-"""
-    
-    return f"""
-Perform an ENHANCED DEEP stylometry analysis of the following text for creating a comprehensive writing style profile. Provide specific, quantifiable insights with exact numbers, percentages, and examples:
-{user_context}
+# The 25 points of the deep analysis, grouped under the 7 PART headings
+ANALYSIS_FRAMEWORK = """
 **PART 1: LINGUISTIC ARCHITECTURE**
 1. Sentence Structure Mastery: Calculate exact average sentence length, identify complex/compound/simple ratios with percentages, analyze syntactic patterns
 2. Clause Choreography: Measure subordinate clause frequency, coordination vs subordination ratios, dependent clause patterns
@@ -73,6 +56,57 @@ Perform an ENHANCED DEEP stylometry analysis of the following text for creating
 
 **PART 7: UNIQUE FINGERPRINT**
 25. Personal Signature Elements: Identify unique phrases, idiosyncratic expressions, personal linguistic habits
+""".strip()
+
+_FRAMEWORK_PARTS = {
+    part: block.strip()
+    for part, block in zip(ANALYSIS_PARTS, ANALYSIS_FRAMEWORK.split("\n\n"))
+}
+
+
+def _build_user_context(user_profile):
+    """Build the writer background section shared by the analysis prompts."""
+    user_context = ""
+    if user_profile and user_profile.get('native_language', 'Not provided') != 'Not provided':
+        user_context = f"""
+**WRITER BACKGROUND CONTEXT:**
+Consider this writer's background when analyzing their style:
+- Native Language: {user_profile.get('native_language', 'Unknown')}
+- English Fluency: {user_profile.get('english_fluency', 'Unknown')}
+- Other Languages: {user_profile.get('other_languages', 'None specified')}
+- Nationality/Culture: {user_profile.get('nationality', 'Unknown')}
+- Cultural Background: {user_profile.get('cultural_background', 'Not specified')}
+- Education Level: {user_profile.get('education_level', 'Unknown')}
+- Field of Study: {user_profile.get('field_of_study', 'Unknown')}
+- Writing Experience: {user_profile.get('writing_experience', 'Unknown')}
+- Writing Frequency: {user_profile.get('writing_frequency', 'Unknown')}
+
+Use this background to:
+1. Interpret language transfer patterns from their native language
+2. Understand cultural influences on writing style
+3. Consider educational and professional writing conventions
+4. Recognize multilingual writing characteristics
+5. Account for non-native English patterns (if applicable)
+
+"""
+    return user_context
+
+
+def create_deep_prompt_prefix(user_profile=None):
+    """
+    Return the fixed part of the deep analysis prompt, ending just before the text.
+    
+    The prefix is identical for every text analyzed for the same writer, so
+    Ollama can keep its evaluated tokens cached and only process the text.
+    """
+    
+    # Build user context section if profile is provided
+    user_context = _build_user_context(user_profile)
+    
+    return f"""
+Perform an ENHANCED DEEP stylometry analysis of the following text for creating a comprehensive writing style profile. Provide specific, quantifiable insights with exact numbers, percentages, and examples:
+{user_context}
+{ANALYSIS_FRAMEWORK}
 
 PROVIDE YOUR ANALYSIS AS:
 1. Quantitative metrics with exact numbers and percentages
@@ -83,5 +117,186 @@ PROVIDE YOUR ANALYSIS AS:
 6. Cultural/linguistic influence markers (based on writer background)
 
 Text to analyze:
-{text_to_analyze}
-"""
\ No newline at end of file
+"""
+
+
+def create_enhanced_deep_prompt(text_to_analyze, user_profile=None):
+    """Create the enhanced 25-point deep stylometry analysis prompt with user context."""
+    # Variable text goes last so the shared prefix can be reused between calls
+    return f"{create_deep_prompt_prefix(user_profile)}{text_to_analyze}\n"
+
+
+def create_section_prompt_prefix(part_number, user_profile=None):
+    """
+    Return the fixed part of one PART's analysis prompt, ending just before the text.
+    
+    Sectioned analysis sends each PART of the framework as its own prompt,
+    so the parts can be generated concurrently and cached separately.
+    """
+    title, first_point, last_point = ANALYSIS_PARTS[part_number]
+    user_context = _build_user_context(user_profile)
+    points = f"point {first_point}" if first_point == last_point else f"points {first_point}-{last_point}"
+    
+    return f"""
+Perform an ENHANCED DEEP stylometry analysis of the following text, covering ONLY PART {part_number} ({title}) of a 25-point writing style profile. Provide specific, quantifiable insights with exact numbers, percentages, and examples:
+{user_context}
+{_FRAMEWORK_PARTS[part_number]}
+
+PROVIDE YOUR ANALYSIS AS:
+1. The heading **PART {part_number}: {title}** followed by {points}, numbered as above
+2. Quantitative metrics with exact numbers and percentages
+3. Specific examples from the text for each point
+4. Comparative assessments (high/medium/low with context)
+5. Cultural/linguistic influence markers (based on writer background)
+
+Text to analyze:
+"""
+
+
+def create_section_prompt(part_number, text_to_analyze, user_profile=None):
+    """Create the analysis prompt for one PART of the 25-point framework."""
+    # Variable text goes last so the shared prefix can be reused between calls
+    return f"{create_section_prompt_prefix(part_number, user_profile)}{text_to_analyze}\n"
+
+
+def create_reduce_prompt(partial_analyses, user_profile=None):
+    """
+    Create the prompt that merges partial analyses of one text into a single analysis.
+    
+    Used by chunked (map-reduce) analysis: each partial analysis covers one
+    excerpt of a text too long for a single prompt.
+    """
+    user_context = _build_user_context(user_profile)
+    sections = "\n\n".join(
+        f"--- Partial analysis {index} ---\n{analysis}"
+        for index, analysis in enumerate(partial_analyses, 1)
+    )
+    
+    return f"""
+The following are 25-point stylometry analyses of consecutive excerpts from the SAME writer's text. Merge them into ONE enhanced deep stylometry analysis of the whole text:
+{user_context}
+MERGING RULES:
+1. Keep the same 25 numbered points, grouped under the same 7 PARTS
+2. Combine quantitative metrics as weighted averages; note ranges where excerpts differ
+3. Keep the most representative specific examples for each point
+4. Report patterns that recur across excerpts as the writer's stable traits, and call out any that appear only once
+5. Do not invent metrics or examples that are absent from the partial analyses
+
+Partial analyses:
+{sections}
+"""
+
+
+def _format_statistics(text_statistics, readability_metrics):
+    """Render locally computed corpus metrics as a compact prompt section."""
+    lines = []
+    if text_statistics:
+        for name in ('word_count', 'sentence_count', 'paragraph_count', 'character_count',
+                     'avg_words_per_sentence', 'avg_sentences_per_paragraph', 'unique_words', 'lexical_diversity'):
+            if name in text_statistics:
+                lines.append(f"- {name.replace('_', ' ').title()}: {text_statistics[name]}")
+        punctuation = text_statistics.get('punctuation_counts', {})
+        if punctuation:
+            lines.append("- Punctuation: " + ", ".join(f"{key} {count}" for key, count in punctuation.items()))
+        frequent_words = list(text_statistics.get('word_frequency', {}).items())[:10]
+        if frequent_words:
+            lines.append("- Most frequent words: " + ", ".join(f"{word} ({count})" for word, count in frequent_words))
+    if readability_metrics:
+        for name, value in readability_metrics.items():
+            lines.append(f"- {name.replace('_', ' ').title()}: {value}")
+    return "\n".join(lines)
+
+
+def create_consolidation_prompt(sample_analyses, text_statistics=None, readability_metrics=None, user_profile=None):
+    """
+    Create the prompt that consolidates per-sample analyses into one style profile.
+    
+    Used by hierarchical consolidation instead of re-sending the raw text of
+    every sample. Corpus statistics are included when given (the final merge).
+    """
+    user_context = _build_user_context(user_profile)
+    sections = "\n\n".join(
+        f"--- Sample analysis {index} ---\n{analysis}"
+        for index, analysis in enumerate(sample_analyses, 1)
+    )
+    statistics = _format_statistics(text_statistics, readability_metrics)
+    statistics_section = f"""
+**MEASURED CORPUS STATISTICS (computed exactly over all samples):**
+{statistics}
+""" if statistics else ""
+    
+    return f"""
+The following are 25-point stylometry analyses of DIFFERENT writing samples by the SAME writer. Consolidate them into ONE enhanced deep stylometry analysis describing the writer's overall style:
+{user_context}{statistics_section}
+CONSOLIDATION RULES:
+1. Keep the same 25 numbered points, grouped under the same 7 PARTS
+2. Prefer the measured corpus statistics over estimates in the sample analyses where they overlap
+3. Separate stable traits seen across samples from traits specific to one sample
+4. Keep the most representative specific examples for each point
+5. Do not invent metrics or examples that are absent from the inputs
+
+Sample analyses:
+{sections}
+"""
+
+
+def create_part_refine_prompt(part_number, draft_part, sample_text, text_statistics=None, readability_metrics=None, user_profile=None):
+    """
+    Create the prompt that has a larger model rewrite one part of a draft analysis.
+    
+    Used by tiered analysis for the parts a small model drafted with low
+    confidence. The samples come before the part-specific instructions, so
+    the refinements of one profile share a reusable prompt prefix.
+    """
+    title, first_point, last_point = ANALYSIS_PARTS[part_number]
+    points = f"point {first_point}" if first_point == last_point else f"points {first_point}-{last_point}"
+    user_context = _build_user_context(user_profile)
+    statistics = _format_statistics(text_statistics, readability_metrics)
+    statistics_section = f"""
+**MEASURED CORPUS STATISTICS (computed exactly over all samples):**
+{statistics}
+""" if statistics else ""
+    
+    return f"""
+You are reviewing an ENHANCED DEEP stylometry analysis drafted by a smaller model from the writing samples below.
+{user_context}{statistics_section}
+Writing samples:
+{sample_text}
+
+REFINE PART {part_number}: {title}
+Rewrite {points} of the draft below as "**PART {part_number}: {title}**" followed by the same numbered points.
+
+REFINEMENT RULES:
+1. Give exact numbers and percentages for every point, preferring the measured corpus statistics
+2. Quote specific examples from the writing samples for every point
+3. Correct anything in the draft that the samples do not support
+4. Output only PART {part_number}; do not repeat the other parts
+
+Draft of PART {part_number}:
+{draft_part}
+"""
+
+
+def create_style_fields_prompt(analysis, json_schema):
+    """
+    Create the prompt that summarizes a finished analysis as structured style fields.
+    
+    The schema is spelled out in the prompt as well as passed to the backend,
+    since only Ollama enforces it; OpenAI and Gemini are just put in JSON mode.
+    """
+    return f"""
+Summarize the writer's style described in the stylometry analysis below as a JSON object matching this JSON schema:
+{json.dumps(json_schema, indent=2)}
+
+FIELD GUIDANCE:
+1. overall_tone: a few words, e.g. "warm and conversational"
+2. active_voice_share: the share of active-voice sentences between 0 and 1
+3. preferred_domains: up to 5 vocabulary domains the writer favours
+4. signature_phrases: up to 5 phrases quoted from the analysis that mark this writer
+5. Base every value on the analysis; use "moderate", "medium", "balanced" or "mixed" where it says nothing
+
+Respond with the JSON object only.
+
+Stylometry analysis:
+{analysis}
+"""
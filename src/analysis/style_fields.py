@@ -0,0 +1,158 @@
+"""
+Structured style fields for Style Transfer AI.
+Defines the JSON schema that the consolidated analysis is summarized into
+and validates model output against it, so generation and style transfer can
+read typed fields instead of re-interpreting the analysis text.
+"""
+
+import json
+import re
+
+STYLE_FIELDS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "tone": {
+            "type": "object",
+            "properties": {
+                "overall_tone": {"type": "string"},
+                "emotional_range": {"type": "string", "enum": ["restrained", "moderate", "expressive"]},
+                "certainty": {"type": "string", "enum": ["tentative", "balanced", "assertive"]}
+            },
+            "required": ["overall_tone", "emotional_range", "certainty"]
+        },
+        "vocabulary": {
+            "type": "object",
+            "properties": {
+                "formality_level": {"type": "string", "enum": ["informal", "moderate", "formal"]},
+                "complexity": {"type": "string", "enum": ["low", "medium", "high"]},
+                "preferred_domains": {"type": "array", "items": {"type": "string"}}
+            },
+            "required": ["formality_level", "complexity", "preferred_domains"]
+        },
+        "structure": {
+            "type": "object",
+            "properties": {
+                "paragraph_style": {"type": "string"},
+                "organization": {"type": "string"},
+                "transition_style": {"type": "string"}
+            },
+            "required": ["paragraph_style", "organization", "transition_style"]
+        },
+        "voice": {
+            "type": "object",
+            "properties": {
+                "person": {"type": "string", "enum": ["first", "second", "third", "mixed"]},
+                "active_voice_share": {"type": "number", "minimum": 0, "maximum": 1}
+            },
+            "required": ["person", "active_voice_share"]
+        },
+        "signature_phrases": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["tone", "vocabulary", "structure", "voice", "signature_phrases"]
+}
+
+_CODE_FENCE_RE = re.compile(r'^```(?:json)?\s*|\s*```$')
+
+
+class StyleFieldsError(ValueError):
+    """Model output could not be read as style fields."""
+
+
+def _validate(value, schema, path, problems):
+    """Return ``value`` cleaned to match ``schema``, recording problems by path."""
+    kind = schema.get("type")
+    if kind == "object":
+        if not isinstance(value, dict):
+            problems.append(f"{path}: expected an object")
+            return None
+        cleaned = {}
+        for name, field_schema in schema["properties"].items():
+            if name in value:
+                field = _validate(value[name], field_schema, f"{path}.{name}", problems)
+                if field is not None:
+                    cleaned[name] = field
+            elif name in schema.get("required", ()):
+                problems.append(f"{path}.{name}: missing")
+        return cleaned
+    
+    if kind == "array":
+        if not isinstance(value, list):
+            problems.append(f"{path}: expected a list")
+            return None
+        items = [_validate(item, schema["items"], f"{path}[{index}]", problems) for index, item in enumerate(value)]
+        return [item for item in items if item not in (None, "")]
+    
+    if kind == "number":
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            problems.append(f"{path}: expected a number")
+            return None
+        if schema.get("maximum") == 1 and 1 < value <= 100:
+            # Shares are sometimes given as percentages
+            value = value / 100
+        if not schema.get("minimum", value) <= value <= schema.get("maximum", value):
+            problems.append(f"{path}: {value} is out of range")
+            return None
+        return float(value)
+    
+    if not isinstance(value, str):
+        problems.append(f"{path}: expected text")
+        return None
+    value = value.strip()
+    if "enum" in schema:
+        lowered = value.lower()
+        if lowered not in schema["enum"]:
+            problems.append(f"{path}: '{value}' is not one of {', '.join(schema['enum'])}")
+            return None
+        return lowered
+    return value
+
+
+def validate_style_fields(data):
+    """
+    Check decoded JSON against STYLE_FIELDS_SCHEMA.
+    
+    Enum values are matched case-insensitively, shares given as percentages
+    are scaled to 0-1 and unknown keys are dropped.
+    
+    Args:
+        data: Decoded JSON from the model
+    
+    Returns:
+        dict: Style fields with the schema's keys and types
+    
+    Raises:
+        StyleFieldsError: If a required field is missing or has the wrong type
+    """
+    problems = []
+    cleaned = _validate(data, STYLE_FIELDS_SCHEMA, "style_fields", problems)
+    if problems:
+        raise StyleFieldsError("; ".join(problems))
+    return cleaned
+
+
+def parse_style_fields(response):
+    """
+    Decode and validate a model's style fields response.
+    
+    Args:
+        response (str): JSON text, optionally in a Markdown code fence or
+            surrounded by other text
+    
+    Returns:
+        dict: Validated style fields
+    
+    Raises:
+        StyleFieldsError: If the response holds no valid style fields
+    """
+    text = _CODE_FENCE_RE.sub("", response.strip())
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        start, end = text.find("{"), text.rfind("}")
+        if start < 0 or end <= start:
+            raise StyleFieldsError("response is not JSON")
+        try:
+            data = json.loads(text[start:end + 1])
+        except json.JSONDecodeError as e:
+            raise StyleFieldsError(f"response is not valid JSON: {e}")
+    return validate_style_fields(data)
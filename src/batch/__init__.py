@@ -0,0 +1 @@
+"""Offline batch jobs: JSONL manifests run by a resumable worker."""
\ No newline at end of file
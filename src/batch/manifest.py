@@ -0,0 +1,186 @@
+"""
+Batch manifests and checkpoints for Style Transfer AI.
+A manifest is a JSONL file with one analysis, generation or transfer job
+per line; the checkpoint is a JSONL file the worker appends one result to
+as each job finishes, so an interrupted run can resume where it stopped.
+"""
+
+import json
+import os
+from datetime import datetime
+
+from ..config.settings import BATCH_RESULTS_SUFFIX, BATCH_JOB_TYPES
+
+
+class ManifestError(ValueError):
+    """A manifest line is not a valid batch job."""
+
+
+def make_job(job_id, job_type, **params):
+    """
+    Build a manifest entry.
+    
+    Args:
+        job_id (str): Unique id; the checkpoint records results under it
+        job_type (str): One of BATCH_JOB_TYPES
+        **params: Job parameters, e.g. file_paths for 'analyze' or
+            profile and topic_or_prompt for 'generate'
+    
+    Returns:
+        dict: Job ready for write_manifest
+    """
+    job = {'id': job_id, 'type': job_type}
+    job.update(params)
+    return job
+
+
+def validate_job(job, line_number=None):
+    """
+    Check the fields every job type needs.
+    
+    Args:
+        job (dict): Manifest entry
+        line_number (int): Manifest line, for the error message
+    
+    Raises:
+        ManifestError: If the job is missing its id or required parameters
+    """
+    where = f"line {line_number}: " if line_number else ""
+    if not isinstance(job, dict):
+        raise ManifestError(f"{where}expected a JSON object")
+    if not job.get('id'):
+        raise ManifestError(f"{where}job has no 'id'")
+    if job.get('type') not in BATCH_JOB_TYPES:
+        raise ManifestError(f"{where}job {job['id']} has unknown type {job.get('type')!r} "
+                            f"(expected one of {', '.join(BATCH_JOB_TYPES)})")
+    
+    if job['type'] == "analyze":
+        required = ['file_paths']
+    elif job['type'] == "generate":
+        required = ['profile', 'content_type', 'topic_or_prompt']
+    else:
+        required = ['profile']
+        if not job.get('original_content') and not job.get('content_path'):
+            raise ManifestError(f"{where}transfer job {job['id']} needs 'original_content' or 'content_path'")
+    
+    missing = [field for field in required if not job.get(field)]
+    if missing:
+        raise ManifestError(f"{where}{job['type']} job {job['id']} is missing {', '.join(missing)}")
+
+
+def write_manifest(path, jobs):
+    """
+    Write jobs to a manifest file, one JSON object per line.
+    
+    Args:
+        path (str): Manifest path
+        jobs (list): Job dicts (see make_job)
+    
+    Returns:
+        int: Number of jobs written
+    """
+    seen = set()
+    for job in jobs:
+        validate_job(job)
+        if job['id'] in seen:
+            raise ManifestError(f"duplicate job id {job['id']!r}")
+        seen.add(job['id'])
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        for job in jobs:
+            f.write(json.dumps(job, ensure_ascii=False) + "\n")
+    return len(jobs)
+
+
+def read_manifest(path):
+    """
+    Read and validate a manifest.
+    
+    Blank lines and lines starting with '#' are ignored.
+    
+    Args:
+        path (str): Manifest path
+    
+    Returns:
+        list: Job dicts in manifest order
+    
+    Raises:
+        ManifestError: On invalid JSON, invalid jobs or duplicate ids
+    """
+    jobs = []
+    seen = set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                job = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ManifestError(f"line {line_number}: invalid JSON ({e})")
+            validate_job(job, line_number)
+            if job['id'] in seen:
+                raise ManifestError(f"line {line_number}: duplicate job id {job['id']!r}")
+            seen.add(job['id'])
+            jobs.append(job)
+    return jobs
+
+
+def default_checkpoint_path(manifest_path):
+    """Return the checkpoint path used for a manifest when none is given."""
+    root, _ = os.path.splitext(manifest_path)
+    return root + BATCH_RESULTS_SUFFIX
+
+
+def load_checkpoint(path):
+    """
+    Read the results recorded so far.
+    
+    A torn last line (the process died mid-write) is ignored, and a job
+    recorded more than once keeps its latest result.
+    
+    Args:
+        path (str): Checkpoint path
+    
+    Returns:
+        dict: Result records keyed by job id (empty if the file does not exist)
+    """
+    records = {}
+    if not os.path.exists(path):
+        return records
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and record.get('id'):
+                records[record['id']] = record
+    return records
+
+
+def append_checkpoint(path, record):
+    """
+    Append one result to the checkpoint and flush it to disk.
+    
+    Args:
+        path (str): Checkpoint path
+        record (dict): Result with at least 'id' and 'status'
+    """
+    record = dict(record, recorded_at=datetime.now().isoformat())
+    line = json.dumps(record, ensure_ascii=False, default=str)
+    
+    # A previous run may have died mid-line; start on a fresh line so this record stays readable
+    needs_newline = False
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+    
+    with open(path, 'a', encoding='utf-8') as f:
+        if needs_newline:
+            f.write("\n")
+        f.write(line + "\n")
+        f.flush()
+        os.fsync(f.fileno())
@@ -0,0 +1,223 @@
+"""
+Batch worker for Style Transfer AI.
+Runs the jobs of a manifest one after another without prompting, recording
+each result in the checkpoint as soon as it finishes. Re-running the same
+manifest skips every job the checkpoint already holds, so a crash or Ctrl+C
+costs at most the job that was in progress.
+"""
+
+import os
+import time
+
+from ..analysis.analyzer import create_enhanced_style_profile
+from ..generation.content_generator import ContentGenerator
+from ..generation.style_transfer import StyleTransfer
+from ..models.dispatch import is_error_response
+from ..storage.local_storage import load_local_profile, save_style_profile_locally
+from ..config.settings import BATCH_USER_PROFILE
+from .manifest import read_manifest, default_checkpoint_path, load_checkpoint, append_checkpoint
+
+# Profiles can name an earlier analyze job instead of a file: "job:<id>"
+JOB_REFERENCE_PREFIX = "job:"
+
+
+class JobError(Exception):
+    """A job could not be run or its model call failed."""
+
+
+def _with_absolute_paths(job, base_dir):
+    """Resolve a job's relative file paths against the manifest's directory."""
+    job = dict(job)
+    if job['type'] == "analyze":
+        job['file_paths'] = [os.path.join(base_dir, path) for path in job['file_paths']]
+    if job.get('profile') and not job['profile'].startswith(JOB_REFERENCE_PREFIX):
+        job['profile'] = os.path.join(base_dir, job['profile'])
+    if job.get('content_path'):
+        job['content_path'] = os.path.join(base_dir, job['content_path'])
+    return job
+
+
+def _resolve_profile(reference, records):
+    """Load a style profile from a file path or an earlier job's result."""
+    if reference.startswith(JOB_REFERENCE_PREFIX):
+        job_id = reference[len(JOB_REFERENCE_PREFIX):]
+        record = records.get(job_id)
+        if not record or record.get('status') != "completed" or record.get('type') != "analyze":
+            raise JobError(f"profile {reference} is not a completed analyze job")
+        return record['result']['profile']
+    
+    loaded = load_local_profile(reference)
+    if not loaded['success']:
+        raise JobError(loaded['error'])
+    return loaded['profile']
+
+
+def _run_analyze(job, backend, records):
+    profile = create_enhanced_style_profile(
+        job['file_paths'],
+        processing_mode=job.get('processing_mode', "enhanced"),
+        consolidation=job.get('consolidation'),
+        user_profile=job.get('user_profile') or dict(BATCH_USER_PROFILE),
+        **backend
+    )
+    if not profile.get('profile_created'):
+        raise JobError(profile.get('error', "Analysis failed"))
+    if is_error_response(profile.get('consolidated_analysis')):
+        raise JobError(profile['consolidated_analysis'])
+    
+    result = {'profile': profile}
+    if job.get('save'):
+        saved = save_style_profile_locally(profile)
+        if not saved['success']:
+            raise JobError(saved['error'])
+        result['saved_to'] = [saved['json_file'], saved['txt_file']]
+    return result
+
+
+def _run_generate(job, backend, records):
+    result = ContentGenerator().generate_content(
+        style_profile=_resolve_profile(job['profile'], records),
+        content_type=job['content_type'],
+        topic_or_prompt=job['topic_or_prompt'],
+        target_length=job.get('target_length', 500),
+        tone=job.get('tone', "neutral"),
+        additional_context=job.get('additional_context', ""),
+        **backend
+    )
+    if result.get('error'):
+        raise JobError(result['error'])
+    if is_error_response(result.get('generated_content')):
+        raise JobError(result['generated_content'])
+    return result
+
+
+def _run_transfer(job, backend, records):
+    original_content = job.get('original_content')
+    if not original_content:
+        try:
+            with open(job['content_path'], 'r', encoding='utf-8') as f:
+                original_content = f.read()
+        except OSError as e:
+            raise JobError(f"Cannot read {job['content_path']}: {e}")
+    
+    result = StyleTransfer().transfer_style(
+        original_content=original_content,
+        target_style_profile=_resolve_profile(job['profile'], records),
+        transfer_type=job.get('transfer_type', "direct_transfer"),
+        intensity=job.get('intensity', 1.0),
+        preserve_elements=job.get('preserve_elements'),
+        **backend
+    )
+    if result.get('error'):
+        raise JobError(result['error'])
+    if is_error_response(result.get('transferred_content')):
+        raise JobError(result['transferred_content'])
+    return result
+
+
+JOB_RUNNERS = {
+    'analyze': _run_analyze,
+    'generate': _run_generate,
+    'transfer': _run_transfer
+}
+
+
+def batch_status(manifest_path, checkpoint_path=None):
+    """
+    Summarize how far a manifest has got.
+    
+    Args:
+        manifest_path (str): Manifest path
+        checkpoint_path (str): Checkpoint path (defaults to the manifest's)
+    
+    Returns:
+        dict: 'total', 'completed', 'failed' and 'pending' job counts,
+            'failed_jobs' ({id: error}) and 'checkpoint'
+    """
+    checkpoint_path = checkpoint_path or default_checkpoint_path(manifest_path)
+    jobs = read_manifest(manifest_path)
+    records = load_checkpoint(checkpoint_path)
+    
+    statuses = [records.get(job['id'], {}).get('status') for job in jobs]
+    return {
+        'total': len(jobs),
+        'completed': statuses.count("completed"),
+        'failed': statuses.count("failed"),
+        'pending': statuses.count(None),
+        'failed_jobs': {
+            job['id']: records[job['id']].get('error')
+            for job, status in zip(jobs, statuses) if status == "failed"
+        },
+        'checkpoint': checkpoint_path
+    }
+
+
+def run_batch(manifest_path, checkpoint_path=None, use_local=True, model_name=None, api_type=None,
+              api_client=None, retry_failed=False, should_stop=None):
+    """
+    Run every job of a manifest that the checkpoint does not already hold.
+    
+    Jobs run in manifest order, so a generate or transfer job can use the
+    profile of an analyze job listed before it ("profile": "job:<id>").
+    Relative paths in jobs are taken from the manifest's directory.
+    
+    Args:
+        manifest_path (str): Manifest path
+        checkpoint_path (str): Checkpoint path (defaults to the manifest's)
+        use_local (bool): Whether to use the local Ollama model
+        model_name (str): Ollama model name
+        api_type (str): 'openai' or 'gemini' for cloud APIs
+        api_client: Pre-initialized API client
+        retry_failed (bool): Run jobs recorded as failed again
+        should_stop (callable): Checked between jobs; returning True ends
+            the run early, as Ctrl+C does
+    
+    Returns:
+        dict: Counts of 'total', 'completed', 'failed', 'skipped' (already
+            in the checkpoint) and 'pending' jobs, 'interrupted' and 'checkpoint'
+    """
+    checkpoint_path = checkpoint_path or default_checkpoint_path(manifest_path)
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    jobs = [_with_absolute_paths(job, base_dir) for job in read_manifest(manifest_path)]
+    records = load_checkpoint(checkpoint_path)
+    backend = {'use_local': use_local, 'model_name': model_name, 'api_type': api_type, 'api_client': api_client}
+    
+    summary = {'total': len(jobs), 'completed': 0, 'failed': 0, 'skipped': 0, 'pending': 0,
+               'interrupted': False, 'checkpoint': checkpoint_path}
+    
+    for index, job in enumerate(jobs, 1):
+        previous = records.get(job['id'], {}).get('status')
+        if previous == "completed" or (previous == "failed" and not retry_failed):
+            summary['skipped'] += 1
+            continue
+        
+        if summary['interrupted'] or (should_stop is not None and should_stop()):
+            summary['interrupted'] = True
+            summary['pending'] += 1
+            continue
+        
+        print(f"[{index}/{len(jobs)}] {job['type']} {job['id']}...")
+        started = time.perf_counter()
+        try:
+            record = {'status': "completed", 'result': JOB_RUNNERS[job['type']](job, backend, records)}
+        except KeyboardInterrupt:
+            # Nothing is recorded for the interrupted job; it runs again on resume
+            print(f"Interrupted during {job['id']}; completed results are kept in {checkpoint_path}")
+            summary['interrupted'] = True
+            summary['pending'] += 1
+            continue
+        except Exception as e:
+            record = {'status': "failed", 'error': str(e)}
+        
+        record.update(id=job['id'], type=job['type'], duration=round(time.perf_counter() - started, 3))
+        append_checkpoint(checkpoint_path, record)
+        records[job['id']] = record
+        summary[record['status']] += 1
+        
+        if record['status'] == "completed":
+            print(f"  ✓ done in {record['duration']:.1f}s")
+        else:
+            print(f"  ✗ failed: {record['error']}")
+    
+    return summary
+
@@ -0,0 +1 @@
+"""Benchmarks comparing analysis strategies for token cost and latency."""
\ No newline at end of file
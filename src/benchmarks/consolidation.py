@@ -0,0 +1,193 @@
+"""
+Consolidation strategy benchmark for Style Transfer AI.
+Compares the full-text and hierarchical consolidated analysis on the same
+samples for model calls, prompt tokens and wall time.
+
+Usage:
+    python -m src.benchmarks.consolidation [FILE ...] [--model gemma3:1b] [--simulate]
+"""
+
+import argparse
+import sys
+import threading
+import time
+
+from ..analysis import analyzer
+from ..analysis.ingestion import iter_file_summaries
+from ..analysis.metrics import TextStatsAccumulator
+from ..models import dispatch
+from ..utils.text_processing import estimate_tokens
+from ..config.settings import DEFAULT_FILE_PATHS, CONSOLIDATION_STRATEGIES, CHARS_PER_TOKEN
+
+
+class UsageMeter:
+    """Wraps a generate function and tallies calls and estimated tokens."""
+    
+    def __init__(self, generate):
+        self.generate = generate
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.prompt_tokens = 0
+            self.response_tokens = 0
+    
+    def __call__(self, prompt, *args, **kwargs):
+        response = self.generate(prompt, *args, **kwargs)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += estimate_tokens(prompt)
+            self.response_tokens += estimate_tokens(str(response))
+        return response
+    
+    def snapshot(self, wall_time):
+        return {
+            'calls': self.calls,
+            'prompt_tokens': self.prompt_tokens,
+            'response_tokens': self.response_tokens,
+            'wall_time': wall_time
+        }
+
+
+class SimulatedBackend:
+    """
+    Stand-in model whose latency grows with prompt and response size.
+    
+    Lets the strategies be compared without a running backend: each call
+    sleeps for prefill plus decode time and returns filler text of a fixed
+    token length.
+    """
+    
+    def __init__(self, prefill_tokens_per_second=500, decode_tokens_per_second=25,
+                 response_tokens=800, time_scale=1.0):
+        self.prefill_tokens_per_second = prefill_tokens_per_second
+        self.decode_tokens_per_second = decode_tokens_per_second
+        self.response_tokens = response_tokens
+        self.time_scale = time_scale
+    
+    def __call__(self, prompt, *args, **kwargs):
+        latency = (estimate_tokens(prompt) / self.prefill_tokens_per_second
+                   + self.response_tokens / self.decode_tokens_per_second)
+        if self.time_scale:
+            time.sleep(latency * self.time_scale)
+        return "Simulated analysis\n" + "x" * (self.response_tokens * CHARS_PER_TOKEN)
+
+
+def _uncached_generate(prompt, *args, **kwargs):
+    # Cached responses would make the second strategy look free
+    return dispatch.generate_text(prompt, *args, use_cache=False, **kwargs)
+
+
+def run_consolidation_benchmark(file_paths, use_local=True, model_name=None, api_type=None, api_client=None,
+                                processing_mode="enhanced", generate=None):
+    """
+    Analyze the samples once, then time each consolidation strategy on the results.
+    
+    Args:
+        file_paths (list): Writing sample paths
+        use_local (bool): Whether to use local Ollama model or cloud APIs
+        model_name (str): The specific model to use (for local models)
+        api_type (str): 'openai' or 'gemini' for cloud APIs
+        api_client: Pre-initialized API client (for OpenAI or Gemini)
+        processing_mode (str): 'enhanced' or 'statistical'
+        generate (callable): Replacement for generate_text, e.g. a
+            SimulatedBackend (defaults to the configured backend, uncached)
+    
+    Returns:
+        dict: 'files', 'individual' usage and per-strategy usage under
+            'strategies' ('calls', 'prompt_tokens', 'response_tokens', 'wall_time')
+    """
+    meter = UsageMeter(generate or _uncached_generate)
+    original_generate_text = analyzer.generate_text
+    analyzer.generate_text = meter
+    try:
+        summaries = [summary for summary in iter_file_summaries(file_paths, keep_text=True) if 'error' not in summary]
+        if not summaries:
+            raise ValueError("No readable sample files")
+        
+        corpus_statistics = TextStatsAccumulator()
+        for summary in summaries:
+            corpus_statistics.merge(summary['statistics'])
+        text_statistics = corpus_statistics.text_statistics()
+        readability_metrics = corpus_statistics.readability_metrics()
+        
+        started = time.perf_counter()
+        results = analyzer._analyze_files_concurrently(
+            summaries, use_local, model_name, api_type, api_client, None, processing_mode
+        )
+        individual = meter.snapshot(time.perf_counter() - started)
+        
+        individual_analyses = [
+            {'filename': summary['filename'], 'analysis': analysis} for summary, _, analysis in results
+        ]
+        combined_text = "".join(
+            f"\n\n--- From {summary['filename']} ---\n{file_content}" for summary, file_content, _ in results
+        )
+        
+        strategies = {}
+        for strategy in CONSOLIDATION_STRATEGIES:
+            meter.reset()
+            started = time.perf_counter()
+            if strategy == "hierarchical":
+                analyzer.consolidate_from_analyses(
+                    individual_analyses, text_statistics, readability_metrics, use_local, model_name,
+                    api_type, api_client, None, processing_mode
+                )
+            else:
+                analyzer.analyze_style(
+                    combined_text, use_local, model_name, api_type, api_client, None, processing_mode
+                )
+            strategies[strategy] = meter.snapshot(time.perf_counter() - started)
+    finally:
+        analyzer.generate_text = original_generate_text
+    
+    return {'files': len(summaries), 'individual': individual, 'strategies': strategies}
+
+
+def format_benchmark_report(results):
+    """
+    Format benchmark results as a text table.
+    
+    Args:
+        results (dict): Output of run_consolidation_benchmark
+    
+    Returns:
+        str: Report with one row per stage
+    """
+    lines = [
+        f"Consolidation benchmark over {results['files']} file(s)",
+        f"{'Stage':<28}{'Calls':>7}{'Prompt tok':>12}{'Output tok':>12}{'Wall s':>9}"
+    ]
+    rows = [("individual analyses", results['individual'])]
+    rows += [(f"consolidate: {name}", usage) for name, usage in results['strategies'].items()]
+    for label, usage in rows:
+        lines.append(
+            f"{label:<28}{usage['calls']:>7}{usage['prompt_tokens']:>12}"
+            f"{usage['response_tokens']:>12}{usage['wall_time']:>9.2f}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    """Run the benchmark from the command line against Ollama or the simulated backend."""
+    parser = argparse.ArgumentParser(description="Compare consolidation strategies for tokens and wall time")
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILE_PATHS, help="Writing sample files")
+    parser.add_argument("--model", default="gemma3:1b", help="Ollama model to benchmark")
+    parser.add_argument("--mode", default="enhanced", help="Processing mode")
+    parser.add_argument("--simulate", action="store_true", help="Use a simulated backend instead of Ollama")
+    parser.add_argument("--time-scale", type=float, default=0.01,
+                        help="Fraction of simulated latency to actually sleep (default: 0.01)")
+    args = parser.parse_args(argv)
+    
+    generate = SimulatedBackend(time_scale=args.time_scale) if args.simulate else None
+    results = run_consolidation_benchmark(
+        args.files, use_local=True, model_name=args.model, processing_mode=args.mode, generate=generate
+    )
+    print(format_benchmark_report(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""
+Fake Ollama server for Style Transfer AI.
+Answers /api/generate, /api/tags and /api/ps like Ollama does, with
+configurable request latency and jitter, model load time, prompt and generation
+speed, streaming, error rate and canned responses, so the pipeline can be
+benchmarked and tested without a model install or paid APIs.
+
+Usage:
+    python -m src.benchmarks.fake_ollama [--port 11434] [--tokens-per-second 30] [--error-rate 0.05]
+"""
+
+import argparse
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ..utils.text_processing import estimate_tokens
+
+_FILLER_WORDS = (
+    "The writer favours short declarative sentences, balanced by longer reflective passages "
+    "with frequent commas, concrete nouns and a conversational, lightly humorous tone."
+).split()
+
+
+def filler_response(word_count):
+    """Return a style-analysis-like text of ``word_count`` words."""
+    return " ".join(itertools.islice(itertools.cycle(_FILLER_WORDS), word_count))
+
+
+def example_for_schema(schema):
+    """Return a value that satisfies a JSON schema (first enum value, filler text, midpoint number)."""
+    kind = schema.get("type")
+    if kind == "object":
+        return {name: example_for_schema(field) for name, field in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [example_for_schema(schema.get("items", {"type": "string"}))]
+    if kind in ("number", "integer"):
+        return (schema.get("minimum", 0) + schema.get("maximum", 1)) / 2
+    if "enum" in schema:
+        return schema["enum"][0]
+    return filler_response(4)
+
+
+class _FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _send_chunk(self, payload):
+        data = (json.dumps(payload) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+    
+    def do_GET(self):
+        fake = self.server.fake
+        if self.path == "/api/tags":
+            self._send_json(200, {"models": [{"name": name} for name in fake.models]})
+        elif self.path == "/api/ps":
+            self._send_json(200, {"models": [{"name": name} for name in sorted(fake.loaded)]})
+        elif self.path == "/api/version":
+            self._send_json(200, {"version": "0.0.0-fake"})
+        else:
+            self._send_json(404, {"error": "not found"})
+    
+    def do_POST(self):
+        fake = self.server.fake
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self.path != "/api/generate":
+            self._send_json(404, {"error": "not found"})
+            return
+        
+        model_name = request.get("model")
+        if model_name not in fake.models:
+            self._send_json(404, {"error": f"model '{model_name}' not found"})
+            return
+        if fake.should_fail():
+            fake.count('errors')
+            self._send_json(fake.error_status, {"error": "fake server error"})
+            return
+        
+        prompt = request.get("prompt", "")
+        num_predict = request.get("options", {}).get("num_predict")
+        if isinstance(request.get("format"), dict):
+            # Structured output is sent whole, as one token
+            words = [json.dumps(example_for_schema(request["format"]))]
+        else:
+            words = fake.response_for(prompt).split(" ")
+        if num_predict and num_predict > 0:
+            words = words[:num_predict]
+        # An empty prompt only loads the model (warm-up)
+        if not prompt:
+            words = []
+        
+        load_seconds = fake.load(model_name)
+        prompt_tokens = estimate_tokens(prompt)
+        prompt_seconds = prompt_tokens / fake.prompt_tokens_per_second
+        fake.sleep(fake.request_latency() + prompt_seconds)
+        
+        token_seconds = 1.0 / fake.tokens_per_second
+        final = {
+            "model": model_name,
+            "done": True,
+            "load_duration": int(load_seconds * 1e9),
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(prompt_seconds * 1e9),
+            "eval_count": len(words),
+            "eval_duration": int(len(words) * token_seconds * 1e9)
+        }
+        fake.count('requests')
+        fake.count('prompt_tokens', prompt_tokens)
+        fake.count('eval_tokens', len(words))
+        
+        if not request.get("stream", True):
+            fake.sleep(len(words) * token_seconds)
+            self._send_json(200, dict(final, response=" ".join(words)))
+            return
+        
+        fake.count('streamed')
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for index, word in enumerate(words):
+                fake.sleep(token_seconds)
+                self._send_chunk({"model": model_name, "response": word if index == 0 else " " + word, "done": False})
+            self._send_chunk(dict(final, response=""))
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client cancelled the stream
+            pass
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeOllamaServer:
+    """
+    In-process HTTP server that behaves like a (slow, flaky) Ollama.
+    
+    Each generate call waits ``latency`` (plus random ``jitter``) and the
+    prompt processing time, then
+    produces the response at ``tokens_per_second``; the first call for a
+    model also waits ``load_seconds``. ``time_scale`` shrinks every wait so
+    tests can run a realistic profile in milliseconds.
+    """
+    
+    def __init__(self, models=("gemma3:1b", "gpt-oss:20b"), tokens_per_second=200.0,
+                 prompt_tokens_per_second=4000.0, latency=0.02, jitter=0.0, load_seconds=0.0,
+                 response_tokens=120, responses=None, error_rate=0.0, error_status=503, time_scale=1.0, seed=None,
+                 host="127.0.0.1", port=0):
+        """
+        Args:
+            models (iterable): Model tags reported by /api/tags
+            tokens_per_second (float): Generation speed
+            prompt_tokens_per_second (float): Prompt processing speed
+            latency (float): Fixed seconds added to every generate call
+            jitter (float): Mean of an exponentially distributed extra delay,
+                which gives the latency distribution a realistic tail
+            load_seconds (float): Extra wait on a model's first call
+            response_tokens (int): Length of the default filler response
+            responses (list or callable): Canned responses used in turn, or a
+                function taking the prompt and returning the response
+            error_rate (float): Fraction of generate calls answered with ``error_status``
+            error_status (int): HTTP status of injected errors
+            time_scale (float): Multiplier applied to every simulated wait
+            seed (int): Seed for error injection and jitter, for repeatable runs
+            host (str): Interface to listen on
+            port (int): Port to listen on; 0 picks a free one
+        """
+        self.models = list(models)
+        self.tokens_per_second = tokens_per_second
+        self.prompt_tokens_per_second = prompt_tokens_per_second
+        self.latency = latency
+        self.jitter = jitter
+        self.load_seconds = load_seconds
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.time_scale = time_scale
+        self.loaded = set()
+        self._default_response = filler_response(response_tokens)
+        self._responses = itertools.cycle(responses) if isinstance(responses, (list, tuple)) else responses
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'streamed': 0, 'errors': 0, 'prompt_tokens': 0, 'eval_tokens': 0}
+        self._address = (host, port)
+        self._server = None
+    
+    @property
+    def url(self):
+        """Base URL to use as OLLAMA_BASE_URL (or in OLLAMA_HOSTS)."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self):
+        """Start serving in a background thread and return self."""
+        self._server = ThreadingHTTPServer(self._address, _FakeOllamaHandler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+    
+    def stop(self):
+        """Stop serving and release the port."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+    
+    def sleep(self, seconds):
+        if seconds > 0 and self.time_scale:
+            time.sleep(seconds * self.time_scale)
+    
+    def request_latency(self):
+        if not self.jitter:
+            return self.latency
+        with self._lock:
+            return self.latency + self._random.expovariate(1.0 / self.jitter)
+    
+    def should_fail(self):
+        with self._lock:
+            return self._random.random() < self.error_rate
+    
+    def load(self, model_name):
+        """Mark a model loaded, returning the load time paid by this call."""
+        with self._lock:
+            cold = model_name not in self.loaded
+            self.loaded.add(model_name)
+        if cold and self.load_seconds:
+            self.sleep(self.load_seconds)
+            return self.load_seconds
+        return 0.0
+    
+    def response_for(self, prompt):
+        if self._responses is None:
+            return self._default_response
+        if callable(self._responses):
+            return self._responses(prompt)
+        with self._lock:
+            return next(self._responses)
+    
+    def count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+    
+    def stats(self):
+        """
+        Return what the server has handled.
+        
+        Returns:
+            dict: 'requests' and 'streamed' generate calls served, injected
+                'errors', and the 'prompt_tokens' and 'eval_tokens' processed
+        """
+        with self._lock:
+            return dict(self._stats)
+
+
+def main(argv=None):
+    """Serve a fake Ollama until interrupted, e.g. to point the app at it."""
+    parser = argparse.ArgumentParser(description="Run a fake Ollama server for benchmarks and tests")
+    parser.add_argument("--port", type=int, default=11434, help="Port to listen on (default: 11434)")
+    parser.add_argument("--models", nargs="+", default=["gemma3:1b", "gpt-oss:20b"], help="Models to report")
+    parser.add_argument("--tokens-per-second", type=float, default=30.0, help="Generation speed")
+    parser.add_argument("--prompt-tokens-per-second", type=float, default=500.0, help="Prompt processing speed")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fixed seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Mean random extra seconds per request")
+    parser.add_argument("--load-seconds", type=float, default=2.0, help="Model load time on first use")
+    parser.add_argument("--response-tokens", type=int, default=400, help="Length of each response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status of failed requests")
+    args = parser.parse_args(argv)
+    
+    server = FakeOllamaServer(
+        models=args.models, tokens_per_second=args.tokens_per_second,
+        prompt_tokens_per_second=args.prompt_tokens_per_second, latency=args.latency,
+        jitter=args.jitter, load_seconds=args.load_seconds, response_tokens=args.response_tokens,
+        error_rate=args.error_rate, error_status=args.error_status, port=args.port
+    ).start()
+    print(f"Fake Ollama listening on {server.url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
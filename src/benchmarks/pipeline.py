@@ -0,0 +1,300 @@
+"""
+End-to-end latency benchmark for Style Transfer AI.
+Runs profile analysis, content generation and style transfer repeatedly
+against Ollama (by default a FakeOllamaServer started for the run) and
+reports throughput, p50/p95/p99 latency and how each stage's time splits
+between local compute and waiting for the model.
+
+Usage:
+    python -m src.benchmarks.pipeline [FILE ...] [--iterations 5] [--tokens-per-second 200] [--url URL]
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import threading
+import time
+
+from ..analysis import analyzer
+from ..generation import content_generator, style_transfer
+from ..models import dispatch, ollama_client
+from ..models.dispatch import is_error_response
+from ..models.resilience import percentile
+from ..utils.text_processing import read_text_file
+from ..config.settings import DEFAULT_FILE_PATHS
+from .fake_ollama import FakeOllamaServer
+
+PIPELINE_STAGES = ["analyze", "generate", "transfer"]
+
+# Modules whose generate_text calls are timed as model wait
+_TIMED_MODULES = (analyzer, content_generator, style_transfer)
+
+
+class ModelWaitMeter:
+    """
+    Wraps generate_text and records when model calls are in flight.
+    
+    Concurrent calls overlap, so the wait is the length of the union of
+    the call intervals rather than their sum.
+    """
+    
+    def __init__(self, generate):
+        self.generate = generate
+        self._lock = threading.Lock()
+        self._intervals = []
+    
+    def __call__(self, prompt, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self.generate(prompt, *args, **kwargs)
+        finally:
+            with self._lock:
+                self._intervals.append((started, time.perf_counter()))
+    
+    def take(self):
+        """Return (calls, seconds waited) since the last take and start over."""
+        with self._lock:
+            intervals, self._intervals = sorted(self._intervals), []
+        
+        waited = 0.0
+        current_start = current_end = None
+        for start, end in intervals:
+            if current_end is None or start > current_end:
+                if current_end is not None:
+                    waited += current_end - current_start
+                current_start, current_end = start, end
+            else:
+                current_end = max(current_end, end)
+        if current_end is not None:
+            waited += current_end - current_start
+        return len(intervals), waited
+
+
+def _uncached_generate(prompt, *args, **kwargs):
+    # Cached responses would make every iteration after the first free
+    return dispatch.generate_text(prompt, *args, use_cache=False, **kwargs)
+
+
+def _analysis_error(profile):
+    if not profile.get('profile_created'):
+        return profile.get('error', "Analysis failed")
+    failed = [info['analysis_error'] for info in profile['metadata']['file_info'] if info.get('analysis_error')]
+    if is_error_response(profile['consolidated_analysis']):
+        failed.append(profile['consolidated_analysis'])
+    return failed[0] if failed else None
+
+
+def _output_error(result, key):
+    if result.get('error'):
+        return result['error']
+    return result[key] if is_error_response(result.get(key)) else None
+
+
+def _summarize_stage(samples, total_seconds):
+    latencies = [sample['latency'] for sample in samples]
+    model_wait = sum(sample['model_wait'] for sample in samples)
+    elapsed = sum(latencies)
+    return {
+        'runs': len(samples),
+        'errors': sum(1 for sample in samples if sample['error']),
+        'model_calls': sum(sample['model_calls'] for sample in samples),
+        'throughput': len(samples) / total_seconds if total_seconds else None,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+        'mean': elapsed / len(latencies) if latencies else None,
+        'model_wait_seconds': model_wait,
+        'local_seconds': max(0.0, elapsed - model_wait),
+        'model_wait_share': model_wait / elapsed if elapsed else None
+    }
+
+
+def run_pipeline_benchmark(file_paths, iterations=5, model_name="gemma3:1b", processing_mode="enhanced",
+                           consolidation=None, stages=None, stream=False, base_url=None,
+                           server_options=None, quiet=True):
+    """
+    Drive the analysis, generation and transfer pipeline end to end.
+    
+    Each iteration analyzes the samples, then generates and restyles
+    content with the resulting profile. Responses are never cached.
+    
+    Args:
+        file_paths (list): Writing sample paths
+        iterations (int): Runs of each stage
+        model_name (str): Ollama model to use
+        processing_mode (str): Key of PROCESSING_MODES
+        consolidation (str): Key of CONSOLIDATION_STRATEGIES for the analysis
+        stages (list): Subset of PIPELINE_STAGES to time (all by default;
+            later stages still need one analysis for their profile)
+        stream (bool): Stream the analysis calls
+        base_url (str): Ollama to benchmark; a FakeOllamaServer is started
+            when omitted
+        server_options (dict): FakeOllamaServer keyword arguments
+        quiet (bool): Hide the pipeline's progress output
+    
+    Returns:
+        dict: 'iterations', 'backend' (URL), 'server' (fake server stats or
+            None) and per-stage results under 'stages': 'runs', 'errors',
+            'model_calls', 'throughput' (runs per second), 'p50', 'p95',
+            'p99' and 'mean' latency, 'model_wait_seconds', 'local_seconds'
+            and 'model_wait_share'
+    """
+    stages = stages or PIPELINE_STAGES
+    unknown = [stage for stage in stages if stage not in PIPELINE_STAGES]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)}")
+    
+    sample_text = next(
+        (text for text in map(read_text_file, file_paths) if text and not text.startswith("Error")), None
+    )
+    if sample_text is None:
+        raise ValueError("No readable sample files")
+    transfer_text = sample_text[:1500]
+    
+    server = None
+    if base_url is None:
+        server = FakeOllamaServer(**(server_options or {})).start()
+        base_url = server.url
+    
+    meter = ModelWaitMeter(_uncached_generate)
+    originals = {module: module.generate_text for module in _TIMED_MODULES}
+    original_hosts = ollama_client.OLLAMA_HOSTS
+    ollama_client.OLLAMA_HOSTS = [base_url]
+    ollama_client.close_ollama_session()
+    for module in _TIMED_MODULES:
+        module.generate_text = meter
+    
+    generator = content_generator.ContentGenerator()
+    transfer = style_transfer.StyleTransfer()
+    user_profile = {'name': "Benchmark"}
+    on_token = (lambda token: None) if stream else None
+    samples = {stage: [] for stage in stages}
+    stage_seconds = {stage: 0.0 for stage in stages}
+    
+    def timed(stage, run, check):
+        meter.take()
+        started = time.perf_counter()
+        try:
+            result = run()
+            error = check(result)
+        except Exception as e:
+            result, error = None, str(e)
+        latency = time.perf_counter() - started
+        calls, waited = meter.take()
+        if stage in samples:
+            samples[stage].append({'latency': latency, 'model_wait': waited, 'model_calls': calls, 'error': error})
+            stage_seconds[stage] += latency
+        return result
+    
+    output = io.StringIO() if quiet else sys.stdout
+    try:
+        with contextlib.redirect_stdout(output):
+            profile = None
+            for _ in range(iterations):
+                if profile is None or "analyze" in stages:
+                    result = timed("analyze", lambda: analyzer.create_enhanced_style_profile(
+                        file_paths, True, model_name, processing_mode=processing_mode,
+                        on_token=on_token, consolidation=consolidation, user_profile=user_profile
+                    ), _analysis_error)
+                    if result and result.get('profile_created'):
+                        profile = result
+                if not profile:
+                    raise RuntimeError("Analysis failed; no profile to generate with")
+                
+                timed("generate", lambda: generator.generate_content(
+                    profile, "email", "A short update about the project schedule", target_length=150,
+                    use_local=True, model_name=model_name
+                ), lambda result: _output_error(result, 'generated_content'))
+                timed("transfer", lambda: transfer.transfer_style(
+                    transfer_text, profile, use_local=True, model_name=model_name
+                ), lambda result: _output_error(result, 'transferred_content'))
+    finally:
+        for module, generate in originals.items():
+            module.generate_text = generate
+        ollama_client.OLLAMA_HOSTS = original_hosts
+        ollama_client.close_ollama_session()
+        if server is not None:
+            server.stop()
+    
+    return {
+        'iterations': iterations,
+        'backend': base_url,
+        'server': server.stats() if server is not None else None,
+        'stages': {stage: _summarize_stage(samples[stage], stage_seconds[stage]) for stage in stages}
+    }
+
+
+def format_pipeline_report(results):
+    """
+    Format benchmark results as a text table.
+    
+    Args:
+        results (dict): Output of run_pipeline_benchmark
+    
+    Returns:
+        str: Report with one row per stage
+    """
+    lines = [
+        f"Pipeline benchmark: {results['iterations']} iteration(s) against {results['backend']}",
+        f"{'Stage':<10}{'Runs':>6}{'Err':>5}{'Calls':>7}{'Ops/s':>8}{'p50 s':>8}{'p95 s':>8}{'p99 s':>8}"
+        f"{'Model s':>9}{'Local s':>9}{'Wait':>7}"
+    ]
+    for stage, usage in results['stages'].items():
+        if not usage['runs']:
+            continue
+        lines.append(
+            f"{stage:<10}{usage['runs']:>6}{usage['errors']:>5}{usage['model_calls']:>7}"
+            f"{usage['throughput'] or 0:>8.2f}{usage['p50']:>8.3f}{usage['p95']:>8.3f}{usage['p99']:>8.3f}"
+            f"{usage['model_wait_seconds']:>9.2f}{usage['local_seconds']:>9.2f}"
+            f"{(usage['model_wait_share'] or 0) * 100:>6.0f}%"
+        )
+    if results['server']:
+        server = results['server']
+        lines.append(
+            f"Fake server: {server['requests']} generate call(s), {server['errors']} injected error(s), "
+            f"{server['prompt_tokens']} prompt / {server['eval_tokens']} output tokens"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    """Run the benchmark from the command line against a fake or real Ollama."""
+    parser = argparse.ArgumentParser(description="Time the analysis, generation and transfer pipeline end to end")
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILE_PATHS, help="Writing sample files")
+    parser.add_argument("--iterations", type=int, default=5, help="Runs of each stage (default: 5)")
+    parser.add_argument("--model", default="gemma3:1b", help="Ollama model to use")
+    parser.add_argument("--mode", default="enhanced", help="Processing mode")
+    parser.add_argument("--consolidation", help="Consolidation strategy for the analysis")
+    parser.add_argument("--stages", nargs="+", choices=PIPELINE_STAGES, help="Stages to time (default: all)")
+    parser.add_argument("--stream", action="store_true", help="Stream the analysis calls")
+    parser.add_argument("--url", help="Benchmark this Ollama instead of a fake server")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0, help="Fake generation speed")
+    parser.add_argument("--prompt-tokens-per-second", type=float, default=4000.0, help="Fake prompt speed")
+    parser.add_argument("--latency", type=float, default=0.02, help="Fake fixed seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Fake mean random extra seconds per request")
+    parser.add_argument("--response-tokens", type=int, default=120, help="Fake response length")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of fake requests that fail")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's progress output")
+    args = parser.parse_args(argv)
+    
+    server_options = {
+        'tokens_per_second': args.tokens_per_second,
+        'prompt_tokens_per_second': args.prompt_tokens_per_second,
+        'latency': args.latency,
+        'jitter': args.jitter,
+        'response_tokens': args.response_tokens,
+        'error_rate': args.error_rate,
+        'models': [args.model]
+    }
+    results = run_pipeline_benchmark(
+        args.files, iterations=args.iterations, model_name=args.model, processing_mode=args.mode,
+        consolidation=args.consolidation, stages=args.stages, stream=args.stream, base_url=args.url,
+        server_options=server_options, quiet=not args.verbose
+    )
+    print(format_pipeline_report(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Prompt prefix reuse benchmark for Style Transfer AI.
+Sends the same analysis prompts to Ollama in two layouts and reports the
+server's prompt-eval work per call: variable text first (no shared prefix)
+versus the stable framework first, which Ollama serves from its cache.
+
+Usage:
+    python -m src.benchmarks.prefix_reuse [FILE ...] [--model gemma3:1b] [--max-output 64]
+"""
+
+import argparse
+import sys
+
+from ..analysis.analyzer import get_chunk_token_budget
+from ..analysis.prompts import create_deep_prompt_prefix, create_enhanced_deep_prompt
+from ..models.dispatch import is_error_response
+from ..models.ollama_client import analyze_with_ollama, get_call_metrics
+from ..models.token_budget import plan_request
+from ..utils.text_processing import read_text_file, split_text_for_budget
+from ..config.settings import DEFAULT_FILE_PATHS
+
+_TEXT_HEADER = "Text to analyze:\n"
+
+
+def variable_first_prompt(text, user_profile=None):
+    """Build the analysis prompt with the sample text ahead of the framework."""
+    framework = create_deep_prompt_prefix(user_profile)[:-len(_TEXT_HEADER)]
+    return f"{_TEXT_HEADER}{text}\n\n{framework}"
+
+
+PROMPT_LAYOUTS = {
+    "variable_first": variable_first_prompt,
+    "prefix_first": create_enhanced_deep_prompt
+}
+
+
+def _ollama_sender(model_name, processing_mode, max_output_tokens):
+    def send(prompt):
+        budget = plan_request(prompt, "ollama", model_name, processing_mode)
+        budget['num_predict'] = min(budget['num_predict'], max_output_tokens)
+        response = analyze_with_ollama(prompt, model_name, processing_mode, budget=budget)
+        if is_error_response(response):
+            raise RuntimeError(response)
+        return get_call_metrics()[-1]
+    return send
+
+
+def _mean(values):
+    values = [value for value in values if value is not None]
+    return sum(values) / len(values) if values else None
+
+
+def run_prefix_reuse_benchmark(file_paths, model_name="gemma3:1b", processing_mode="enhanced",
+                               user_profile=None, max_output_tokens=64, send=None):
+    """
+    Send every sample chunk in each prompt layout and collect per-call metrics.
+    
+    Args:
+        file_paths (list): Writing sample paths
+        model_name (str): Ollama model to benchmark
+        processing_mode (str): Key of PROCESSING_MODES
+        user_profile (dict): User background included in the prompt
+        max_output_tokens (int): Response cap per call; only prompt eval is measured
+        send (callable): Takes a prompt and returns its call metrics
+            (defaults to an uncached Ollama call)
+    
+    Returns:
+        dict: 'calls' per layout and, under 'layouts', each layout's
+            per-call 'prompt_eval_count' and 'prompt_eval_seconds' lists with
+            their means over warm calls (every call after the first)
+    """
+    send = send or _ollama_sender(model_name, processing_mode, max_output_tokens)
+    chunk_tokens = get_chunk_token_budget(True, model_name, None, processing_mode, user_profile)
+    
+    texts = []
+    for file_path in file_paths:
+        text = read_text_file(file_path)
+        if text and not text.startswith("Error"):
+            texts.extend(split_text_for_budget(text, chunk_tokens))
+    if len(texts) < 2:
+        raise ValueError("Need at least two sample chunks to measure prefix reuse")
+    
+    layouts = {}
+    for name, build_prompt in PROMPT_LAYOUTS.items():
+        metrics = [send(build_prompt(text, user_profile)) for text in texts]
+        counts = [entry.get('prompt_eval_count') for entry in metrics]
+        seconds = [entry.get('prompt_eval_seconds') for entry in metrics]
+        layouts[name] = {
+            'prompt_eval_count': counts,
+            'prompt_eval_seconds': seconds,
+            'warm_mean_count': _mean(counts[1:]),
+            'warm_mean_seconds': _mean(seconds[1:])
+        }
+    
+    return {'calls': len(texts), 'layouts': layouts}
+
+
+def format_prefix_report(results):
+    """
+    Format benchmark results as a text table.
+    
+    Args:
+        results (dict): Output of run_prefix_reuse_benchmark
+    
+    Returns:
+        str: Report with one row per call and a warm-call summary per layout
+    """
+    layouts = results['layouts']
+    lines = [
+        f"Prompt prefix reuse over {results['calls']} call(s) per layout",
+        f"{'Call':<6}" + "".join(f"{name + ' tok':>22}{'s':>9}" for name in layouts)
+    ]
+    for index in range(results['calls']):
+        row = f"{index + 1:<6}"
+        for usage in layouts.values():
+            count = usage['prompt_eval_count'][index]
+            row += f"{count if count is not None else '-':>22}{usage['prompt_eval_seconds'][index] or 0:>9.3f}"
+        lines.append(row)
+    
+    summary = f"{'warm':<6}"
+    for usage in layouts.values():
+        count = usage['warm_mean_count']
+        summary += f"{f'{count:.0f}' if count is not None else '-':>22}{usage['warm_mean_seconds'] or 0:>9.3f}"
+    lines.append(summary)
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    """Run the benchmark from the command line against Ollama."""
+    parser = argparse.ArgumentParser(description="Measure Ollama prompt-eval time with and without a shared prefix")
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILE_PATHS, help="Writing sample files")
+    parser.add_argument("--model", default="gemma3:1b", help="Ollama model to benchmark")
+    parser.add_argument("--mode", default="enhanced", help="Processing mode")
+    parser.add_argument("--max-output", type=int, default=64,
+                        help="Response tokens per call (default: 64)")
+    args = parser.parse_args(argv)
+    
+    results = run_prefix_reuse_benchmark(
+        args.files, model_name=args.model, processing_mode=args.mode, max_output_tokens=args.max_output
+    )
+    print(format_prefix_report(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
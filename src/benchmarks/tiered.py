@@ -0,0 +1,256 @@
+"""
+Tiered analysis benchmark for Style Transfer AI.
+Builds the same profile with the small model only, the large model only and
+the two tiered scopes (small model drafts, large model refines), and
+compares wall time, model calls, output tokens and the local confidence
+score of the resulting consolidated analysis.
+
+Usage:
+    python -m src.benchmarks.tiered [FILE ...] [--modes small large tiered:sections] [--simulate]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import re
+import sys
+import threading
+import time
+
+from ..analysis import analyzer
+from ..analysis.confidence import score_analysis
+from ..analysis.prompts import ANALYSIS_PARTS
+from ..models import dispatch
+from ..utils.text_processing import estimate_tokens
+from ..config.settings import (
+    DEFAULT_FILE_PATHS, AVAILABLE_MODELS, TIERED_DRAFT_MODEL, TIERED_REFINE_MODEL, TIERED_CONFIDENCE_THRESHOLD
+)
+from .fake_ollama import filler_response, example_for_schema
+
+TIERED_BENCHMARK_MODES = ["small", "large", "tiered:profile", "tiered:sections"]
+
+_REFINE_PART_RE = re.compile(r'^REFINE PART (\d)', re.MULTILINE)
+
+
+class ModelUsageMeter:
+    """Wraps a generate function and tallies calls and estimated tokens per model."""
+    
+    def __init__(self, generate):
+        self.generate = generate
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        with self._lock:
+            self.calls = {}
+            self.output_tokens = {}
+    
+    def __call__(self, prompt, use_local, model_name=None, *args, **kwargs):
+        response = self.generate(prompt, use_local, model_name, *args, **kwargs)
+        with self._lock:
+            self.calls[model_name] = self.calls.get(model_name, 0) + 1
+            self.output_tokens[model_name] = self.output_tokens.get(model_name, 0) + estimate_tokens(str(response))
+        return response
+
+
+def simulated_analysis(parts, detailed_parts, words_per_point=30):
+    """
+    Return a 25-point-style analysis of the given parts.
+    
+    Points in ``detailed_parts`` carry a measurement and a quoted example;
+    the others are vague, as a small model's weaker parts tend to be.
+    """
+    lines = []
+    for part in parts:
+        title, first_point, last_point = ANALYSIS_PARTS[part]
+        lines.append(f"**PART {part}: {title}**")
+        for point in range(first_point, last_point + 1):
+            if part in detailed_parts:
+                detail = f'Measured in {point * 3.5:.1f}% of sentences, as in "a representative phrase".'
+            else:
+                detail = "Varies across the samples."
+            lines.append(f"{point}. {detail} {filler_response(words_per_point)}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+class TieredSimulator:
+    """
+    Stand-in for a small and a large Ollama model.
+    
+    Each call sleeps for the model's prefill and decode time, using the
+    speeds in AVAILABLE_MODELS, with at most ``parallel_requests`` calls per
+    model at once. The refine model details every part it writes; other
+    models only detail the first ``draft_detailed_parts`` parts.
+    """
+    
+    def __init__(self, refine_model=TIERED_REFINE_MODEL, draft_detailed_parts=4, words_per_point=30,
+                 parallel_requests=1, time_scale=0.01):
+        self.refine_model = refine_model
+        self.draft_detailed_parts = draft_detailed_parts
+        self.words_per_point = words_per_point
+        self.parallel_requests = parallel_requests
+        self.time_scale = time_scale
+        self._lock = threading.Lock()
+        self._slots = {}
+    
+    def _slot(self, model_name):
+        with self._lock:
+            if model_name not in self._slots:
+                self._slots[model_name] = threading.Semaphore(self.parallel_requests)
+            return self._slots[model_name]
+    
+    def __call__(self, prompt, use_local, model_name=None, *args, **kwargs):
+        refine = _REFINE_PART_RE.search(prompt)
+        parts = [int(refine.group(1))] if refine else list(ANALYSIS_PARTS)
+        if model_name == self.refine_model:
+            detailed_parts = parts
+        else:
+            detailed_parts = [part for part in parts if part <= self.draft_detailed_parts]
+        if kwargs.get('json_schema'):
+            response = json.dumps(example_for_schema(kwargs['json_schema']))
+        else:
+            response = simulated_analysis(parts, detailed_parts, self.words_per_point)
+        
+        speeds = AVAILABLE_MODELS.get(model_name, {})
+        latency = (estimate_tokens(prompt) / speeds.get('prefill_tokens_per_second', 500)
+                   + estimate_tokens(response) / speeds.get('decode_tokens_per_second', 25))
+        with self._slot(model_name):
+            if self.time_scale:
+                time.sleep(latency * self.time_scale)
+        return response
+
+
+def _uncached_generate(prompt, *args, **kwargs):
+    # Cached responses would let later modes reuse the drafts of earlier ones
+    return dispatch.generate_text(prompt, *args, use_cache=False, **kwargs)
+
+
+def run_tiered_benchmark(file_paths, modes=None, draft_model=TIERED_DRAFT_MODEL, refine_model=TIERED_REFINE_MODEL,
+                         processing_mode="enhanced", confidence_threshold=TIERED_CONFIDENCE_THRESHOLD,
+                         generate=None, quiet=True):
+    """
+    Build one profile per mode and measure what each cost.
+    
+    Args:
+        file_paths (list): Writing sample paths
+        modes (list): Subset of TIERED_BENCHMARK_MODES (all by default)
+        draft_model (str): Small Ollama model
+        refine_model (str): Large Ollama model
+        processing_mode (str): Key of PROCESSING_MODES
+        confidence_threshold (float): Refinement threshold of the 'tiered:sections' mode
+        generate (callable): Replacement for generate_text, e.g. a
+            TieredSimulator (defaults to Ollama, uncached)
+        quiet (bool): Hide the analysis progress output
+    
+    Returns:
+        dict: Per mode 'wall_time', 'calls' and 'output_tokens' per model,
+            mean 'confidence' of the consolidated analysis, 'refined_parts'
+            and 'error' (None on success)
+    """
+    modes = modes or TIERED_BENCHMARK_MODES
+    unknown = [mode for mode in modes if mode not in TIERED_BENCHMARK_MODES]
+    if unknown:
+        raise ValueError(f"Unknown mode(s): {', '.join(unknown)}")
+    
+    meter = ModelUsageMeter(generate or _uncached_generate)
+    original_generate_text = analyzer.generate_text
+    analyzer.generate_text = meter
+    user_profile = {'name': "Benchmark"}
+    results = {}
+    output = io.StringIO() if quiet else sys.stdout
+    try:
+        for mode in modes:
+            meter.reset()
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(output):
+                if mode.startswith("tiered:"):
+                    profile = analyzer.create_tiered_style_profile(
+                        file_paths, draft_model, refine_model, refine_scope=mode.split(":", 1)[1],
+                        processing_mode=processing_mode, user_profile=user_profile,
+                        confidence_threshold=confidence_threshold
+                    )
+                else:
+                    profile = analyzer.create_enhanced_style_profile(
+                        file_paths, True, draft_model if mode == "small" else refine_model,
+                        processing_mode=processing_mode, consolidation="hierarchical", user_profile=user_profile
+                    )
+            wall_time = time.perf_counter() - started
+            
+            created = profile.get('profile_created')
+            confidence = score_analysis(profile['consolidated_analysis']) if created else {}
+            results[mode] = {
+                'wall_time': wall_time,
+                'calls': dict(meter.calls),
+                'output_tokens': dict(meter.output_tokens),
+                'confidence': sum(confidence.values()) / len(confidence) if confidence else None,
+                'refined_parts': profile['metadata'].get('tiered', {}).get('refined_parts', []) if created else [],
+                'error': None if created else profile.get('error', "Analysis failed")
+            }
+    finally:
+        analyzer.generate_text = original_generate_text
+    
+    return results
+
+
+def format_tiered_report(results, draft_model=TIERED_DRAFT_MODEL, refine_model=TIERED_REFINE_MODEL):
+    """
+    Format benchmark results as a text table.
+    
+    Args:
+        results (dict): Output of run_tiered_benchmark
+        draft_model (str): Small model, for the per-model columns
+        refine_model (str): Large model, for the per-model columns
+    
+    Returns:
+        str: Report with one row per mode
+    """
+    lines = [
+        f"Tiered analysis benchmark (small: {draft_model}, large: {refine_model})",
+        f"{'Mode':<18}{'Wall s':>9}{'Small calls':>13}{'Large calls':>13}{'Large out tok':>15}"
+        f"{'Confidence':>12}  Refined parts"
+    ]
+    for mode, usage in results.items():
+        if usage['error']:
+            lines.append(f"{mode:<18}failed: {usage['error']}")
+            continue
+        refined = ",".join(str(part) for part in usage['refined_parts']) or "-"
+        lines.append(
+            f"{mode:<18}{usage['wall_time']:>9.2f}{usage['calls'].get(draft_model, 0):>13}"
+            f"{usage['calls'].get(refine_model, 0):>13}{usage['output_tokens'].get(refine_model, 0):>15}"
+            f"{usage['confidence']:>12.2f}  {refined}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    """Run the benchmark from the command line against Ollama or the simulated models."""
+    parser = argparse.ArgumentParser(description="Compare small, large and tiered analysis for time and detail")
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILE_PATHS, help="Writing sample files")
+    parser.add_argument("--modes", nargs="+", choices=TIERED_BENCHMARK_MODES, help="Modes to run (default: all)")
+    parser.add_argument("--draft-model", default=TIERED_DRAFT_MODEL, help="Small Ollama model")
+    parser.add_argument("--refine-model", default=TIERED_REFINE_MODEL, help="Large Ollama model")
+    parser.add_argument("--mode", default="enhanced", help="Processing mode")
+    parser.add_argument("--threshold", type=float, default=TIERED_CONFIDENCE_THRESHOLD,
+                        help="Confidence below which a part is refined")
+    parser.add_argument("--simulate", action="store_true", help="Use simulated models instead of Ollama")
+    parser.add_argument("--time-scale", type=float, default=0.01,
+                        help="Fraction of simulated latency to actually sleep (default: 0.01)")
+    parser.add_argument("--parallel", type=int, default=1, help="Simulated requests per model at once")
+    parser.add_argument("--verbose", action="store_true", help="Show the analysis progress output")
+    args = parser.parse_args(argv)
+    
+    generate = None
+    if args.simulate:
+        generate = TieredSimulator(args.refine_model, parallel_requests=args.parallel, time_scale=args.time_scale)
+    results = run_tiered_benchmark(
+        args.files, args.modes, args.draft_model, args.refine_model, processing_mode=args.mode,
+        confidence_threshold=args.threshold, generate=generate, quiet=not args.verbose
+    )
+    print(format_tiered_report(results, args.draft_model, args.refine_model))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,25 +13,68 @@ OLLAMA_BASE_URL = "http://localhost:11434"
 OPENAI_API_KEY = "your-openai-api-key-here"  # Replace with your actual OpenAI API key
 GEMINI_API_KEY = "your-gemini-api-key-here"  # Replace with your actual Gemini API key
 
+# Ollama HTTP Connection Pool
+OLLAMA_POOL_CONNECTIONS = 1  # Distinct hosts to keep pools for
+OLLAMA_POOL_MAXSIZE = 10  # Keep-alive connections kept open per host
+OLLAMA_CONNECT_TIMEOUT = 5  # Seconds to establish a TCP connection
+OLLAMA_HEALTH_TIMEOUT = 5  # Seconds to wait for /api/tags during connection checks
+OLLAMA_METRICS_HISTORY = 100  # Recent generate calls kept for timing metrics
+OLLAMA_KEEP_ALIVE = "30m"  # Keep the model and its prompt cache loaded between calls
+OLLAMA_SESSION_KEEP_ALIVE = "2h"  # Keep the selected model loaded while it stays selected
+OLLAMA_WARM_UP_TIMEOUT = 600  # Seconds allowed for loading a model in the background
+WARM_UP_ON_SELECT = True  # Start loading an Ollama model as soon as it is selected
+COLD_START_SECONDS = 1.0  # Model load time above which a call counts as a cold start
+
+# Ollama Host Pool (spread requests over several servers)
+OLLAMA_HOSTS = []  # e.g. ["http://gpu-1:11434", "http://gpu-2:11434"]; empty uses OLLAMA_BASE_URL only
+OLLAMA_HEALTH_TTL = 30  # Seconds a host's /api/tags probe is trusted before re-checking
+OLLAMA_RETRY_STATUSES = (404, 500, 502, 503, 504)  # HTTP statuses retried on another host
+STREAM_LIVE_OUTPUT = True  # Show Ollama tokens as they are generated in the menu
+
 # Available AI Models
+# context_window: maximum prompt + output tokens; *_tokens_per_second: rough
+# prompt-processing and generation speeds used to size request timeouts;
+# load_seconds: allowance for loading the model (or a busy server) before it answers
 AVAILABLE_MODELS = {
     "gpt-oss:20b": {
         "description": "GPT-OSS 20B (Advanced, Slower)",
-        "type": "ollama"
+        "type": "ollama",
+        "context_window": 131072,
+        "prefill_tokens_per_second": 400,
+        "decode_tokens_per_second": 20,
+        "load_seconds": 60
     },
     "gemma3:1b": {
         "description": "Gemma 3:1B (Fast, Efficient)", 
-        "type": "ollama"
+        "type": "ollama",
+        "context_window": 32768,
+        "prefill_tokens_per_second": 1500,
+        "decode_tokens_per_second": 60,
+        "load_seconds": 10
     },
     "gpt-3.5-turbo": {
         "description": "OpenAI GPT-3.5 Turbo",
-        "type": "openai"
+        "type": "openai",
+        "context_window": 16385,
+        "prefill_tokens_per_second": 5000,
+        "decode_tokens_per_second": 80,
+        "load_seconds": 0
     },
     "gemini-1.5-flash": {
         "description": "Google Gemini 1.5 Flash",
-        "type": "gemini"
+        "type": "gemini",
+        "context_window": 1048576,
+        "prefill_tokens_per_second": 5000,
+        "decode_tokens_per_second": 120,
+        "load_seconds": 0
     }
 }
+DEFAULT_MODEL_LIMITS = {  # Assumed for Ollama models not listed above
+    "context_window": 8192,
+    "prefill_tokens_per_second": 400,
+    "decode_tokens_per_second": 20,
+    "load_seconds": 30
+}
 
 # Processing Modes
 PROCESSING_MODES = {
@@ -44,8 +87,8 @@ PROCESSING_MODES = {
         "gemma_tokens": 2000
     },
     "statistical": {
-        "description": "Statistical analysis only (word count, readability, etc.)",
-        "features": ["Statistical Metrics", "Readability Scores", "Basic Analysis"],
+        "description": "Statistical analysis only, computed locally without a model (word count, readability, etc.)",
+        "features": ["Statistical Metrics", "Readability Scores", "Basic Analysis", "No Model Required"],
         "temperature": 0.3,
         "timeout": 120,
         "gpt_oss_tokens": 2000,
@@ -61,6 +104,116 @@ DEFAULT_FILE_PATHS = [
 ]
 SUPPORTED_ENCODINGS = ["utf-8", "latin-1"]
 MAX_FILENAME_LENGTH = 30
+STREAM_CHUNK_SIZE = 1024 * 1024  # Bytes read per chunk when streaming large files
+ENCODING_DETECTION_BYTES = 64 * 1024  # Prefix size used to pick the file encoding
+SYLLABLE_CACHE_SIZE = 65536  # Distinct word forms kept by the syllable counter
+CHARS_PER_TOKEN = 4  # Rough characters per model token, used to size prompts
+
+# Parallel Ingestion
+PARALLEL_INGESTION = False  # Read and score input files in a process pool
+INGESTION_MAX_WORKERS = None  # Worker processes; None uses every available core
+INGESTION_CHUNK_SIZE = 4  # Files handed to a worker per task
+
+# Cloud API Rate Limits (match your account tier; requests beyond them wait instead of failing)
+CLOUD_RATE_LIMITS = {
+    "openai": {"name": "OpenAI", "requests_per_minute": 500, "tokens_per_minute": 60000},
+    "gemini": {"name": "Gemini", "requests_per_minute": 15, "tokens_per_minute": 1000000}
+}
+RATE_LIMIT_BURST_SECONDS = 10  # Seconds of quota that may be spent at once
+RATE_LIMIT_MAX_RETRIES = 6  # Retries of a rate-limited (HTTP 429) call before giving up
+RATE_LIMIT_BASE_DELAY = 1.0  # First backoff delay in seconds when no retry-after is given
+RATE_LIMIT_MAX_DELAY = 60.0  # Longest backoff delay in seconds
+
+# Resilient Analysis Calls (retries, hedging and circuit breaking)
+MODEL_RETRY_ATTEMPTS = 2  # Extra attempts on an unreachable or failing backend (timeouts fail over instead)
+MODEL_RETRY_BASE_DELAY = 1.0  # First backoff delay in seconds
+MODEL_RETRY_MAX_DELAY = 15.0  # Longest backoff delay in seconds
+FALLBACK_MODELS = {}  # Ollama model tried when a model or cloud backend fails or is slow, e.g. {"gpt-oss:20b": "gemma3:1b", "openai": "gemma3:1b"}
+HEDGING_ENABLED = True  # Also send a slow request to the fallback and keep whichever answers first
+HEDGE_MIN_SAMPLES = 5  # Successful calls needed before the primary's p95 latency is trusted
+HEDGE_MIN_DELAY = 5.0  # Never hedge sooner than this many seconds
+LATENCY_HISTORY = 50  # Recent latencies kept per backend for the p95
+CIRCUIT_FAILURE_THRESHOLD = 5  # Consecutive failures that open a backend's circuit
+CIRCUIT_RESET_SECONDS = 60  # Seconds before an open circuit lets a trial request through
+
+# Concurrent Model Requests (maximum outstanding requests per backend)
+MAX_IN_FLIGHT_REQUESTS = {
+    "ollama": 2,  # Per Ollama host; match the servers' OLLAMA_NUM_PARALLEL before raising this
+    "openai": 8,
+    "gemini": 4
+}
+
+# Chunked (Map-Reduce) Analysis
+CHUNKED_ANALYSIS = True  # Split texts that exceed the chunk budget instead of sending one prompt
+ANALYSIS_CHUNK_TOKENS = {  # Estimated tokens of sample text per map prompt, by model or API
+    "gpt-oss:20b": 6000,
+    "gemma3:1b": 3000,
+    "openai": 8000,
+    "gemini": 16000
+}
+DEFAULT_ANALYSIS_CHUNK_TOKENS = 3000  # Budget for models not listed above
+REDUCE_FAN_IN = 4  # Partial analyses merged by one reduce prompt
+
+# Sectioned Analysis (one concurrent prompt per PART of the 25-point framework)
+SECTIONED_ANALYSIS = False  # Analyze each PART separately instead of all 25 points in one response
+
+# Token Budgets (sizing output length and timeouts from the prompt)
+ANALYSIS_SECTIONS = 25  # Sections requested by the deep analysis prompts
+OUTPUT_TOKENS_PER_SECTION = 100  # Output tokens reserved per requested section
+MIN_OUTPUT_TOKENS = 256  # Requests that cannot leave this much room for output are rejected
+CLOUD_MAX_OUTPUT_TOKENS = 3000  # Output cap for OpenAI and Gemini requests
+TOKENS_PER_WORD = 1.4  # Rough model tokens per English word, used to size generated output
+OUTPUT_HEADROOM = 1.5  # Output budget over the expected length of generated or restyled text
+CONTEXT_SAFETY_MARGIN = 256  # Tokens kept free to absorb estimation error
+MIN_OLLAMA_CONTEXT = 2048  # Smallest num_ctx requested from Ollama
+REQUEST_TIMEOUT_FLOOR = 30  # Seconds; shortest timeout given to any request
+REQUEST_TIMEOUT_CEILING = 900  # Seconds; longest timeout given to any request
+TIMEOUT_SAFETY_FACTOR = 2.0  # Multiplier on the estimated processing time
+
+# Consolidated Analysis Strategies
+CONSOLIDATION_STRATEGIES = {
+    "full_text": {
+        "description": "Re-analyze the combined text of all samples (most detail, highest token cost)"
+    },
+    "hierarchical": {
+        "description": "Merge the per-file analyses with corpus statistics (no sample text re-sent)"
+    }
+}
+CONSOLIDATION_STRATEGY = "full_text"  # Default strategy for multi-file profiles
+
+# Tiered Analysis (a small model drafts, a large model refines)
+TIERED_DRAFT_MODEL = "gemma3:1b"  # Drafts the per-file analyses
+TIERED_REFINE_MODEL = "gpt-oss:20b"  # Refines the consolidated profile
+TIERED_REFINE_SCOPES = {
+    "profile": {
+        "description": "The large model consolidates the small model's drafts into the profile"
+    },
+    "sections": {
+        "description": "The large model rewrites only the profile parts drafted with low confidence"
+    }
+}
+TIERED_REFINE_SCOPE = "sections"
+TIERED_CONFIDENCE_THRESHOLD = 0.7  # Parts scoring below this (0-1) are refined in "sections" scope
+
+# Structured Style Fields (typed summary of the analysis for generation and transfer)
+STYLE_FIELDS_ENABLED = True  # Extract the fields once when a profile is created
+STYLE_FIELDS_SECTIONS = 4  # Output budget of the extraction, in analysis sections
+
+# Response Cache
+RESPONSE_CACHE_ENABLED = True  # Reuse model responses for identical requests
+RESPONSE_CACHE_DIR = ".response_cache"
+RESPONSE_CACHE_MAX_BYTES = 256 * 1024 * 1024  # Least recently used entries are evicted beyond this
+RESPONSE_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60  # Entries expire 30 days after creation; None keeps them
+
+# Profile Catalog (SQLite index of saved style profiles)
+PROFILE_CATALOG_PATH = ".profile_catalog.sqlite3"
+PROFILE_DIRECTORIES = [".", "stylometry fingerprints"]  # Scanned when the catalog is rebuilt
+PROFILE_FILE_PATTERN = "*_stylometric_profile_*.json"
+
+# Batch Jobs (offline runs from a JSONL manifest)
+BATCH_RESULTS_SUFFIX = ".results.jsonl"  # Checkpoint file written next to the manifest
+BATCH_JOB_TYPES = ["analyze", "generate", "transfer"]
+BATCH_USER_PROFILE = {"name": "Batch_User"}  # Writer background for analyze jobs that give none
 
 # Output Configuration
 DEFAULT_OUTPUT_BASE = "user_style_profile_enhanced"
@@ -7,11 +7,11 @@ import json
 from datetime import datetime
 from typing import Dict, List, Optional, Union
 
-from ..models.ollama_client import analyze_with_ollama
-from ..models.openai_client import analyze_with_openai  
-from ..models.gemini_client import analyze_with_gemini
-from ..utils.text_processing import extract_basic_stats
-from ..config.settings import TIMESTAMP_FORMAT
+from ..models.dispatch import generate_text, resolve_backend
+from ..models.token_budget import sections_for_output
+from ..analysis.metrics import profile_statistics
+from ..utils.text_processing import extract_basic_stats, TextFeatures
+from ..config.settings import TIMESTAMP_FORMAT, TOKENS_PER_WORD
 from .templates import GenerationTemplates
 
 
@@ -87,11 +87,13 @@ class ContentGenerator:
                 use_local=use_local,
                 model_name=model_name,
                 api_type=api_type,
-                api_client=api_client
+                api_client=api_client,
+                expected_tokens=target_length * TOKENS_PER_WORD
             )
             
-            # Analyze and validate generated content
-            quality_metrics = self._analyze_generated_content(generated_text, style_profile)
+            # Analyze and validate generated content (split the text only once)
+            generated_features = TextFeatures(generated_text)
+            quality_metrics = self._analyze_generated_content(generated_features, style_profile)
             
             # Package results
             result = {
@@ -100,7 +102,7 @@ class ContentGenerator:
                     'content_type': content_type,
                     'topic_prompt': topic_or_prompt,
                     'target_length': target_length,
-                    'actual_length': len(generated_text.split()),
+                    'actual_length': generated_features.word_count,
                     'tone': tone,
                     'additional_context': additional_context,
                     'model_used': model_name or api_type,
@@ -108,7 +110,7 @@ class ContentGenerator:
                     'style_profile_source': style_profile.get('metadata', {}).get('source_files', 'Unknown')
                 },
                 'quality_metrics': quality_metrics,
-                'style_adherence_score': self._calculate_style_adherence(generated_text, style_profile)
+                'style_adherence_score': self._calculate_style_adherence(generated_features, style_profile)
             }
             
             return result
@@ -138,18 +140,25 @@ class ContentGenerator:
         }
         
         try:
-            # Extract from statistical analysis
-            if 'statistical_analysis' in style_profile:
-                stats = style_profile['statistical_analysis']
+            # Extract from statistical analysis (or the analyzer's text statistics)
+            stats = profile_statistics(style_profile)
+            if stats:
                 essence['linguistic_patterns'] = {
                     'avg_sentence_length': stats.get('average_sentence_length', 15),
                     'lexical_diversity': stats.get('lexical_diversity', 0.5),
                     'readability_level': stats.get('readability_scores', {}).get('flesch_reading_ease', 50)
                 }
             
-            # Extract from deep analysis (if available)
-            if 'deep_analysis' in style_profile:
-                deep = style_profile['deep_analysis']
+            # Prefer the style fields validated when the profile was created
+            fields = style_profile.get('style_fields')
+            deep = style_profile.get('deep_analysis') or style_profile.get('consolidated_analysis')
+            if fields:
+                essence['tone_characteristics'] = dict(fields['tone'])
+                essence['vocabulary_preferences'] = dict(fields['vocabulary'])
+                essence['structural_tendencies'] = dict(fields['structure'])
+                essence['voice'] = dict(fields['voice'])
+                essence['signature_phrases'] = list(fields['signature_phrases'])
+            elif deep:
                 # Parse deep analysis text for key patterns
                 essence['tone_characteristics'] = self._parse_tone_from_analysis(deep)
                 essence['vocabulary_preferences'] = self._parse_vocabulary_from_analysis(deep)
@@ -177,23 +186,32 @@ class ContentGenerator:
     ) -> str:
         """Build the AI prompt for content generation based on style profile."""
         
-        # Get content type template
-        content_template = self.templates.get_content_template(content_type)
-        
-        # Build style instructions
-        style_instructions = self._build_style_instructions(style_essence)
-        
         # Add tone and context sections
         tone_instruction = f"\nDESIRED TONE: {tone}" if tone and tone != "neutral" else ""
         context_instruction = f"\nADDITIONAL CONTEXT/REQUIREMENTS:\n{additional_context}" if additional_context else ""
         
-        prompt = f"""
-TASK: Generate a {content_type} following the specific writing style profile provided.
-
+        # Request details go last so the profile and template prefix can be reused between calls
+        prompt = f"""{self._build_generation_prefix(style_essence, content_type)}
 TOPIC/PROMPT: {topic_or_prompt}
 
 TARGET LENGTH: Approximately {target_length} words{tone_instruction}{context_instruction}
 
+Generate the content now, ensuring it authentically reflects the specified writing style:
+"""
+        return prompt
+    
+    def _build_generation_prefix(self, style_essence: Dict, content_type: str) -> str:
+        """Build the part of the generation prompt shared by every request for one profile and content type."""
+        
+        # Get content type template
+        content_template = self.templates.get_content_template(content_type)
+        
+        # Build style instructions
+        style_instructions = self._build_style_instructions(style_essence)
+        
+        return f"""
+TASK: Generate a {content_type} following the specific writing style profile provided.
+
 WRITING STYLE PROFILE TO EMULATE:
 {style_instructions}
 
@@ -207,10 +225,7 @@ GENERATION GUIDELINES:
 4. Follow the content type conventions while preserving personal style
 5. Ensure natural flow and readability
 6. Target the specified word count (±20%)
-
-Generate the content now, ensuring it authentically reflects the specified writing style:
 """
-        return prompt
     
     def _build_style_instructions(self, style_essence: Dict) -> str:
         """Convert style essence into detailed instructions for AI generation."""
@@ -228,7 +243,9 @@ Generate the content now, ensuring it authentically reflects the specified writi
         if 'vocabulary_preferences' in style_essence:
             vocab = style_essence['vocabulary_preferences']
             instructions.append(f"- Formality level: {vocab.get('formality_level', 'moderate')}")
-            if 'preferred_domains' in vocab:
+            if 'complexity' in vocab:
+                instructions.append(f"- Vocabulary complexity: {vocab['complexity']}")
+            if vocab.get('preferred_domains'):
                 instructions.append(f"- Preferred vocabulary domains: {', '.join(vocab['preferred_domains'])}")
         
         # Tone characteristics
@@ -237,6 +254,8 @@ Generate the content now, ensuring it authentically reflects the specified writi
             instructions.append(f"- Overall tone: {tone.get('overall_tone', 'neutral')}")
             if 'emotional_range' in tone:
                 instructions.append(f"- Emotional expression: {tone['emotional_range']}")
+            if 'certainty' in tone:
+                instructions.append(f"- Certainty: {tone['certainty']}")
         
         # Structural tendencies
         if 'structural_tendencies' in style_essence:
@@ -245,6 +264,15 @@ Generate the content now, ensuring it authentically reflects the specified writi
             if 'transition_style' in structure:
                 instructions.append(f"- Transition style: {structure['transition_style']}")
         
+        # Voice and signature phrases (profiles with style fields only)
+        if 'voice' in style_essence:
+            voice = style_essence['voice']
+            instructions.append(f"- Narrative person: {voice['person']}")
+            instructions.append(f"- Active voice: {voice['active_voice_share']:.0%} of sentences")
+        if style_essence.get('signature_phrases'):
+            phrases = ', '.join(f'"{phrase}"' for phrase in style_essence['signature_phrases'])
+            instructions.append(f"- Signature phrases to echo sparingly: {phrases}")
+        
         return "\n".join(instructions)
     
     def _execute_generation(
@@ -253,44 +281,42 @@ Generate the content now, ensuring it authentically reflects the specified writi
         use_local: bool, 
         model_name: Optional[str], 
         api_type: Optional[str], 
-        api_client
+        api_client,
+        expected_tokens: float
     ) -> str:
-        """Execute the content generation using the specified AI model."""
+        """Execute the content generation, with an output budget sized for the target length."""
         
         try:
-            if use_local and model_name:
-                result = analyze_with_ollama(prompt, model_name, processing_mode="enhanced")
-                return result
-            elif api_type == "openai" and api_client:
-                result = analyze_with_openai(api_client, prompt)
-                return result
-            elif api_type == "gemini" and api_client:
-                result = analyze_with_gemini(api_client, prompt)
-                return result
-            else:
+            if resolve_backend(use_local, model_name, api_type, api_client) is None:
                 raise ValueError("Invalid model configuration for generation")
+            
+            # Identical requests are answered from the response cache
+            return generate_text(
+                prompt, use_local, model_name, api_type, api_client, processing_mode="enhanced",
+                sections=sections_for_output(expected_tokens)
+            )
                 
         except Exception as e:
             raise RuntimeError(f"Content generation failed: {str(e)}")
     
-    def _analyze_generated_content(self, generated_text: str, original_style_profile: Dict) -> Dict:
+    def _analyze_generated_content(self, generated_features: TextFeatures, original_style_profile: Dict) -> Dict:
         """Analyze the quality and characteristics of generated content."""
         
-        basic_stats = extract_basic_stats(generated_text)
+        basic_stats = extract_basic_stats(generated_features)
         
         quality_metrics = {
             'word_count': basic_stats.get('word_count', 0),
             'sentence_count': basic_stats.get('sentence_count', 0),
             'paragraph_count': basic_stats.get('paragraph_count', 0),
             'avg_sentence_length': basic_stats.get('avg_sentence_length', 0),
-            'readability_estimate': self._estimate_readability(generated_text),
-            'coherence_score': self._estimate_coherence(generated_text),
-            'style_consistency': self._estimate_style_consistency(generated_text)
+            'readability_estimate': self._estimate_readability(generated_features),
+            'coherence_score': self._estimate_coherence(generated_features.text),
+            'style_consistency': self._estimate_style_consistency(generated_features.text)
         }
         
         return quality_metrics
     
-    def _calculate_style_adherence(self, generated_text: str, style_profile: Dict) -> float:
+    def _calculate_style_adherence(self, generated_features: TextFeatures, style_profile: Dict) -> float:
         """Calculate how well the generated content matches the target style profile."""
         
         # This would be a sophisticated comparison between generated content
@@ -298,8 +324,8 @@ Generate the content now, ensuring it authentically reflects the specified writi
         # For now, return a placeholder score
         
         try:
-            generated_stats = extract_basic_stats(generated_text)
-            original_stats = style_profile.get('statistical_analysis', {})
+            generated_stats = extract_basic_stats(generated_features)
+            original_stats = profile_statistics(style_profile)
             
             # Compare key metrics
             sentence_length_diff = abs(
@@ -329,10 +355,10 @@ Generate the content now, ensuring it authentically reflects the specified writi
         # Placeholder - would identify structural preferences
         return {'paragraph_style': 'standard', 'organization': 'logical'}
     
-    def _estimate_readability(self, text: str) -> float:
+    def _estimate_readability(self, features: TextFeatures) -> float:
         """Estimate readability score of generated text."""
         # Simplified readability estimation
-        avg_sentence_length = len(text.split()) / max(1, text.count('.'))
+        avg_sentence_length = features.word_count / max(1, features.text.count('.'))
         return max(0.0, min(100.0, 100 - avg_sentence_length * 2))
     
     def _estimate_coherence(self, text: str) -> float:
@@ -7,7 +7,7 @@ import re
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
 
-from ..utils.text_processing import extract_basic_stats
+from ..utils.text_processing import extract_basic_stats, TextFeatures
 from ..config.settings import TIMESTAMP_FORMAT
 
 
@@ -66,6 +66,9 @@ class QualityController:
             if not content or not content.strip():
                 return self._create_failed_validation("Empty or invalid content")
             
+            # Split the content once and share the features across all checks
+            features = TextFeatures(content)
+            
             # Initialize quality assessment
             quality_assessment = {
                 'overall_score': 0.0,
@@ -77,20 +80,20 @@ class QualityController:
                     'content_type': content_type,
                     'validation_timestamp': datetime.now().strftime(TIMESTAMP_FORMAT),
                     'content_length': len(content),
-                    'word_count': len(content.split())
+                    'word_count': features.word_count
                 }
             }
             
             # Perform quality checks
             quality_assessment['category_scores']['content_accuracy'] = self._validate_content_accuracy(content)
-            quality_assessment['category_scores']['readability'] = self._validate_readability(content)
+            quality_assessment['category_scores']['readability'] = self._validate_readability(features)
             quality_assessment['category_scores']['style_consistency'] = self._validate_style_consistency(
                 content, target_style_profile
             )
-            quality_assessment['category_scores']['grammar_structure'] = self._validate_grammar_structure(content)
+            quality_assessment['category_scores']['grammar_structure'] = self._validate_grammar_structure(features)
             quality_assessment['category_scores']['coherence'] = self._validate_coherence(content)
             quality_assessment['category_scores']['requirement_compliance'] = self._validate_requirement_compliance(
-                content, requirements, content_type
+                features, requirements, content_type
             )
             
             # Calculate overall score
@@ -104,7 +107,7 @@ class QualityController:
             
             # Check compliance with requirements
             quality_assessment['compliance_status'] = self._check_requirement_compliance(
-                content, requirements, category_scores
+                features, requirements, category_scores
             )
             
             # Identify quality issues
@@ -259,14 +262,14 @@ class QualityController:
         
         return max(0.0, score)
     
-    def _validate_readability(self, content: str) -> float:
+    def _validate_readability(self, features: TextFeatures) -> float:
         """Validate readability metrics."""
         
-        stats = extract_basic_stats(content)
+        stats = extract_basic_stats(features)
         
         # Calculate readability score (simplified Flesch-like calculation)
         avg_sentence_length = stats.get('avg_sentence_length', 15)
-        avg_word_length = self._calculate_avg_word_length(content)
+        avg_word_length = self._calculate_avg_word_length(features)
         
         # Optimal ranges
         optimal_sentence_length = 15
@@ -288,23 +291,23 @@ class QualityController:
         # Compare against target style profile
         return self._compare_to_target_style(content, target_style_profile)
     
-    def _validate_grammar_structure(self, content: str) -> float:
+    def _validate_grammar_structure(self, features: TextFeatures) -> float:
         """Validate grammar and sentence structure."""
         
         # Basic grammar validation
         score = 1.0
         
         # Check for common grammar issues
-        if self._has_grammar_errors(content):
+        if self._has_grammar_errors(features.text):
             score -= 0.3
         
         # Check sentence structure variety
-        structure_variety = self._calculate_structure_variety(content)
+        structure_variety = self._calculate_structure_variety(features)
         if structure_variety < self.quality_thresholds['min_sentence_variety']:
             score -= 0.2
         
         # Check punctuation usage
-        if self._has_punctuation_issues(content):
+        if self._has_punctuation_issues(features.text):
             score -= 0.1
         
         return max(0.0, score)
@@ -331,7 +334,7 @@ class QualityController:
     
     def _validate_requirement_compliance(
         self,
-        content: str,
+        features: TextFeatures,
         requirements: Dict = None,
         content_type: str = "general"
     ) -> float:
@@ -345,23 +348,23 @@ class QualityController:
         # Check length requirements
         if 'target_length' in requirements:
             target_length = requirements['target_length']
-            actual_length = len(content.split())
+            actual_length = features.word_count
             length_diff = abs(actual_length - target_length) / target_length
             if length_diff > 0.2:  # More than 20% difference
                 compliance_score -= 0.3
         
         # Check tone requirements
         if 'required_tone' in requirements:
-            if not self._matches_required_tone(content, requirements['required_tone']):
+            if not self._matches_required_tone(features.text, requirements['required_tone']):
                 compliance_score -= 0.3
         
         # Check format requirements
         if 'format_requirements' in requirements:
-            if not self._meets_format_requirements(content, requirements['format_requirements']):
+            if not self._meets_format_requirements(features.text, requirements['format_requirements']):
                 compliance_score -= 0.2
         
         # Check content type specific requirements
-        if not self._meets_content_type_requirements(content, content_type):
+        if not self._meets_content_type_requirements(features.text, content_type):
             compliance_score -= 0.2
         
         return max(0.0, compliance_score)
@@ -412,7 +415,7 @@ class QualityController:
     
     def _check_requirement_compliance(
         self,
-        content: str,
+        features: TextFeatures,
         requirements: Dict = None,
         category_scores: Dict = None
     ) -> Dict:
@@ -430,13 +433,13 @@ class QualityController:
             # Length compliance
             if 'target_length' in requirements:
                 target = requirements['target_length']
-                actual = len(content.split())
+                actual = features.word_count
                 compliance_status['length_compliance'] = abs(actual - target) / target <= 0.2
             
             # Tone compliance
             if 'required_tone' in requirements:
                 compliance_status['tone_compliance'] = self._matches_required_tone(
-                    content, requirements['required_tone']
+                    features.text, requirements['required_tone']
                 )
         
         # Quality threshold compliance
@@ -515,9 +518,9 @@ class QualityController:
         # Simplified plausibility check
         return False
     
-    def _calculate_avg_word_length(self, content: str) -> float:
+    def _calculate_avg_word_length(self, features: TextFeatures) -> float:
         """Calculate average word length."""
-        words = content.split()
+        words = features.tokens
         if not words:
             return 0
         return sum(len(word.strip('.,!?";:')) for word in words) / len(words)
@@ -539,14 +542,14 @@ class QualityController:
         missing_capitals = re.search(r'\. [a-z]', content) is not None
         return double_spaces or missing_capitals
     
-    def _calculate_structure_variety(self, content: str) -> float:
+    def _calculate_structure_variety(self, features: TextFeatures) -> float:
         """Calculate sentence structure variety."""
-        sentences = re.split(r'[.!?]+', content)
-        if len(sentences) < 2:
+        # Fewer than two raw segments means there is no terminal punctuation
+        if not re.search(r'[.!?]', features.text):
             return 0.5
         
         # Simple variety measure based on sentence length variation
-        lengths = [len(s.split()) for s in sentences if s.strip()]
+        lengths = [len(s.split()) for s in features.sentences]
         if not lengths:
             return 0.5
         
@@ -6,10 +6,10 @@ Transforms existing content to match different writing style profiles.
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
-from ..models.ollama_client import analyze_with_ollama
-from ..models.openai_client import analyze_with_openai
-from ..models.gemini_client import analyze_with_gemini
-from ..utils.text_processing import extract_basic_stats
+from ..models.dispatch import generate_text, resolve_backend
+from ..models.token_budget import sections_for_output
+from ..analysis.metrics import profile_statistics
+from ..utils.text_processing import extract_basic_stats, TextFeatures, estimate_tokens
 from ..config.settings import TIMESTAMP_FORMAT
 from .templates import GenerationTemplates
 
@@ -91,7 +91,8 @@ class StyleTransfer:
                 use_local=use_local,
                 model_name=model_name,
                 api_type=api_type,
-                api_client=api_client
+                api_client=api_client,
+                expected_tokens=estimate_tokens(original_content)
             )
             
             # Analyze transfer quality
@@ -229,17 +230,19 @@ class StyleTransfer:
     def _analyze_original_content(self, content: str) -> Dict:
         """Analyze the style characteristics of the original content."""
         
-        basic_stats = extract_basic_stats(content)
+        # Split the content once and share the features across all helpers
+        features = TextFeatures(content)
+        basic_stats = extract_basic_stats(features)
         
         analysis = {
             'word_count': basic_stats.get('word_count', 0),
             'sentence_count': basic_stats.get('sentence_count', 0),
             'paragraph_count': basic_stats.get('paragraph_count', 0),
             'avg_sentence_length': basic_stats.get('avg_sentence_length', 0),
-            'lexical_diversity': self._calculate_lexical_diversity(content),
-            'formality_level': self._estimate_formality_level(content),
+            'lexical_diversity': self._calculate_lexical_diversity(features),
+            'formality_level': self._estimate_formality_level(features),
             'tone_indicators': self._identify_tone_indicators(content),
-            'structural_patterns': self._identify_structural_patterns(content)
+            'structural_patterns': self._identify_structural_patterns(features)
         }
         
         return analysis
@@ -255,9 +258,9 @@ class StyleTransfer:
         }
         
         try:
-            # Extract from statistical analysis
-            if 'statistical_analysis' in style_profile:
-                stats = style_profile['statistical_analysis']
+            # Extract from statistical analysis (or the analyzer's text statistics)
+            stats = profile_statistics(style_profile)
+            if stats:
                 characteristics['linguistic_patterns'] = {
                     'avg_sentence_length': stats.get('average_sentence_length', 15),
                     'lexical_diversity': stats.get('lexical_diversity', 0.5),
@@ -265,9 +268,23 @@ class StyleTransfer:
                     'punctuation_patterns': stats.get('punctuation_analysis', {})
                 }
             
-            # Extract from deep analysis if available
-            if 'deep_analysis' in style_profile:
-                deep = style_profile['deep_analysis']
+            # Prefer the style fields validated when the profile was created
+            fields = style_profile.get('style_fields')
+            deep = style_profile.get('deep_analysis') or style_profile.get('consolidated_analysis')
+            if fields:
+                characteristics['tone_profile'] = {
+                    'primary_tone': fields['tone']['overall_tone'],
+                    'emotional_register': fields['tone']['emotional_range']
+                }
+                characteristics['vocabulary_style'] = {
+                    'formality': fields['vocabulary']['formality_level'],
+                    'complexity': fields['vocabulary']['complexity']
+                }
+                characteristics['structural_preferences'] = {
+                    'organization': fields['structure']['organization'],
+                    'paragraph_style': fields['structure']['paragraph_style']
+                }
+            elif deep:
                 characteristics['tone_profile'] = self._extract_tone_from_analysis(deep)
                 characteristics['vocabulary_style'] = self._extract_vocabulary_style(deep)
                 characteristics['structural_preferences'] = self._extract_structural_preferences(deep)
@@ -303,11 +320,9 @@ class StyleTransfer:
         # Build preservation instructions
         preservation_instructions = self._build_preservation_instructions(preserve_elements)
         
+        # The original content goes last so the instruction prefix can be reused between calls
         prompt = f"""
-TASK: Transform the following content to match the specified writing style profile.
-
-ORIGINAL CONTENT:
-{original_content}
+TASK: Transform the content given at the end to match the specified writing style profile.
 
 TARGET WRITING STYLE PROFILE:
 {style_instructions}
@@ -329,6 +344,9 @@ SPECIFIC INSTRUCTIONS:
 5. Respect any preservation requirements
 6. Ensure consistency throughout the transformed content
 
+ORIGINAL CONTENT:
+{original_content}
+
 Transform the content now:
 """
         return prompt
@@ -396,22 +414,20 @@ Transform the content now:
         use_local: bool,
         model_name: Optional[str],
         api_type: Optional[str],
-        api_client
+        api_client,
+        expected_tokens: float
     ) -> str:
-        """Execute the style transfer using the specified AI model."""
+        """Execute the style transfer, with an output budget sized for the original content."""
         
         try:
-            if use_local and model_name:
-                result = analyze_with_ollama(prompt, model_name, processing_mode="enhanced")
-                return result
-            elif api_type == "openai" and api_client:
-                result = analyze_with_openai(api_client, prompt)
-                return result
-            elif api_type == "gemini" and api_client:
-                result = analyze_with_gemini(api_client, prompt)
-                return result
-            else:
+            if resolve_backend(use_local, model_name, api_type, api_client) is None:
                 raise ValueError("Invalid model configuration for style transfer")
+            
+            # Identical requests are answered from the response cache
+            return generate_text(
+                prompt, use_local, model_name, api_type, api_client, processing_mode="enhanced",
+                sections=sections_for_output(expected_tokens)
+            )
                 
         except Exception as e:
             raise RuntimeError(f"Style transfer failed: {str(e)}")
@@ -449,7 +465,7 @@ Transform the content now:
         
         try:
             transferred_stats = extract_basic_stats(transferred_content)
-            target_stats = target_style_profile.get('statistical_analysis', {})
+            target_stats = profile_statistics(target_style_profile)
             
             # Compare sentence length
             sentence_length_score = self._compare_sentence_lengths(
@@ -481,17 +497,16 @@ Transform the content now:
     
     # Utility methods for analysis (simplified implementations)
     
-    def _calculate_lexical_diversity(self, content: str) -> float:
+    def _calculate_lexical_diversity(self, features: TextFeatures) -> float:
         """Calculate lexical diversity of content."""
-        words = content.lower().split()
-        unique_words = set(words)
-        return len(unique_words) / max(1, len(words))
+        unique_words = set(word.lower() for word in features.tokens)
+        return len(unique_words) / max(1, features.word_count)
     
-    def _estimate_formality_level(self, content: str) -> str:
+    def _estimate_formality_level(self, features: TextFeatures) -> str:
         """Estimate the formality level of content."""
         # Simplified formality estimation
-        contractions = content.count("'")
-        formal_words = sum(1 for word in content.split() if len(word) > 6)
+        contractions = features.text.count("'")
+        formal_words = sum(1 for word in features.tokens if len(word) > 6)
         
         if contractions > formal_words:
             return "casual"
@@ -505,12 +520,13 @@ Transform the content now:
         # Placeholder implementation
         return ["neutral", "informative"]
     
-    def _identify_structural_patterns(self, content: str) -> Dict:
+    def _identify_structural_patterns(self, features: TextFeatures) -> Dict:
         """Identify structural patterns in content."""
-        paragraphs = content.split('\n\n')
+        # Raw blank-line block count, including empty blocks
+        paragraph_count = features.text.count('\n\n') + 1
         return {
-            'paragraph_count': len(paragraphs),
-            'avg_paragraph_length': len(content.split()) / max(1, len(paragraphs))
+            'paragraph_count': paragraph_count,
+            'avg_paragraph_length': features.word_count / max(1, paragraph_count)
         }
     
     def _extract_tone_from_analysis(self, deep_analysis: str) -> Dict:
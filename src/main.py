@@ -3,6 +3,7 @@ Main orchestrator for Style Transfer AI.
 Integrates all modules and provides the primary application entry point.
 """
 
+import argparse
 import sys
 import os
 from datetime import datetime
@@ -13,6 +14,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from src.menu.main_menu import run_main_menu
 from src.menu.model_selection import require_model_selection
 from src.config.settings import APPLICATION_NAME, VERSION, AUTHOR
+from src.storage.profile_catalog import CATALOG_COLUMNS
 from src.menu.navigation import print_header, clear_screen
 
 
@@ -174,15 +176,206 @@ def main():
         sys.exit(1)
 
 
-def cli_entry_point():
+def handle_cache_command(args):
+    """
+    Inspect or purge the model response cache.
+    
+    Args:
+        args (argparse.Namespace): Parsed 'cache' subcommand arguments
+        
+    Returns:
+        int: Process exit code
+    """
+    from src.storage.response_cache import get_response_cache, ResponseCache
+    from src.utils.formatters import format_cache_info
+    
+    cache = get_response_cache() or ResponseCache()
+    
+    if args.cache_command == "info":
+        print(format_cache_info(cache.info()))
+    elif args.cache_command == "purge":
+        deleted_count = cache.purge(expired_only=args.expired)
+        kind = "expired " if args.expired else ""
+        print(f"Deleted {deleted_count} {kind}cache entries")
+    return 0
+
+
+def handle_profiles_command(args):
+    """
+    List catalogued style profiles or rebuild the profile catalog.
+    
+    Args:
+        args (argparse.Namespace): Parsed 'profiles' subcommand arguments
+        
+    Returns:
+        int: Process exit code
+    """
+    from src.storage.profile_catalog import get_profile_catalog
+    from src.utils.formatters import format_profile_list
+    
+    catalog = get_profile_catalog()
+    
+    if args.profiles_command == "rebuild":
+        result = catalog.rebuild(full=args.full)
+        print(f"Indexed {result['indexed']}, unchanged {result['unchanged']}, "
+              f"removed {result['removed']}, failed {result['failed']} profile(s)")
+        for error in result['errors']:
+            print(f"  ✗ {error['filename']}: {error['error']}")
+        print(f"Catalog: {os.path.abspath(catalog.path)} ({catalog.count()} profiles)")
+        return 1 if result['failed'] else 0
+    
+    profiles = catalog.list(
+        sort_by=args.sort, descending=not args.ascending, limit=args.limit,
+        user_name=args.user, model_used=args.model
+    )
+    print(format_profile_list(profiles) if profiles else "No style profiles found.")
+    return 0
+
+
+def handle_batch_command(args):
+    """
+    Run a batch manifest or report its progress.
+    
+    Args:
+        args (argparse.Namespace): Parsed 'batch' subcommand arguments
+        
+    Returns:
+        int: Process exit code
+    """
+    from src.batch.manifest import ManifestError
+    from src.batch.worker import run_batch, batch_status
+    from src.utils.formatters import format_batch_summary
+    
+    try:
+        if args.batch_command == "status":
+            print(format_batch_summary(batch_status(args.manifest, args.results)))
+            return 0
+        
+        if args.api:
+            from src.models.openai_client import setup_openai_client
+            from src.models.gemini_client import setup_gemini_client
+            
+            setup_client = setup_openai_client if args.api == "openai" else setup_gemini_client
+            api_client, message = setup_client()
+            if not api_client:
+                print(f"❌ {message}")
+                return 1
+            backend = {'use_local': False, 'api_type': args.api, 'api_client': api_client}
+        else:
+            from src.models.ollama_client import check_ollama_connection
+            
+            available, message = check_ollama_connection(args.model)
+            if not available:
+                print(f"❌ {message}")
+                return 1
+            backend = {'use_local': True, 'model_name': args.model}
+        
+        summary = run_batch(args.manifest, args.results, retry_failed=args.retry_failed, **backend)
+    except (OSError, ManifestError) as e:
+        print(f"❌ {e}")
+        return 1
+    
+    print(format_batch_summary(summary))
+    return 1 if summary['failed'] or summary['interrupted'] else 0
+
+
+def build_arg_parser():
+    """
+    Build the command-line parser.
+    
+    Running without a command starts the interactive menu.
+    
+    Returns:
+        argparse.ArgumentParser: Configured parser
+    """
+    parser = argparse.ArgumentParser(
+        prog="style-transfer-ai",
+        description=f"{APPLICATION_NAME} - run without a command for the interactive menu"
+    )
+    parser.add_argument("--interactive", action="store_true", help="Start the interactive menu (default)")
+    commands = parser.add_subparsers(dest="command")
+    
+    cache_parser = commands.add_parser("cache", help="Inspect or purge the model response cache")
+    cache_commands = cache_parser.add_subparsers(dest="cache_command", required=True)
+    cache_commands.add_parser("info", help="Show cache size and entry count")
+    purge_parser = cache_commands.add_parser("purge", help="Delete cached responses")
+    purge_parser.add_argument("--expired", action="store_true", help="Only delete expired entries")
+    cache_parser.set_defaults(handler=handle_cache_command)
+    
+    profiles_parser = commands.add_parser("profiles", help="List saved style profiles or rebuild their catalog")
+    profiles_commands = profiles_parser.add_subparsers(dest="profiles_command", required=True)
+    list_parser = profiles_commands.add_parser("list", help="List profiles from the catalog")
+    list_parser.add_argument("--user", help="Only profiles of this writer")
+    list_parser.add_argument("--model", help="Only profiles made with this model")
+    list_parser.add_argument("--sort", default="mtime", choices=list(CATALOG_COLUMNS), help="Column to sort on (default: mtime)")
+    list_parser.add_argument("--ascending", action="store_true", help="Oldest / smallest first")
+    list_parser.add_argument("--limit", type=int, help="Show at most this many profiles")
+    rebuild_parser = profiles_commands.add_parser("rebuild", help="Rescan the profile directories into the catalog")
+    rebuild_parser.add_argument("--full", action="store_true", help="Re-read every profile, not only changed files")
+    profiles_parser.set_defaults(handler=handle_profiles_command)
+    
+    batch_parser = commands.add_parser("batch", help="Run analysis, generation and transfer jobs from a manifest")
+    batch_commands = batch_parser.add_subparsers(dest="batch_command", required=True)
+    run_parser = batch_commands.add_parser("run", help="Run the jobs not yet recorded in the results file")
+    run_parser.add_argument("manifest", type=os.path.abspath, help="JSONL file with one job per line")
+    run_parser.add_argument("--results", type=os.path.abspath, help="Checkpoint file (default: <manifest>.results.jsonl)")
+    backend_group = run_parser.add_mutually_exclusive_group()
+    backend_group.add_argument("--model", default="gemma3:1b", help="Ollama model to use (default: gemma3:1b)")
+    backend_group.add_argument("--api", choices=["openai", "gemini"], help="Use a cloud API instead of Ollama")
+    run_parser.add_argument("--retry-failed", action="store_true", help="Run failed jobs again")
+    status_parser = batch_commands.add_parser("status", help="Show how many jobs are done")
+    status_parser.add_argument("manifest", type=os.path.abspath, help="JSONL file with one job per line")
+    status_parser.add_argument("--results", type=os.path.abspath, help="Checkpoint file (default: <manifest>.results.jsonl)")
+    batch_parser.set_defaults(handler=handle_batch_command)
+    
+    return parser
+
+
+def parse_cli_args(argv=None):
+    """
+    Parse the command line, leaving options that are not commands to the menu.
+    
+    Commands (cache, profiles, batch) and --help are parsed strictly. Other
+    options, such as the README's --analyze examples, are reported as
+    ignored and the interactive menu starts instead of exiting with an error.
+    
+    Args:
+        argv (list): Command-line arguments (defaults to sys.argv[1:])
+        
+    Returns:
+        argparse.Namespace: Parsed arguments; 'command' is None for the menu
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    parser = build_arg_parser()
+    if not argv or not argv[0].startswith("-") or argv[0] in ("-h", "--help"):
+        return parser.parse_args(argv)
+    
+    # Only leading options are parsed; a file name after an unknown option would read as a command
+    leading_options = [arg for arg in argv if arg.startswith("-")]
+    args, ignored = parser.parse_known_args(leading_options)
+    if ignored:
+        print(f"Ignoring unsupported options: {' '.join(ignored)} - starting the interactive menu")
+    return args
+
+
+def cli_entry_point(argv=None):
     """
     Command-line interface entry point.
     This function is called when the module is run as a script.
+    
+    Args:
+        argv (list): Command-line arguments (defaults to sys.argv[1:])
     """
+    args = parse_cli_args(argv)
+    
     # Change to the project root directory to ensure relative paths work
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(script_dir)
     os.chdir(project_root)
+    
+    if args.command:
+        sys.exit(args.handler(args))
     main()
 
 
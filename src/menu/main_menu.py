@@ -6,9 +6,17 @@ Handles primary navigation and menu display.
 import sys
 import subprocess
 import os
-from ..config.settings import PROCESSING_MODES
-from ..analysis.analyzer import create_enhanced_style_profile
+import threading
+from ..config.settings import (
+    PROCESSING_MODES, STREAM_LIVE_OUTPUT, CONSOLIDATION_STRATEGIES, CONSOLIDATION_STRATEGY,
+    TIERED_DRAFT_MODEL, TIERED_REFINE_MODEL, TIERED_REFINE_SCOPES
+)
+from ..analysis.analyzer import (
+    create_enhanced_style_profile, create_statistical_style_profile, create_tiered_style_profile
+)
 from ..storage.local_storage import list_local_profiles, load_local_profile, cleanup_old_reports, save_style_profile_locally
+from ..storage.response_cache import get_response_cache, ResponseCache
+from .navigation import print_stream_token
 from .model_selection import (
     select_model_interactive, 
     reset_model_selection, 
@@ -16,7 +24,10 @@ from .model_selection import (
 )
 from ..models.openai_client import setup_openai_client
 from ..models.gemini_client import setup_gemini_client
-from ..utils.user_profile import get_file_paths
+from ..utils.user_profile import get_file_paths, get_user_profile
+from ..utils.formatters import format_cache_info, format_call_timing, format_host_stats, format_profile_list
+from ..models.lifecycle import get_model_lifecycle, summarize_call_timing
+from ..models.ollama_client import get_host_stats
 from ..generation import ContentGenerator, StyleTransfer, QualityController
 
 
@@ -30,7 +41,7 @@ def display_main_menu():
     # Show current model status
     model_info = get_current_model_info()
     if model_info['has_model']:
-        print(f"Current Model: {model_info['selected_model']} (will be reset before next analysis)")
+        print(f"Current Model: {model_info['selected_model']} (kept for the next task; option 8 switches)")
     else:
         print("Current Model: None (will be selected before analysis)")
     print("-" * 60)
@@ -49,21 +60,115 @@ def display_main_menu():
     print("7. Cleanup Old Reports")
     print("8. Switch Analysis Model")
     print("9. Check Configuration")
+    print("10. Manage Response Cache")
     print("0. Exit")
     print("="*60)
 
 
+def select_consolidation_strategy():
+    """
+    Ask how a multi-file profile's consolidated analysis should be built.
+    
+    Returns:
+        str: Key of CONSOLIDATION_STRATEGIES
+    """
+    strategies = list(CONSOLIDATION_STRATEGIES)
+    print("\nConsolidated analysis strategy:")
+    for index, name in enumerate(strategies, 1):
+        default_marker = " (default)" if name == CONSOLIDATION_STRATEGY else ""
+        print(f"{index}. {name}{default_marker} - {CONSOLIDATION_STRATEGIES[name]['description']}")
+    
+    choice = input(f"Select strategy (1-{len(strategies)}, Enter for default): ").strip()
+    if choice.isdigit() and 1 <= int(choice) <= len(strategies):
+        return strategies[int(choice) - 1]
+    return CONSOLIDATION_STRATEGY
+
+
+def select_tiered_scope(model_name):
+    """
+    Offer a tiered analysis when the selected model is one of the two tiers.
+    
+    Args:
+        model_name (str): The selected Ollama model
+        
+    Returns:
+        str: Key of TIERED_REFINE_SCOPES, or None to analyze with model_name only
+    """
+    if model_name not in (TIERED_DRAFT_MODEL, TIERED_REFINE_MODEL):
+        return None
+    
+    scopes = list(TIERED_REFINE_SCOPES)
+    print("\nAnalysis tiers:")
+    print(f"1. {model_name} only (default)")
+    for index, name in enumerate(scopes, 2):
+        print(f"{index}. Tiered, refine {name} - {TIERED_REFINE_SCOPES[name]['description']}")
+    print(f"   ({TIERED_DRAFT_MODEL} drafts, {TIERED_REFINE_MODEL} refines)")
+    
+    choice = input(f"Select (1-{len(scopes) + 1}, Enter for default): ").strip()
+    if choice.isdigit() and 2 <= int(choice) <= len(scopes) + 1:
+        return scopes[int(choice) - 2]
+    return None
+
+
+def choose_model(purpose):
+    """
+    Reuse the current model if the user agrees, otherwise run model selection.
+    
+    Keeping the model avoids reloading a local Ollama model between tasks.
+    
+    Args:
+        purpose (str): Task shown in the prompt, e.g. 'analysis'
+        
+    Returns:
+        dict: Current model info (see get_current_model_info)
+    """
+    model_info = get_current_model_info()
+    if model_info['has_model']:
+        keep = input(f"\nUse {model_info['selected_model']} for {purpose}? (y/n, Enter for yes): ").strip().lower()
+        if keep in ('', 'y'):
+            return model_info
+    
+    print(f"\nPlease select a model for {purpose}:")
+    select_model_interactive()
+    return get_current_model_info()
+
+
+def _save_analysis_results(style_profile):
+    """Save a finished analysis locally and report the outcome."""
+    if style_profile and not style_profile.get('profile_created', True):
+        print(f"\n✗ Analysis failed: {style_profile.get('error', 'Unknown error')}")
+        return
+    
+    if style_profile:
+        print("\nSaving analysis results...")
+        save_result = save_style_profile_locally(style_profile)
+        if save_result['success']:
+            print(f"✓ {save_result['message']}")
+            
+        else:
+            print(f"✗ Failed to save results: {save_result.get('error', 'Unknown error')}")
+    
+    print("\nAnalysis completed successfully!")
+
+
 def handle_analyze_style(processing_mode='enhanced'):
     """Handle style analysis workflow."""
     try:
         print(f"\nStarting {processing_mode} style analysis...")
         
-        # Force model selection for each analysis
-        print("\nPlease select a model for this analysis:")
-        select_model_interactive()
+        if processing_mode == 'statistical':
+            # Local metrics only: no model selection, network or Ollama needed
+            file_paths = get_file_paths()
+            if not file_paths:
+                print("No files selected. Analysis cancelled.")
+                return
+            style_profile = create_statistical_style_profile(file_paths, get_user_profile())
+            _save_analysis_results(style_profile)
+            input("\nPress Enter to continue...")
+            return
         
-        # Get current model info
-        model_info = get_current_model_info()
+        # Local models start loading in the background once selected
+        model_info = choose_model("this analysis")
         if not model_info['has_model']:
             print("No model selected. Analysis cancelled.")
             return
@@ -75,14 +180,44 @@ def handle_analyze_style(processing_mode='enhanced'):
             print("No files selected. Analysis cancelled.")
             return
         
+        tiered_scope = select_tiered_scope(model_info['selected_model']) if model_info['use_local_model'] else None
+        if tiered_scope:
+            # Tiered analysis always consolidates the per-file drafts
+            consolidation = "hierarchical"
+        elif len(file_paths) > 1:
+            consolidation = select_consolidation_strategy()
+        else:
+            consolidation = CONSOLIDATION_STRATEGY
+        
         # Prepare model parameters based on selection
-        if model_info['use_local_model']:
+        if tiered_scope:
+            # The refine model loads while the draft model works
+            get_model_lifecycle().start_warm_up(TIERED_REFINE_MODEL)
+            get_model_lifecycle().start_warm_up(TIERED_DRAFT_MODEL)
+            # Drafts and refinements run in worker threads; Ctrl+C reaches them through the event
+            if STREAM_LIVE_OUTPUT:
+                print("Model output is streamed live. Press Ctrl+C to stop the current response early.")
+            style_profile = create_tiered_style_profile(
+                file_paths,
+                refine_scope=tiered_scope,
+                processing_mode=processing_mode,
+                on_token=print_stream_token if STREAM_LIVE_OUTPUT else None,
+                cancel_event=threading.Event()
+            )
+        elif model_info['use_local_model']:
             # Local Ollama model
+            # Show tokens as they arrive; Ctrl+C stops the calls in progress and keeps their partial text.
+            # Per-file calls run in worker threads, so Ctrl+C reaches them through this event.
+            if STREAM_LIVE_OUTPUT:
+                print("Model output is streamed live. Press Ctrl+C to stop the current response early.")
             style_profile = create_enhanced_style_profile(
                 file_paths, 
                 use_local=True, 
                 model_name=model_info['selected_model'], 
-                processing_mode=processing_mode
+                processing_mode=processing_mode,
+                on_token=print_stream_token if STREAM_LIVE_OUTPUT else None,
+                consolidation=consolidation,
+                cancel_event=threading.Event()
             )
         else:
             # Cloud API model
@@ -117,23 +252,20 @@ def handle_analyze_style(processing_mode='enhanced'):
                 use_local=False,
                 api_type=model_type,
                 api_client=api_client,
-                processing_mode=processing_mode
+                processing_mode=processing_mode,
+                consolidation=consolidation
             )
         
         # Save the analysis results locally
-        if style_profile:
-            print("\nSaving analysis results...")
-            save_result = save_style_profile_locally(style_profile)
-            if save_result['success']:
-                print(f"✓ {save_result['message']}")
-                
-            else:
-                print(f"✗ Failed to save results: {save_result.get('error', 'Unknown error')}")
+        _save_analysis_results(style_profile)
         
-        print("\nAnalysis completed successfully!")
-        
-        # Reset model selection to force re-selection next time
-        reset_model_selection()
+        if model_info['use_local_model']:
+            print("\nModel time (load vs inference):")
+            print(format_call_timing(summarize_call_timing(), get_model_lifecycle().warm_up_results()))
+            host_stats = get_host_stats()
+            if len(host_stats) > 1:
+                print("\nOllama hosts:")
+                print(format_host_stats(host_stats))
         
         input("\nPress Enter to continue...")
         
@@ -157,15 +289,7 @@ def handle_view_profiles():
     
     print(f"\nFound {len(profiles)} style profiles:")
     print("-" * 80)
-    
-    for i, profile in enumerate(profiles, 1):
-        # Extract user name from filename (remove path and extension parts)
-        filename_only = os.path.basename(profile['filename'])
-        user_name = filename_only.split('_stylometric_profile_')[0] if '_stylometric_profile_' in filename_only else 'Unknown'
-        size_mb = profile['size'] / (1024 * 1024)  # Convert bytes to MB
-        
-        print(f"{i:2d}. {filename_only} | {user_name} | {profile['modified']} | {size_mb:.2f} MB")
-    
+    print(format_profile_list(profiles))
     print("-" * 80)
     
     try:
@@ -307,6 +431,34 @@ def handle_check_configuration():
         print(f"\nError running configuration check: {e}")
 
 
+def handle_manage_cache():
+    """Handle inspection and purging of the model response cache."""
+    try:
+        cache = get_response_cache() or ResponseCache()
+        
+        print("\n" + "="*60)
+        print("RESPONSE CACHE")
+        print("="*60)
+        print(format_cache_info(cache.info()))
+        print("-"*60)
+        print("1. Purge expired entries")
+        print("2. Purge all entries")
+        print("0. Back to main menu")
+        
+        choice = input("\nEnter your choice (0-2): ").strip()
+        if choice == "1":
+            print(f"Deleted {cache.purge(expired_only=True)} expired cache entries")
+        elif choice == "2":
+            print(f"Deleted {cache.purge()} cache entries")
+        
+        input("\nPress Enter to continue...")
+        
+    except KeyboardInterrupt:
+        print("\n\nReturning to main menu...")
+    except Exception as e:
+        print(f"\nError managing response cache: {e}")
+
+
 def handle_generate_content():
     """Handle content generation with style profiles."""
     try:
@@ -323,8 +475,7 @@ def handle_generate_content():
         
         # Let user select a style profile
         print("\nAvailable Style Profiles:")
-        for i, profile in enumerate(profiles, 1):
-            print(f"{i}. {profile['filename']} ({profile['modified']})")
+        print(format_profile_list(profiles))
         
         choice = input(f"\nSelect a profile (1-{len(profiles)}): ").strip()
         
@@ -332,11 +483,12 @@ def handle_generate_content():
             profile_index = int(choice) - 1
             if 0 <= profile_index < len(profiles):
                 selected_profile = profiles[profile_index]
-                profile_data = load_local_profile(selected_profile['filename'])
+                result = load_local_profile(selected_profile['filename'])
                 
-                if not profile_data:
-                    print("Failed to load profile data.")
+                if not result['success']:
+                    print(f"Failed to load profile data: {result['error']}")
                     return
+                profile_data = result['profile']
                 
                 # Initialize content generator
                 generator = ContentGenerator()
@@ -377,9 +529,7 @@ def handle_generate_content():
                 context = input("Additional context/requirements (optional): ").strip()
                 
                 # Select model for generation
-                print("\nPlease select a model for content generation:")
-                select_model_interactive()
-                model_info = get_current_model_info()
+                model_info = choose_model("content generation")
                 
                 if not model_info['has_model']:
                     print("No model selected. Generation cancelled.")
@@ -526,9 +676,6 @@ def handle_generate_content():
                         except Exception as e:
                             print(f"Failed to save content: {e}")
                 
-                # Reset model selection
-                reset_model_selection()
-                
             else:
                 print("Invalid selection.")
                 
@@ -590,8 +737,7 @@ def handle_style_transfer():
         
         # Let user select target style profile
         print("\nAvailable Style Profiles:")
-        for i, profile in enumerate(profiles, 1):
-            print(f"{i}. {profile['filename']} ({profile['modified']})")
+        print(format_profile_list(profiles))
         
         choice = input(f"\nSelect target style profile (1-{len(profiles)}): ").strip()
         
@@ -599,11 +745,12 @@ def handle_style_transfer():
             profile_index = int(choice) - 1
             if 0 <= profile_index < len(profiles):
                 selected_profile = profiles[profile_index]
-                profile_data = load_local_profile(selected_profile['filename'])
+                result = load_local_profile(selected_profile['filename'])
                 
-                if not profile_data:
-                    print("Failed to load profile data.")
+                if not result['success']:
+                    print(f"Failed to load profile data: {result['error']}")
                     return
+                profile_data = result['profile']
                 
                 # Initialize style transfer
                 transfer = StyleTransfer()
@@ -626,9 +773,7 @@ def handle_style_transfer():
                 preserve_list = [item.strip() for item in preserve_elements.split(',')] if preserve_elements else []
                 
                 # Select model for transfer
-                print("\nPlease select a model for style transfer:")
-                select_model_interactive()
-                model_info = get_current_model_info()
+                model_info = choose_model("style transfer")
                 
                 if not model_info['has_model']:
                     print("No model selected. Transfer cancelled.")
@@ -771,9 +916,6 @@ def handle_style_transfer():
                         except Exception as e:
                             print(f"Failed to save content: {e}")
                 
-                # Reset model selection
-                reset_model_selection()
-                
             else:
                 print("Invalid selection.")
                 
@@ -936,6 +1078,7 @@ def run_main_menu():
             choice = input("\nEnter your choice (0-10): ").strip()
             
             if choice == "0":
+                get_model_lifecycle().end_session()
                 print("\nThank you for using Style Transfer AI!")
                 sys.exit(0)
                 
@@ -968,10 +1111,14 @@ def run_main_menu():
             elif choice == "9":
                 handle_check_configuration()
                 
+            elif choice == "10":
+                handle_manage_cache()
+                
             else:
                 print("Invalid choice. Please enter 0-10.")
                 
         except KeyboardInterrupt:
+            get_model_lifecycle().end_session()
             print("\n\nExiting Style Transfer AI...")
             sys.exit(0)
         except Exception as e:
@@ -3,8 +3,9 @@ Model selection module for Style Transfer AI.
 Handles interactive model selection and validation.
 """
 
-from ..config.settings import AVAILABLE_MODELS, OLLAMA_BASE_URL, PROCESSING_MODES
+from ..config.settings import AVAILABLE_MODELS, OLLAMA_BASE_URL, PROCESSING_MODES, WARM_UP_ON_SELECT
 from ..models.ollama_client import check_ollama_connection
+from ..models.lifecycle import get_model_lifecycle
 from ..models.openai_client import setup_openai_client, get_api_key as get_openai_api_key
 from ..models.gemini_client import setup_gemini_client, get_api_key as get_gemini_api_key
 
@@ -17,6 +18,8 @@ USER_CHOSEN_API_KEY = None
 def reset_model_selection():
     """Reset the model selection state to force new selection."""
     global USE_LOCAL_MODEL, SELECTED_MODEL, USER_CHOSEN_API_KEY
+    # Let the server unload the previous local model on its normal schedule
+    get_model_lifecycle().end_session()
     USE_LOCAL_MODEL = False
     SELECTED_MODEL = None
     USER_CHOSEN_API_KEY = None
@@ -69,6 +72,10 @@ def validate_model_selection(model_key):
         if is_available:
             USE_LOCAL_MODEL = True
             SELECTED_MODEL = model_key
+            if WARM_UP_ON_SELECT:
+                # Load the model while the user confirms and picks files
+                get_model_lifecycle().begin_session(model_key)
+                message += " (loading in the background)"
             return {
                 'success': True,
                 'message': f"✓ {message}"
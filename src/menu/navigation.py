@@ -130,6 +130,12 @@ def display_loading_animation(message="Processing", duration=2):
     print(f"\r{message} ✓")
 
 
+def print_stream_token(token):
+    """Write a streamed model output fragment to the console immediately."""
+    sys.stdout.write(token)
+    sys.stdout.flush()
+
+
 def pause_for_user(message="Press Enter to continue..."):
     """
     Pause execution and wait for user input.
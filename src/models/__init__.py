@@ -0,0 +1 @@
+"""AI model clients for local Ollama and cloud (OpenAI, Gemini) backends."""
@@ -0,0 +1,47 @@
+"""
+API key handling for cloud model clients.
+Offers a configured key first, then prompts the user for one.
+"""
+
+
+def prompt_for_api_key(service_name, existing_key, key_url):
+    """
+    Get an API key from the user, offering an existing key when one is set.
+    
+    Args:
+        service_name (str): Display name of the service, e.g. 'OpenAI'
+        existing_key (str): Key from the configuration, possibly a placeholder
+        key_url (str): Where the user can create a key
+        
+    Returns:
+        str: The API key, or None if the user cancelled
+    """
+    # Placeholder keys in settings are short; only offer real-looking keys
+    if existing_key and len(existing_key) > 20 and not existing_key.startswith("your-"):
+        masked_key = f"{existing_key[:10]}...{existing_key[-10:]}"
+        print(f"\nFound existing {service_name} API key: {masked_key}")
+        use_existing = input(f"Do you want to use this {service_name} API key? (y/n): ").strip().lower()
+        
+        if use_existing == 'y':
+            return existing_key
+    
+    print(f"\nPlease enter your {service_name} API key:")
+    print(f"(You can find this at: {key_url})")
+    
+    while True:
+        try:
+            api_key = input("API Key: ").strip()
+            
+            if not api_key:
+                print("API key cannot be empty. Please try again.")
+                continue
+            
+            if len(api_key) < 20:
+                print("API key seems too short. Please check and try again.")
+                continue
+            
+            return api_key
+        
+        except KeyboardInterrupt:
+            print("\n\nSetup cancelled by user.")
+            return None
@@ -0,0 +1,169 @@
+"""
+Backend dispatch for Style Transfer AI.
+Routes a prompt to Ollama, OpenAI or Gemini and caches successful responses.
+"""
+
+import re
+import threading
+
+from .ollama_client import analyze_with_ollama, stream_with_ollama, get_ollama_hosts, get_num_ctx
+from .openai_client import analyze_with_openai, OPENAI_MODEL
+from .gemini_client import analyze_with_gemini, GEMINI_MODEL
+from .token_budget import plan_request, describe_budget_error
+from ..config.settings import PROCESSING_MODES, MAX_IN_FLIGHT_REQUESTS, ANALYSIS_SECTIONS
+from ..storage.response_cache import get_response_cache, make_cache_key
+
+# Clients report failures as text such as "Ollama Error: ..." or "Timeout Error: ..."
+_ERROR_RESPONSE_RE = re.compile(r'^[\w ]*Error:')
+
+# One semaphore per backend caps outstanding requests across all callers,
+# including nested fan-out such as chunked analyses of several files at once
+_backend_slots = {}
+_backend_slots_lock = threading.Lock()
+
+
+def is_error_response(response):
+    """Return True if a client response is an error message rather than model output."""
+    return not isinstance(response, str) or bool(_ERROR_RESPONSE_RE.match(response))
+
+
+def resolve_backend(use_local, model_name, api_type, api_client):
+    """
+    Decide which backend a request goes to.
+
+    Args:
+        use_local (bool): Prefer the local Ollama model
+        model_name (str): Ollama model name
+        api_type (str): 'openai' or 'gemini'
+        api_client: Pre-initialized API client
+
+    Returns:
+        str: 'ollama', 'openai' or 'gemini', or None if the configuration is unusable
+    """
+    if use_local and model_name:
+        return "ollama"
+    if api_type in ("openai", "gemini") and api_client:
+        return api_type
+    return None
+
+
+def backend_capacity(backend):
+    """
+    Return how many requests may be outstanding to a backend at once.
+    
+    The Ollama limit applies per host, so adding hosts to OLLAMA_HOSTS
+    scales out analyses of many files.
+    
+    Args:
+        backend (str): 'ollama', 'openai' or 'gemini'
+    
+    Returns:
+        int: Maximum concurrent requests
+    """
+    capacity = max(1, MAX_IN_FLIGHT_REQUESTS.get(backend, 1))
+    if backend == "ollama":
+        capacity *= len(get_ollama_hosts())
+    return capacity
+
+
+def _backend_slot(backend):
+    """Return the semaphore bounding concurrent requests to a backend."""
+    with _backend_slots_lock:
+        if backend not in _backend_slots:
+            _backend_slots[backend] = threading.BoundedSemaphore(backend_capacity(backend))
+        return _backend_slots[backend]
+
+
+def _request_signature(backend, model_name, processing_mode, budget, json_schema=None):
+    """Model name and generation options that determine a backend's output."""
+    structured = {'json_schema': json_schema} if json_schema else {}
+    if backend == "ollama":
+        mode = PROCESSING_MODES.get(processing_mode, PROCESSING_MODES["enhanced"])
+        return model_name, {
+            'processing_mode': processing_mode, **mode, 'num_predict': budget['num_predict'],
+            'num_ctx': get_num_ctx(model_name, budget), **structured
+        }
+    if backend == "openai":
+        return OPENAI_MODEL, {'temperature': 0.2, 'max_tokens': budget['num_predict'], **structured}
+    return GEMINI_MODEL, {'temperature': 0.2, 'max_output_tokens': budget['num_predict'], **structured}
+
+
+def generate_text(prompt, use_local, model_name=None, api_type=None, api_client=None,
+                  processing_mode="enhanced", use_cache=True, on_token=None, cancel_event=None,
+                  sections=ANALYSIS_SECTIONS, json_schema=None):
+    """
+    Send a prompt to the configured backend, serving repeats from the response cache.
+
+    Error responses and cancelled (partial) streams are returned as usual
+    but never cached. At most backend_capacity(backend) calls reach a
+    backend at once; further callers wait for a free slot.
+
+    Output length, context size and timeout are planned from the prompt
+    (see token_budget.plan_request). A prompt that leaves too little room
+    for the response is rejected before anything is sent.
+
+    Args:
+        prompt (str): The complete prompt
+        use_local (bool): Whether to use local Ollama model or cloud APIs
+        model_name (str): The specific model to use (for local models)
+        api_type (str): 'openai' or 'gemini' for cloud APIs
+        api_client: Pre-initialized API client (for OpenAI or Gemini)
+        processing_mode (str): Key of PROCESSING_MODES (Ollama only)
+        use_cache (bool): Read from and write to the response cache
+        on_token (callable): Stream Ollama output, passing each fragment here
+            (a cached response is passed once, whole)
+        cancel_event (threading.Event): Set to stop a streamed Ollama call early
+        sections (int): Number of sections the prompt asks for, used to size the output
+        json_schema (dict): Ask for JSON output; Ollama is held to the schema,
+            OpenAI and Gemini are put in JSON mode
+
+    Returns:
+        str: Model response or client error message
+
+    Raises:
+        ValueError: If no backend matches the configuration
+    """
+    backend = resolve_backend(use_local, model_name, api_type, api_client)
+    if backend is None:
+        raise ValueError("Invalid model configuration")
+
+    budget = plan_request(prompt, backend, model_name, processing_mode, sections)
+    if not budget['fits']:
+        return describe_budget_error(budget, model_name if backend == "ollama" else backend)
+
+    cache = get_response_cache() if use_cache else None
+    if cache is not None:
+        cache_model, options = _request_signature(backend, model_name, processing_mode, budget, json_schema)
+        key = make_cache_key(backend, cache_model, prompt, options)
+        cached = cache.get(key)
+        if cached is not None:
+            print(f"Using cached {backend} response ({cache_model})")
+            if backend == "ollama" and on_token is not None:
+                # Live output still shows the answer, in one piece
+                on_token(cached)
+                print()
+            return cached
+
+    # Structured requests only pass the extra argument, so plain calls are unchanged
+    ollama_format = {'json_schema': json_schema} if json_schema else {}
+    cloud_format = {'json_mode': True} if json_schema else {}
+    cacheable = True
+    with _backend_slot(backend):
+        if backend == "ollama" and (on_token is not None or cancel_event is not None):
+            result = stream_with_ollama(prompt, model_name, processing_mode, on_token, cancel_event, budget, **ollama_format)
+            response = result['error'] or result['response']
+            cacheable = not result['cancelled']
+        elif backend == "ollama":
+            response = analyze_with_ollama(prompt, model_name, processing_mode, budget=budget, **ollama_format)
+        elif backend == "openai":
+            response = analyze_with_openai(api_client, prompt, max_tokens=budget['num_predict'], **cloud_format)
+        else:
+            response = analyze_with_gemini(api_client, prompt, max_output_tokens=budget['num_predict'], **cloud_format)
+
+    if cache is not None and cacheable and not is_error_response(response):
+        try:
+            cache.put(key, response, {'backend': backend, 'model': cache_model})
+        except OSError as e:
+            print(f"Warning: Could not write response cache: {e}")
+
+    return response
@@ -0,0 +1,93 @@
+"""
+Google Gemini client for Style Transfer AI.
+Handles client setup and content generation requests.
+"""
+
+from .api_keys import prompt_for_api_key
+from .rate_limiter import get_rate_limiter
+from ..utils.text_processing import estimate_tokens
+from ..config.settings import GEMINI_API_KEY
+
+GEMINI_MODEL = "gemini-1.5-flash"
+
+
+def get_api_key():
+    """Get the Gemini API key from settings or the user."""
+    return prompt_for_api_key("Google Gemini", GEMINI_API_KEY, "https://aistudio.google.com/app/apikey")
+
+
+def setup_gemini_client(api_key=None):
+    """
+    Initialize Gemini client with provided API key.
+    
+    Args:
+        api_key (str): API key to use; prompts the user when omitted
+        
+    Returns:
+        tuple: (model instance or None, status message)
+    """
+    try:
+        import google.generativeai as genai
+        
+        if not api_key:
+            api_key = get_api_key()
+        
+        if not api_key:
+            return None, "No API key provided"
+        
+        genai.configure(api_key=api_key)
+        model = genai.GenerativeModel(GEMINI_MODEL)
+        
+        return model, f"Gemini client initialized successfully with key: {api_key[:10]}...{api_key[-10:]}"
+    except ImportError:
+        return None, "Google Generative AI library not installed. Run: pip install google-generativeai"
+    except Exception as e:
+        return None, f"Error initializing Gemini client: {e}"
+
+
+def analyze_with_gemini(api_client, prompt, max_output_tokens=3000, json_mode=False):
+    """
+    Send a prompt to Gemini and return the generated text.
+    
+    Calls are paced by the shared Gemini rate limiter and retried when the
+    API answers with HTTP 429 (see rate_limiter.get_rate_limiter).
+    
+    Args:
+        api_client: Initialized Gemini GenerativeModel
+        prompt (str): The complete prompt
+        max_output_tokens (int): Maximum tokens in the response
+        json_mode (bool): Ask for a JSON response
+        
+    Returns:
+        str: The model response, or an error message starting with the error type
+    """
+    if not api_client:
+        return "Gemini Error: No client provided. Please ensure client is initialized."
+    
+    print(f"Sending request to Google {GEMINI_MODEL} model...")
+    
+    try:
+        import google.generativeai as genai
+        
+        # Configure generation settings for consistent analysis
+        options = {'response_mime_type': "application/json"} if json_mode else {}
+        generation_config = genai.types.GenerationConfig(
+            temperature=0.2,
+            max_output_tokens=max_output_tokens,
+            candidate_count=1,
+            **options
+        )
+        
+        # Requests wait for request and token quota; HTTP 429 responses are retried
+        response = get_rate_limiter("gemini").call(
+            lambda: api_client.generate_content(
+                prompt,
+                generation_config=generation_config
+            ),
+            tokens=estimate_tokens(prompt) + max_output_tokens
+        )
+        
+        print("Deep analysis completed successfully!")
+        return response.text
+    except Exception as e:
+        return f"Gemini API Error: {e}"
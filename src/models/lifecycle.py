@@ -0,0 +1,247 @@
+"""
+Local model lifecycle for Style Transfer AI.
+Warms Ollama models in the background and keeps them loaded for a session,
+separating model load time from inference time in the call metrics.
+"""
+
+import threading
+import time
+
+import requests
+
+from . import ollama_client
+from .ollama_client import get_ollama_session, get_call_metrics, set_keep_alive, pin_num_ctx
+from .token_budget import plan_request
+from ..analysis.prompts import create_enhanced_deep_prompt
+from ..config.settings import (
+    OLLAMA_KEEP_ALIVE, OLLAMA_SESSION_KEEP_ALIVE, OLLAMA_CONNECT_TIMEOUT, OLLAMA_HEALTH_TIMEOUT,
+    OLLAMA_WARM_UP_TIMEOUT, COLD_START_SECONDS, ANALYSIS_CHUNK_TOKENS, DEFAULT_ANALYSIS_CHUNK_TOKENS,
+    CHARS_PER_TOKEN
+)
+
+
+def _warm_up_options(model_name):
+    """
+    Options that load a model with the context size analysis requests will use.
+    
+    Ollama reloads a model whose num_ctx changes, so warm-up plans a
+    full-size analysis chunk and pins its num_ctx (see ollama_client.pin_num_ctx);
+    real requests never go below the pin and reuse the loaded model.
+    """
+    sample_tokens = ANALYSIS_CHUNK_TOKENS.get(model_name, DEFAULT_ANALYSIS_CHUNK_TOKENS)
+    prompt = create_enhanced_deep_prompt("x" * (sample_tokens * CHARS_PER_TOKEN))
+    return {"num_ctx": pin_num_ctx(model_name, plan_request(prompt, "ollama", model_name))}
+
+
+def warm_up_model(model_name, keep_alive=None):
+    """
+    Load a model into memory without generating any text.
+    
+    Ollama loads the model for a generate request with an empty prompt and
+    reports how long the load took. The model is loaded with the num_ctx of
+    a full-size analysis request, so the first analysis does not reload it.
+    Every pool host that has the model is warmed, since requests may be
+    routed to any of them.
+    
+    Args:
+        model_name (str): Ollama model tag
+        keep_alive (str or int): How long the server keeps the model loaded
+            (defaults to the current client setting)
+    
+    Returns:
+        dict: 'model', 'success' (loaded on at least one host), 'hosts'
+            (number loaded), 'load_seconds' (slowest host), 'wall_time' and
+            'error' (first failure)
+    """
+    payload = {
+        "model": model_name,
+        "prompt": "",
+        "keep_alive": keep_alive if keep_alive is not None else ollama_client.get_keep_alive(),
+        "options": _warm_up_options(model_name)
+    }
+    started = time.perf_counter()
+    result = {'model': model_name, 'success': False, 'hosts': 0, 'load_seconds': None, 'wall_time': None, 'error': None}
+    
+    hosts = ollama_client.get_ollama_pool().hosts_with_model(model_name)
+    if not hosts:
+        result['error'] = f"Ollama Error: no reachable server has {model_name}"
+    
+    for host in hosts:
+        error = None
+        try:
+            response = get_ollama_session().post(
+                f"{host.url}/api/generate",
+                json=payload,
+                timeout=(OLLAMA_CONNECT_TIMEOUT, OLLAMA_WARM_UP_TIMEOUT)
+            )
+            if response.status_code == 200:
+                load_seconds = response.json().get('load_duration', 0) / 1e9
+                result['success'] = True
+                result['hosts'] += 1
+                result['load_seconds'] = max(result['load_seconds'] or 0.0, load_seconds)
+            else:
+                error = f"Ollama Error: HTTP {response.status_code} - {response.text}"
+        except requests.exceptions.Timeout:
+            error = f"Timeout Error: {model_name} did not load within {OLLAMA_WARM_UP_TIMEOUT}s"
+        except Exception as e:
+            error = f"Ollama Error: {e}"
+        result['error'] = result['error'] or error
+    
+    result['wall_time'] = time.perf_counter() - started
+    return result
+
+
+def summarize_call_timing(metrics=None):
+    """
+    Split recent Ollama call time into model loading and inference, per model.
+    
+    Args:
+        metrics (list): Call metrics (defaults to get_call_metrics())
+    
+    Returns:
+        dict: Per model 'calls', 'cold_starts' (calls that loaded the model
+            for COLD_START_SECONDS or longer), 'load_seconds' and 'inference_seconds'
+    """
+    summary = {}
+    for entry in get_call_metrics() if metrics is None else metrics:
+        totals = summary.setdefault(
+            entry['model'], {'calls': 0, 'cold_starts': 0, 'load_seconds': 0.0, 'inference_seconds': 0.0}
+        )
+        load_seconds = entry.get('load_seconds') or 0.0
+        totals['calls'] += 1
+        totals['cold_starts'] += load_seconds >= COLD_START_SECONDS
+        totals['load_seconds'] += load_seconds
+        totals['inference_seconds'] += (entry.get('prompt_eval_seconds') or 0.0) + (entry.get('eval_seconds') or 0.0)
+    return summary
+
+
+class ModelLifecycle:
+    """
+    Tracks which local model is in use and keeps it warm for the session.
+    
+    A session starts when an Ollama model is selected: the model is loaded
+    in a background thread while the user carries on, and every request
+    asks the server to keep it loaded for OLLAMA_SESSION_KEEP_ALIVE. Ending
+    the session hands expiry back to the normal OLLAMA_KEEP_ALIVE.
+    """
+    
+    def __init__(self, warm_up=warm_up_model):
+        self._warm_up = warm_up
+        self._lock = threading.Lock()
+        self._warm_ups = {}
+        self.session_model = None
+    
+    def start_warm_up(self, model_name):
+        """
+        Load a model in a background thread unless it is already loading or loaded.
+        
+        Args:
+            model_name (str): Ollama model tag
+        
+        Returns:
+            threading.Event: Set once the warm-up has finished
+        """
+        with self._lock:
+            warm_up = self._warm_ups.get(model_name)
+            if warm_up and (warm_up['result'] is None or warm_up['result']['success']):
+                return warm_up['done']
+            
+            warm_up = {'done': threading.Event(), 'result': None}
+            self._warm_ups[model_name] = warm_up
+        
+        def run():
+            warm_up['result'] = self._warm_up(model_name)
+            warm_up['done'].set()
+        
+        threading.Thread(target=run, name=f"warm-up-{model_name}", daemon=True).start()
+        return warm_up['done']
+    
+    def wait_until_ready(self, model_name, timeout=None):
+        """
+        Wait for a model's warm-up to finish.
+        
+        Args:
+            model_name (str): Ollama model tag
+            timeout (float): Seconds to wait; None waits until done
+        
+        Returns:
+            dict: The warm_up_model result, or None if no warm-up finished in time
+        """
+        with self._lock:
+            warm_up = self._warm_ups.get(model_name)
+        if warm_up is None or not warm_up['done'].wait(timeout):
+            return None
+        return warm_up['result']
+    
+    def warm_up_results(self):
+        """Return the finished warm-up results, keyed by model."""
+        with self._lock:
+            return {
+                model_name: warm_up['result']
+                for model_name, warm_up in self._warm_ups.items()
+                if warm_up['result'] is not None
+            }
+    
+    def begin_session(self, model_name):
+        """
+        Keep a model loaded for the session and start warming it.
+        
+        Args:
+            model_name (str): Ollama model tag
+        
+        Returns:
+            threading.Event: Set once the warm-up has finished
+        """
+        if self.session_model and self.session_model != model_name:
+            self.end_session()
+        self.session_model = model_name
+        set_keep_alive(OLLAMA_SESSION_KEEP_ALIVE)
+        return self.start_warm_up(model_name)
+    
+    def end_session(self):
+        """Return the session model to the normal keep_alive so the server can unload it."""
+        model_name = self.session_model
+        if model_name is None:
+            return
+        
+        self.session_model = None
+        set_keep_alive(None)
+        with self._lock:
+            self._warm_ups.pop(model_name, None)
+        
+        session = get_ollama_session()
+        timeout = (OLLAMA_CONNECT_TIMEOUT, OLLAMA_HEALTH_TIMEOUT)
+        for base_url in ollama_client.get_ollama_hosts():
+            try:
+                loaded = session.get(f"{base_url}/api/ps", timeout=timeout).json().get('models', [])
+                if any(model.get('name') == model_name for model in loaded):
+                    # Only a request can change the expiry the server already holds for the model;
+                    # it carries the pinned num_ctx so the model is not reloaded for it
+                    session.post(
+                        f"{base_url}/api/generate",
+                        json={
+                            "model": model_name, "prompt": "", "keep_alive": OLLAMA_KEEP_ALIVE,
+                            "options": _warm_up_options(model_name)
+                        },
+                        timeout=timeout
+                    )
+            except (requests.exceptions.RequestException, ValueError):
+                continue
+
+
+_default_lifecycle = None
+_default_lifecycle_lock = threading.Lock()
+
+
+def get_model_lifecycle():
+    """
+    Return the shared model lifecycle manager.
+    
+    Returns:
+        ModelLifecycle: Manager used by the menu and model selection
+    """
+    global _default_lifecycle
+    with _default_lifecycle_lock:
+        if _default_lifecycle is None:
+            _default_lifecycle = ModelLifecycle()
+    return _default_lifecycle
@@ -0,0 +1,454 @@
+"""
+Ollama client for Style Transfer AI.
+Talks to a local Ollama server over a shared, pooled HTTP session.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..config.settings import (
+    OLLAMA_BASE_URL, PROCESSING_MODES, OLLAMA_POOL_CONNECTIONS, OLLAMA_POOL_MAXSIZE,
+    OLLAMA_CONNECT_TIMEOUT, OLLAMA_HEALTH_TIMEOUT, OLLAMA_METRICS_HISTORY, OLLAMA_KEEP_ALIVE,
+    COLD_START_SECONDS, OLLAMA_HOSTS, OLLAMA_RETRY_STATUSES
+)
+from .ollama_pool import OllamaPool, HostError, ModelMissingError
+
+_session = None
+_session_lock = threading.Lock()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# Timing of recent generate calls, newest last
+_call_metrics = deque(maxlen=OLLAMA_METRICS_HISTORY)
+
+# Largest num_ctx requested per model; Ollama reloads the model (dropping its
+# prompt cache) whenever num_ctx changes, so it only ever grows
+_pinned_contexts = {}
+_pinned_contexts_lock = threading.Lock()
+
+# keep_alive sent with each request; None means OLLAMA_KEEP_ALIVE
+_keep_alive = None
+
+
+def get_ollama_session():
+    """
+    Return the shared HTTP session used for every Ollama request.
+    
+    The session keeps keep-alive connections in a pool sized by
+    OLLAMA_POOL_MAXSIZE, so repeated generate calls reuse open TCP
+    connections instead of reconnecting each time. requests sessions are
+    safe to share between the analyzer's worker threads.
+    
+    Returns:
+        requests.Session: The pooled session, created on first use
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=max(OLLAMA_POOL_CONNECTIONS, len(get_ollama_hosts())),
+                    pool_maxsize=OLLAMA_POOL_MAXSIZE
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def close_ollama_session():
+    """Close the shared session and its pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def get_ollama_hosts():
+    """Return the configured Ollama base URLs (OLLAMA_HOSTS, or OLLAMA_BASE_URL alone)."""
+    return list(OLLAMA_HOSTS) or [OLLAMA_BASE_URL]
+
+
+def get_ollama_pool():
+    """
+    Return the pool that routes generate requests across the Ollama hosts.
+    
+    Returns:
+        OllamaPool: Shared pool, kept in sync with get_ollama_hosts()
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = OllamaPool(get_ollama_hosts(), get_ollama_session)
+        else:
+            _pool.set_urls(get_ollama_hosts())
+    return _pool
+
+
+def get_host_stats():
+    """
+    Return per-host health, queue depth and latency of the Ollama pool.
+    
+    Returns:
+        list: One dict per host (see OllamaPool.stats)
+    """
+    return get_ollama_pool().stats()
+
+
+def check_ollama_connection(model_name):
+    """
+    Check if Ollama server is running and specified model is available.
+    
+    Args:
+        model_name (str): Model tag to look for, e.g. 'gemma3:1b'
+    
+    Returns:
+        tuple: (is_available, message)
+    """
+    hosts = get_ollama_hosts()
+    if len(hosts) > 1:
+        available = get_ollama_pool().hosts_with_model(model_name, refresh=True)
+        if available:
+            return True, f"{len(available)} of {len(hosts)} Ollama servers have {model_name} available"
+        return False, f"Model {model_name} not found on any reachable Ollama server ({', '.join(hosts)})"
+    
+    try:
+        response = get_ollama_session().get(
+            f"{hosts[0]}/api/tags",
+            timeout=(OLLAMA_CONNECT_TIMEOUT, OLLAMA_HEALTH_TIMEOUT)
+        )
+        if response.status_code == 200:
+            models = response.json().get('models', [])
+            model_names = [model.get('name', '') for model in models]
+            
+            if model_name in model_names:
+                return True, f"Ollama server running with {model_name} model available"
+            else:
+                return False, f"Model {model_name} not found. Available models: {model_names}"
+        else:
+            return False, f"Ollama server responded with status {response.status_code}"
+    except requests.exceptions.ConnectionError:
+        return False, "Cannot connect to Ollama server. Please run 'ollama serve'"
+    except Exception as e:
+        return False, f"Error checking Ollama: {e}"
+
+
+def set_keep_alive(keep_alive=None):
+    """
+    Set how long the server keeps models loaded after each request.
+    
+    Args:
+        keep_alive (str or int): Ollama duration such as "2h", or None to
+            restore OLLAMA_KEEP_ALIVE
+    """
+    global _keep_alive
+    _keep_alive = keep_alive
+
+
+def get_keep_alive():
+    """Return the keep_alive sent with each request."""
+    return OLLAMA_KEEP_ALIVE if _keep_alive is None else _keep_alive
+
+
+def get_call_metrics():
+    """
+    Return timing metrics of recent Ollama generate calls, oldest first.
+    
+    Each entry holds 'model', 'streamed', 'cancelled', 'wall_time',
+    'time_to_first_token' (None unless streamed), 'eval_count',
+    'tokens_per_second', 'prompt_eval_count', 'prompt_eval_seconds',
+    'eval_seconds', 'load_seconds' and 'host'. The server-side figures separate
+    model loading from inference; prompt eval shrinks when a prompt
+    prefix is served from Ollama's cache.
+    
+    Returns:
+        list: Metric dicts for up to OLLAMA_METRICS_HISTORY calls
+    """
+    return list(_call_metrics)
+
+
+def _resolve_num_ctx(model_name, budget):
+    """Planned num_ctx raised to the model's pin and capped at its window; call with the lock held."""
+    return min(max(budget['num_ctx'], _pinned_contexts.get(model_name, 0)), budget['context_window'])
+
+
+def get_num_ctx(model_name, budget):
+    """
+    Return the num_ctx a request with this budget would be sent with.
+    
+    This is the planned context, raised to the model's pinned context (see
+    pin_num_ctx) and capped at its context window. Nothing is pinned.
+    
+    Args:
+        model_name (str): Ollama model name
+        budget (dict): Plan from token_budget.plan_request
+        
+    Returns:
+        int: Context size in tokens
+    """
+    with _pinned_contexts_lock:
+        return _resolve_num_ctx(model_name, budget)
+
+
+def pin_num_ctx(model_name, budget):
+    """
+    Return the num_ctx for a request and pin it, so it never shrinks between calls.
+    
+    Args:
+        model_name (str): Ollama model name
+        budget (dict): Plan from token_budget.plan_request
+        
+    Returns:
+        int: Context size in tokens
+    """
+    with _pinned_contexts_lock:
+        num_ctx = _resolve_num_ctx(model_name, budget)
+        _pinned_contexts[model_name] = num_ctx
+    return num_ctx
+
+
+def _host_error(response):
+    """Error for a status another host may not return; 404 means the host lacks the model."""
+    message = f"HTTP {response.status_code} - {response.text}"
+    return ModelMissingError(message) if response.status_code == 404 else HostError(message)
+
+
+def _build_generate_payload(prompt, model_name, mode, stream, budget=None, json_schema=None):
+    if budget:
+        num_predict = budget['num_predict']
+    else:
+        num_predict = mode["gpt_oss_tokens"] if "gpt-oss" in model_name else mode["gemma_tokens"]
+    payload = {
+        "model": model_name,
+        "prompt": prompt,
+        "stream": stream,
+        "keep_alive": get_keep_alive(),
+        "options": {
+            "temperature": mode["temperature"],
+            "top_p": 0.9,
+            "top_k": 40,
+            "num_predict": num_predict,
+            "stop": ["Human:", "Assistant:"]
+        }
+    }
+    if budget:
+        payload["options"]["num_ctx"] = pin_num_ctx(model_name, budget)
+    if json_schema:
+        # Ollama constrains the output to JSON matching the schema
+        payload["format"] = json_schema
+    return payload
+
+
+def _record_call_metrics(model_name, started, final, streamed, first_token_at=None,
+                         token_chunks=0, cancelled=False, host=None):
+    """Derive and store timing metrics for one generate call."""
+    finished = time.perf_counter()
+    eval_count = final.get('eval_count') or token_chunks
+    eval_seconds = final.get('eval_duration', 0) / 1e9
+    
+    if eval_count and eval_seconds:
+        tokens_per_second = eval_count / eval_seconds
+    elif first_token_at is not None and finished > first_token_at:
+        # Cancelled streams have no server totals; use the client-side rate
+        tokens_per_second = token_chunks / (finished - first_token_at)
+    else:
+        tokens_per_second = None
+    
+    metrics = {
+        'model': model_name,
+        'streamed': streamed,
+        'cancelled': cancelled,
+        'wall_time': finished - started,
+        'time_to_first_token': first_token_at - started if first_token_at is not None else None,
+        'eval_count': eval_count,
+        'tokens_per_second': tokens_per_second,
+        'prompt_eval_count': final.get('prompt_eval_count'),
+        'prompt_eval_seconds': final.get('prompt_eval_duration', 0) / 1e9,
+        'eval_seconds': eval_seconds,
+        'load_seconds': final.get('load_duration', 0) / 1e9,
+        'host': host
+    }
+    _call_metrics.append(metrics)
+    return metrics
+
+
+def stream_with_ollama(prompt, model_name, processing_mode="enhanced", on_token=None, cancel_event=None, budget=None, json_schema=None):
+    """
+    Stream a generate call, passing tokens to a callback as they arrive.
+    
+    Ollama answers with newline-delimited JSON chunks; each is decoded as
+    soon as it is received. Setting ``cancel_event`` or pressing Ctrl+C
+    stops the call and keeps the text generated so far. A host that fails
+    before the first token is replaced by another from the pool.
+    
+    Args:
+        prompt (str): The complete prompt
+        model_name (str): Ollama model tag
+        processing_mode (str): Key of PROCESSING_MODES
+        on_token (callable): Called with each text fragment
+        cancel_event (threading.Event): Set to stop the stream early
+        budget (dict): Request plan from token_budget.plan_request
+        json_schema (dict): JSON schema the response must follow
+    
+    Returns:
+        dict: 'response' (text received), 'error' (message or None),
+            'cancelled' (bool) and 'metrics' (see get_call_metrics)
+    """
+    mode = PROCESSING_MODES.get(processing_mode, PROCESSING_MODES["enhanced"])
+    payload = _build_generate_payload(prompt, model_name, mode, stream=True, budget=budget, json_schema=json_schema)
+    timeout = budget['timeout'] if budget else mode["timeout"]
+    
+    parts = []
+    final = {}
+    error = None
+    cancelled = False
+    first_token_at = None
+    host = None
+    started = time.perf_counter()
+    
+    def consume(base_url):
+        nonlocal final, error, cancelled, first_token_at, host
+        host = base_url
+        # With stream=True the read timeout applies between chunks, not to the whole call
+        with get_ollama_session().post(
+            f"{base_url}/api/generate",
+            json=payload,
+            stream=True,
+            timeout=(OLLAMA_CONNECT_TIMEOUT, timeout)
+        ) as response:
+            if response.status_code in OLLAMA_RETRY_STATUSES:
+                raise _host_error(response)
+            if response.status_code != 200:
+                error = f"Ollama Error: HTTP {response.status_code} - {response.text}"
+                return
+            
+            for line in response.iter_lines():
+                if cancel_event is not None and cancel_event.is_set():
+                    cancelled = True
+                    break
+                if not line:
+                    continue
+                
+                chunk = json.loads(line)
+                if 'error' in chunk:
+                    error = f"Ollama Error: {chunk['error']}"
+                    break
+                
+                token = chunk.get('response', '')
+                if token:
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    parts.append(token)
+                    if on_token is not None:
+                        on_token(token)
+                
+                if chunk.get('done'):
+                    final = chunk
+                    break
+    
+    try:
+        print(f"Streaming from local Ollama model ({model_name} - {processing_mode} mode)...")
+        # A failed host is only retried elsewhere before any token has been shown
+        get_ollama_pool().request(model_name, consume, can_retry=lambda: not parts)
+    
+    except KeyboardInterrupt:
+        cancelled = True
+    except requests.exceptions.Timeout:
+        error = "Timeout Error: Deep analysis took too long. Try with shorter text or cloud API."
+    except Exception as e:
+        error = f"Ollama Error: {e}"
+    
+    if on_token is not None and parts:
+        print()  # End the line of streamed output
+    
+    metrics = _record_call_metrics(
+        model_name, started, final, streamed=True, first_token_at=first_token_at,
+        token_chunks=len(parts), cancelled=cancelled, host=host
+    )
+    text = "".join(parts)
+    
+    if cancelled:
+        print(f"Generation cancelled; keeping {len(text)} characters of partial output.")
+    elif not error:
+        print(f"Deep analysis completed successfully!{_format_speed(metrics)}")
+    
+    return {'response': text, 'error': error, 'cancelled': cancelled, 'metrics': metrics}
+
+
+def _format_speed(metrics):
+    details = []
+    if metrics['load_seconds'] >= COLD_START_SECONDS:
+        details.append(f"model load {metrics['load_seconds']:.1f}s")
+    if metrics['time_to_first_token'] is not None:
+        details.append(f"first token after {metrics['time_to_first_token']:.1f}s")
+    if metrics['tokens_per_second']:
+        details.append(f"{metrics['tokens_per_second']:.1f} tokens/s")
+    return f" ({', '.join(details)})" if details else ""
+
+
+def analyze_with_ollama(prompt, model_name, processing_mode="enhanced", on_token=None, cancel_event=None, budget=None, json_schema=None):
+    """
+    Send a prompt to a local Ollama model and return the generated text.
+    
+    Passing ``on_token`` or ``cancel_event`` switches to a streamed call
+    (see stream_with_ollama); a cancelled stream returns its partial text.
+    The request goes to the least-loaded Ollama host that has the model
+    and moves to another host if that one fails (see get_ollama_pool).
+    
+    Args:
+        prompt (str): The complete prompt
+        model_name (str): Ollama model tag
+        processing_mode (str): Key of PROCESSING_MODES controlling temperature,
+            token budget and timeout
+        on_token (callable): Called with each text fragment while streaming
+        cancel_event (threading.Event): Set to stop a streamed call early
+        budget (dict): Request plan from token_budget.plan_request; overrides
+            the mode's num_predict and timeout and sets num_ctx
+        json_schema (dict): JSON schema the response must follow (Ollama's
+            structured output ``format``)
+    
+    Returns:
+        str: The model response, or an error message starting with the error type
+    """
+    if on_token is not None or cancel_event is not None:
+        result = stream_with_ollama(prompt, model_name, processing_mode, on_token, cancel_event, budget, json_schema)
+        return result['error'] or result['response']
+    
+    mode = PROCESSING_MODES.get(processing_mode, PROCESSING_MODES["enhanced"])
+    payload = _build_generate_payload(prompt, model_name, mode, stream=False, budget=budget, json_schema=json_schema)
+    started = time.perf_counter()
+    
+    def send(base_url):
+        response = get_ollama_session().post(
+            f"{base_url}/api/generate",
+            json=payload,
+            timeout=(OLLAMA_CONNECT_TIMEOUT, budget['timeout'] if budget else mode["timeout"])
+        )
+        if response.status_code in OLLAMA_RETRY_STATUSES:
+            raise _host_error(response)
+        return base_url, response
+    
+    try:
+        print(f"Sending request to local Ollama model ({model_name} - {processing_mode} mode)...")
+        host, response = get_ollama_pool().request(model_name, send)
+        
+        if response.status_code == 200:
+            result = response.json()
+            metrics = _record_call_metrics(model_name, started, result, streamed=False, host=host)
+            print(f"Deep analysis completed successfully!{_format_speed(metrics)}")
+            return result.get('response', 'No response received')
+        else:
+            return f"Ollama Error: HTTP {response.status_code} - {response.text}"
+    
+    except requests.exceptions.Timeout:
+        return "Timeout Error: Deep analysis took too long. Try with shorter text or cloud API."
+    except Exception as e:
+        return f"Ollama Error: {e}"
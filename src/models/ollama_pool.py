@@ -0,0 +1,210 @@
+"""
+Ollama host pool for Style Transfer AI.
+Spreads generate requests over several Ollama servers, routing each one to
+the least-loaded healthy host that has the model and retrying elsewhere
+when a host fails.
+"""
+
+import threading
+import time
+
+import requests
+
+from ..config.settings import OLLAMA_HEALTH_TTL, OLLAMA_CONNECT_TIMEOUT, OLLAMA_HEALTH_TIMEOUT
+
+
+class HostError(Exception):
+    """A host answered with a status another host might not return (e.g. HTTP 503)."""
+
+
+class ModelMissingError(HostError):
+    """A healthy host does not have the requested model (HTTP 404)."""
+
+
+# Failures worth retrying on another host
+RETRYABLE_ERRORS = (HostError, requests.exceptions.ConnectionError)
+
+
+class OllamaHost:
+    """Health and load of one Ollama server."""
+    
+    def __init__(self, url):
+        self.url = url.rstrip("/")
+        self.in_flight = 0
+        self.requests = 0
+        self.completed = 0
+        self.failures = 0
+        self.total_latency = 0.0
+        self.last_latency = None
+        self.models = None
+        self.healthy = True
+        self.checked_at = None
+    
+    @property
+    def average_latency(self):
+        return self.total_latency / self.completed if self.completed else None
+    
+    def snapshot(self):
+        return {
+            'url': self.url,
+            'healthy': self.healthy,
+            'queue_depth': self.in_flight,
+            'requests': self.requests,
+            'failures': self.failures,
+            'average_latency': self.average_latency,
+            'last_latency': self.last_latency,
+            'models': sorted(self.models) if self.models is not None else None
+        }
+
+
+class OllamaPool:
+    """
+    Routes requests across Ollama hosts by health, model availability and load.
+    
+    Health comes from /api/tags probes cached for ``health_ttl`` seconds; a
+    host that fails a request is skipped until its next probe. A host that
+    answers 404 stays healthy but loses the model from its list until then.
+    With a single host nothing is probed and every request goes straight to it.
+    """
+    
+    def __init__(self, urls, session_getter, health_ttl=OLLAMA_HEALTH_TTL):
+        self._session_getter = session_getter
+        self.health_ttl = health_ttl
+        self._lock = threading.Lock()
+        self.hosts = []
+        self.set_urls(urls)
+    
+    def set_urls(self, urls):
+        """Replace the host list, keeping the state of hosts that remain."""
+        with self._lock:
+            existing = {host.url: host for host in self.hosts}
+            self.hosts = [existing.get(url.rstrip("/")) or OllamaHost(url) for url in urls]
+    
+    def probe(self, host, force=False):
+        """
+        Refresh a host's health and model list unless the cached probe is still fresh.
+        
+        Args:
+            host (OllamaHost): Host to check
+            force (bool): Probe even if the cached result has not expired
+        """
+        if not force and host.checked_at is not None and time.monotonic() - host.checked_at < self.health_ttl:
+            return
+        
+        try:
+            response = self._session_getter().get(
+                f"{host.url}/api/tags", timeout=(OLLAMA_CONNECT_TIMEOUT, OLLAMA_HEALTH_TIMEOUT)
+            )
+            if response.status_code == 200:
+                host.models = {model.get('name', '') for model in response.json().get('models', [])}
+                host.healthy = True
+            else:
+                host.healthy = False
+        except (requests.exceptions.RequestException, ValueError):
+            host.healthy = False
+        host.checked_at = time.monotonic()
+    
+    def hosts_with_model(self, model_name, refresh=False):
+        """
+        Return the healthy hosts that have a model.
+        
+        Args:
+            model_name (str): Ollama model tag
+            refresh (bool): Probe every host now instead of using cached health
+        
+        Returns:
+            list: Matching OllamaHost objects (the only host, unprobed, if there is one)
+        """
+        hosts = list(self.hosts)
+        if len(hosts) == 1:
+            return hosts
+        for host in hosts:
+            self.probe(host, force=refresh)
+        return [host for host in hosts if host.healthy and host.models is not None and model_name in host.models]
+    
+    def _lease(self, model_name, tried):
+        listed = self.hosts_with_model(model_name)
+        if not listed:
+            # Nobody reports the model; try every host so the real error surfaces
+            listed = self.hosts
+        candidates = [host for host in listed if host not in tried]
+        if not candidates:
+            return None
+        
+        with self._lock:
+            host = min(candidates, key=lambda candidate: (candidate.in_flight, candidate.average_latency or 0.0))
+            host.in_flight += 1
+            host.requests += 1
+        return host
+    
+    def _release(self, host, latency=None, failed=False, missing_model=None):
+        with self._lock:
+            host.in_flight -= 1
+            if missing_model is not None:
+                # The host is up; only route this model elsewhere until the next probe
+                if host.models is not None:
+                    host.models.discard(missing_model)
+            elif failed:
+                host.failures += 1
+                host.healthy = False
+                host.checked_at = time.monotonic()
+            elif latency is not None:
+                host.completed += 1
+                host.last_latency = latency
+                host.total_latency += latency
+    
+    def request(self, model_name, send, can_retry=None):
+        """
+        Run a request on the best host, moving to the next one if it fails.
+        
+        Args:
+            model_name (str): Ollama model tag used for routing
+            send (callable): Takes a host base URL and performs the request;
+                raises one of RETRYABLE_ERRORS when the host itself failed,
+                or ModelMissingError when it does not have the model
+            can_retry (callable): Returns False when a failure must not be
+                retried, e.g. once a stream has delivered tokens
+        
+        Returns:
+            The value returned by ``send``
+        """
+        tried = []
+        last_error = None
+        while True:
+            host = self._lease(model_name, tried)
+            if host is None:
+                raise last_error
+            tried.append(host)
+            started = time.monotonic()
+            try:
+                result = send(host.url)
+            except ModelMissingError as e:
+                self._release(host, missing_model=model_name)
+                if can_retry is not None and not can_retry():
+                    raise
+                last_error = e
+                continue
+            except RETRYABLE_ERRORS as e:
+                self._release(host, failed=True)
+                if can_retry is not None and not can_retry():
+                    raise
+                last_error = e
+                continue
+            except BaseException:
+                # Timeouts and cancellations say nothing about the host's health
+                self._release(host)
+                raise
+            self._release(host, latency=time.monotonic() - started)
+            return result
+    
+    def stats(self):
+        """
+        Return the load and latency of every host.
+        
+        Returns:
+            list: Per host 'url', 'healthy', 'queue_depth' (requests in
+                flight), 'requests', 'failures', 'average_latency',
+                'last_latency' and 'models'
+        """
+        with self._lock:
+            return [host.snapshot() for host in self.hosts]
@@ -0,0 +1,86 @@
+"""
+OpenAI client for Style Transfer AI.
+Handles client setup and chat completion requests.
+"""
+
+from .api_keys import prompt_for_api_key
+from .rate_limiter import get_rate_limiter
+from ..utils.text_processing import estimate_tokens
+from ..config.settings import OPENAI_API_KEY
+
+OPENAI_MODEL = "gpt-3.5-turbo"
+
+
+def get_api_key():
+    """Get the OpenAI API key from settings or the user."""
+    return prompt_for_api_key("OpenAI", OPENAI_API_KEY, "https://platform.openai.com/api-keys")
+
+
+def setup_openai_client(api_key=None):
+    """
+    Initialize OpenAI client with provided API key.
+    
+    Args:
+        api_key (str): API key to use; prompts the user when omitted
+        
+    Returns:
+        tuple: (client or None, status message)
+    """
+    try:
+        from openai import OpenAI
+        
+        if not api_key:
+            api_key = get_api_key()
+        
+        if not api_key:
+            return None, "No API key provided"
+        
+        client = OpenAI(api_key=api_key)
+        return client, f"OpenAI client initialized successfully with key: {api_key[:10]}...{api_key[-10:]}"
+    except ImportError:
+        return None, "OpenAI library not installed. Run: pip install openai"
+    except Exception as e:
+        return None, f"Error initializing OpenAI client: {e}"
+
+
+def analyze_with_openai(api_client, prompt, max_tokens=3000, json_mode=False):
+    """
+    Send a prompt to OpenAI and return the generated text.
+    
+    Calls are paced by the shared OpenAI rate limiter and retried when the
+    API answers with HTTP 429 (see rate_limiter.get_rate_limiter).
+    
+    Args:
+        api_client: Initialized OpenAI client
+        prompt (str): The complete prompt
+        max_tokens (int): Maximum tokens in the response
+        json_mode (bool): Ask for a JSON object (the prompt must mention JSON)
+        
+    Returns:
+        str: The model response, or an error message starting with the error type
+    """
+    if not api_client:
+        return "OpenAI Error: No client provided. Please ensure client is initialized."
+    
+    print(f"Sending request to OpenAI {OPENAI_MODEL} model...")
+    
+    options = {'response_format': {"type": "json_object"}} if json_mode else {}
+    try:
+        # Requests wait for request and token quota; HTTP 429 responses are retried
+        response = get_rate_limiter("openai").call(
+            lambda: api_client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.2,  # Lower for more consistent analysis
+                max_tokens=max_tokens,
+                **options
+            ),
+            tokens=estimate_tokens(prompt) + max_tokens
+        )
+        
+        print("Deep analysis completed successfully!")
+        return response.choices[0].message.content
+    except Exception as e:
+        return f"OpenAI API Error: {e}"
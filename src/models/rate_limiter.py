@@ -0,0 +1,226 @@
+"""
+Cloud API rate limiting for Style Transfer AI.
+Paces OpenAI and Gemini calls with per-backend token buckets for requests
+and tokens per minute, and retries rate-limited calls after the server's
+retry-after delay or an exponential backoff with jitter.
+"""
+
+import random
+import re
+import threading
+import time
+
+from ..config.settings import (
+    CLOUD_RATE_LIMITS, RATE_LIMIT_BURST_SECONDS, RATE_LIMIT_MAX_RETRIES, RATE_LIMIT_BASE_DELAY,
+    RATE_LIMIT_MAX_DELAY
+)
+
+# Exception class names the OpenAI and Google SDKs use for HTTP 429
+_RATE_LIMIT_ERROR_NAMES = {"RateLimitError", "ResourceExhausted", "TooManyRequests"}
+
+# Gemini reports its retry delay in the message, e.g. "Please retry in 37.5s"
+_RETRY_IN_MESSAGE_RE = re.compile(r'retry(?:_delay| in)\D{0,20}?(\d+(?:\.\d+)?)\s*s', re.IGNORECASE)
+
+# google-api-core prints the RetryInfo detail as "retry_delay { seconds: 37 nanos: 500000000 }"
+_RETRY_DELAY_FIELD_RE = re.compile(r'retry_delay\s*\{\s*seconds:\s*(\d+)(?:\s*nanos:\s*(\d+))?')
+
+
+def _retry_info_delay(error):
+    """Return the delay of a google.rpc.RetryInfo in a google-api-core error's details, if any."""
+    for detail in getattr(error, 'details', None) or ():
+        retry_delay = getattr(detail, 'retry_delay', None)
+        if retry_delay is not None and hasattr(retry_delay, 'seconds'):
+            return retry_delay.seconds + getattr(retry_delay, 'nanos', 0) / 1e9
+    return None
+
+
+class TokenBucket:
+    """
+    Continuously refilling budget of units per minute.
+    
+    Callers reserve units up front and are told how long to wait, so
+    concurrent callers queue in order and the bucket drains at exactly
+    its configured rate. At most RATE_LIMIT_BURST_SECONDS worth of units
+    can be spent at once.
+    """
+    
+    def __init__(self, per_minute, capacity=None, clock=time.monotonic):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or max(1.0, self.rate * RATE_LIMIT_BURST_SECONDS)
+        self._clock = clock
+        self._available = float(self.capacity)
+        self._updated = clock()
+    
+    def reserve(self, amount, now=None):
+        """
+        Take units from the bucket, going into debt if necessary.
+        
+        Args:
+            amount (float): Units needed; capped at the bucket capacity
+            now (float): Current clock reading
+        
+        Returns:
+            float: Seconds to wait before the units are really available
+        """
+        now = self._clock() if now is None else now
+        self._available = min(self.capacity, self._available + (now - self._updated) * self.rate)
+        self._updated = now
+        self._available -= min(amount, self.capacity)
+        return max(0.0, -self._available / self.rate)
+
+
+def full_jitter_delay(attempt, base_delay, max_delay):
+    """Return a full-jitter exponential backoff delay for a retry attempt (1-based)."""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+
+def is_rate_limit_error(error):
+    """Return True if an SDK exception reports HTTP 429 / quota exhaustion."""
+    if type(error).__name__ in _RATE_LIMIT_ERROR_NAMES:
+        return True
+    return 429 in (getattr(error, 'status_code', None), getattr(error, 'code', None))
+
+
+def get_retry_after(error):
+    """
+    Read the server's requested delay from a rate-limit error.
+    
+    Args:
+        error (Exception): Error raised by the OpenAI or Gemini SDK
+    
+    Returns:
+        float: Seconds to wait, or None if the server gave no delay
+    """
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000
+        if headers.get('retry-after'):
+            return float(headers['retry-after'])
+    except (TypeError, ValueError):
+        pass
+    
+    retry_delay = _retry_info_delay(error)
+    if retry_delay is not None:
+        return retry_delay
+    
+    message = str(error)
+    match = _RETRY_DELAY_FIELD_RE.search(message)
+    if match:
+        return int(match.group(1)) + int(match.group(2) or 0) / 1e9
+    match = _RETRY_IN_MESSAGE_RE.search(message)
+    return float(match.group(1)) if match else None
+
+
+class RateLimiter:
+    """
+    Request and token buckets for one backend, plus retry on HTTP 429.
+    
+    A 429 pauses every caller of the backend, not just the one that got
+    it, so queued work resumes together at the sustainable rate instead
+    of each request failing in turn.
+    """
+    
+    def __init__(self, name, requests_per_minute, tokens_per_minute=None,
+                 max_retries=RATE_LIMIT_MAX_RETRIES, base_delay=RATE_LIMIT_BASE_DELAY,
+                 max_delay=RATE_LIMIT_MAX_DELAY, clock=time.monotonic, sleep=time.sleep):
+        self.name = name
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._requests = TokenBucket(requests_per_minute, clock=clock)
+        self._tokens = TokenBucket(tokens_per_minute, clock=clock) if tokens_per_minute else None
+        self._paused_until = 0.0
+        self.stats = {'calls': 0, 'rate_limited': 0, 'wait_seconds': 0.0}
+    
+    def acquire(self, tokens=0):
+        """
+        Block until one request of ``tokens`` estimated tokens may be sent.
+        
+        Args:
+            tokens (int): Estimated prompt plus response tokens
+        
+        Returns:
+            float: Seconds spent waiting
+        """
+        with self._lock:
+            now = self._clock()
+            wait = self._requests.reserve(1, now)
+            if self._tokens is not None:
+                wait = max(wait, self._tokens.reserve(tokens, now))
+            wait = max(wait, self._paused_until - now)
+            self.stats['calls'] += 1
+            self.stats['wait_seconds'] += wait
+        
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+    
+    def pause(self, seconds):
+        """Hold back every caller of this backend for ``seconds``."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+    
+    def backoff_delay(self, attempt):
+        """Return a full-jitter exponential backoff delay for a retry attempt (1-based)."""
+        return full_jitter_delay(attempt, self.base_delay, self.max_delay)
+    
+    def call(self, request, tokens=0):
+        """
+        Send a request within the rate limits, retrying it when rate limited.
+        
+        Args:
+            request (callable): Performs the API call and returns its result
+            tokens (int): Estimated prompt plus response tokens
+        
+        Returns:
+            The result of ``request``; the last rate-limit error is raised
+            once max_retries is exhausted, other errors immediately
+        """
+        attempt = 0
+        while True:
+            self.acquire(tokens)
+            try:
+                return request()
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                with self._lock:
+                    self.stats['rate_limited'] += 1
+                
+                retry_after = get_retry_after(e)
+                if retry_after is not None:
+                    # A little jitter keeps paused callers from all retrying at the same instant
+                    delay = retry_after + random.uniform(0, self.base_delay)
+                else:
+                    delay = self.backoff_delay(attempt)
+                print(f"{self.name} rate limit reached; retrying in {delay:.1f}s "
+                      f"(attempt {attempt} of {self.max_retries})")
+                self.pause(delay)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(backend):
+    """
+    Return the shared rate limiter for a cloud backend.
+    
+    Args:
+        backend (str): 'openai' or 'gemini' (a key of CLOUD_RATE_LIMITS)
+    
+    Returns:
+        RateLimiter: Limiter configured from CLOUD_RATE_LIMITS
+    """
+    with _limiters_lock:
+        if backend not in _limiters:
+            limits = CLOUD_RATE_LIMITS[backend]
+            _limiters[backend] = RateLimiter(
+                limits['name'], limits['requests_per_minute'], limits.get('tokens_per_minute')
+            )
+        return _limiters[backend]
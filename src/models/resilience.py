@@ -0,0 +1,478 @@
+"""
+Resilient model calls for Style Transfer AI.
+Turns client error text into typed errors, retries failing backends with
+backoff, fails over (or hedges) to fallback models, and stops sending work
+to a backend whose circuit breaker has opened after repeated failures.
+"""
+
+import math
+import queue
+import re
+import threading
+import time
+from collections import deque
+
+from .dispatch import generate_text, is_error_response
+from .rate_limiter import full_jitter_delay
+from ..config.settings import (
+    MODEL_RETRY_ATTEMPTS, MODEL_RETRY_BASE_DELAY, MODEL_RETRY_MAX_DELAY, FALLBACK_MODELS, HEDGING_ENABLED,
+    HEDGE_MIN_SAMPLES, HEDGE_MIN_DELAY, LATENCY_HISTORY, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS
+)
+
+_HTTP_STATUS_RE = re.compile(r'HTTP (\d{3})')
+_UNAVAILABLE_HINTS = ("connection", "refused", "unavailable", "overloaded", "timed out", "reset by peer")
+
+
+class ModelError(Exception):
+    """A model call failed; ``str(error)`` is the client's error message."""
+    
+    retryable = False
+    output_shown = False
+    
+    def __init__(self, message, backend=None):
+        super().__init__(message)
+        self.backend = backend
+
+
+class ModelTimeoutError(ModelError):
+    """The backend did not answer within the request timeout."""
+
+
+class ModelUnavailableError(ModelError):
+    """The backend could not be reached or failed on its side (HTTP 5xx, refused connection)."""
+    
+    retryable = True
+
+
+class ModelRequestError(ModelError):
+    """The request itself was rejected (too long, unknown model, bad key); retrying will not help."""
+
+
+class CircuitOpenError(ModelUnavailableError):
+    """The backend's circuit breaker is open, so the call was not attempted."""
+    
+    retryable = False
+
+
+def classify_error(response, backend=None):
+    """
+    Map a client's error text to a typed error.
+    
+    Args:
+        response: Error response from generate_text (normally a string)
+        backend (str): Target label recorded on the error
+    
+    Returns:
+        ModelError: The matching error subclass
+    """
+    if not isinstance(response, str):
+        return ModelUnavailableError(f"Model Error: no response from {backend}", backend)
+    if response.startswith("Timeout Error"):
+        return ModelTimeoutError(response, backend)
+    if response.startswith("Token Budget Error") or "No client provided" in response:
+        return ModelRequestError(response, backend)
+    
+    lowered = response.lower()
+    if "rate limit" in lowered or "429" in response:
+        # The rate limiter has already waited and retried; fail over instead of retrying again
+        error = ModelUnavailableError(response, backend)
+        error.retryable = False
+        return error
+    
+    status = _HTTP_STATUS_RE.search(response)
+    if status:
+        code = int(status.group(1))
+        if 400 <= code < 500 and code != 408:
+            return ModelRequestError(response, backend)
+        return ModelUnavailableError(response, backend)
+    if response.startswith("Ollama Error") or any(hint in lowered for hint in _UNAVAILABLE_HINTS):
+        return ModelUnavailableError(response, backend)
+    # Other cloud API errors (authentication, invalid request) will not go away on retry
+    return ModelRequestError(response, backend)
+
+
+def percentile(values, pct):
+    """
+    Return a linearly interpolated percentile.
+    
+    Args:
+        values (list): Numbers (need not be sorted)
+        pct (float): Percentile between 0 and 100
+    
+    Returns:
+        float: The percentile, or None for an empty list
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower, upper = math.floor(position), math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one backend.
+    
+    After ``failure_threshold`` failures in a row the circuit opens and
+    calls are refused. Once ``reset_seconds`` have passed, one trial call
+    is let through: success closes the circuit, failure opens it again.
+    """
+    
+    def __init__(self, name, failure_threshold=CIRCUIT_FAILURE_THRESHOLD, reset_seconds=CIRCUIT_RESET_SECONDS,
+                 clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+    
+    def allow(self):
+        """Return True if a call may be sent now (claiming the trial slot when half open)."""
+        with self._lock:
+            if self.state == "open" and self._clock() - self._opened_at >= self.reset_seconds:
+                self.state = "half_open"
+                self._trial_in_flight = False
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+    
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial_in_flight = False
+    
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    print(f"{self.name} failed {self.failures} time(s) in a row; pausing it for "
+                          f"{self.reset_seconds:g}s")
+                self.state = "open"
+                self._opened_at = self._clock()
+
+
+def make_target(use_local, model_name=None, api_type=None, api_client=None):
+    """
+    Describe one backend a request can be sent to.
+    
+    Args:
+        use_local (bool): Whether to use local Ollama model or cloud APIs
+        model_name (str): The specific model to use (for local models)
+        api_type (str): 'openai' or 'gemini' for cloud APIs
+        api_client: Pre-initialized API client (for OpenAI or Gemini)
+    
+    Returns:
+        dict: 'label' (e.g. 'ollama:gemma3:1b' or 'openai') plus the
+            generate_text backend arguments
+    """
+    return {
+        'label': f"ollama:{model_name}" if use_local else api_type,
+        'use_local': use_local,
+        'model_name': model_name,
+        'api_type': api_type,
+        'api_client': api_client
+    }
+
+
+def analysis_targets(use_local, model_name=None, api_type=None, api_client=None, fallbacks=None):
+    """
+    Return the primary target followed by its fallbacks.
+    
+    Args:
+        use_local (bool): Whether to use local Ollama model or cloud APIs
+        model_name (str): The specific model to use (for local models)
+        api_type (str): 'openai' or 'gemini' for cloud APIs
+        api_client: Pre-initialized API client (for OpenAI or Gemini)
+        fallbacks (list): Targets from make_target; defaults to the
+            FALLBACK_MODELS entry of the Ollama model or cloud backend
+    
+    Returns:
+        list: Targets in the order they are tried
+    """
+    targets = [make_target(use_local, model_name, api_type, api_client)]
+    if fallbacks is None:
+        # Cloud backends are keyed by api_type; every fallback is a local Ollama model
+        fallback_model = FALLBACK_MODELS.get(model_name if use_local else api_type)
+        fallbacks = [make_target(True, fallback_model)] if fallback_model else []
+    return targets + [target for target in fallbacks if target['label'] != targets[0]['label']]
+
+
+class _HedgeCancel:
+    """Cancel flag for one leg of a hedge race, also set by the caller's own event."""
+    
+    def __init__(self, caller_event=None):
+        self._event = threading.Event()
+        self._caller_event = caller_event
+    
+    def set(self):
+        self._event.set()
+    
+    def is_set(self):
+        return self._event.is_set() or (self._caller_event is not None and self._caller_event.is_set())
+
+
+class ResilientDispatcher:
+    """
+    Sends a prompt to the first healthy target, with retry, hedging and failover.
+    
+    Each target is tried in turn: unreachable backends are retried with
+    backoff, timeouts and rejected requests move straight on to the next
+    target. When hedging is enabled and the primary has not answered within
+    its recent p95 latency, the same prompt also goes to the next target and
+    the first successful answer wins; a losing Ollama stream is cancelled.
+    """
+    
+    def __init__(self, max_retries=MODEL_RETRY_ATTEMPTS, base_delay=MODEL_RETRY_BASE_DELAY,
+                 max_delay=MODEL_RETRY_MAX_DELAY, hedging=HEDGING_ENABLED, hedge_min_samples=HEDGE_MIN_SAMPLES,
+                 hedge_min_delay=HEDGE_MIN_DELAY, clock=time.monotonic, sleep=time.sleep):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedging = hedging
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay = hedge_min_delay
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Forget all latency history and close every circuit."""
+        with self._lock:
+            self._breakers = {}
+            self._latencies = {}
+            self.counters = {'retries': 0, 'failovers': 0, 'hedges': 0, 'hedge_wins': 0}
+    
+    def breaker(self, label):
+        """Return the circuit breaker of a target label."""
+        with self._lock:
+            if label not in self._breakers:
+                self._breakers[label] = CircuitBreaker(label, clock=self._clock)
+            return self._breakers[label]
+    
+    def _record_latency(self, label, seconds):
+        with self._lock:
+            self._latencies.setdefault(label, deque(maxlen=LATENCY_HISTORY)).append(seconds)
+    
+    def _count(self, key):
+        with self._lock:
+            self.counters[key] += 1
+    
+    def hedge_delay(self, label):
+        """Return how long to wait for a target before hedging, or None without enough history."""
+        with self._lock:
+            latencies = list(self._latencies.get(label, ()))
+        if len(latencies) < self.hedge_min_samples:
+            return None
+        return max(self.hedge_min_delay, percentile(latencies, 95))
+    
+    def stats(self):
+        """
+        Return per-target health and latency.
+        
+        Returns:
+            dict: Per label 'state', 'failures', 'p95' and 'calls' (latency
+                samples), plus the dispatcher-wide 'counters'
+        """
+        with self._lock:
+            labels = set(self._breakers) | set(self._latencies)
+            targets = {
+                label: {
+                    'state': self._breakers[label].state if label in self._breakers else "closed",
+                    'failures': self._breakers[label].failures if label in self._breakers else 0,
+                    'p95': percentile(list(self._latencies.get(label, ())), 95),
+                    'calls': len(self._latencies.get(label, ()))
+                }
+                for label in sorted(labels)
+            }
+            return {'targets': targets, 'counters': dict(self.counters)}
+    
+    def _call(self, prompt, target, generate, processing_mode, on_token, cancel_event, options):
+        """Call one target, retrying retryable failures; return the response or raise ModelError."""
+        label = target['label']
+        breaker = self.breaker(label)
+        delivered = []
+        if on_token is not None:
+            def forward(token):
+                delivered.append(True)
+                on_token(token)
+            options = dict(options, on_token=forward)
+        if cancel_event is not None:
+            options = dict(options, cancel_event=cancel_event)
+        
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(f"Model Error: {label} is paused after repeated failures", label)
+            started = self._clock()
+            response = generate(
+                prompt, target['use_local'], target['model_name'], target['api_type'], target['api_client'],
+                processing_mode, **options
+            )
+            if cancel_event is not None and cancel_event.is_set():
+                # Cancelled (e.g. lost a hedge race): the backend was working, but the latency means nothing
+                breaker.record_success()
+                return response
+            if not is_error_response(response):
+                breaker.record_success()
+                self._record_latency(label, self._clock() - started)
+                return response
+            
+            error = classify_error(response, label)
+            if isinstance(error, ModelRequestError):
+                # The backend answered; the request was the problem
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+            if not error.retryable or attempt >= self.max_retries or delivered:
+                error.output_shown = bool(delivered)
+                raise error
+            
+            attempt += 1
+            self._count('retries')
+            delay = full_jitter_delay(attempt, self.base_delay, self.max_delay)
+            print(f"{label} failed ({error}); retrying in {delay:.1f}s (attempt {attempt} of {self.max_retries})")
+            self._sleep(delay)
+    
+    def _race(self, prompt, primary, hedge, delay, generate, processing_mode, cancel_event, options):
+        """
+        Run the primary, adding the hedge target if it is slower than ``delay``.
+        
+        Setting ``cancel_event`` stops both legs; the loser is also stopped
+        once the other leg has answered.
+        
+        Returns:
+            tuple: (response or None, errors raised, whether the hedge was started)
+        """
+        outcomes = queue.Queue()
+        cancels = {}
+        
+        def run(target):
+            try:
+                outcomes.put((target, self._call(
+                    prompt, target, generate, processing_mode, None, cancels[target['label']], options
+                ), None))
+            except ModelError as e:
+                outcomes.put((target, None, e))
+            except Exception as e:
+                outcomes.put((target, None, ModelError(f"Model Error: {e}", target['label'])))
+        
+        def start(target):
+            # A cancel flag lets the loser stop early (Ollama streams check it between tokens)
+            cancels[target['label']] = _HedgeCancel(cancel_event) if target['use_local'] else cancel_event
+            threading.Thread(target=run, args=(target,), daemon=True).start()
+        
+        start(primary)
+        pending = 1
+        hedged = False
+        try:
+            outcome = outcomes.get(timeout=delay)
+        except queue.Empty:
+            print(f"{primary['label']} is slower than usual ({delay:.1f}s); also asking {hedge['label']}")
+            self._count('hedges')
+            start(hedge)
+            pending += 1
+            hedged = True
+            outcome = outcomes.get()
+        
+        errors = []
+        while True:
+            pending -= 1
+            target, response, error = outcome
+            if error is None:
+                for label, cancel in cancels.items():
+                    if label != target['label'] and isinstance(cancel, _HedgeCancel):
+                        cancel.set()
+                if target is hedge:
+                    self._count('hedge_wins')
+                return response, errors, hedged
+            errors.append(error)
+            if not pending:
+                return None, errors, hedged
+            outcome = outcomes.get()
+    
+    def generate(self, prompt, targets, processing_mode="enhanced", on_token=None, cancel_event=None,
+                 generate=None, **options):
+        """
+        Send a prompt to the first target that answers successfully.
+        
+        Calls that show live output (``on_token``) are never hedged, and are
+        neither retried nor failed over once output has been shown. Calls
+        that only carry a ``cancel_event`` are hedged like any other; the
+        event stops both legs of the race.
+        
+        Args:
+            prompt (str): The complete prompt
+            targets (list): Targets from analysis_targets, primary first
+            processing_mode (str): Key of PROCESSING_MODES
+            on_token (callable): Receives Ollama output fragments as they stream in
+            cancel_event (threading.Event): Set to stop a streamed Ollama call early
+            generate (callable): Replacement for dispatch.generate_text
+            **options: Further generate_text keyword arguments (e.g. sections)
+        
+        Returns:
+            str: The model response
+        
+        Raises:
+            ModelError: Typed error of the most informative failure once every
+                target has failed
+        """
+        generate = generate or generate_text
+        streaming = on_token is not None
+        remaining = list(targets)
+        errors = []
+        
+        while remaining:
+            target = remaining.pop(0)
+            if errors:
+                self._count('failovers')
+                print(f"Falling back to {target['label']}...")
+            
+            hedge = remaining[0] if remaining and self.hedging and not streaming else None
+            delay = self.hedge_delay(target['label']) if hedge is not None else None
+            if delay is None:
+                try:
+                    return self._call(prompt, target, generate, processing_mode, on_token, cancel_event, options)
+                except ModelError as e:
+                    if e.output_shown:
+                        # A second answer would follow the partial one on screen
+                        raise
+                    errors.append(e)
+                    continue
+            
+            response, race_errors, hedged = self._race(
+                prompt, target, hedge, delay, generate, processing_mode, cancel_event, options
+            )
+            if response is not None:
+                return response
+            errors.extend(race_errors)
+            if hedged:
+                remaining.pop(0)
+        
+        # A paused circuit says less about the failure than the error that opened it
+        informative = [error for error in errors if not isinstance(error, CircuitOpenError)]
+        raise (informative or errors)[0]
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_resilient_dispatcher():
+    """Return the shared dispatcher, so circuit state and latency history span all analyses."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = ResilientDispatcher()
+        return _dispatcher
@@ -0,0 +1,154 @@
+"""
+Token budgeting for Style Transfer AI model requests.
+Sizes output length, context and timeout from the prompt before any network call.
+"""
+
+import math
+from ..utils.text_processing import estimate_tokens
+from ..config.settings import (
+    AVAILABLE_MODELS, DEFAULT_MODEL_LIMITS, PROCESSING_MODES, ANALYSIS_SECTIONS,
+    OUTPUT_TOKENS_PER_SECTION, MIN_OUTPUT_TOKENS, CLOUD_MAX_OUTPUT_TOKENS, CONTEXT_SAFETY_MARGIN,
+    OUTPUT_HEADROOM, MIN_OLLAMA_CONTEXT, REQUEST_TIMEOUT_FLOOR, REQUEST_TIMEOUT_CEILING, TIMEOUT_SAFETY_FACTOR
+)
+from .openai_client import OPENAI_MODEL
+from .gemini_client import GEMINI_MODEL
+
+
+def get_model_limits(backend, model_name=None):
+    """
+    Look up the context window and speed estimates for a model.
+    
+    Args:
+        backend (str): 'ollama', 'openai' or 'gemini'
+        model_name (str): Ollama model tag (ignored for cloud backends)
+    
+    Returns:
+        dict: 'context_window', 'prefill_tokens_per_second',
+            'decode_tokens_per_second' and 'load_seconds'
+    """
+    if backend == "openai":
+        model_name = OPENAI_MODEL
+    elif backend == "gemini":
+        model_name = GEMINI_MODEL
+    model_info = AVAILABLE_MODELS.get(model_name, {})
+    return {key: model_info.get(key, default) for key, default in DEFAULT_MODEL_LIMITS.items()}
+
+
+def _output_cap(backend, model_name, processing_mode):
+    """Largest output the mode allows for this backend."""
+    if backend != "ollama":
+        return CLOUD_MAX_OUTPUT_TOKENS
+    mode = PROCESSING_MODES.get(processing_mode, PROCESSING_MODES["enhanced"])
+    return mode["gpt_oss_tokens"] if "gpt-oss" in (model_name or "") else mode["gemma_tokens"]
+
+
+def _wanted_output_tokens(backend, model_name, processing_mode, sections):
+    return min(
+        _output_cap(backend, model_name, processing_mode),
+        max(MIN_OUTPUT_TOKENS, sections * OUTPUT_TOKENS_PER_SECTION)
+    )
+
+
+def sections_for_output(expected_tokens):
+    """
+    Number of sections (see plan_request) that leaves room for a text of known length.
+    
+    Generation and style transfer produce one text rather than the analysis
+    sections, so their output budget follows the length they are asked for,
+    with OUTPUT_HEADROOM on top.
+    
+    Args:
+        expected_tokens (float): Estimated tokens of the text to be written
+    
+    Returns:
+        int: Value for the ``sections`` argument of plan_request and generate_text
+    """
+    return max(1, math.ceil(expected_tokens * OUTPUT_HEADROOM / OUTPUT_TOKENS_PER_SECTION))
+
+
+def max_prompt_tokens(backend, model_name=None, processing_mode="enhanced", sections=ANALYSIS_SECTIONS):
+    """
+    Return the largest prompt that still leaves the full output budget free.
+    
+    Args:
+        backend (str): 'ollama', 'openai' or 'gemini'
+        model_name (str): Ollama model tag
+        processing_mode (str): Key of PROCESSING_MODES
+        sections (int): Number of sections the prompt asks for
+    
+    Returns:
+        int: Maximum estimated prompt tokens
+    """
+    context_window = get_model_limits(backend, model_name)['context_window']
+    wanted = _wanted_output_tokens(backend, model_name, processing_mode, sections)
+    return context_window - wanted - CONTEXT_SAFETY_MARGIN
+
+
+def plan_request(prompt, backend, model_name=None, processing_mode="enhanced", sections=ANALYSIS_SECTIONS):
+    """
+    Size a request's output budget, context and timeout from its prompt.
+    
+    The output budget covers the requested sections, never exceeds the
+    processing mode's cap and shrinks when the prompt leaves less room in
+    the context window. A request is marked as not fitting when less than
+    MIN_OUTPUT_TOKENS would remain for the answer. The timeout adds the
+    model's load allowance to the estimated processing time; Ollama
+    requests never get less than the processing mode's timeout.
+    
+    Args:
+        prompt (str): The complete prompt
+        backend (str): 'ollama', 'openai' or 'gemini'
+        model_name (str): Ollama model tag
+        processing_mode (str): Key of PROCESSING_MODES
+        sections (int): Number of sections the prompt asks for
+    
+    Returns:
+        dict: 'prompt_tokens', 'context_window', 'num_predict' (output
+            tokens), 'num_ctx' (context to request from Ollama), 'timeout'
+            (seconds) and 'fits' (bool)
+    """
+    limits = get_model_limits(backend, model_name)
+    context_window = limits['context_window']
+    prompt_tokens = estimate_tokens(prompt)
+    
+    available = context_window - prompt_tokens - CONTEXT_SAFETY_MARGIN
+    num_predict = min(_wanted_output_tokens(backend, model_name, processing_mode, sections), available)
+    fits = num_predict >= MIN_OUTPUT_TOKENS
+    num_predict = max(num_predict, 0)
+    
+    # Round the context up to a power of two so Ollama reloads the model rarely
+    needed_context = prompt_tokens + num_predict + CONTEXT_SAFETY_MARGIN
+    num_ctx = MIN_OLLAMA_CONTEXT
+    while num_ctx < needed_context:
+        num_ctx *= 2
+    num_ctx = min(num_ctx, context_window)
+    
+    processing_seconds = (prompt_tokens / limits['prefill_tokens_per_second']
+                          + num_predict / limits['decode_tokens_per_second'])
+    timeout_floor = REQUEST_TIMEOUT_FLOOR
+    if backend == "ollama":
+        # A cold or busy local model never gets less than the mode's fixed timeout
+        mode = PROCESSING_MODES.get(processing_mode, PROCESSING_MODES["enhanced"])
+        timeout_floor = max(timeout_floor, mode["timeout"])
+    timeout = min(
+        REQUEST_TIMEOUT_CEILING,
+        max(timeout_floor, processing_seconds * TIMEOUT_SAFETY_FACTOR + limits['load_seconds'])
+    )
+    
+    return {
+        'prompt_tokens': prompt_tokens,
+        'context_window': context_window,
+        'num_predict': num_predict,
+        'num_ctx': num_ctx,
+        'timeout': round(timeout, 1),
+        'fits': fits
+    }
+
+
+def describe_budget_error(budget, model_label):
+    """Error message for a request that cannot fit in the model's context."""
+    return (
+        f"Token Budget Error: Prompt is about {budget['prompt_tokens']} tokens but {model_label} has a "
+        f"{budget['context_window']}-token context window, leaving too little room for the response. "
+        "Use chunked analysis, a shorter input or a model with a larger context."
+    )
@@ -3,12 +3,16 @@ Local file storage module for Style Transfer AI.
 Handles saving and loading of analysis results to local files.
 """
 
+import fnmatch
 import json
 import os
+import sqlite3
+import time
 from datetime import datetime
-from ..config.settings import TIMESTAMP_FORMAT
+from ..config.settings import TIMESTAMP_FORMAT, PROFILE_DIRECTORIES, PROFILE_FILE_PATTERN
 from ..utils.formatters import format_human_readable_output, save_dual_format
 from ..utils.text_processing import sanitize_filename
+from .profile_catalog import get_profile_catalog
 
 
 def save_style_profile_locally(style_profile, base_filename="user_style_profile_enhanced"):
@@ -31,6 +35,12 @@ def save_style_profile_locally(style_profile, base_filename="user_style_profile_
         # Save using dual format utility
         json_filename, txt_filename = save_dual_format(style_profile, base_filename, user_name)
         
+        # A catalog failure must not lose the saved files; a rebuild picks them up later
+        try:
+            get_profile_catalog().add(json_filename, style_profile)
+        except (sqlite3.Error, OSError) as e:
+            print(f"Warning: Could not add the profile to the catalog: {e}")
+        
         return {
             'success': True,
             'json_file': json_filename,
@@ -45,15 +55,17 @@ def save_style_profile_locally(style_profile, base_filename="user_style_profile_
         }
 
 
-def cleanup_old_reports(patterns=None):
+def cleanup_old_reports(patterns=None, days_to_keep=None):
     """
     Clean up old analysis reports based on filename patterns.
     
     Args:
         patterns (list): List of filename patterns to match for deletion
+        days_to_keep (int): Only delete catalogued profiles (and their TXT
+            reports) older than this many days; patterns are ignored
         
     Returns:
-        dict: Cleanup result with count of deleted files
+        dict: Cleanup result with count and list of deleted files
     """
     if patterns is None:
         patterns = [
@@ -63,28 +75,42 @@ def cleanup_old_reports(patterns=None):
             "user_style_profile_enhanced_*.txt"
         ]
     
-    deleted_count = 0
+    deleted_files = []
     try:
-        import glob
-        
-        # Check both main directory and stylometry fingerprints directory
-        directories_to_check = [".", "stylometry fingerprints"]
-        
-        for directory in directories_to_check:
-            for pattern in patterns:
-                search_pattern = pattern if directory == "." else os.path.join(directory, pattern)
-                files = glob.glob(search_pattern)
-                for file in files:
-                    try:
-                        os.remove(file)
-                        deleted_count += 1
-                    except Exception as e:
-                        print(f"Warning: Could not delete {file}: {e}")
+        catalog = get_profile_catalog()
+        if days_to_keep is not None:
+            cutoff = time.time() - days_to_keep * 24 * 60 * 60
+            profiles = catalog.list(older_than=cutoff)
+            files = [
+                path for profile in profiles
+                for path in (profile['filename'], os.path.splitext(profile['filename'])[0] + ".txt")
+            ]
+        else:
+            import glob
+            
+            # Check both main directory and stylometry fingerprints directory
+            files = [
+                file
+                for directory in PROFILE_DIRECTORIES
+                for pattern in patterns
+                for file in glob.glob(pattern if directory == "." else os.path.join(directory, pattern))
+            ]
+        
+        for file in files:
+            if not os.path.exists(file):
+                continue
+            try:
+                os.remove(file)
+                deleted_files.append(file)
+            except Exception as e:
+                print(f"Warning: Could not delete {file}: {e}")
+        catalog.remove([file for file in deleted_files if file.endswith(".json")])
         
         return {
             'success': True,
-            'deleted_count': deleted_count,
-            'message': f"Cleaned up {deleted_count} old report files"
+            'deleted_count': len(deleted_files),
+            'deleted_files': deleted_files,
+            'message': f"Cleaned up {len(deleted_files)} old report files"
         }
         
     except Exception as e:
@@ -94,29 +120,41 @@ def cleanup_old_reports(patterns=None):
         }
 
 
-def list_local_profiles(pattern="*_stylometric_profile_*.json"):
+def list_local_profiles(pattern=PROFILE_FILE_PATTERN, sort_by="mtime", descending=True, **filters):
     """
-    List existing local profile files.
+    List existing local profile files from the profile catalog.
+    
+    Falls back to scanning the profile directories if the catalog cannot
+    be read.
     
     Args:
-        pattern (str): Glob pattern to match profile files
+        pattern (str): Glob pattern to match profile file names
+        sort_by (str): Catalog column to sort on (see CATALOG_COLUMNS)
+        descending (bool): Newest / largest first
+        **filters: Exact matches such as user_name or model_used
         
     Returns:
-        list: List of found profile files with metadata
+        list: Found profiles with 'filename', 'size', 'modified' and the
+            other catalog columns
     """
+    try:
+        profiles = get_profile_catalog().list(sort_by=sort_by, descending=descending, **filters)
+        if pattern != PROFILE_FILE_PATTERN:
+            profiles = [p for p in profiles if fnmatch.fnmatch(os.path.basename(p['filename']), pattern)]
+        return profiles
+    except (sqlite3.Error, OSError):
+        return _scan_local_profiles(pattern)
+
+
+def _scan_local_profiles(pattern):
+    """List profile files by scanning the profile directories (no catalog)."""
     try:
         import glob
         
-        # Look for profiles in both the main directory and the stylometry fingerprints directory
-        patterns_to_check = [
-            pattern,  # Main directory
-            os.path.join("stylometry fingerprints", pattern)  # Stylometry fingerprints directory
-        ]
-        
         profiles = []
         
-        for search_pattern in patterns_to_check:
-            files = glob.glob(search_pattern)
+        for directory in PROFILE_DIRECTORIES:
+            files = glob.glob(pattern if directory == "." else os.path.join(directory, pattern))
             for file in files:
                 try:
                     stat = os.stat(file)
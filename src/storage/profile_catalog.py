@@ -0,0 +1,267 @@
+"""
+SQLite catalog of saved style profiles.
+Indexes each profile's writer, date, model, mode, sample and word counts and
+key metrics, so profiles can be listed, filtered and sorted without opening
+every JSON file.
+"""
+
+import glob
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+from ..config.settings import PROFILE_CATALOG_PATH, PROFILE_DIRECTORIES, PROFILE_FILE_PATTERN
+
+# Columns of the profiles table, in order, with their SQLite types
+CATALOG_COLUMNS = {
+    'filename': "TEXT PRIMARY KEY",
+    'user_name': "TEXT",
+    'analysis_date': "TEXT",
+    'modified': "TEXT",
+    'mtime': "REAL",
+    'size': "INTEGER",
+    'model_used': "TEXT",
+    'analysis_method': "TEXT",
+    'processing_mode': "TEXT",
+    'total_samples': "INTEGER",
+    'word_count': "INTEGER",
+    'combined_text_length': "INTEGER",
+    'avg_words_per_sentence': "REAL",
+    'lexical_diversity': "REAL",
+    'flesch_reading_ease': "REAL",
+    'flesch_kincaid_grade': "REAL"
+}
+
+# Columns profiles can be filtered on with an exact match
+FILTER_COLUMNS = ('user_name', 'model_used', 'processing_mode', 'analysis_method')
+
+
+def _user_name_from_filename(filename):
+    name = os.path.basename(filename)
+    return name.split('_stylometric_profile_')[0] if '_stylometric_profile_' in name else "Unknown"
+
+
+def catalog_entry(filename, style_profile, stat=None):
+    """
+    Build the catalog row for a saved profile.
+    
+    Args:
+        filename (str): Path of the profile's JSON file
+        style_profile (dict): The profile as saved
+        stat (os.stat_result): The file's stat (read from disk if omitted)
+    
+    Returns:
+        dict: Values for CATALOG_COLUMNS
+    """
+    stat = stat or os.stat(filename)
+    metadata = style_profile.get('metadata', {})
+    statistics = style_profile.get('text_statistics') or {}
+    readability = style_profile.get('readability_metrics') or {}
+    word_count = statistics.get('word_count')
+    if word_count is None and metadata.get('file_info'):
+        word_count = sum(info.get('word_count', 0) for info in metadata['file_info'])
+    
+    return {
+        'filename': os.path.normpath(filename),
+        'user_name': style_profile.get('user_profile', {}).get('name') or _user_name_from_filename(filename),
+        'analysis_date': metadata.get('analysis_date'),
+        'modified': datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+        'mtime': stat.st_mtime,
+        'size': stat.st_size,
+        'model_used': metadata.get('model_used'),
+        'analysis_method': metadata.get('analysis_method'),
+        'processing_mode': metadata.get('processing_mode'),
+        'total_samples': metadata.get('total_samples'),
+        'word_count': word_count,
+        'combined_text_length': metadata.get('combined_text_length'),
+        'avg_words_per_sentence': statistics.get('avg_words_per_sentence'),
+        'lexical_diversity': statistics.get('lexical_diversity'),
+        'flesch_reading_ease': readability.get('flesch_reading_ease'),
+        'flesch_kincaid_grade': readability.get('flesch_kincaid_grade')
+    }
+
+
+class ProfileCatalog:
+    """
+    Index of saved profiles in one SQLite file.
+    
+    Rows are written when a profile is saved (see save_style_profile_locally)
+    and by rebuild(), which rescans the profile directories and only reads
+    files whose size or modification time changed.
+    """
+    
+    def __init__(self, path=PROFILE_CATALOG_PATH, directories=None, pattern=PROFILE_FILE_PATTERN):
+        self.path = path
+        self.directories = list(PROFILE_DIRECTORIES if directories is None else directories)
+        self.pattern = pattern
+        self._lock = threading.Lock()
+    
+    def _connect(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=10)
+        connection.row_factory = sqlite3.Row
+        columns = ", ".join(f"{name} {kind}" for name, kind in CATALOG_COLUMNS.items())
+        connection.execute(f"CREATE TABLE IF NOT EXISTS profiles ({columns})")
+        connection.execute("CREATE INDEX IF NOT EXISTS profiles_user ON profiles (user_name, mtime)")
+        connection.execute("CREATE INDEX IF NOT EXISTS profiles_mtime ON profiles (mtime)")
+        return connection
+    
+    def exists(self):
+        """Return True once the catalog file has been created."""
+        return os.path.exists(self.path)
+    
+    def add(self, filename, style_profile):
+        """
+        Index (or re-index) a saved profile.
+        
+        Args:
+            filename (str): Path of the profile's JSON file
+            style_profile (dict): The profile as saved
+        """
+        self._upsert([catalog_entry(filename, style_profile)])
+    
+    def _upsert(self, entries):
+        if not entries:
+            return
+        names = list(CATALOG_COLUMNS)
+        statement = (
+            f"INSERT OR REPLACE INTO profiles ({', '.join(names)}) "
+            f"VALUES ({', '.join('?' for _ in names)})"
+        )
+        with self._lock, closing(self._connect()) as connection, connection:
+            connection.executemany(statement, [[entry[name] for name in names] for entry in entries])
+    
+    def remove(self, filenames):
+        """
+        Drop profiles from the catalog (the files are not touched).
+        
+        Args:
+            filenames (list): Paths of profile JSON files
+        """
+        with self._lock, closing(self._connect()) as connection, connection:
+            connection.executemany(
+                "DELETE FROM profiles WHERE filename = ?", [(os.path.normpath(name),) for name in filenames]
+            )
+    
+    def list(self, sort_by="mtime", descending=True, limit=None, older_than=None, **filters):
+        """
+        List catalogued profiles.
+        
+        Args:
+            sort_by (str): Column of CATALOG_COLUMNS to sort on
+            descending (bool): Newest / largest first
+            limit (int): Maximum rows to return
+            older_than (float): Only profiles modified before this timestamp
+            **filters: Exact matches on FILTER_COLUMNS, e.g. user_name="Jane"
+        
+        Returns:
+            list: One dict per profile with the CATALOG_COLUMNS keys
+        
+        Raises:
+            ValueError: For an unknown sort or filter column
+        """
+        if sort_by not in CATALOG_COLUMNS:
+            raise ValueError(f"Unknown sort column: {sort_by}")
+        unknown = [name for name in filters if name not in FILTER_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown filter column(s): {', '.join(unknown)}")
+        
+        conditions = [f"{name} = ?" for name, value in filters.items() if value is not None]
+        values = [value for value in filters.values() if value is not None]
+        if older_than is not None:
+            conditions.append("mtime < ?")
+            values.append(older_than)
+        query = "SELECT * FROM profiles"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY {sort_by} {'DESC' if descending else 'ASC'}, filename"
+        if limit is not None:
+            query += " LIMIT ?"
+            values.append(int(limit))
+        
+        with self._lock, closing(self._connect()) as connection:
+            return [dict(row) for row in connection.execute(query, values)]
+    
+    def count(self):
+        """Return the number of catalogued profiles."""
+        with self._lock, closing(self._connect()) as connection:
+            return connection.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+    
+    def rebuild(self, full=False):
+        """
+        Rescan the profile directories and bring the catalog up to date.
+        
+        Files whose size and modification time match their row are skipped
+        unless ``full`` is set; rows of deleted files are removed.
+        
+        Args:
+            full (bool): Re-read every profile file
+        
+        Returns:
+            dict: Counts of 'indexed', 'unchanged', 'removed' and 'failed'
+                files, and 'errors' (filename and message per failed file)
+        """
+        with self._lock, closing(self._connect()) as connection:
+            known = {
+                row['filename']: (row['size'], row['mtime'])
+                for row in connection.execute("SELECT filename, size, mtime FROM profiles")
+            }
+        
+        found = set()
+        entries = []
+        unchanged = 0
+        errors = []
+        for directory in self.directories:
+            for filename in glob.glob(os.path.join(directory, self.pattern)):
+                filename = os.path.normpath(filename)
+                if filename in found:
+                    continue
+                found.add(filename)
+                try:
+                    stat = os.stat(filename)
+                    if not full and known.get(filename) == (stat.st_size, stat.st_mtime):
+                        unchanged += 1
+                        continue
+                    with open(filename, 'r', encoding='utf-8') as f:
+                        entries.append(catalog_entry(filename, json.load(f), stat))
+                except (OSError, ValueError, AttributeError) as e:
+                    errors.append({'filename': filename, 'error': str(e)})
+        
+        removed = [filename for filename in known if filename not in found]
+        self._upsert(entries)
+        self.remove(removed)
+        return {
+            'indexed': len(entries),
+            'unchanged': unchanged,
+            'removed': len(removed),
+            'failed': len(errors),
+            'errors': errors
+        }
+
+
+_default_catalog = None
+_default_catalog_lock = threading.Lock()
+
+
+def get_profile_catalog():
+    """
+    Return the shared profile catalog.
+    
+    The catalog is built from the profile directories the first time it is
+    used, so profiles saved before it existed are listed too.
+    
+    Returns:
+        ProfileCatalog: The catalog at PROFILE_CATALOG_PATH
+    """
+    global _default_catalog
+    with _default_catalog_lock:
+        if _default_catalog is None:
+            catalog = ProfileCatalog()
+            if not catalog.exists():
+                catalog.rebuild()
+            _default_catalog = catalog
+        return _default_catalog
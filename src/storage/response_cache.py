@@ -0,0 +1,220 @@
+"""
+Content-addressed disk cache for model responses.
+Stores one JSON file per response, keyed by a hash of the request.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from ..config.settings import (
+    RESPONSE_CACHE_ENABLED, RESPONSE_CACHE_DIR, RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL_SECONDS
+)
+
+
+def make_cache_key(backend, model, prompt, options=None):
+    """
+    Build the cache key for a model request.
+
+    Args:
+        backend (str): 'ollama', 'openai' or 'gemini'
+        model (str): Model name
+        prompt (str): The complete prompt
+        options (dict): Generation options that affect the output
+
+    Returns:
+        str: Hex SHA-256 digest identifying the request
+    """
+    request = json.dumps(
+        {'backend': backend, 'model': model, 'prompt': prompt, 'options': options or {}},
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(request.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Size-bounded, expiring cache of model responses on local disk.
+
+    Entries live in ``<cache_dir>/<key[:2]>/<key>.json``. A file's
+    modification time records its last use, so eviction removes the least
+    recently used entries once the total size exceeds ``max_bytes``.
+    Entries older than ``ttl_seconds`` (measured from creation) are misses.
+
+    The total size is counted once when the cache is opened and kept up to
+    date on every write and removal, so the directory is only scanned again
+    when the cache goes over budget.
+    """
+
+    def __init__(self, cache_dir=RESPONSE_CACHE_DIR, max_bytes=RESPONSE_CACHE_MAX_BYTES,
+                 ttl_seconds=RESPONSE_CACHE_TTL_SECONDS):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._total_bytes = sum(size for _, size, _ in self._iter_entries())
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _iter_entries(self):
+        """Yield (path, size, last_used) for every entry file."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith('.json'):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    yield entry.path, stat.st_size, stat.st_mtime
+
+    def _is_expired(self, record):
+        return self.ttl_seconds is not None and time.time() - record.get('created', 0) > self.ttl_seconds
+
+    def get(self, key):
+        """
+        Look up a cached response.
+
+        Args:
+            key (str): Key from make_cache_key
+
+        Returns:
+            str: The cached response, or None on a miss
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if self._is_expired(record):
+            with self._lock:
+                self._total_bytes -= self._remove(path)
+            return None
+
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        return record.get('response')
+
+    def put(self, key, response, metadata=None):
+        """
+        Store a response and evict old entries if the cache is over budget.
+
+        Args:
+            key (str): Key from make_cache_key
+            response (str): Model response text
+            metadata (dict): Extra fields stored alongside the response
+        """
+        record = dict(metadata or {})
+        record.update({'key': key, 'created': time.time(), 'response': response})
+        path = self._entry_path(key)
+
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first so readers never see a partial entry
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(record, f, ensure_ascii=False)
+                written_bytes = os.path.getsize(temp_path)
+                replaced_bytes = os.path.getsize(path) if os.path.exists(path) else 0
+                os.replace(temp_path, path)
+            except Exception:
+                self._remove(temp_path)
+                raise
+            self._total_bytes += written_bytes - replaced_bytes
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        # Rescan rather than trust the running total: other processes may share the directory
+        entries = list(self._iter_entries())
+        total_bytes = sum(size for _, size, _ in entries)
+        if total_bytes > self.max_bytes:
+            for path, _, _ in sorted(entries, key=lambda entry: entry[2]):
+                if total_bytes <= self.max_bytes:
+                    break
+                total_bytes -= self._remove(path)
+        self._total_bytes = total_bytes
+
+    def _remove(self, path):
+        """Delete a file and return its size, or 0 if it could not be removed."""
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return 0
+        return size
+
+    def info(self):
+        """
+        Summarize the cache contents.
+
+        Returns:
+            dict: Directory, entry count, total and maximum bytes, TTL, and
+                the oldest and newest last-use times (None when empty)
+        """
+        entries = list(self._iter_entries())
+        last_used = [mtime for _, _, mtime in entries]
+        return {
+            'cache_dir': os.path.abspath(self.cache_dir),
+            'entries': len(entries),
+            'total_bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+            'ttl_seconds': self.ttl_seconds,
+            'oldest_use': min(last_used) if last_used else None,
+            'newest_use': max(last_used) if last_used else None
+        }
+
+    def purge(self, expired_only=False):
+        """
+        Delete cache entries.
+
+        Args:
+            expired_only (bool): Only delete entries past their TTL
+
+        Returns:
+            int: Number of entries deleted
+        """
+        deleted_count = 0
+        with self._lock:
+            for path, _, _ in list(self._iter_entries()):
+                if expired_only:
+                    try:
+                        with open(path, 'r', encoding='utf-8') as f:
+                            expired = self._is_expired(json.load(f))
+                    except (OSError, ValueError):
+                        expired = True
+                    if not expired:
+                        continue
+                self._total_bytes -= self._remove(path)
+                deleted_count += 1
+        return deleted_count
+
+
+_default_cache = None
+
+
+def get_response_cache():
+    """
+    Return the shared response cache, or None when caching is disabled.
+
+    Returns:
+        ResponseCache: Cache configured from settings
+    """
+    global _default_cache
+    if not RESPONSE_CACHE_ENABLED:
+        return None
+    if _default_cache is None:
+        _default_cache = ResponseCache()
+    return _default_cache
@@ -4,6 +4,7 @@ Handles JSON and human-readable text report generation.
 """
 
 import json
+import os
 from datetime import datetime
 from ..config.settings import TIMESTAMP_FORMAT
 
@@ -150,6 +151,23 @@ def format_human_readable_output(style_profile):
                 output_lines.append(line)
         output_lines.append("")
     
+    # Structured style fields
+    if style_profile.get('style_fields'):
+        fields = style_profile['style_fields']
+        output_lines.append("STYLE FIELDS")
+        output_lines.append("-" * 40)
+        output_lines.append(f"Tone: {fields['tone']['overall_tone']} ({fields['tone']['emotional_range']}, {fields['tone']['certainty']})")
+        output_lines.append(f"Vocabulary: {fields['vocabulary']['formality_level']} formality, {fields['vocabulary']['complexity']} complexity")
+        if fields['vocabulary']['preferred_domains']:
+            output_lines.append(f"Preferred Domains: {', '.join(fields['vocabulary']['preferred_domains'])}")
+        output_lines.append(f"Paragraphs: {fields['structure']['paragraph_style']}")
+        output_lines.append(f"Organization: {fields['structure']['organization']}")
+        output_lines.append(f"Transitions: {fields['structure']['transition_style']}")
+        output_lines.append(f"Voice: {fields['voice']['person']} person, {fields['voice']['active_voice_share']:.0%} active")
+        if fields['signature_phrases']:
+            output_lines.append(f"Signature Phrases: {', '.join(fields['signature_phrases'])}")
+        output_lines.append("")
+    
     # Recommendations
     output_lines.append("STYLE PROFILE INSIGHTS")
     output_lines.append("-" * 40)
@@ -203,4 +221,121 @@ def save_dual_format(style_profile, base_filename, user_name="Anonymous_User"):
     with open(txt_filename, 'w', encoding='utf-8') as f:
         f.write(human_readable_content)
     
-    return json_filename, txt_filename
\ No newline at end of file
+    return json_filename, txt_filename
+
+def format_cache_info(info):
+    """
+    Format response cache statistics for display.
+    
+    Args:
+        info (dict): Result of ResponseCache.info()
+        
+    Returns:
+        str: Multi-line summary
+    """
+    def format_time(timestamp):
+        return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S") if timestamp else "N/A"
+    
+    ttl = info['ttl_seconds']
+    lines = [
+        f"Cache directory: {info['cache_dir']}",
+        f"Entries: {info['entries']}",
+        f"Size: {info['total_bytes'] / (1024 * 1024):.2f} MB of {info['max_bytes'] / (1024 * 1024):.0f} MB",
+        f"Expiry: {ttl / 86400:g} days" if ttl is not None else "Expiry: never",
+        f"Least recently used: {format_time(info['oldest_use'])}",
+        f"Most recently used: {format_time(info['newest_use'])}"
+    ]
+    return '\n'.join(lines)
+
+
+def format_profile_list(profiles):
+    """
+    Format catalogued profiles as a numbered table for display.
+    
+    Args:
+        profiles (list): Rows from ProfileCatalog.list() or list_local_profiles()
+        
+    Returns:
+        str: One line per profile
+    """
+    lines = []
+    for index, profile in enumerate(profiles, 1):
+        words = profile.get('word_count')
+        flesch = profile.get('flesch_reading_ease')
+        details = [
+            profile.get('user_name') or "Unknown",
+            profile['modified'],
+            profile.get('model_used') or "unknown model",
+            f"{profile.get('total_samples') or 0} sample(s)",
+            f"{words} words" if words is not None else "words n/a",
+            f"Flesch {flesch:.1f}" if flesch is not None else "Flesch n/a"
+        ]
+        lines.append(f"{index:2d}. {os.path.basename(profile['filename'])} | {' | '.join(details)}")
+    return '\n'.join(lines)
+
+
+def format_batch_summary(summary):
+    """
+    Format the outcome of a batch run or status check for display.
+    
+    Args:
+        summary (dict): Result of run_batch() or batch_status()
+        
+    Returns:
+        str: Multi-line summary
+    """
+    lines = [f"Jobs: {summary['total']}", f"Completed: {summary['completed']}", f"Failed: {summary['failed']}"]
+    if 'skipped' in summary:
+        lines.append(f"Already recorded: {summary['skipped']}")
+    lines.append(f"Pending: {summary['pending']}")
+    for job_id, error in summary.get('failed_jobs', {}).items():
+        lines.append(f"  ✗ {job_id}: {error}")
+    lines.append(f"Results: {summary['checkpoint']}")
+    if summary.get('interrupted'):
+        lines.append("Run stopped early; run the same command again to resume.")
+    return '\n'.join(lines)
+
+
+def format_call_timing(summary, warm_ups=None):
+    """
+    Format model load versus inference time for display.
+    
+    Args:
+        summary (dict): Result of lifecycle.summarize_call_timing()
+        warm_ups (dict): Background warm-up results keyed by model
+        
+    Returns:
+        str: One line per model
+    """
+    lines = []
+    for model_name, totals in summary.items():
+        line = (
+            f"{model_name}: {totals['calls']} call(s), {totals['cold_starts']} cold start(s), "
+            f"load {totals['load_seconds']:.1f}s, inference {totals['inference_seconds']:.1f}s"
+        )
+        warm_up = (warm_ups or {}).get(model_name)
+        if warm_up and warm_up['success']:
+            line += f", background warm-up load {warm_up['load_seconds']:.1f}s"
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def format_host_stats(stats):
+    """
+    Format Ollama host pool statistics for display.
+    
+    Args:
+        stats (list): Result of ollama_client.get_host_stats()
+        
+    Returns:
+        str: One line per host
+    """
+    lines = []
+    for host in stats:
+        latency = f"{host['average_latency']:.1f}s avg" if host['average_latency'] is not None else "no calls yet"
+        lines.append(
+            f"{host['url']}: {'healthy' if host['healthy'] else 'unavailable'}, "
+            f"queue {host['queue_depth']}, {host['requests']} request(s), "
+            f"{host['failures']} failure(s), {latency}"
+        )
+    return '\n'.join(lines)
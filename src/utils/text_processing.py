@@ -3,37 +3,163 @@ Text processing utilities for Style Transfer AI.
 Handles file reading, text sanitization, and basic text operations.
 """
 
+import codecs
 import re
-from ..config.settings import SUPPORTED_ENCODINGS, MAX_FILENAME_LENGTH
+from collections import Counter
+from functools import lru_cache
+from ..config.settings import (
+    SUPPORTED_ENCODINGS, MAX_FILENAME_LENGTH, STREAM_CHUNK_SIZE, ENCODING_DETECTION_BYTES,
+    SYLLABLE_CACHE_SIZE, CHARS_PER_TOKEN
+)
+
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+_VOWEL_GROUP_RE = re.compile(r'[aeiouy]+')
+
+# A blank line whose preceding non-whitespace character ends a sentence. Splitting
+# a stream right after such a boundary leaves word, sentence and paragraph counts
+# exactly as they would be for the unsplit text.
+_SAFE_CHUNK_BOUNDARY_RE = re.compile(r'[.!?]\s*\n\n')
+
+_PARAGRAPH_SPLIT_RE = re.compile(r'\n\s*\n')
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+def _normalize_newlines(text):
+    """Translate CRLF and CR line endings to LF, as text-mode file reads do."""
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def detect_encoding(prefix):
+    """
+    Pick the first supported encoding that can decode a byte prefix.
+    
+    A multi-byte character cut off at the end of the prefix is not treated
+    as a decoding failure.
+    
+    Args:
+        prefix (bytes): Leading bytes of a file
+        
+    Returns:
+        str | None: Encoding name, or None if no supported encoding fits
+    """
+    for encoding in SUPPORTED_ENCODINGS:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(prefix, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return None
 
 
 def read_text_file(file_path):
     """
     Reads text content from a file with encoding fallback.
     
+    The file is read from disk once; encoding fallback happens in memory.
+    
     Args:
         file_path (str): Path to the text file
         
     Returns:
         str: File content or error message
     """
+    try:
+        with open(file_path, 'rb') as file:
+            raw = file.read()
+    except FileNotFoundError:
+        return f"Error: File '{file_path}' not found"
+    except Exception as e:
+        return f"Error: Cannot read file '{file_path}' - {e}"
+    
     for encoding in SUPPORTED_ENCODINGS:
         try:
-            with open(file_path, 'r', encoding=encoding) as file:
-                content = file.read()
-                if len(content.strip()) == 0:
-                    return f"Error: File '{file_path}' is empty"
-                return content
+            content = _normalize_newlines(raw.decode(encoding))
         except UnicodeDecodeError:
             continue
-        except FileNotFoundError:
-            return f"Error: File '{file_path}' not found"
-        except Exception as e:
-            return f"Error: Cannot read file '{file_path}' - {e}"
+        if len(content.strip()) == 0:
+            return f"Error: File '{file_path}' is empty"
+        return content
     
     return f"Error: Cannot read file '{file_path}' with any supported encoding"
 
 
+def _find_chunk_split(buffer, force):
+    """
+    Find where to cut a streaming buffer so no sentence or paragraph is split.
+    
+    Args:
+        buffer (str): Decoded text waiting to be emitted
+        force (bool): Fall back to weaker boundaries if no safe one exists
+        
+    Returns:
+        int: Cut position, or 0 if the buffer should keep growing
+    """
+    split_at = 0
+    for match in _SAFE_CHUNK_BOUNDARY_RE.finditer(buffer):
+        split_at = match.end()
+    if split_at or not force:
+        return split_at
+    
+    # Pathological input without sentence-ending paragraphs: prefer any blank
+    # line, then any whitespace, so memory stays bounded
+    paragraph_break = buffer.rfind('\n\n')
+    if paragraph_break != -1:
+        return paragraph_break + 2
+    whitespace = max(buffer.rfind(' '), buffer.rfind('\n'), buffer.rfind('\t'))
+    return whitespace + 1 if whitespace != -1 else len(buffer)
+
+
+def iter_text_chunks(file_path, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Stream a text file as decoded chunks split on paragraph boundaries.
+    
+    The encoding is detected once from a prefix of the file and every byte is
+    read exactly once. Bytes past the prefix that the encoding cannot decode
+    become U+FFFD, so one encoding covers the whole file. Chunks end on a
+    blank line that follows a complete sentence, so per-chunk statistics add
+    up to the statistics of the whole file while memory use stays
+    proportional to ``chunk_size``.
+    
+    Args:
+        file_path (str): Path to the text file
+        chunk_size (int): Number of bytes to read per step
+        
+    Yields:
+        str: Consecutive pieces of the file content
+        
+    Raises:
+        OSError: If the file cannot be opened or read
+        UnicodeDecodeError: If no supported encoding can decode the prefix
+    """
+    with open(file_path, 'rb') as file:
+        raw = file.read(max(chunk_size, ENCODING_DETECTION_BYTES))
+        encoding = detect_encoding(raw)
+        if encoding is None:
+            raise UnicodeDecodeError(
+                SUPPORTED_ENCODINGS[-1], raw[:1], 0, 1,
+                f"Cannot read file '{file_path}' with any supported encoding"
+            )
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        buffer = ""
+        
+        while raw:
+            buffer += decoder.decode(raw)
+            # Hold back a trailing \r in case the matching \n arrives next
+            held = '\r' if buffer.endswith('\r') else ''
+            buffer = _normalize_newlines(buffer[:-1] if held else buffer)
+            
+            split_at = _find_chunk_split(buffer, force=len(buffer) >= 4 * chunk_size)
+            if split_at:
+                yield buffer[:split_at]
+                buffer = buffer[split_at:]
+            buffer += held
+            raw = file.read(chunk_size)
+        
+        buffer = _normalize_newlines(buffer + decoder.decode(b'', final=True))
+        if buffer:
+            yield buffer
+
+
 def sanitize_filename(name):
     """
     Sanitize a name for use in filenames by removing or replacing invalid characters.
@@ -106,29 +232,227 @@ def sanitize_topic_for_filename(topic):
     return sanitized.lower()
 
 
+@lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
 def count_syllables(word):
-    """Count syllables in a word using vowel patterns."""
-    word = word.lower()
-    vowels = "aeiouy"
-    syllable_count = 0
-    previous_was_vowel = False
+    """
+    Count syllables in a word using vowel patterns.
     
-    for char in word:
-        is_vowel = char in vowels
-        if is_vowel and not previous_was_vowel:
-            syllable_count += 1
-        previous_was_vowel = is_vowel
+    Each run of consecutive vowels counts as one syllable, and a trailing
+    silent 'e' is dropped when the word has more than one. Results are kept
+    in a bounded LRU cache, so repeated word forms are only counted once.
+    
+    Args:
+        word (str): The word to count
+        
+    Returns:
+        int: Estimated syllable count, at least 1
+    """
+    word = word.lower()
+    syllable_count = len(_VOWEL_GROUP_RE.findall(word))
     
     # Handle silent e
-    if word.endswith('e') and syllable_count > 1:
+    if syllable_count > 1 and word.endswith('e'):
         syllable_count -= 1
     
     return max(1, syllable_count)
 
 
+def count_syllables_batch(words):
+    """
+    Count syllables for a whole vocabulary at once.
+    
+    Word forms are interned first, so each distinct form is counted once no
+    matter how often it appears in ``words``.
+    
+    Args:
+        words (iterable): Words or tokens, repeats allowed
+        
+    Returns:
+        dict: Syllable count for each distinct word form
+    """
+    return {word: count_syllables(word) for word in set(words)}
+
+
+def total_syllables(words):
+    """
+    Sum syllables over a token sequence in time proportional to its vocabulary.
+    
+    Args:
+        words (iterable): Words or tokens, repeats allowed
+        
+    Returns:
+        int: Total syllable count across all tokens
+    """
+    frequencies = Counter(words)
+    return sum(count_syllables(word) * frequency for word, frequency in frequencies.items())
+
+
+def estimate_tokens(text):
+    """
+    Estimate how many model tokens a text occupies.
+    
+    Uses the common heuristic of CHARS_PER_TOKEN characters per token, which
+    is close enough for English prose to size prompts without a tokenizer.
+    
+    Args:
+        text (str): Text to measure
+        
+    Returns:
+        int: Estimated token count
+    """
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _split_oversized(paragraph, max_tokens):
+    """Break a paragraph larger than the budget on sentence, then word, boundaries."""
+    pieces = []
+    current = []
+    current_tokens = 0
+    
+    for sentence in _SENTENCE_END_RE.split(paragraph):
+        units = [sentence] if estimate_tokens(sentence) <= max_tokens else sentence.split()
+        for unit in units:
+            unit_tokens = estimate_tokens(unit) + 1
+            if current and current_tokens + unit_tokens > max_tokens:
+                pieces.append(" ".join(current))
+                current = []
+                current_tokens = 0
+            current.append(unit)
+            current_tokens += unit_tokens
+    
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def split_text_for_budget(text, max_tokens):
+    """
+    Split text into chunks that each fit within a token budget.
+    
+    Chunks are built from whole paragraphs wherever possible. A paragraph
+    that is too large on its own is broken on sentence boundaries, and a
+    single overlong sentence on word boundaries.
+    
+    Args:
+        text (str): Text to split
+        max_tokens (int): Maximum estimated tokens per chunk
+        
+    Returns:
+        list: Chunk strings, in text order (one chunk if the text already fits)
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+    
+    chunks = []
+    current = []
+    current_tokens = 0
+    
+    for paragraph in _PARAGRAPH_SPLIT_RE.split(_normalize_newlines(text)):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        
+        paragraph_tokens = estimate_tokens(paragraph)
+        pieces = [paragraph] if paragraph_tokens <= max_tokens else _split_oversized(paragraph, max_tokens)
+        
+        for piece in pieces:
+            piece_tokens = estimate_tokens(piece) + 1  # Paragraph separator
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append("\n\n".join(current))
+                current = []
+                current_tokens = 0
+            current.append(piece)
+            current_tokens += piece_tokens
+    
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+class TextFeatures:
+    """
+    Token, sentence and paragraph features of a text, extracted once.
+    
+    Metric functions accept either raw text or a TextFeatures instance, so a
+    caller that needs several metrics for the same text can split it a
+    single time and share the result instead of re-tokenizing per metric.
+    
+    Attributes:
+        text (str): The original text
+        tokens (list): Whitespace-delimited words
+        sentences (list): Non-empty sentences split on terminal punctuation
+        paragraphs (list): Non-empty paragraphs split on blank lines
+        character_count (int): Number of characters in the text
+        letter_count (int): Total characters across all tokens
+    """
+    
+    __slots__ = ('text', 'tokens', 'sentences', 'paragraphs',
+                 'character_count', 'letter_count', '_syllable_count')
+    
+    def __init__(self, text):
+        text = text or ""
+        self.text = text
+        self.tokens = text.split()
+        self.sentences = [s.strip() for s in _SENTENCE_SPLIT_RE.split(text) if s.strip()]
+        self.paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
+        self.character_count = len(text)
+        self.letter_count = sum(map(len, self.tokens))
+        self._syllable_count = None
+    
+    @property
+    def word_count(self):
+        """Number of whitespace-delimited words."""
+        return len(self.tokens)
+    
+    @property
+    def sentence_count(self):
+        """Number of non-empty sentences."""
+        return len(self.sentences)
+    
+    @property
+    def paragraph_count(self):
+        """Number of non-empty paragraphs."""
+        return len(self.paragraphs)
+    
+    @property
+    def syllable_count(self):
+        """Total syllables across all tokens, computed on first access."""
+        if self._syllable_count is None:
+            self._syllable_count = total_syllables(self.tokens)
+        return self._syllable_count
+    
+    def is_empty(self):
+        """Return True when the text has no non-whitespace content."""
+        return not self.tokens
+
+
+def as_text_features(text_or_features):
+    """
+    Return a TextFeatures instance for raw text, or pass one through unchanged.
+    
+    Args:
+        text_or_features (str | TextFeatures): Raw text or pre-extracted features
+        
+    Returns:
+        TextFeatures: Features for the given text
+    """
+    if isinstance(text_or_features, TextFeatures):
+        return text_or_features
+    return TextFeatures(text_or_features)
+
+
 def extract_basic_stats(text):
-    """Extract basic text statistics."""
-    if not text or not text.strip():
+    """
+    Extract basic text statistics.
+    
+    Args:
+        text (str | TextFeatures): Raw text or pre-extracted features
+        
+    Returns:
+        dict: Word, sentence, paragraph and character counts
+    """
+    features = as_text_features(text)
+    if features.is_empty():
         return {
             'word_count': 0,
             'sentence_count': 0,
@@ -136,14 +460,9 @@ def extract_basic_stats(text):
             'character_count': 0
         }
     
-    words = text.split()
-    sentences = re.split(r'[.!?]+', text)
-    sentences = [s.strip() for s in sentences if s.strip()]
-    paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-    
     return {
-        'word_count': len(words),
-        'sentence_count': len(sentences),
-        'paragraph_count': len(paragraphs),
-        'character_count': len(text)
+        'word_count': features.word_count,
+        'sentence_count': features.sentence_count,
+        'paragraph_count': features.paragraph_count,
+        'character_count': features.character_count
     }
\ No newline at end of file
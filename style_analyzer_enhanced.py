@@ -35,9 +35,13 @@ import math
 import sys
 import glob
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 from collections import Counter
 
+from src.models.rate_limiter import get_rate_limiter
+from src.utils.text_processing import estimate_tokens
+
 # Configuration
 OLLAMA_BASE_URL = "http://localhost:11434"
 AVAILABLE_MODELS = {
@@ -47,6 +51,10 @@ AVAILABLE_MODELS = {
 OPENAI_API_KEY = "your-openai-api-key-here"  # Replace with your actual OpenAI API key
 GEMINI_API_KEY = "your-gemini-api-key-here"  # Replace with your actual Gemini API key
 
+# Shared Ollama session: keeps keep-alive connections open between requests
+OLLAMA_SESSION = requests.Session()
+OLLAMA_SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=10))
+
 # GitHub API Configuration
 GITHUB_API_KEY = "your-github-personal-access-token-here"  # Replace with your GitHub Personal Access Token
 GITHUB_USERNAME = "your-github-username"  # Replace with your GitHub username
@@ -205,7 +213,7 @@ def check_ollama_connection(model_name):
     """Check if Ollama server is running and specified model is available."""
     try:
         # Check if Ollama server is running
-        response = requests.get(f"{OLLAMA_BASE_URL}/api/tags", timeout=5)
+        response = OLLAMA_SESSION.get(f"{OLLAMA_BASE_URL}/api/tags", timeout=5)
         if response.status_code == 200:
             models = response.json().get('models', [])
             model_names = [model.get('name', '') for model in models]
@@ -560,7 +568,7 @@ def analyze_style(text_to_analyze, use_local=True, model_name="gpt-oss:20b", api
                 }
             }
             
-            response = requests.post(
+            response = OLLAMA_SESSION.post(
                 f"{OLLAMA_BASE_URL}/api/generate",
                 json=payload,
                 timeout=timeout
@@ -586,13 +594,17 @@ def analyze_style(text_to_analyze, use_local=True, model_name="gpt-oss:20b", api
         print("Sending request to OpenAI GPT-3.5-turbo model...")
         
         try:
-            response = api_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.2,  # Lower for more consistent analysis
-                max_tokens=3000   # More tokens for deep analysis
+            # Shares the package's OpenAI rate limiter: waits for quota and retries HTTP 429
+            response = get_rate_limiter("openai").call(
+                lambda: api_client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.2,  # Lower for more consistent analysis
+                    max_tokens=3000   # More tokens for deep analysis
+                ),
+                tokens=estimate_tokens(prompt) + 3000
             )
             
             print("Deep analysis completed successfully!")
@@ -618,9 +630,13 @@ def analyze_style(text_to_analyze, use_local=True, model_name="gpt-oss:20b", api
                 candidate_count=1
             )
             
-            response = api_client.generate_content(
-                prompt,
-                generation_config=generation_config
+            # Shares the package's Gemini rate limiter: waits for quota and retries HTTP 429
+            response = get_rate_limiter("gemini").call(
+                lambda: api_client.generate_content(
+                    prompt,
+                    generation_config=generation_config
+                ),
+                tokens=estimate_tokens(prompt) + 3000
             )
             
             print("Deep analysis completed successfully!")
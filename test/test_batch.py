@@ -0,0 +1,169 @@
+"""
+Tests for offline batch jobs.
+Jobs run against an in-process fake Ollama server, so no model is needed.
+"""
+
+import sys
+import os
+import json
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+SAMPLE_TEXT = (
+    "I write short sentences. Then I explain them at length, with commas, asides and "
+    "the occasional digression about coffee. Honestly, it works for me. "
+) * 20
+
+
+class _GenerateHandler(BaseHTTPRequestHandler):
+    """Fake Ollama server that answers every generate request with a fixed analysis."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.generate_calls += 1
+        body = json.dumps({"response": "Warm, conversational style with short sentences.", "done": True}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _write_jobs(work_dir):
+    from src.batch.manifest import make_job, write_manifest
+
+    with open(os.path.join(work_dir, "sample.txt"), "w", encoding="utf-8") as f:
+        f.write(SAMPLE_TEXT)
+
+    manifest_path = os.path.join(work_dir, "nightly.jsonl")
+    write_manifest(manifest_path, [
+        make_job("profile", "analyze", file_paths=["sample.txt"], consolidation="hierarchical"),
+        make_job("email", "generate", profile="job:profile", content_type="email",
+                 topic_or_prompt="Team offsite next week", target_length=120),
+        make_job("missing", "generate", profile="no_such_profile.json", content_type="email",
+                 topic_or_prompt="Never runs"),
+        make_job("restyle", "transfer", profile="job:profile",
+                 original_content="The quarterly report is attached for your review.")
+    ])
+    return manifest_path
+
+
+def test_manifest_and_checkpoint_files():
+    """Manifests are validated, and torn checkpoint lines are skipped rather than fatal."""
+    from src.batch.manifest import (
+        make_job, write_manifest, read_manifest, load_checkpoint, append_checkpoint,
+        default_checkpoint_path, ManifestError
+    )
+
+    work_dir = tempfile.mkdtemp()
+    manifest_path = os.path.join(work_dir, "jobs.jsonl")
+    jobs = [make_job("a", "analyze", file_paths=["a.txt"]),
+            make_job("b", "transfer", profile="job:a", content_path="draft.txt")]
+    assert write_manifest(manifest_path, jobs) == 2
+    assert read_manifest(manifest_path) == jobs
+    assert default_checkpoint_path(manifest_path) == os.path.join(work_dir, "jobs.results.jsonl")
+
+    for bad_jobs in ([jobs[0], jobs[0]], [make_job("c", "summarize")], [make_job("d", "generate", profile="p.json")]):
+        try:
+            write_manifest(manifest_path, bad_jobs)
+            assert False, f"expected {bad_jobs} to be rejected"
+        except ManifestError:
+            pass
+
+    checkpoint_path = os.path.join(work_dir, "results.jsonl")
+    append_checkpoint(checkpoint_path, {'id': "a", 'status': "failed", 'error': "timeout"})
+    with open(checkpoint_path, "a", encoding="utf-8") as f:
+        f.write('{"id": "b", "status": "comp')
+    append_checkpoint(checkpoint_path, {'id': "a", 'status': "completed", 'result': {}})
+
+    records = load_checkpoint(checkpoint_path)
+    assert list(records) == ["a"] and records['a']['status'] == "completed"
+    print("✓ Manifests are validated and checkpoints survive torn writes")
+
+
+def test_batch_run_resumes_without_repeating_calls():
+    """An interrupted run resumes from the checkpoint and never re-sends finished jobs."""
+    from src.models import ollama_client, dispatch
+    from src.batch import worker
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _GenerateHandler)
+    server.generate_calls = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    original_url = ollama_client.OLLAMA_BASE_URL
+    original_get_cache = dispatch.get_response_cache
+    original_transfer = worker.JOB_RUNNERS['transfer']
+    ollama_client.OLLAMA_BASE_URL = f"http://127.0.0.1:{server.server_address[1]}"
+    ollama_client.close_ollama_session()
+    dispatch.get_response_cache = lambda: None
+
+    def interrupted_transfer(job, backend, records):
+        raise KeyboardInterrupt
+
+    try:
+        manifest_path = _write_jobs(tempfile.mkdtemp())
+        worker.JOB_RUNNERS['transfer'] = interrupted_transfer
+        summary = worker.run_batch(manifest_path, model_name="gemma3:1b")
+        assert summary['interrupted']
+        assert (summary['completed'], summary['failed'], summary['pending']) == (2, 1, 1)
+        calls_before_resume = server.generate_calls
+        assert calls_before_resume >= 2
+
+        status = worker.batch_status(manifest_path)
+        assert status['pending'] == 1 and "no_such_profile.json" in status['failed_jobs']['missing']
+
+        # Resume: only the interrupted transfer is sent to the model
+        worker.JOB_RUNNERS['transfer'] = original_transfer
+        summary = worker.run_batch(manifest_path, model_name="gemma3:1b")
+        assert (summary['completed'], summary['skipped'], summary['pending']) == (1, 3, 0)
+        assert server.generate_calls == calls_before_resume + 1
+
+        # A finished manifest costs nothing to run again
+        summary = worker.run_batch(manifest_path, model_name="gemma3:1b")
+        assert summary['skipped'] == 4 and server.generate_calls == calls_before_resume + 1
+
+        records = worker.load_checkpoint(summary['checkpoint'])
+        assert records['profile']['result']['profile']['user_profile']['name'] == "Batch_User"
+        assert records['email']['result']['generated_content'].startswith("Warm, conversational")
+        assert records['restyle']['status'] == "completed"
+    finally:
+        worker.JOB_RUNNERS['transfer'] = original_transfer
+        dispatch.get_response_cache = original_get_cache
+        ollama_client.close_ollama_session()
+        ollama_client.OLLAMA_BASE_URL = original_url
+        server.shutdown()
+        server.server_close()
+    print("✓ Batch runs resume from the checkpoint without repeating calls")
+
+
+def main():
+    """Run all batch tests."""
+    tests = [
+        test_manifest_and_checkpoint_files,
+        test_batch_run_resumes_without_repeating_calls
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Results: {passed}/{len(tests)} tests passed ===")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Tests for chunked (map-reduce) deep analysis.
+Model calls are replaced by a fake so no backend is needed.
+"""
+
+import sys
+import os
+import threading
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+
+def _make_text(paragraphs, words_per_paragraph=40):
+    return "\n\n".join(
+        " ".join(f"word{index}_{position}" for position in range(words_per_paragraph)) + "."
+        for index in range(paragraphs)
+    )
+
+
+def test_split_respects_budget_and_paragraphs():
+    """Chunks fit the budget, keep paragraphs whole and lose no words."""
+    from src.utils.text_processing import split_text_for_budget, estimate_tokens
+
+    text = _make_text(30)
+    chunks = split_text_for_budget(text, 400)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 400 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+    paragraphs = text.split("\n\n")
+    assert all(paragraph in paragraphs for chunk in chunks for paragraph in chunk.split("\n\n"))
+
+    assert split_text_for_budget("short text", 400) == ["short text"]
+    print("✓ Text splits on paragraph boundaries within the budget")
+
+
+def test_split_breaks_oversized_paragraphs():
+    """A single paragraph larger than the budget is split on sentences and words."""
+    from src.utils.text_processing import split_text_for_budget, estimate_tokens
+
+    paragraph = " ".join(f"Sentence number {index} is here." for index in range(200))
+    run_on = " ".join(f"token{index}" for index in range(500))
+    chunks = split_text_for_budget(paragraph + "\n\n" + run_on, 100)
+
+    assert all(estimate_tokens(chunk) <= 100 for chunk in chunks)
+    assert " ".join(chunks).split() == (paragraph + " " + run_on).split()
+    print("✓ Oversized paragraphs are split on sentence and word boundaries")
+
+
+def test_map_reduce_bounds_prompts():
+    """Long texts are analyzed per chunk and merged in a bounded reduce tree."""
+    from src.analysis import analyzer
+
+    calls = {'map': 0, 'reduce': 0}
+    largest_prompt = [0]
+    lock = threading.Lock()
+
+    def fake_generate_text(prompt, *args, **kwargs):
+        with lock:
+            largest_prompt[0] = max(largest_prompt[0], len(prompt))
+            if "Partial analyses:" in prompt:
+                calls['reduce'] += 1
+                return f"merged {prompt.count('--- Partial analysis')}"
+            calls['map'] += 1
+            return "chunk analysis"
+
+    original_generate_text = analyzer.generate_text
+    original_budget = dict(analyzer.ANALYSIS_CHUNK_TOKENS)
+    analyzer.generate_text = fake_generate_text
+    analyzer.ANALYSIS_CHUNK_TOKENS["openai"] = 400
+    try:
+        text = _make_text(90)
+        chunk_count = len(analyzer.split_text_for_budget(text, 400))
+        result = analyzer.analyze_style(text, False, api_type="openai", api_client=object())
+
+        assert chunk_count > analyzer.REDUCE_FAN_IN ** 2
+        assert calls['map'] == chunk_count
+        assert result.startswith("merged")
+        # Every prompt stays bounded by the chunk budget, never the input size
+        assert largest_prompt[0] < len(text) / 4
+
+        calls['map'] = 0
+        analyzer.analyze_style(text, False, api_type="openai", api_client=object(), chunked=False)
+        assert calls['map'] == 1
+    finally:
+        analyzer.generate_text = original_generate_text
+        analyzer.ANALYSIS_CHUNK_TOKENS.clear()
+        analyzer.ANALYSIS_CHUNK_TOKENS.update(original_budget)
+    print("✓ Map-reduce analysis keeps every prompt within the budget")
+
+
+def test_map_reduce_skips_failed_chunks():
+    """Failed chunk analyses are dropped; all failures raise the typed error."""
+    from src.analysis import analyzer
+    from src.models.resilience import ModelUnavailableError, get_resilient_dispatcher
+
+    def partly_failing(prompt, *args, **kwargs):
+        if "Partial analyses:" in prompt:
+            return "merged"
+        return "OpenAI API Error: rate limited" if "word0_0" in prompt else "chunk analysis"
+
+    original_generate_text = analyzer.generate_text
+    try:
+        chunks = ["word0_0 text.", "word1_0 text.", "word2_0 text."]
+        analyzer.generate_text = partly_failing
+        assert analyzer._map_reduce_analysis(chunks, False, None, "openai", object(), None, "enhanced") == "merged"
+
+        analyzer.generate_text = lambda prompt, *args, **kwargs: "OpenAI API Error: rate limited"
+        try:
+            analyzer._map_reduce_analysis(chunks, False, None, "openai", object(), None, "enhanced")
+            assert False, "expected the chunk error to be raised"
+        except ModelUnavailableError as e:
+            assert str(e).startswith("OpenAI API Error") and e.backend == "openai"
+    finally:
+        analyzer.generate_text = original_generate_text
+        get_resilient_dispatcher().reset()
+    print("✓ Failed chunk analyses are skipped during the merge")
+
+
+def main():
+    """Run all chunked analysis tests."""
+    tests = [
+        test_split_respects_budget_and_paragraphs,
+        test_split_breaks_oversized_paragraphs,
+        test_map_reduce_bounds_prompts,
+        test_map_reduce_skips_failed_chunks
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Results: {passed}/{len(tests)} tests passed ===")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
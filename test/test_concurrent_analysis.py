@@ -0,0 +1,140 @@
+"""
+Tests for concurrent per-file analysis in the analyzer.
+Model calls are replaced by a slow fake so no backend is needed.
+"""
+
+import sys
+import os
+import threading
+import time
+import _thread
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+
+def _make_summaries(count):
+    return [
+        {'filename': f"sample_{index}.txt", 'word_count': 1, 'character_count': 6, 'text': f"text {index}"}
+        for index in range(count)
+    ]
+
+
+def _run_with_fake_backend(summaries, delays, limit):
+    """Run the concurrent stage against a fake backend; return results and peak concurrency."""
+    from src.analysis import analyzer
+    from src.models import dispatch
+
+    state = {'active': 0, 'peak': 0}
+    lock = threading.Lock()
+
+    def fake_analyze_style(text, *args, **kwargs):
+        with lock:
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+        time.sleep(delays[int(text.split()[-1])])
+        with lock:
+            state['active'] -= 1
+        return f"analysis of {text}"
+
+    original_analyze_style = analyzer.analyze_style
+    original_limit = dispatch.MAX_IN_FLIGHT_REQUESTS.get("openai")
+    analyzer.analyze_style = fake_analyze_style
+    dispatch.MAX_IN_FLIGHT_REQUESTS["openai"] = limit
+    try:
+        results = analyzer._analyze_files_concurrently(
+            summaries, False, None, "openai", object(), None, "enhanced"
+        )
+    finally:
+        analyzer.analyze_style = original_analyze_style
+        dispatch.MAX_IN_FLIGHT_REQUESTS["openai"] = original_limit
+    return results, state['peak']
+
+
+def test_results_keep_input_order():
+    """Results come back in file order even when later files finish first."""
+    summaries = _make_summaries(5)
+    delays = [0.25, 0.2, 0.15, 0.1, 0.05]
+
+    results, _ = _run_with_fake_backend(summaries, delays, limit=5)
+
+    assert [summary['filename'] for summary, _, _ in results] == [s['filename'] for s in summaries]
+    assert [analysis for _, _, analysis in results] == [f"analysis of text {i}" for i in range(5)]
+    print("✓ Concurrent analyses keep input order")
+
+
+def test_in_flight_limit_and_overlap():
+    """Calls overlap up to the backend limit and never exceed it."""
+    summaries = _make_summaries(6)
+    delays = [0.2] * 6
+
+    start = time.perf_counter()
+    _, peak = _run_with_fake_backend(summaries, delays, limit=3)
+    elapsed = time.perf_counter() - start
+
+    assert peak == 3
+    assert elapsed < 0.2 * 6 * 0.75  # Roughly two round trips instead of six
+    print("✓ In-flight limit respected")
+
+
+def test_ctrl_c_stops_the_analyses_in_progress():
+    """Ctrl+C in the waiting thread stops the running worker calls; queued files still run."""
+    from src.analysis import analyzer
+    from src.models import dispatch
+
+    started = threading.Event()
+
+    def fake_analyze_style(text, *args, cancel_event=None, **kwargs):
+        started.set()
+        if text.endswith("2"):
+            return "full analysis" if not cancel_event.is_set() else "cancelled too early"
+        # Stand-in for a stream that stops at the next chunk once cancelled
+        return "partial analysis" if cancel_event.wait(5) else "never cancelled"
+
+    def press_ctrl_c():
+        started.wait(5)
+        time.sleep(0.05)
+        _thread.interrupt_main()
+
+    cancel_event = threading.Event()
+    original_analyze_style = analyzer.analyze_style
+    original_limit = dispatch.MAX_IN_FLIGHT_REQUESTS.get("openai")
+    analyzer.analyze_style = fake_analyze_style
+    dispatch.MAX_IN_FLIGHT_REQUESTS["openai"] = 2
+    threading.Thread(target=press_ctrl_c, daemon=True).start()
+    try:
+        results = analyzer._analyze_files_concurrently(
+            _make_summaries(3), False, None, "openai", object(), None, "enhanced", cancel_event=cancel_event
+        )
+    finally:
+        analyzer.analyze_style = original_analyze_style
+        dispatch.MAX_IN_FLIGHT_REQUESTS["openai"] = original_limit
+
+    assert [analysis for _, _, analysis in results] == ["partial analysis", "partial analysis", "full analysis"]
+    assert not cancel_event.is_set()
+    print("✓ Ctrl+C stops the analyses in progress and keeps their partial output")
+
+
+def main():
+    """Run all concurrency tests."""
+    tests = [
+        test_results_keep_input_order,
+        test_in_flight_limit_and_overlap,
+        test_ctrl_c_stops_the_analyses_in_progress
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Results: {passed}/{len(tests)} tests passed ===")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
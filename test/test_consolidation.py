@@ -0,0 +1,178 @@
+"""
+Tests for hierarchical consolidation and the consolidation benchmark.
+Model calls are replaced by fakes so no backend is needed.
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+
+def _capture_prompts(analyzer, response="consolidated"):
+    prompts = []
+
+    def fake_generate_text(prompt, *args, **kwargs):
+        prompts.append(prompt)
+        return response
+
+    analyzer.generate_text = fake_generate_text
+    return prompts
+
+
+def test_hierarchical_uses_analyses_not_text():
+    """The consolidation prompt carries analyses and statistics, never sample text."""
+    from src.analysis import analyzer
+
+    individual_analyses = [
+        {'filename': "a.txt", 'analysis': "Analysis of sample A"},
+        {'filename': "b.txt", 'analysis': "Ollama Error: timed out"},
+        {'filename': "c.txt", 'analysis': "Analysis of sample C"}
+    ]
+    text_statistics = {'word_count': 1234, 'lexical_diversity': 0.61, 'word_frequency': {'the': 80}}
+    readability_metrics = {'flesch_reading_ease': 55.2}
+
+    original_generate_text = analyzer.generate_text
+    prompts = _capture_prompts(analyzer)
+    try:
+        result = analyzer.consolidate_from_analyses(
+            individual_analyses, text_statistics, readability_metrics, False, None, "openai", object()
+        )
+    finally:
+        analyzer.generate_text = original_generate_text
+
+    assert result == "consolidated"
+    assert len(prompts) == 1
+    assert "Analysis of sample A" in prompts[0] and "Analysis of sample C" in prompts[0]
+    assert "Ollama Error" not in prompts[0]
+    assert "Word Count: 1234" in prompts[0] and "Flesch Reading Ease: 55.2" in prompts[0]
+    print("✓ Hierarchical consolidation merges analyses with corpus statistics")
+
+
+def test_hierarchical_reduces_in_tree():
+    """Many files are merged REDUCE_FAN_IN at a time; statistics go to the final merge only."""
+    from src.analysis import analyzer
+
+    fan_in = analyzer.REDUCE_FAN_IN
+    individual_analyses = [
+        {'filename': f"{index}.txt", 'analysis': f"analysis {index}"} for index in range(fan_in * 2 + 1)
+    ]
+
+    original_generate_text = analyzer.generate_text
+    prompts = _capture_prompts(analyzer)
+    try:
+        analyzer.consolidate_from_analyses(
+            individual_analyses, {'word_count': 99}, {}, False, None, "openai", object()
+        )
+    finally:
+        analyzer.generate_text = original_generate_text
+
+    # Two merges of fan_in analyses, then one final merge of the results and the leftover
+    assert len(prompts) == 3
+    assert all(prompt.count("--- Sample analysis") <= fan_in for prompt in prompts)
+    assert ["Word Count: 99" in prompt for prompt in prompts] == [False, False, True]
+    print("✓ Hierarchical consolidation reduces in a bounded tree")
+
+
+def test_profile_keeps_texts_only_for_full_text():
+    """Hierarchical profiles drop each text after its analysis; full_text joins them for the prompt."""
+    from src.analysis import analyzer
+
+    work_dir = tempfile.mkdtemp()
+    paths = []
+    for index in range(3):
+        path = os.path.join(work_dir, f"sample_{index}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"Sample number {index} has a sentence. And another one here.\n\n" * 5)
+        paths.append(path)
+
+    original_generate_text = analyzer.generate_text
+    original_analyze_files = analyzer._analyze_files_concurrently
+    kept = []
+
+    def tracking_analyze_files(*args, **kwargs):
+        results = original_analyze_files(*args, **kwargs)
+        kept.append([content for _, content, _ in results])
+        return results
+
+    prompts = _capture_prompts(analyzer, response="analysis")
+    analyzer._analyze_files_concurrently = tracking_analyze_files
+    try:
+        profiles = {
+            strategy: analyzer.create_enhanced_style_profile(
+                paths, False, None, "openai", object(), consolidation=strategy, user_profile={}, style_fields=False
+            )
+            for strategy in ("hierarchical", "full_text")
+        }
+    finally:
+        analyzer.generate_text = original_generate_text
+        analyzer._analyze_files_concurrently = original_analyze_files
+        shutil.rmtree(work_dir)
+
+    assert kept[0] == [None, None, None]
+    assert all(content and content.startswith("Sample number") for content in kept[1])
+    assert "Sample number 2" in prompts[-1]
+    for profile in profiles.values():
+        metadata = profile['metadata']
+        assert metadata['combined_text_length'] == sum(info['character_count'] for info in metadata['file_info'])
+        assert metadata['combined_text_length'] == profile['text_statistics']['character_count']
+    print("✓ Profiles keep sample texts only for full-text consolidation")
+
+
+def test_benchmark_compares_strategies():
+    """The benchmark reports both strategies; hierarchical sends fewer tokens on long samples."""
+    from src.benchmarks.consolidation import (
+        run_consolidation_benchmark, format_benchmark_report, SimulatedBackend
+    )
+
+    sample_dir = tempfile.mkdtemp()
+    try:
+        paragraph = " ".join(["The quick brown fox jumps over the lazy dog."] * 20)
+        file_paths = []
+        for index in range(3):
+            file_path = os.path.join(sample_dir, f"sample_{index}.txt")
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write("\n\n".join([paragraph] * 30))
+            file_paths.append(file_path)
+
+        results = run_consolidation_benchmark(
+            file_paths, False, None, "openai", object(), generate=SimulatedBackend(time_scale=0)
+        )
+    finally:
+        shutil.rmtree(sample_dir)
+
+    strategies = results['strategies']
+    assert results['files'] == 3
+    assert set(strategies) == {"full_text", "hierarchical"}
+    assert strategies['hierarchical']['prompt_tokens'] < strategies['full_text']['prompt_tokens']
+    assert "consolidate: hierarchical" in format_benchmark_report(results)
+    print("✓ Benchmark compares consolidation strategies")
+
+
+def main():
+    """Run all consolidation tests."""
+    tests = [
+        test_hierarchical_uses_analyses_not_text,
+        test_hierarchical_reduces_in_tree,
+        test_profile_keeps_texts_only_for_full_text,
+        test_benchmark_compares_strategies
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Results: {passed}/{len(tests)} tests passed ===")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
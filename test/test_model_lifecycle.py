@@ -0,0 +1,166 @@
+"""
+Tests for local model warm-up and session keep_alive.
+The Ollama HTTP session is replaced by a fake so no server is needed.
+"""
+
+import sys
+import os
+import threading
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+
+class _FakeResponse:
+    def __init__(self, payload):
+        self.status_code = 200
+        self.text = ""
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class _FakeSession:
+    """Records generate requests and lists the models in `loaded` as running."""
+
+    def __init__(self, load_duration=2_500_000_000, loaded=()):
+        self.posts = []
+        self.load_duration = load_duration
+        self.loaded = list(loaded)
+
+    def post(self, url, json=None, timeout=None):
+        self.posts.append(json)
+        return _FakeResponse({"response": "", "done": True, "load_duration": self.load_duration})
+
+    def get(self, url, timeout=None):
+        return _FakeResponse({"models": [{"name": name} for name in self.loaded]})
+
+
+def test_warm_up_reports_load_time():
+    """Warm-up loads the model with an empty prompt and separates load from inference."""
+    from src.models import lifecycle
+
+    session = _FakeSession()
+    original_session = lifecycle.get_ollama_session
+    lifecycle.get_ollama_session = lambda: session
+    try:
+        result = lifecycle.warm_up_model("gemma3:1b", keep_alive="1h")
+    finally:
+        lifecycle.get_ollama_session = original_session
+
+    assert result['success'] and result['error'] is None
+    assert result['load_seconds'] == 2.5
+    assert [{key: post[key] for key in ("model", "prompt", "keep_alive")} for post in session.posts] == [
+        {"model": "gemma3:1b", "prompt": "", "keep_alive": "1h"}
+    ]
+
+    summary = lifecycle.summarize_call_timing([
+        {'model': "gemma3:1b", 'load_seconds': 4.0, 'prompt_eval_seconds': 0.5, 'eval_seconds': 3.0},
+        {'model': "gemma3:1b", 'load_seconds': 0.01, 'prompt_eval_seconds': 0.2, 'eval_seconds': 2.0}
+    ])
+    assert summary["gemma3:1b"]['calls'] == 2
+    assert summary["gemma3:1b"]['cold_starts'] == 1
+    assert summary["gemma3:1b"]['load_seconds'] == 4.01
+    assert summary["gemma3:1b"]['inference_seconds'] == 5.7
+    print("✓ Warm-up reports model load time separately from inference")
+
+
+def test_session_warms_in_background():
+    """A session warms the model once in the background and holds keep_alive until it ends."""
+    from src.models import lifecycle, ollama_client
+
+    release = threading.Event()
+    warm_ups = []
+
+    def slow_warm_up(model_name):
+        warm_ups.append(model_name)
+        release.wait(5)
+        return {'model': model_name, 'success': True, 'load_seconds': 3.0, 'wall_time': 3.0, 'error': None}
+
+    session = _FakeSession(loaded=["gemma3:1b"])
+    original_session = lifecycle.get_ollama_session
+    lifecycle.get_ollama_session = lambda: session
+    manager = lifecycle.ModelLifecycle(warm_up=slow_warm_up)
+    try:
+        done = manager.begin_session("gemma3:1b")
+        # begin_session returns while the model is still loading
+        assert not done.is_set()
+        assert manager.wait_until_ready("gemma3:1b", timeout=0.01) is None
+        assert ollama_client.get_keep_alive() == lifecycle.OLLAMA_SESSION_KEEP_ALIVE
+
+        manager.start_warm_up("gemma3:1b")
+        release.set()
+        assert manager.wait_until_ready("gemma3:1b", timeout=5)['load_seconds'] == 3.0
+        assert warm_ups == ["gemma3:1b"]
+        assert manager.warm_up_results()["gemma3:1b"]['success']
+
+        manager.end_session()
+        assert ollama_client.get_keep_alive() == ollama_client.OLLAMA_KEEP_ALIVE
+        assert session.posts[-1]["keep_alive"] == ollama_client.OLLAMA_KEEP_ALIVE
+        assert session.posts[-1]["options"] == session.posts[0]["options"]
+        assert manager.session_model is None and manager.warm_up_results() == {}
+
+        # Models the server has already unloaded are not reloaded just to expire them
+        session.loaded = []
+        manager.begin_session("gemma3:1b")
+        posts_before = len(session.posts)
+        manager.end_session()
+        assert len(session.posts) == posts_before
+    finally:
+        release.set()
+        ollama_client.set_keep_alive(None)
+        lifecycle.get_ollama_session = original_session
+    print("✓ Sessions warm the model in the background and restore keep_alive")
+
+
+def test_warm_up_loads_the_analysis_context():
+    """The warm-up and the first analysis ask for the same num_ctx, so the model is loaded once."""
+    from src.models import lifecycle, ollama_client, dispatch
+    from src.analysis.prompts import create_enhanced_deep_prompt
+    from src.config.settings import MIN_OLLAMA_CONTEXT
+
+    session = _FakeSession()
+    original = (lifecycle.get_ollama_session, ollama_client.get_ollama_session, dict(ollama_client._pinned_contexts))
+    lifecycle.get_ollama_session = ollama_client.get_ollama_session = lambda: session
+    ollama_client._pinned_contexts.clear()
+    try:
+        for model_name in ("gemma3:1b", "gpt-oss:20b"):
+            session.posts.clear()
+            lifecycle.warm_up_model(model_name)
+            dispatch.generate_text(
+                create_enhanced_deep_prompt("A short sample paragraph. " * 40), True, model_name, use_cache=False
+            )
+            warm_up, first_request = session.posts
+            assert warm_up["options"]["num_ctx"] == first_request["options"]["num_ctx"], model_name
+            assert warm_up["options"]["num_ctx"] > MIN_OLLAMA_CONTEXT
+    finally:
+        lifecycle.get_ollama_session, ollama_client.get_ollama_session = original[:2]
+        ollama_client._pinned_contexts.clear()
+        ollama_client._pinned_contexts.update(original[2])
+    print("✓ Warm-up loads the model with the analysis context size")
+
+
+def main():
+    """Run all model lifecycle tests."""
+    tests = [
+        test_warm_up_reports_load_time,
+        test_warm_up_loads_the_analysis_context,
+        test_session_warms_in_background
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Results: {passed}/{len(tests)} tests passed ===")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""
+Tests for the Ollama client.
+Runs against a small in-process HTTP server instead of a real Ollama install.
+"""
+
+import sys
+import os
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+
+STREAM_TOKENS = ["The ", "prose ", "is ", "terse."]
+
+
+class _FakeOllamaHandler(BaseHTTPRequestHandler):
+    """Answers /api/tags and /api/generate over keep-alive HTTP/1.1."""
+
+    protocol_version = "HTTP/1.1"
+    connections = set()
+    payloads = []
+
+    def setup(self):
+        super().setup()
+        _FakeOllamaHandler.connections.add(self.client_address)
+
+    def _send_json(self, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._send_json({"models": [{"name": "gemma3:1b"}]})
+
+    def _send_chunk(self, payload):
+        body = (json.dumps(payload) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(body):x}\r\n".encode("ascii") + body + b"\r\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        _FakeOllamaHandler.payloads.append(request)
+        if not request.get("stream"):
+            self._send_json({"response": f"echo {request['model']}", "done": True,
+                             "prompt_eval_count": 12, "prompt_eval_duration": 300_000_000})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for token in STREAM_TOKENS:
+                self._send_chunk({"response": token, "done": False})
+            self._send_chunk({"response": "", "done": True, "eval_count": len(STREAM_TOKENS),
+                              "eval_duration": 2_000_000_000})
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _start_fake_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOllamaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_session_reuses_connections():
+    """Repeated calls share one pooled keep-alive connection."""
+    from src.models import ollama_client
+
+    server = _start_fake_server()
+    original_url = ollama_client.OLLAMA_BASE_URL
+    ollama_client.OLLAMA_BASE_URL = f"http://127.0.0.1:{server.server_address[1]}"
+    _FakeOllamaHandler.connections = set()
+    ollama_client.close_ollama_session()
+    try:
+        available, _ = ollama_client.check_ollama_connection("gemma3:1b")
+        assert available
+        for _ in range(5):
+            assert ollama_client.analyze_with_ollama("hello", "gemma3:1b") == "echo gemma3:1b"
+        assert len(_FakeOllamaHandler.connections) == 1
+        assert ollama_client.get_ollama_session() is ollama_client.get_ollama_session()
+    finally:
+        ollama_client.close_ollama_session()
+        ollama_client.OLLAMA_BASE_URL = original_url
+        server.shutdown()
+        server.server_close()
+    print("✓ Ollama session reuses connections")
+
+
+def test_connection_error_message():
+    """An unreachable server yields the usual error tuple and string."""
+    from src.models import ollama_client
+
+    original_url = ollama_client.OLLAMA_BASE_URL
+    ollama_client.OLLAMA_BASE_URL = "http://127.0.0.1:9"
+    try:
+        available, message = ollama_client.check_ollama_connection("gemma3:1b")
+        assert not available and "Cannot connect" in message
+        assert ollama_client.analyze_with_ollama("hello", "gemma3:1b").startswith("Ollama Error")
+    finally:
+        ollama_client.OLLAMA_BASE_URL = original_url
+    print("✓ Connection errors reported")
+
+
+def _use_fake_server(server):
+    from src.models import ollama_client
+
+    original_url = ollama_client.OLLAMA_BASE_URL
+    ollama_client.OLLAMA_BASE_URL = f"http://127.0.0.1:{server.server_address[1]}"
+    ollama_client.close_ollama_session()
+    return original_url
+
+
+def _stop_fake_server(server, original_url):
+    from src.models import ollama_client
+
+    ollama_client.close_ollama_session()
+    ollama_client.OLLAMA_BASE_URL = original_url
+    server.shutdown()
+    server.server_close()
+
+
+def test_streaming_tokens_and_metrics():
+    """Streamed tokens reach the callback and timing metrics are recorded."""
+    from src.models import ollama_client
+
+    server = _start_fake_server()
+    original_url = _use_fake_server(server)
+    received = []
+    try:
+        result = ollama_client.stream_with_ollama("hello", "gemma3:1b", on_token=received.append)
+        assert received == STREAM_TOKENS
+        assert result['response'] == "".join(STREAM_TOKENS)
+        assert result['error'] is None and not result['cancelled']
+
+        metrics = result['metrics']
+        assert metrics['streamed'] and metrics['eval_count'] == len(STREAM_TOKENS)
+        assert metrics['time_to_first_token'] is not None
+        assert metrics['time_to_first_token'] <= metrics['wall_time']
+        assert metrics['tokens_per_second'] == len(STREAM_TOKENS) / 2
+        assert ollama_client.get_call_metrics()[-1] is metrics
+
+        assert ollama_client.analyze_with_ollama("hello", "gemma3:1b", on_token=lambda token: None) == "".join(STREAM_TOKENS)
+    finally:
+        _stop_fake_server(server, original_url)
+    print("✓ Streaming delivers tokens and records TTFT and tokens/sec")
+
+
+def test_streaming_cancellation():
+    """Cancelling keeps partial output, which dispatch does not cache; hits still reach on_token."""
+    import shutil
+    import tempfile
+    from src.models import ollama_client, dispatch
+    from src.storage.response_cache import ResponseCache
+
+    server = _start_fake_server()
+    original_url = _use_fake_server(server)
+    original_get_cache = dispatch.get_response_cache
+    cache_dir = tempfile.mkdtemp()
+    cache = ResponseCache(cache_dir)
+    dispatch.get_response_cache = lambda: cache
+    try:
+        cancel_event = threading.Event()
+        result = ollama_client.stream_with_ollama(
+            "hello", "gemma3:1b", on_token=lambda token: cancel_event.set(), cancel_event=cancel_event
+        )
+        assert result['cancelled'] and result['error'] is None
+        assert result['response'] == STREAM_TOKENS[0]
+        assert result['metrics']['cancelled']
+
+        cancel_event = threading.Event()
+        partial = dispatch.generate_text(
+            "hello", True, model_name="gemma3:1b",
+            on_token=lambda token: cancel_event.set(), cancel_event=cancel_event
+        )
+        assert partial == STREAM_TOKENS[0]
+        assert cache.info()['entries'] == 0
+
+        complete = dispatch.generate_text("hello", True, model_name="gemma3:1b", on_token=lambda token: None)
+        assert complete == "".join(STREAM_TOKENS)
+        assert cache.info()['entries'] == 1
+
+        # A cache hit still reaches live output, without a request
+        shown = []
+        requests_sent = len(_FakeOllamaHandler.payloads)
+        assert dispatch.generate_text("hello", True, model_name="gemma3:1b", on_token=shown.append) == complete
+        assert shown == [complete] and len(_FakeOllamaHandler.payloads) == requests_sent
+    finally:
+        dispatch.get_response_cache = original_get_cache
+        _stop_fake_server(server, original_url)
+        shutil.rmtree(cache_dir)
+    print("✓ Cancelled streams return partial text and are not cached")
+
+
+def test_keep_alive_and_pinned_context():
+    """Requests keep the model loaded and never shrink num_ctx, so the prompt cache survives."""
+    from src.models import ollama_client
+    from src.models.token_budget import plan_request
+
+    server = _start_fake_server()
+    original_url = _use_fake_server(server)
+    original_pins = dict(ollama_client._pinned_contexts)
+    ollama_client._pinned_contexts.clear()
+    _FakeOllamaHandler.payloads = []
+    try:
+        large = plan_request("word " * 12000, "ollama", "gemma3:1b")
+        small = plan_request("word", "ollama", "gemma3:1b")
+        assert small['num_ctx'] < large['num_ctx']
+
+        ollama_client.analyze_with_ollama("word " * 12000, "gemma3:1b", budget=large)
+        ollama_client.analyze_with_ollama("word", "gemma3:1b", budget=small)
+
+        first, second = _FakeOllamaHandler.payloads
+        assert first['keep_alive'] == second['keep_alive'] == ollama_client.OLLAMA_KEEP_ALIVE
+        assert second['options']['num_ctx'] == first['options']['num_ctx'] == large['num_ctx']
+        assert ollama_client.get_num_ctx("gemma3:1b", small) == large['num_ctx']
+        assert ollama_client.get_num_ctx("gemma3:4b", small) == small['num_ctx']
+        assert "gemma3:4b" not in ollama_client._pinned_contexts
+
+        metrics = ollama_client.get_call_metrics()[-1]
+        assert metrics['prompt_eval_count'] == 12
+        assert metrics['prompt_eval_seconds'] == 0.3
+    finally:
+        ollama_client._pinned_contexts.clear()
+        ollama_client._pinned_contexts.update(original_pins)
+        _stop_fake_server(server, original_url)
+    print("✓ Requests keep the model loaded with a pinned context and record prompt eval")
+
+
+def main():
+    """Run all Ollama client tests."""
+    tests = [
+        test_session_reuses_connections,
+        test_connection_error_message,
+        test_streaming_tokens_and_metrics,
+        test_streaming_cancellation,
+        test_keep_alive_and_pinned_context
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Results: {passed}/{len(tests)} tests passed ===")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,264 @@
+"""
+Tests for routing Ollama requests across several hosts.
+Hosts are small in-process HTTP servers or fakes, so no Ollama install is needed.
+"""
+
+import sys
+import os
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+
+class _FakeTagsResponse:
+    def __init__(self, models):
+        self.status_code = 200
+        self._models = models
+
+    def json(self):
+        return {"models": [{"name": name} for name in self._models]}
+
+
+class _FakeTagsSession:
+    """Answers /api/tags from a {url: [models]} map; unknown hosts are unreachable."""
+
+    def __init__(self, models_by_url):
+        self.models_by_url = models_by_url
+        self.probes = 0
+
+    def get(self, url, timeout=None):
+        self.probes += 1
+        base_url = url[:-len("/api/tags")]
+        if base_url not in self.models_by_url:
+            raise requests.exceptions.ConnectionError(f"cannot reach {base_url}")
+        return _FakeTagsResponse(self.models_by_url[base_url])
+
+
+def test_routes_to_least_loaded_host_with_model():
+    """Requests go to healthy hosts that have the model, least loaded first; probes are cached."""
+    from src.models.ollama_pool import OllamaPool
+
+    session = _FakeTagsSession({"http://a": ["gemma3:1b"], "http://b": ["gemma3:1b"], "http://c": ["other:7b"]})
+    pool = OllamaPool(["http://a", "http://b", "http://c", "http://down"], lambda: session, health_ttl=60)
+
+    assert [host.url for host in pool.hosts_with_model("gemma3:1b")] == ["http://a", "http://b"]
+    assert session.probes == 4
+
+    release = threading.Event()
+    started = threading.Event()
+    used = []
+
+    def slow_send(base_url):
+        used.append(base_url)
+        started.set()
+        release.wait(5)
+        return base_url
+
+    worker = threading.Thread(target=pool.request, args=("gemma3:1b", slow_send))
+    worker.start()
+    started.wait(5)
+    # The first host is busy, so the next request goes to the other one
+    assert pool.request("gemma3:1b", lambda base_url: base_url) == "http://b"
+    assert {entry['url']: entry['queue_depth'] for entry in pool.stats()}["http://a"] == 1
+    release.set()
+    worker.join(5)
+
+    assert used == ["http://a"]
+    assert session.probes == 4
+    stats = {entry['url']: entry for entry in pool.stats()}
+    assert stats["http://a"]['requests'] == stats["http://b"]['requests'] == 1
+    assert stats["http://a"]['queue_depth'] == 0
+    assert stats["http://a"]['average_latency'] is not None
+    assert not stats["http://down"]['healthy']
+    print("✓ Requests are routed to the least-loaded healthy host with the model")
+
+
+def test_failed_host_is_retried_elsewhere():
+    """A failing host is marked unhealthy and the request moves to another host."""
+    from src.models.ollama_pool import OllamaPool, HostError
+
+    session = _FakeTagsSession({"http://a": ["gemma3:1b"], "http://b": ["gemma3:1b"]})
+    pool = OllamaPool(["http://a", "http://b"], lambda: session, health_ttl=60)
+
+    def flaky_send(base_url):
+        if base_url == "http://a":
+            raise HostError("HTTP 503 - overloaded")
+        return "analysis from b"
+
+    assert pool.request("gemma3:1b", flaky_send) == "analysis from b"
+    stats = {entry['url']: entry for entry in pool.stats()}
+    assert stats["http://a"]['failures'] == 1 and not stats["http://a"]['healthy']
+    assert [host.url for host in pool.hosts_with_model("gemma3:1b")] == ["http://b"]
+
+    def always_down(base_url):
+        raise requests.exceptions.ConnectionError(f"{base_url} refused")
+
+    try:
+        pool.request("gemma3:1b", always_down)
+        assert False, "expected the last host's error"
+    except requests.exceptions.ConnectionError:
+        pass
+
+    # Once output has been delivered, a failure is not retried
+    calls = []
+
+    def fails_after_output(base_url):
+        calls.append(base_url)
+        raise requests.exceptions.ConnectionError("stream broken")
+
+    pool = OllamaPool(["http://a", "http://b"], lambda: _FakeTagsSession({"http://a": ["m"], "http://b": ["m"]}))
+    try:
+        pool.request("m", fails_after_output, can_retry=lambda: False)
+    except requests.exceptions.ConnectionError:
+        pass
+    assert len(calls) == 1
+    print("✓ Failed hosts are skipped and the request is retried elsewhere")
+
+
+def test_missing_model_keeps_host_healthy():
+    """A 404 routes the model elsewhere without taking the host out of rotation."""
+    from src.models.ollama_pool import OllamaPool, ModelMissingError
+
+    session = _FakeTagsSession({"http://a": ["gemma3:1b", "other:1b"], "http://b": ["gemma3:1b"]})
+    pool = OllamaPool(["http://a", "http://b"], lambda: session, health_ttl=60)
+
+    def send(base_url):
+        if base_url == "http://a":
+            raise ModelMissingError("HTTP 404 - model 'gemma3:1b' not found")
+        return "analysis from b"
+
+    assert pool.request("gemma3:1b", send) == "analysis from b"
+    stats = {entry['url']: entry for entry in pool.stats()}
+    assert stats["http://a"]['healthy'] and stats["http://a"]['failures'] == 0
+    assert stats["http://a"]['models'] == ["other:1b"]
+    assert [host.url for host in pool.hosts_with_model("gemma3:1b")] == ["http://b"]
+    assert [host.url for host in pool.hosts_with_model("other:1b")] == ["http://a"]
+
+    # A model nobody reports is tried on every host; none of them is marked unhealthy
+    tried = []
+
+    def nobody_has_it(base_url):
+        tried.append(base_url)
+        raise ModelMissingError("HTTP 404 - model 'new:7b' not found")
+
+    try:
+        pool.request("new:7b", nobody_has_it)
+        assert False, "expected the 404"
+    except ModelMissingError:
+        pass
+    assert tried == ["http://a", "http://b"]
+    assert all(entry['healthy'] and entry['failures'] == 0 for entry in pool.stats())
+
+    # An unreachable first host does not hide the real error from the next one
+    pool = OllamaPool(["http://a", "http://b"], lambda: session, health_ttl=60)
+
+    def first_host_down(base_url):
+        if base_url == "http://a":
+            raise requests.exceptions.ConnectionError("cannot reach http://a")
+        raise ModelMissingError("HTTP 404 - model 'new:7b' not found")
+
+    try:
+        pool.request("new:7b", first_host_down)
+        assert False, "expected the 404"
+    except ModelMissingError:
+        pass
+    print("✓ A missing model does not mark the host unhealthy")
+
+
+class _HostHandler(BaseHTTPRequestHandler):
+    """Fake Ollama host; the server's `status` attribute sets the generate status."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._send(200, {"models": [{"name": "gemma3:1b"}]})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.generate_calls += 1
+        if self.server.status != 200:
+            self._send(self.server.status, {"error": "busy"})
+        else:
+            self._send(200, {"response": f"from {self.server.server_address[1]}", "done": True})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _start_host(status):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _HostHandler)
+    server.status = status
+    server.generate_calls = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_client_fails_over_between_hosts():
+    """analyze_with_ollama retries a failing host on a healthy one and records the host used."""
+    from src.models import ollama_client
+
+    busy, healthy = _start_host(503), _start_host(200)
+    urls = [f"http://127.0.0.1:{server.server_address[1]}" for server in (busy, healthy)]
+    original_hosts = ollama_client.OLLAMA_HOSTS
+    ollama_client.OLLAMA_HOSTS = urls
+    ollama_client.close_ollama_session()
+    try:
+        available, message = ollama_client.check_ollama_connection("gemma3:1b")
+        assert available and "2 of 2" in message
+
+        for _ in range(3):
+            response = ollama_client.analyze_with_ollama("hello", "gemma3:1b")
+            assert response == f"from {healthy.server_address[1]}"
+            assert ollama_client.get_call_metrics()[-1]['host'] == urls[1]
+
+        # The busy host stays out of rotation until its health is re-checked
+        assert busy.generate_calls == 1
+        stats = {entry['url']: entry for entry in ollama_client.get_host_stats()}
+        assert stats[urls[0]]['failures'] == 1
+        assert stats[urls[1]]['requests'] == 3
+    finally:
+        ollama_client.OLLAMA_HOSTS = original_hosts
+        ollama_client.close_ollama_session()
+        for server in (busy, healthy):
+            server.shutdown()
+            server.server_close()
+    print("✓ The Ollama client fails over to another host")
+
+
+def main():
+    """Run all Ollama pool tests."""
+    tests = [
+        test_routes_to_least_loaded_host_with_model,
+        test_failed_host_is_retried_elsewhere,
+        test_missing_model_keeps_host_healthy,
+        test_client_fails_over_between_hosts
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Results: {passed}/{len(tests)} tests passed ===")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Tests for the fake Ollama server and the end-to-end pipeline benchmark.
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+SAMPLE_TEXT = (
+    "Mornings are for lists. I write everything down, then ignore half of it, "
+    "which is, frankly, the whole point of having a list.\n\n"
+) * 15
+
+
+def test_fake_server_speaks_ollama():
+    """The Ollama client works unchanged against the fake server, including streams and errors."""
+    from src.models import ollama_client
+    from src.benchmarks.fake_ollama import FakeOllamaServer
+
+    original_url = ollama_client.OLLAMA_BASE_URL
+    server = FakeOllamaServer(responses=["first canned reply", "second canned reply"], time_scale=0).start()
+    ollama_client.OLLAMA_BASE_URL = server.url
+    ollama_client.close_ollama_session()
+    try:
+        available, _ = ollama_client.check_ollama_connection("gemma3:1b")
+        assert available
+
+        assert ollama_client.analyze_with_ollama("Analyze this.", "gemma3:1b") == "first canned reply"
+        metrics = ollama_client.get_call_metrics()[-1]
+        assert metrics['prompt_eval_count'] > 0 and metrics['eval_count'] == 3
+
+        tokens = []
+        streamed = ollama_client.stream_with_ollama("Analyze this too.", "gemma3:1b", on_token=tokens.append)
+        assert streamed['response'] == "second canned reply" and len(tokens) == 3
+        assert streamed['metrics']['time_to_first_token'] is not None
+
+        server.error_rate = 1.0
+        assert ollama_client.analyze_with_ollama("Fail please.", "gemma3:1b").startswith("Ollama Error")
+
+        stats = server.stats()
+        assert (stats['requests'], stats['streamed'], stats['errors']) == (2, 1, 1)
+        assert server.loaded == {"gemma3:1b"}
+    finally:
+        ollama_client.OLLAMA_BASE_URL = original_url
+        ollama_client.close_ollama_session()
+        server.stop()
+    print("✓ The fake server answers generate, stream and tags like Ollama")
+
+
+def test_pipeline_benchmark_reports_latency():
+    """The harness times every stage and splits it into model wait and local compute."""
+    from src.benchmarks.pipeline import run_pipeline_benchmark, format_pipeline_report, percentile
+
+    assert percentile([1, 2, 3, 4, 5], 50) == 3
+    assert percentile([1, 2, 3, 4, 5], 95) == 4.8
+    assert percentile([], 99) is None
+
+    sample_dir = tempfile.mkdtemp()
+    sample_path = os.path.join(sample_dir, "sample.txt")
+    with open(sample_path, "w", encoding="utf-8") as f:
+        f.write(SAMPLE_TEXT)
+
+    results = run_pipeline_benchmark(
+        [sample_path], iterations=3,
+        server_options={'latency': 0.02, 'jitter': 0.01, 'tokens_per_second': 2000, 'response_tokens': 40, 'seed': 7}
+    )
+    assert set(results['stages']) == {"analyze", "generate", "transfer"}
+    for usage in results['stages'].values():
+        assert usage['runs'] == 3 and usage['errors'] == 0
+        assert usage['p50'] <= usage['p95'] <= usage['p99']
+        assert usage['model_calls'] >= 3 and usage['model_wait_share'] > 0.5
+        assert usage['throughput'] > 0
+    # Every iteration reaches the server; nothing is served from the response cache
+    assert results['server']['requests'] == sum(usage['model_calls'] for usage in results['stages'].values())
+
+    report = format_pipeline_report(results)
+    assert "p95" in report and "transfer" in report
+    print("✓ The pipeline benchmark reports throughput, percentiles and model wait")
+
+
+def main():
+    """Run all pipeline benchmark tests."""
+    tests = [
+        test_fake_server_speaks_ollama,
+        test_pipeline_benchmark_reports_latency
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Results: {passed}/{len(tests)} tests passed ===")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
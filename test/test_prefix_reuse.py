@@ -0,0 +1,106 @@
+"""
+Tests for prompt prefix reuse.
+Prompts must share a stable prefix across requests so Ollama can serve it
+from its cache; the benchmark runs against a simulated prefix cache.
+"""
+
+import sys
+import os
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+SAMPLE_FILES = [
+    os.path.join(project_root, "default text", name)
+    for name in ("about_my_pet.txt", "about_my_pet_1.txt", "about_my_pet_2.txt")
+]
+
+
+def _shared_prefix_length(first, second):
+    length = 0
+    for a, b in zip(first, second):
+        if a != b:
+            break
+        length += 1
+    return length
+
+
+def test_prompts_share_stable_prefix():
+    """Analysis, generation and transfer prompts put the variable input last."""
+    from src.analysis.prompts import create_enhanced_deep_prompt, create_deep_prompt_prefix
+    from src.analysis.analyzer import create_statistical_style_profile
+    from src.generation import ContentGenerator, StyleTransfer
+
+    user_profile = {'name': "Test Writer"}
+    prefix = create_deep_prompt_prefix(user_profile)
+    first = create_enhanced_deep_prompt("First sample text.", user_profile)
+    second = create_enhanced_deep_prompt("Another, different sample.", user_profile)
+    assert first.startswith(prefix) and second.startswith(prefix)
+
+    profile = create_statistical_style_profile(SAMPLE_FILES, user_profile)
+    generator = ContentGenerator()
+    essence = generator._extract_style_essence(profile)
+    emails = [
+        generator._build_generation_prompt(essence, "email", topic, 200, tone="formal")
+        for topic in ("A team offsite", "Quarterly results")
+    ]
+    assert _shared_prefix_length(*emails) > len(emails[0]) * 0.8
+    assert emails[0].rstrip().endswith("specified writing style:")
+
+    transfer = StyleTransfer()
+    target_style = transfer._extract_style_characteristics(profile)
+    transfers = [
+        transfer._build_transfer_prompt(content, {}, target_style, "tone_shift", 0.5, [])
+        for content in ("The meeting is at noon.", "Sales rose sharply last quarter.")
+    ]
+    shared = _shared_prefix_length(*transfers)
+    assert transfers[0][shared:].startswith("The meeting is at noon.")
+    print("✓ Prompts keep a stable prefix ahead of the variable input")
+
+
+def test_benchmark_measures_prefix_reuse():
+    """A warm prefix-first layout evaluates fewer prompt tokens than variable-first."""
+    from src.benchmarks.prefix_reuse import run_prefix_reuse_benchmark, format_prefix_report
+    from src.utils.text_processing import estimate_tokens
+
+    previous = [""]
+
+    def simulated_prefix_cache(prompt):
+        # Like Ollama, only the part after the prefix shared with the last prompt is evaluated
+        evaluated = prompt[_shared_prefix_length(previous[0], prompt):]
+        previous[0] = prompt
+        count = estimate_tokens(evaluated)
+        return {'prompt_eval_count': count, 'prompt_eval_seconds': count / 1000}
+
+    results = run_prefix_reuse_benchmark(SAMPLE_FILES, send=simulated_prefix_cache)
+    layouts = results['layouts']
+
+    assert results['calls'] >= len(SAMPLE_FILES)
+    assert set(layouts) == {"variable_first", "prefix_first"}
+    assert layouts['prefix_first']['warm_mean_count'] < layouts['variable_first']['warm_mean_count'] / 2
+    assert "warm" in format_prefix_report(results)
+    print("✓ Benchmark shows fewer prompt-eval tokens with a shared prefix")
+
+
+def main():
+    """Run all prefix reuse tests."""
+    tests = [
+        test_prompts_share_stable_prefix,
+        test_benchmark_measures_prefix_reuse
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Results: {passed}/{len(tests)} tests passed ===")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+Tests for the SQLite profile catalog and the storage functions that use it.
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import time
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+
+def _profile(name, model="gemma3:1b", words=120, flesch=65.0):
+    return {
+        'user_profile': {'name': name},
+        'metadata': {
+            'analysis_date': "2026-01-02 03:04:05",
+            'analysis_method': "Local Ollama",
+            'model_used': model,
+            'processing_mode': "enhanced",
+            'total_samples': 2,
+            'combined_text_length': words * 5,
+            'file_info': [{'filename': "a.txt", 'word_count': words, 'character_count': words * 5}]
+        },
+        'text_statistics': {'word_count': words, 'avg_words_per_sentence': 14.5, 'lexical_diversity': 0.61},
+        'readability_metrics': {'flesch_reading_ease': flesch, 'flesch_kincaid_grade': 8.1}
+    }
+
+
+def _write_profile(directory, name, profile, age_seconds=0):
+    path = os.path.join(directory, f"{name}_stylometric_profile_2026010{len(name) % 10}_000000.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(profile, f)
+    if age_seconds:
+        modified = time.time() - age_seconds
+        os.utime(path, (modified, modified))
+    return path
+
+
+def test_catalog_lists_filters_and_sorts():
+    """Rows carry the profile's metadata and metrics and can be filtered and sorted."""
+    from src.storage.profile_catalog import ProfileCatalog
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        catalog = ProfileCatalog(os.path.join(work_dir, "catalog.sqlite3"), directories=[work_dir])
+        first = _write_profile(work_dir, "Ann", _profile("Ann", words=300, flesch=40.0), age_seconds=60)
+        second = _write_profile(work_dir, "Bo", _profile("Bo", model="gpt-oss:20b", flesch=80.0))
+        catalog.add(first, _profile("Ann", words=300, flesch=40.0))
+        catalog.add(second, _profile("Bo", model="gpt-oss:20b", flesch=80.0))
+        catalog.add(second, _profile("Bo", model="gpt-oss:20b", flesch=80.0))
+
+        rows = catalog.list()
+        assert [row['user_name'] for row in rows] == ["Bo", "Ann"] and catalog.count() == 2
+        assert rows[1]['word_count'] == 300 and rows[1]['lexical_diversity'] == 0.61
+        assert rows[1]['model_used'] == "gemma3:1b" and rows[1]['size'] == os.path.getsize(first)
+
+        assert [row['user_name'] for row in catalog.list(model_used="gpt-oss:20b")] == ["Bo"]
+        assert [row['user_name'] for row in catalog.list(sort_by="flesch_reading_ease", descending=False)] == ["Ann", "Bo"]
+        assert [row['user_name'] for row in catalog.list(older_than=time.time() - 30)] == ["Ann"]
+        assert len(catalog.list(limit=1)) == 1
+
+        for bad_call in (lambda: catalog.list(sort_by="size; DROP TABLE profiles"), lambda: catalog.list(size=1)):
+            try:
+                bad_call()
+                assert False, "an unknown column was accepted"
+            except ValueError:
+                pass
+    finally:
+        shutil.rmtree(work_dir)
+    print("✓ The catalog lists, filters and sorts profiles")
+
+
+def test_rebuild_reads_only_changed_files():
+    """A rebuild indexes new and changed files, skips unchanged ones and drops deleted ones."""
+    from src.storage.profile_catalog import ProfileCatalog
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        catalog = ProfileCatalog(os.path.join(work_dir, "catalog.sqlite3"), directories=[work_dir])
+        ann = _write_profile(work_dir, "Ann", _profile("Ann"))
+        bo = _write_profile(work_dir, "Bo", _profile("Bo"))
+        broken = os.path.join(work_dir, "Cy_stylometric_profile_20260101_000000.json")
+        with open(broken, "w", encoding="utf-8") as f:
+            f.write("{not json")
+
+        result = catalog.rebuild()
+        assert (result['indexed'], result['unchanged'], result['removed'], result['failed']) == (2, 0, 0, 1)
+        assert result['errors'][0]['filename'] == os.path.normpath(broken)
+
+        os.remove(bo)
+        with open(ann, "w", encoding="utf-8") as f:
+            json.dump(_profile("Ann", words=999), f)
+        os.utime(ann, (time.time() + 5, time.time() + 5))
+        os.remove(broken)
+
+        result = catalog.rebuild()
+        assert (result['indexed'], result['unchanged'], result['removed'], result['failed']) == (1, 0, 1, 0)
+        assert [row['word_count'] for row in catalog.list()] == [999]
+        assert catalog.rebuild()['unchanged'] == 1 and catalog.rebuild(full=True)['indexed'] == 1
+    finally:
+        shutil.rmtree(work_dir)
+    print("✓ Rebuilds read only new and changed profile files")
+
+
+def test_storage_functions_use_the_catalog():
+    """Saving indexes the profile; listing, cleanup and the CLI read the catalog."""
+    from src.storage import profile_catalog, local_storage
+    from src.main import build_arg_parser, handle_profiles_command
+
+    work_dir = tempfile.mkdtemp()
+    original_dir = os.getcwd()
+    original_catalog = profile_catalog._default_catalog
+    os.chdir(work_dir)
+    profile_catalog._default_catalog = None
+    try:
+        saved = local_storage.save_style_profile_locally(_profile("Dee"))
+        assert saved['success'] and os.path.exists(profile_catalog.PROFILE_CATALOG_PATH)
+        profiles = local_storage.list_local_profiles()
+        assert [p['filename'] for p in profiles] == [os.path.normpath(saved['json_file'])]
+        assert profiles[0]['user_name'] == "Dee" and profiles[0]['word_count'] == 120
+        assert local_storage.list_local_profiles(user_name="Nobody") == []
+
+        args = build_arg_parser().parse_args(["profiles", "rebuild"])
+        assert handle_profiles_command(args) == 0
+
+        assert local_storage.cleanup_old_reports(days_to_keep=1)['deleted_count'] == 0
+        old = time.time() - 3 * 24 * 60 * 60
+        os.utime(saved['json_file'], (old, old))
+        profile_catalog.get_profile_catalog().rebuild()
+        result = local_storage.cleanup_old_reports(days_to_keep=1)
+        assert result['success'] and sorted(result['deleted_files']) == sorted([saved['json_file'], saved['txt_file']])
+        assert local_storage.list_local_profiles() == []
+    finally:
+        os.chdir(original_dir)
+        profile_catalog._default_catalog = original_catalog
+        shutil.rmtree(work_dir)
+    print("✓ Saving, listing and cleanup use the profile catalog")
+
+
+def main():
+    """Run all profile catalog tests."""
+    tests = [
+        test_catalog_lists_filters_and_sorts,
+        test_rebuild_reads_only_changed_files,
+        test_storage_functions_use_the_catalog
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Results: {passed}/{len(tests)} tests passed ===")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
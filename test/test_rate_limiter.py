@@ -0,0 +1,173 @@
+"""
+Tests for cloud API rate limiting.
+A fake clock replaces real sleeping, and API clients are fakes.
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+
+class _FakeClock:
+    """Monotonic clock that only moves when something sleeps."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class RateLimitError(Exception):
+    """Shaped like the OpenAI SDK's 429 error."""
+
+    def __init__(self, message, headers=None):
+        super().__init__(message)
+        self.status_code = 429
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+def test_buckets_pace_requests_and_tokens():
+    """Requests beyond the burst wait for the bucket to refill at the configured rate."""
+    from src.models.rate_limiter import RateLimiter
+
+    clock = _FakeClock()
+    limiter = RateLimiter("Test", requests_per_minute=60, clock=clock, sleep=clock.sleep)
+    burst = int(limiter._requests.capacity)
+
+    started = clock.now
+    for _ in range(burst + 5):
+        limiter.acquire()
+    # The burst goes out at once, then one request per second
+    assert clock.now - started == 5.0
+    assert limiter.stats['calls'] == burst + 5
+
+    clock = _FakeClock()
+    limiter = RateLimiter("Test", requests_per_minute=1000, tokens_per_minute=6000, clock=clock, sleep=clock.sleep)
+    started = clock.now
+    for _ in range(4):
+        limiter.acquire(tokens=500)
+    # 6000 tokens per minute is 100 per second with a 1000-token burst
+    assert clock.now - started == 10.0
+    print("✓ Token buckets pace requests and tokens per minute")
+
+
+def test_rate_limited_calls_are_retried():
+    """HTTP 429 pauses the backend for retry-after (plus jitter) and the call is retried."""
+    from src.models.rate_limiter import RateLimiter, get_retry_after, is_rate_limit_error
+
+    clock = _FakeClock()
+    limiter = RateLimiter("Test", requests_per_minute=600, base_delay=0.5, max_retries=3,
+                          clock=clock, sleep=clock.sleep)
+
+    attempts = []
+
+    def flaky():
+        attempts.append(clock.now)
+        if len(attempts) == 1:
+            raise RateLimitError("Too many requests", headers={'retry-after': "2"})
+        return "analysis"
+
+    assert limiter.call(flaky, tokens=100) == "analysis"
+    assert 2.0 <= attempts[1] - attempts[0] <= 2.5
+    assert limiter.stats['rate_limited'] == 1
+
+    def always_limited():
+        raise RateLimitError("Too many requests")
+
+    try:
+        limiter.call(always_limited)
+        assert False, "expected the rate limit error once retries are exhausted"
+    except RateLimitError:
+        pass
+    assert limiter.stats['rate_limited'] == 4
+
+    def broken():
+        attempts.append("broken")
+        raise ValueError("bad request")
+
+    attempts.clear()
+    try:
+        limiter.call(broken)
+    except ValueError:
+        pass
+    assert attempts == ["broken"]
+
+    assert get_retry_after(RateLimitError("slow down", headers={'retry-after-ms': "1500"})) == 1.5
+    assert get_retry_after(Exception("429 Resource has been exhausted. Please retry in 37.5s.")) == 37.5
+    # google-api-core's ResourceExhausted prints its RetryInfo detail without a unit
+    quota_message = ("429 You exceeded your current quota. [violations {\n  quota_metric: \"generate_content\"\n}\n"
+                     ", retry_delay {\n  seconds: 37\n}\n]")
+    assert get_retry_after(Exception(quota_message)) == 37
+    assert get_retry_after(Exception("retry_delay { seconds: 2 nanos: 500000000 }")) == 2.5
+    retry_info = type("RetryInfo", (), {'retry_delay': type("Duration", (), {'seconds': 12, 'nanos': 0})()})()
+    assert get_retry_after(type("ResourceExhausted", (Exception,), {'details': [retry_info]})("quota")) == 12
+    assert is_rate_limit_error(type("ResourceExhausted", (Exception,), {})("quota"))
+    assert not is_rate_limit_error(ValueError("bad request"))
+    print("✓ Rate-limited calls honour retry-after and are retried")
+
+
+def test_openai_client_survives_429():
+    """analyze_with_openai retries through the shared limiter instead of failing."""
+    from src.models import rate_limiter
+    from src.models.openai_client import analyze_with_openai
+
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            raise RateLimitError("Rate limit reached", headers={'retry-after': "1"})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="style analysis"))])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    clock = _FakeClock()
+    original = rate_limiter._limiters.get("openai")
+    rate_limiter._limiters["openai"] = rate_limiter.RateLimiter(
+        "OpenAI", 500, 60000, clock=clock, sleep=clock.sleep
+    )
+    try:
+        assert analyze_with_openai(client, "Analyze this text.", max_tokens=200) == "style analysis"
+    finally:
+        if original is None:
+            rate_limiter._limiters.pop("openai")
+        else:
+            rate_limiter._limiters["openai"] = original
+
+    assert len(calls) == 2 and calls[1]['max_tokens'] == 200
+    assert clock.sleeps and clock.sleeps[0] >= 1.0
+    print("✓ The OpenAI client waits out a 429 and succeeds")
+
+
+def main():
+    """Run all rate limiter tests."""
+    tests = [
+        test_buckets_pace_requests_and_tokens,
+        test_rate_limited_calls_are_retried,
+        test_openai_client_survives_429
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Results: {passed}/{len(tests)} tests passed ===")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+"""
+Tests for resilient analysis calls: typed errors, retries, failover,
+hedging and circuit breaking. Model calls are replaced with fakes.
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+
+class _FakeClock:
+    """Clock whose time only moves when the test says so."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _fake_generate(replies, calls):
+    """Return a generate_text stand-in answering per model from lists of replies."""
+    lock = threading.Lock()
+
+    def generate(prompt, use_local, model_name, api_type, api_client, processing_mode, **kwargs):
+        key = model_name if use_local else api_type
+        with lock:
+            calls.append(key)
+            reply = replies[key].pop(0) if len(replies[key]) > 1 else replies[key][0]
+        if callable(reply):
+            return reply()
+        return reply
+
+    return generate
+
+
+def test_errors_are_classified_and_breakers_trip():
+    """Client error text maps to typed errors, and a breaker opens, half-opens and closes."""
+    from src.models.resilience import (
+        classify_error, CircuitBreaker, ModelTimeoutError, ModelUnavailableError, ModelRequestError
+    )
+
+    timeout = classify_error("Timeout Error: gemma3:1b did not answer within 180s", "ollama:gemma3:1b")
+    assert isinstance(timeout, ModelTimeoutError) and not timeout.retryable
+    assert timeout.backend == "ollama:gemma3:1b"
+    assert isinstance(classify_error("Ollama Error: HTTP 503"), ModelUnavailableError)
+    assert classify_error("Ollama Error: HTTP 503").retryable
+    assert isinstance(classify_error("OpenAI API Error: HTTP 400 bad request"), ModelRequestError)
+    rate_limited = classify_error("OpenAI API Error: 429 Too Many Requests")
+    assert isinstance(rate_limited, ModelUnavailableError) and not rate_limited.retryable
+
+    clock = _FakeClock()
+    breaker = CircuitBreaker("ollama:gemma3:1b", failure_threshold=2, reset_seconds=30, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock.now += 31
+    assert breaker.allow() and breaker.state == "half_open"
+    # Only one trial call goes through while half-open
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+    print("✓ Errors are typed and circuit breakers open, half-open and close")
+
+
+def test_retries_then_fails_over():
+    """Unavailable backends are retried with backoff, then the fallback answers."""
+    from src.models.resilience import ResilientDispatcher, analysis_targets, make_target, ModelTimeoutError
+
+    sleeps = []
+    dispatcher = ResilientDispatcher(max_retries=2, base_delay=1.0, max_delay=4.0, hedging=False,
+                                     clock=_FakeClock(), sleep=sleeps.append)
+    targets = analysis_targets(True, "gpt-oss:20b", fallbacks=[make_target(True, "gemma3:1b")])
+    assert [target['label'] for target in targets] == ["ollama:gpt-oss:20b", "ollama:gemma3:1b"]
+
+    calls = []
+    generate = _fake_generate({
+        "gpt-oss:20b": ["Ollama Error: HTTP 503", "Ollama Error: HTTP 503", "Primary analysis"],
+        "gemma3:1b": ["Fallback analysis"]
+    }, calls)
+    assert dispatcher.generate("Analyze.", targets, generate=generate) == "Primary analysis"
+    assert calls == ["gpt-oss:20b"] * 3 and len(sleeps) == 2
+    assert all(0 <= delay <= 4.0 for delay in sleeps)
+
+    # Timeouts are not retried; the fallback is asked straight away
+    calls.clear()
+    generate = _fake_generate({
+        "gpt-oss:20b": ["Timeout Error: no answer within 180s"],
+        "gemma3:1b": ["Fallback analysis"]
+    }, calls)
+    assert dispatcher.generate("Analyze.", targets, generate=generate) == "Fallback analysis"
+    assert calls == ["gpt-oss:20b", "gemma3:1b"]
+    assert dispatcher.counters['retries'] == 2 and dispatcher.counters['failovers'] == 1
+
+    # With every target failing, the most informative error is raised
+    generate = _fake_generate({
+        "gpt-oss:20b": ["Timeout Error: no answer within 180s"],
+        "gemma3:1b": ["Timeout Error: no answer within 180s"]
+    }, [])
+    try:
+        dispatcher.generate("Analyze.", targets, generate=generate)
+        assert False, "expected a ModelTimeoutError"
+    except ModelTimeoutError as e:
+        assert str(e).startswith("Timeout Error")
+    print("✓ Failing calls are retried with backoff, then fail over")
+
+
+def test_open_circuit_skips_backend():
+    """Once a backend's breaker opens, calls go to the fallback without touching it."""
+    from src.models.resilience import ResilientDispatcher, make_target
+    from src.config.settings import CIRCUIT_FAILURE_THRESHOLD
+
+    dispatcher = ResilientDispatcher(max_retries=0, hedging=False, clock=_FakeClock(), sleep=lambda seconds: None)
+    targets = [make_target(False, api_type="openai", api_client=object()), make_target(True, "gemma3:1b")]
+
+    calls = []
+    generate = _fake_generate({
+        "openai": ["OpenAI API Error: HTTP 502 bad gateway"],
+        "gemma3:1b": ["Local analysis"]
+    }, calls)
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD + 2):
+        assert dispatcher.generate("Analyze.", targets, generate=generate) == "Local analysis"
+    assert calls.count("openai") == CIRCUIT_FAILURE_THRESHOLD
+    assert calls.count("gemma3:1b") == CIRCUIT_FAILURE_THRESHOLD + 2
+    assert dispatcher.stats()['targets']['openai']['state'] == "open"
+    print("✓ An open circuit sends work straight to the fallback")
+
+
+def test_slow_primary_is_hedged():
+    """A call slower than the primary's usual p95 is raced against the fallback."""
+    from src.models.resilience import ResilientDispatcher, make_target
+
+    dispatcher = ResilientDispatcher(hedging=True, hedge_min_samples=3, hedge_min_delay=0.05,
+                                     sleep=lambda seconds: None)
+    targets = [make_target(False, api_type="gemini", api_client=object()), make_target(True, "gemma3:1b")]
+
+    calls = []
+    generate = _fake_generate({"gemini": ["Cloud analysis"], "gemma3:1b": ["Local analysis"]}, calls)
+    for _ in range(3):
+        assert dispatcher.generate("Analyze.", targets, generate=generate) == "Cloud analysis"
+    assert dispatcher.hedge_delay("gemini") == 0.05
+
+    release = threading.Event()
+
+    def stalled():
+        release.wait(5)
+        return "Late cloud analysis"
+
+    generate = _fake_generate({"gemini": [stalled], "gemma3:1b": ["Local analysis"]}, calls)
+    started = time.perf_counter()
+    try:
+        assert dispatcher.generate("Analyze.", targets, generate=generate) == "Local analysis"
+        assert time.perf_counter() - started < 2
+    finally:
+        release.set()
+    assert dispatcher.counters['hedges'] == 1 and dispatcher.counters['hedge_wins'] == 1
+
+    # Streaming calls are never hedged
+    tokens = []
+    generate = _fake_generate({"gemini": ["Streamed analysis"], "gemma3:1b": ["Local analysis"]}, calls)
+    assert dispatcher.generate("Analyze.", targets, on_token=tokens.append, generate=generate) == "Streamed analysis"
+    assert dispatcher.counters['hedges'] == 1
+    print("✓ Slow calls are hedged and the first answer wins")
+
+
+def test_cancellable_calls_are_hedged():
+    """Calls carrying only a cancel event still hedge; the event stops both legs."""
+    from src.models.resilience import ResilientDispatcher, make_target
+
+    dispatcher = ResilientDispatcher(hedging=True, hedge_min_samples=3, hedge_min_delay=0.05,
+                                     sleep=lambda seconds: None)
+    targets = [make_target(True, "gpt-oss:20b"), make_target(True, "gemma3:1b")]
+    stalled_models = set()
+    stopped = []
+
+    def generate(prompt, use_local, model_name, api_type, api_client, processing_mode, cancel_event=None, **kwargs):
+        if model_name in stalled_models:
+            # Stand-in for an Ollama stream, which checks its cancel flag between tokens
+            deadline = time.perf_counter() + 5
+            while not cancel_event.is_set() and time.perf_counter() < deadline:
+                time.sleep(0.01)
+            stopped.append(model_name)
+            return f"Partial {model_name}"
+        return f"Analysis from {model_name}"
+
+    for _ in range(3):
+        assert dispatcher.generate("Analyze.", targets, cancel_event=threading.Event(),
+                                   generate=generate) == "Analysis from gpt-oss:20b"
+
+    # A slow primary is raced against the fallback, and the losing leg is stopped
+    stalled_models.add("gpt-oss:20b")
+    assert dispatcher.generate("Analyze.", targets, cancel_event=threading.Event(),
+                               generate=generate) == "Analysis from gemma3:1b"
+    assert dispatcher.counters['hedges'] == 1 and dispatcher.counters['hedge_wins'] == 1
+    deadline = time.perf_counter() + 2
+    while not stopped and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    assert stopped == ["gpt-oss:20b"]
+
+    # Ctrl+C (the caller's event) stops both legs of a race
+    stalled_models.add("gemma3:1b")
+    cancel_event = threading.Event()
+    threading.Timer(0.2, cancel_event.set).start()
+    started = time.perf_counter()
+    assert dispatcher.generate("Analyze.", targets, cancel_event=cancel_event,
+                               generate=generate).startswith("Partial")
+    assert time.perf_counter() - started < 2
+    assert dispatcher.counters['hedges'] == 2
+    print("✓ Cancellable calls are hedged and stop on the caller's event")
+
+
+def test_cloud_backend_hedges_to_local_fallback():
+    """A cloud backend's FALLBACK_MODELS entry is hedged to from an interactive, cancellable call."""
+    from src.models import resilience
+    from src.models.resilience import ResilientDispatcher, analysis_targets
+
+    client = object()
+    resilience.FALLBACK_MODELS["gemini"] = "gemma3:1b"
+    try:
+        targets = analysis_targets(False, api_type="gemini", api_client=client)
+    finally:
+        del resilience.FALLBACK_MODELS["gemini"]
+    assert [target['label'] for target in targets] == ["gemini", "ollama:gemma3:1b"]
+    assert analysis_targets(False, api_type="gemini", api_client=client)[1:] == []
+
+    dispatcher = ResilientDispatcher(hedging=True, hedge_min_samples=3, hedge_min_delay=0.05,
+                                     sleep=lambda seconds: None)
+    calls = []
+    generate = _fake_generate({"gemini": ["Cloud analysis"], "gemma3:1b": ["Local analysis"]}, calls)
+    for _ in range(3):
+        assert dispatcher.generate("Analyze.", targets, cancel_event=threading.Event(),
+                                   generate=generate) == "Cloud analysis"
+
+    release = threading.Event()
+
+    def stalled():
+        release.wait(5)
+        return "Late cloud analysis"
+
+    generate = _fake_generate({"gemini": [stalled], "gemma3:1b": ["Local analysis"]}, calls)
+    try:
+        assert dispatcher.generate("Analyze.", targets, cancel_event=threading.Event(),
+                                   generate=generate) == "Local analysis"
+    finally:
+        release.set()
+    assert dispatcher.counters['hedges'] == 1 and dispatcher.counters['hedge_wins'] == 1
+    print("✓ Cloud backends hedge to their local fallback")
+
+
+def main():
+    """Run all resilience tests."""
+    tests = [
+        test_errors_are_classified_and_breakers_trip,
+        test_retries_then_fails_over,
+        test_open_circuit_skips_backend,
+        test_slow_primary_is_hedged,
+        test_cancellable_calls_are_hedged,
+        test_cloud_backend_hedges_to_local_fallback
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Results: {passed}/{len(tests)} tests passed ===")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
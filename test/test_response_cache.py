@@ -0,0 +1,205 @@
+"""
+Tests for the model response cache and cached backend dispatch.
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import time
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+
+def test_cache_key_covers_request():
+    """Keys are stable and change with any part of the request."""
+    from src.storage.response_cache import make_cache_key
+
+    key = make_cache_key("ollama", "gemma3:1b", "prompt", {'temperature': 0.2})
+    assert key == make_cache_key("ollama", "gemma3:1b", "prompt", {'temperature': 0.2})
+    assert key != make_cache_key("ollama", "gemma3:1b", "prompt", {'temperature': 0.3})
+    assert key != make_cache_key("ollama", "gpt-oss:20b", "prompt", {'temperature': 0.2})
+    assert key != make_cache_key("openai", "gemma3:1b", "prompt", {'temperature': 0.2})
+    assert key != make_cache_key("ollama", "gemma3:1b", "prompt!", {'temperature': 0.2})
+    print("✓ Cache keys cover backend, model, prompt and options")
+
+
+def test_get_put_expiry_and_purge():
+    """Entries round-trip, expire after the TTL and can be purged."""
+    from src.storage.response_cache import ResponseCache
+
+    cache_dir = tempfile.mkdtemp()
+    try:
+        cache = ResponseCache(cache_dir, max_bytes=1024 * 1024, ttl_seconds=60)
+        cache.put("a" * 64, "first response")
+        assert cache.get("a" * 64) == "first response"
+        assert cache.get("b" * 64) is None
+        assert cache.info()['entries'] == 1
+
+        expired = ResponseCache(cache_dir, max_bytes=1024 * 1024, ttl_seconds=-1)
+        assert expired.get("a" * 64) is None
+        assert cache.info()['entries'] == 0
+
+        cache.put("c" * 64, "kept")
+        assert cache.purge(expired_only=True) == 0
+        assert cache.purge() == 1
+        assert cache.info()['entries'] == 0
+    finally:
+        shutil.rmtree(cache_dir)
+    print("✓ Cache get/put, expiry and purge work")
+
+
+def test_lru_eviction_by_size():
+    """The least recently used entries are evicted once over the byte budget."""
+    from src.storage.response_cache import ResponseCache
+
+    cache_dir = tempfile.mkdtemp()
+    try:
+        cache = ResponseCache(cache_dir, max_bytes=1024 * 1024, ttl_seconds=None)
+        keys = [str(index) * 64 for index in range(3)]
+        for index, key in enumerate(keys):
+            cache.put(key, "x" * 400)
+            last_used = time.time() - 100 + index
+            os.utime(cache._entry_path(key), (last_used, last_used))
+
+        # Room for three entries but not four
+        entry_size = cache.info()['total_bytes'] // 3
+        cache.max_bytes = entry_size * 3 + entry_size // 2
+
+        # Touch the oldest entry so the second one becomes least recently used
+        os.utime(cache._entry_path(keys[0]), (time.time() - 10, time.time() - 10))
+        cache.put("3" * 64, "x" * 400)
+
+        assert cache.info()['total_bytes'] <= cache.max_bytes
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.get("3" * 64) is not None
+    finally:
+        shutil.rmtree(cache_dir)
+    print("✓ LRU eviction keeps the cache within its size limit")
+
+
+def test_puts_track_size_without_scanning():
+    """Writes under budget keep a running total instead of listing the directory."""
+    from src.storage.response_cache import ResponseCache
+
+    cache_dir = tempfile.mkdtemp()
+    try:
+        ResponseCache(cache_dir).put("a" * 64, "existing")
+        cache = ResponseCache(cache_dir, max_bytes=1024 * 1024, ttl_seconds=None)
+
+        scans = []
+        iter_entries = cache._iter_entries
+        cache._iter_entries = lambda: scans.append(True) or iter_entries()
+        for index in range(1, 5):
+            cache.put(str(index) * 64, "x" * 100)
+        cache.put("1" * 64, "y" * 300)
+        assert not scans
+        assert cache._total_bytes == sum(size for _, size, _ in iter_entries())
+
+        cache.max_bytes = cache._total_bytes
+        cache.put("5" * 64, "x" * 100)
+        assert scans
+        assert cache._total_bytes == sum(size for _, size, _ in iter_entries()) <= cache.max_bytes
+    finally:
+        shutil.rmtree(cache_dir)
+    print("✓ Cache writes keep a running size total")
+
+
+def test_dispatch_serves_repeats_from_cache():
+    """Identical requests reach the backend once; errors are never cached."""
+    from src.models import dispatch
+    from src.storage.response_cache import ResponseCache
+
+    cache_dir = tempfile.mkdtemp()
+    calls = []
+
+    def fake_openai(api_client, prompt, max_tokens=3000):
+        calls.append(prompt)
+        return "OpenAI API Error: rate limited" if prompt == "fails" else f"answer to {prompt}"
+
+    original_openai = dispatch.analyze_with_openai
+    original_get_cache = dispatch.get_response_cache
+    cache = ResponseCache(cache_dir)
+    dispatch.analyze_with_openai = fake_openai
+    dispatch.get_response_cache = lambda: cache
+    try:
+        for _ in range(3):
+            assert dispatch.generate_text("hello", False, api_type="openai", api_client=object()) == "answer to hello"
+        assert calls == ["hello"]
+
+        for _ in range(2):
+            dispatch.generate_text("fails", False, api_type="openai", api_client=object())
+        assert calls.count("fails") == 2
+
+        dispatch.generate_text("hello", False, api_type="openai", api_client=object(), use_cache=False)
+        assert calls.count("hello") == 2
+    finally:
+        dispatch.analyze_with_openai = original_openai
+        dispatch.get_response_cache = original_get_cache
+        shutil.rmtree(cache_dir)
+    print("✓ Dispatch caches successful responses only")
+
+
+def test_ollama_key_covers_num_ctx():
+    """A response made with a smaller context is not served for a larger one."""
+    from src.models import dispatch, ollama_client
+    from src.models.token_budget import plan_request
+
+    budget = plan_request("word", "ollama", "gemma3:1b")
+    original_pins = dict(ollama_client._pinned_contexts)
+    ollama_client._pinned_contexts.clear()
+    try:
+        small = dispatch._request_signature("ollama", "gemma3:1b", "enhanced", budget)
+        ollama_client._pinned_contexts["gemma3:1b"] = budget['num_ctx'] * 2
+        large = dispatch._request_signature("ollama", "gemma3:1b", "enhanced", budget)
+    finally:
+        ollama_client._pinned_contexts.clear()
+        ollama_client._pinned_contexts.update(original_pins)
+    assert small[1]['num_ctx'] == budget['num_ctx']
+    assert large[1]['num_ctx'] == min(budget['num_ctx'] * 2, budget['context_window'])
+    assert large[1]['num_ctx'] != small[1]['num_ctx']
+    print("✓ Ollama cache keys cover num_ctx")
+
+
+def test_cache_commands_and_menu_fallthrough():
+    """The cache subcommands parse strictly; other documented options start the menu."""
+    from src.main import parse_cli_args
+
+    args = parse_cli_args(["cache", "purge", "--expired"])
+    assert args.command == "cache" and args.cache_command == "purge" and args.expired
+
+    args = parse_cli_args(["--analyze", "sample.txt", "--local", "--output", "my_analysis"])
+    assert args.command is None
+    assert parse_cli_args(["--interactive"]).interactive
+    print("✓ Cache commands parse and other options fall through to the menu")
+
+
+def main():
+    """Run all response cache tests."""
+    tests = [
+        test_cache_key_covers_request,
+        test_get_put_expiry_and_purge,
+        test_lru_eviction_by_size,
+        test_puts_track_size_without_scanning,
+        test_dispatch_serves_repeats_from_cache,
+        test_ollama_key_covers_num_ctx,
+        test_cache_commands_and_menu_fallthrough
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Results: {passed}/{len(tests)} tests passed ===")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
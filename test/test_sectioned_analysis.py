@@ -0,0 +1,134 @@
+"""
+Tests for sectioned analysis: one concurrent prompt per PART of the
+25-point framework, cached per PART and assembled into one analysis.
+Model calls are replaced with fakes.
+"""
+
+import sys
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+SAMPLE_TEXT = "Honestly? I rewrite every opening line three times.\n\n" * 10
+
+_PART_RE = re.compile(r'covering ONLY PART (\d)')
+
+
+def test_section_prompts_split_the_framework():
+    """Each section prompt holds exactly its PART's points; the full prompt is unchanged."""
+    from src.analysis.prompts import (
+        ANALYSIS_PARTS, ANALYSIS_FRAMEWORK, create_deep_prompt_prefix, create_section_prompt
+    )
+
+    assert ANALYSIS_FRAMEWORK in create_deep_prompt_prefix()
+    for part, (title, first_point, last_point) in ANALYSIS_PARTS.items():
+        prompt = create_section_prompt(part, SAMPLE_TEXT)
+        assert f"**PART {part}: {title}**" in prompt and prompt.endswith(SAMPLE_TEXT + "\n")
+        points = [int(number) for number in re.findall(r'^(\d+)\. [A-Z]\w+(?: [A-Z]\w+)*:', prompt, re.MULTILINE)]
+        assert points == list(range(first_point, last_point + 1)), (part, points)
+    print("✓ Section prompts split the 25-point framework by PART")
+
+
+def test_sectioned_analysis_runs_parts_concurrently():
+    """Every PART is its own call, calls overlap, and the answers keep the 25-point layout."""
+    from src.analysis import analyzer
+    from src.analysis.confidence import split_analysis_parts
+
+    lock = threading.Lock()
+    state = {'active': 0, 'peak': 0, 'sections': set()}
+
+    def fake_generate(prompt, use_local, model_name, api_type, api_client, processing_mode, **kwargs):
+        with lock:
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+            state['sections'].add(kwargs.get('sections'))
+        time.sleep(0.02)
+        with lock:
+            state['active'] -= 1
+        part = int(_PART_RE.search(prompt).group(1))
+        # Part 3 answers without its heading
+        heading = "" if part == 3 else f"**PART {part}: TITLE**\n"
+        return f"{heading}Point analysis for part {part}."
+
+    original_generate_text = analyzer.generate_text
+    analyzer.generate_text = fake_generate
+    try:
+        analysis = analyzer.analyze_style(SAMPLE_TEXT, True, "gemma3:1b", sectioned=True)
+    finally:
+        analyzer.generate_text = original_generate_text
+
+    preamble, parts = split_analysis_parts(analysis)
+    assert preamble == "" and sorted(parts) == list(range(1, 8))
+    assert parts[3] == "**PART 3: STYLISTIC DNA**\nPoint analysis for part 3."
+    assert state['peak'] > 1 and state['sections'] == {4}
+    print("✓ Sectioned analysis runs the PARTs concurrently and assembles them")
+
+
+def test_failed_parts_are_retried_alone():
+    """Successful PARTs come from the response cache; only the failed PART is generated again."""
+    from src.analysis import analyzer
+    from src.models import dispatch
+    from src.models.resilience import get_resilient_dispatcher
+    from src.storage.response_cache import ResponseCache
+
+    calls = []
+    failures = []
+
+    def fake_ollama(prompt, model_name, processing_mode, budget=None, **kwargs):
+        part = int(_PART_RE.search(prompt).group(1))
+        calls.append(part)
+        if part == 5 and not failures:
+            failures.append(part)
+            return "Ollama Error: model crashed"
+        return f"**PART {part}: TITLE**\n{part * 4}. Measured {part * 1.5}% of sentences."
+
+    cache_dir = tempfile.mkdtemp()
+    cache = ResponseCache(cache_dir)
+    dispatcher = get_resilient_dispatcher()
+    original = (dispatch.analyze_with_ollama, dispatch.get_response_cache, dispatcher.max_retries)
+    dispatch.analyze_with_ollama = fake_ollama
+    dispatch.get_response_cache = lambda: cache
+    dispatcher.max_retries = 0
+    try:
+        first = analyzer.analyze_style(SAMPLE_TEXT, True, "gemma3:1b", sectioned=True, fallbacks=[])
+        assert "Section analysis failed" in first and sorted(calls) == list(range(1, 8))
+
+        calls.clear()
+        second = analyzer.analyze_style(SAMPLE_TEXT, True, "gemma3:1b", sectioned=True, fallbacks=[])
+        assert calls == [5] and "Section analysis failed" not in second
+        assert "Measured 7.5%" in second
+    finally:
+        dispatch.analyze_with_ollama, dispatch.get_response_cache, dispatcher.max_retries = original
+        shutil.rmtree(cache_dir)
+    print("✓ Failed PARTs are retried without redoing the others")
+
+
+def main():
+    """Run all sectioned analysis tests."""
+    tests = [
+        test_section_prompts_split_the_framework,
+        test_sectioned_analysis_runs_parts_concurrently,
+        test_failed_parts_are_retried_alone
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Results: {passed}/{len(tests)} tests passed ===")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+Tests for the pure-local statistical processing mode.
+Any model call fails the tests, proving the mode runs without a backend.
+"""
+
+import sys
+import os
+import json
+import tempfile
+import time
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+SAMPLE_FILES = [
+    os.path.join(project_root, "default text", name)
+    for name in ("about_my_pet.txt", "about_my_pet_1.txt", "about_my_pet_2.txt")
+]
+
+
+def _forbid_model_calls(analyzer):
+    def no_model(*args, **kwargs):
+        raise AssertionError("statistical mode must not call a model")
+
+    originals = (analyzer.generate_text, analyzer.get_user_profile)
+    analyzer.generate_text = no_model
+    analyzer.get_user_profile = lambda: {'name': "Test Writer"}
+    return originals
+
+
+def test_statistical_profile_is_local():
+    """Statistical profiles are built from local metrics without any model call."""
+    from src.analysis import analyzer
+    from src.analysis.metrics import TextStatsAccumulator
+
+    originals = _forbid_model_calls(analyzer)
+    try:
+        started = time.perf_counter()
+        profile = analyzer.create_statistical_style_profile(SAMPLE_FILES)
+        elapsed = time.perf_counter() - started
+
+        # Model parameters are not required when the mode is statistical
+        via_enhanced = analyzer.create_enhanced_style_profile(SAMPLE_FILES, processing_mode="statistical")
+    finally:
+        analyzer.generate_text, analyzer.get_user_profile = originals
+
+    expected = TextStatsAccumulator()
+    for file_path in SAMPLE_FILES:
+        expected.merge(TextStatsAccumulator.from_file(file_path))
+
+    assert profile['profile_created']
+    assert profile['metadata']['processing_mode'] == "statistical"
+    assert profile['metadata']['total_samples'] == len(SAMPLE_FILES)
+    assert profile['text_statistics'] == expected.text_statistics()
+    assert profile['readability_metrics'] == expected.readability_metrics()
+    assert all("LOCAL STATISTICAL PROFILE" in entry['analysis'] for entry in profile['individual_analyses'])
+    assert "Readability" in profile['consolidated_analysis']
+    assert via_enhanced['user_profile'] == {'name': "Test Writer"}
+    assert via_enhanced['text_statistics'] == profile['text_statistics']
+    assert elapsed < 1.0
+    print(f"✓ Statistical profile built locally in {elapsed * 1000:.1f} ms")
+
+
+def test_statistical_profile_loads_for_generation():
+    """Saved statistical profiles feed generation and style transfer."""
+    from src.analysis.analyzer import create_statistical_style_profile
+    from src.storage.local_storage import load_local_profile
+    from src.generation import ContentGenerator, StyleTransfer
+
+    profile = create_statistical_style_profile(SAMPLE_FILES, {'name': "Test Writer"})
+
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as f:
+        json.dump(profile, f)
+    try:
+        result = load_local_profile(f.name)
+    finally:
+        os.remove(f.name)
+
+    assert result['success']
+    loaded = result['profile']
+    average_sentence_length = loaded['text_statistics']['avg_words_per_sentence']
+
+    essence = ContentGenerator()._extract_style_essence(loaded)
+    assert essence['linguistic_patterns']['avg_sentence_length'] == average_sentence_length
+    assert essence['linguistic_patterns']['readability_level'] == loaded['readability_metrics']['flesch_reading_ease']
+
+    characteristics = StyleTransfer()._extract_style_characteristics(loaded)
+    assert characteristics['linguistic_patterns']['avg_sentence_length'] == average_sentence_length
+    assert characteristics['linguistic_patterns']['punctuation_patterns'] == loaded['text_statistics']['punctuation_counts']
+    print("✓ Statistical profiles load into generation and style transfer")
+
+
+def main():
+    """Run all statistical profile tests."""
+    tests = [
+        test_statistical_profile_is_local,
+        test_statistical_profile_loads_for_generation
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Results: {passed}/{len(tests)} tests passed ===")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
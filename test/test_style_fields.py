@@ -0,0 +1,152 @@
+"""
+Tests for structured style fields: schema validation, extraction at
+profile creation and their use by generation and style transfer.
+Model calls are replaced with fakes.
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+FIELDS = {
+    "tone": {"overall_tone": "dry and wry", "emotional_range": "Restrained", "certainty": "assertive"},
+    "vocabulary": {"formality_level": "informal", "complexity": "medium", "preferred_domains": ["editing", ""]},
+    "structure": {"paragraph_style": "short", "organization": "anecdote first", "transition_style": "abrupt"},
+    "voice": {"person": "first", "active_voice_share": 85},
+    "signature_phrases": ["Honestly?"],
+    "notes": "dropped"
+}
+
+
+def test_style_fields_are_validated():
+    """Responses are decoded, cleaned to the schema and rejected when incomplete."""
+    from src.analysis.style_fields import parse_style_fields, StyleFieldsError
+
+    fields = parse_style_fields("Here you go:\n```json\n" + json.dumps(FIELDS) + "\n```")
+    assert fields['tone']['emotional_range'] == "restrained"
+    assert fields['voice']['active_voice_share'] == 0.85
+    assert fields['vocabulary']['preferred_domains'] == ["editing"]
+    assert "notes" not in fields
+
+    broken = dict(FIELDS, voice={"person": "fourth"})
+    for response in ("not json", json.dumps(broken)):
+        try:
+            parse_style_fields(response)
+            assert False, "invalid style fields were accepted"
+        except StyleFieldsError as e:
+            message = str(e)
+    assert "style_fields.voice.person" in message and "style_fields.voice.active_voice_share: missing" in message
+    print("✓ Style fields are validated against the schema")
+
+
+def test_profile_stores_style_fields():
+    """Profile creation asks for JSON once and saves the validated fields."""
+    from src.analysis import analyzer
+    from src.models import dispatch
+    from src.models.token_budget import plan_request
+
+    requests = []
+
+    def fake_generate(prompt, use_local, model_name, api_type, api_client, processing_mode, **kwargs):
+        requests.append(kwargs.get('json_schema'))
+        if kwargs.get('json_schema'):
+            return json.dumps(FIELDS)
+        return "1. Sentences average 14.2 words, as in \"Honestly?\""
+
+    sample_path = os.path.join(tempfile.mkdtemp(), "sample.txt")
+    with open(sample_path, "w", encoding="utf-8") as f:
+        f.write("Honestly? I rewrite every opening line three times.\n\n" * 10)
+
+    original_generate_text = analyzer.generate_text
+    analyzer.generate_text = fake_generate
+    try:
+        profile = analyzer.create_enhanced_style_profile([sample_path], True, "gemma3:1b", user_profile={'name': "Fields"})
+        assert profile['style_fields']['tone']['overall_tone'] == "dry and wry"
+        assert profile['metadata']['style_fields_error'] is None
+        assert sum(1 for schema in requests if schema) == 1
+
+        # A response that fails validation leaves the profile usable, without fields
+        saved_tone = FIELDS.pop("tone")
+        try:
+            profile = analyzer.create_enhanced_style_profile([sample_path], True, "gemma3:1b", user_profile={'name': "Fields"})
+        finally:
+            FIELDS["tone"] = saved_tone
+        assert profile['profile_created'] and profile['style_fields'] is None
+        assert "tone: missing" in profile['metadata']['style_fields_error']
+    finally:
+        analyzer.generate_text = original_generate_text
+
+    # The cloud backends are switched to JSON mode, and the schema is part of the cache key
+    captured = {}
+
+    def fake_openai(api_client, prompt, max_tokens=3000, **kwargs):
+        captured.update(kwargs)
+        return "{}"
+
+    original_openai = dispatch.analyze_with_openai
+    dispatch.analyze_with_openai = fake_openai
+    try:
+        dispatch.generate_text("Fields?", False, api_type="openai", api_client=object(), use_cache=False,
+                               json_schema={"type": "object"})
+    finally:
+        dispatch.analyze_with_openai = original_openai
+    assert captured == {'json_mode': True}
+    budget = plan_request("Fields?", "ollama", "gemma3:1b")
+    plain = dispatch._request_signature("ollama", "gemma3:1b", "enhanced", budget)
+    assert plain != dispatch._request_signature("ollama", "gemma3:1b", "enhanced", budget, {"type": "object"})
+    print("✓ Profiles store schema-validated style fields")
+
+
+def test_generators_read_style_fields():
+    """Generation and style transfer use the saved fields instead of parsing the analysis."""
+    from src.analysis.style_fields import validate_style_fields
+    from src.generation.content_generator import ContentGenerator
+    from src.generation.style_transfer import StyleTransfer
+
+    profile = {
+        'consolidated_analysis': "1. Sentences average 14.2 words.",
+        'style_fields': validate_style_fields(FIELDS)
+    }
+    generator = ContentGenerator()
+    essence = generator._extract_style_essence(profile)
+    assert essence['tone_characteristics']['overall_tone'] == "dry and wry"
+    instructions = generator._build_style_instructions(essence)
+    assert "- Narrative person: first" in instructions and '"Honestly?"' in instructions
+
+    target = StyleTransfer()._extract_style_characteristics(profile)
+    assert target['vocabulary_style'] == {'formality': "informal", 'complexity': "medium"}
+    assert target['structural_preferences']['organization'] == "anecdote first"
+
+    # Profiles saved before style fields keep the old defaults
+    del profile['style_fields']
+    assert generator._extract_style_essence(profile)['tone_characteristics']['overall_tone'] == "neutral"
+    print("✓ Generation and style transfer read the style fields")
+
+
+def main():
+    """Run all style fields tests."""
+    tests = [
+        test_style_fields_are_validated,
+        test_profile_stores_style_fields,
+        test_generators_read_style_fields
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Results: {passed}/{len(tests)} tests passed ===")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+"""
+Tests for the local text metrics engine.
+Checks that shared feature extraction and the metric functions agree.
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+SAMPLE_TEXT = (
+    "The quick brown fox jumps over the lazy dog. Does it ever stop? "
+    "No -- it never does!\n\n"
+    "A second paragraph follows; it has a colon: right here, and (parentheses).\n\n"
+    "Short one."
+)
+
+
+def test_text_features_counts():
+    """TextFeatures exposes the same counts as extract_basic_stats."""
+    from src.utils.text_processing import TextFeatures, extract_basic_stats
+
+    features = TextFeatures(SAMPLE_TEXT)
+    stats = extract_basic_stats(SAMPLE_TEXT)
+
+    assert features.word_count == stats['word_count']
+    assert features.sentence_count == stats['sentence_count']
+    assert features.paragraph_count == stats['paragraph_count'] == 3
+    assert features.character_count == stats['character_count'] == len(SAMPLE_TEXT)
+    assert features.letter_count == sum(len(word) for word in SAMPLE_TEXT.split())
+    print("✓ TextFeatures counts match extract_basic_stats")
+
+
+def test_metrics_accept_features():
+    """Metric functions give identical results for raw text and features."""
+    from src.utils.text_processing import TextFeatures, extract_basic_stats
+    from src.analysis.metrics import calculate_readability_metrics, analyze_text_statistics
+
+    features = TextFeatures(SAMPLE_TEXT)
+
+    assert calculate_readability_metrics(features) == calculate_readability_metrics(SAMPLE_TEXT)
+    assert analyze_text_statistics(features) == analyze_text_statistics(SAMPLE_TEXT)
+    assert extract_basic_stats(features) == extract_basic_stats(SAMPLE_TEXT)
+    print("✓ Metric functions accept TextFeatures")
+
+
+def test_empty_text_metrics():
+    """Empty and whitespace-only input keeps the documented fallbacks."""
+    from src.utils.text_processing import TextFeatures
+    from src.analysis.metrics import calculate_readability_metrics, analyze_text_statistics
+
+    for text in ("", "   \n\n  ", None):
+        features = TextFeatures(text)
+        assert features.is_empty()
+        assert calculate_readability_metrics(features) == {}
+        assert analyze_text_statistics(features)['word_count'] == 0
+    print("✓ Empty text handled")
+
+
+def test_accumulator_matches_scalar_functions():
+    """A single-text accumulator reproduces the scalar metric functions."""
+    from src.analysis.metrics import (
+        TextStatsAccumulator, calculate_readability_metrics, analyze_text_statistics
+    )
+
+    accumulator = TextStatsAccumulator.from_text(SAMPLE_TEXT)
+    assert accumulator.text_statistics() == analyze_text_statistics(SAMPLE_TEXT)
+    assert accumulator.readability_metrics() == calculate_readability_metrics(SAMPLE_TEXT)
+
+    empty = TextStatsAccumulator()
+    assert empty.text_statistics() == analyze_text_statistics("")
+    assert empty.readability_metrics() == {}
+    print("✓ Accumulator matches scalar metrics")
+
+
+def test_accumulator_merge():
+    """Merging per-part accumulators equals analyzing the joined corpus."""
+    from src.analysis.metrics import (
+        TextStatsAccumulator, calculate_readability_metrics, analyze_text_statistics
+    )
+
+    paragraphs = SAMPLE_TEXT.split("\n\n")
+    parts = [paragraph + "\n\n" for paragraph in paragraphs[:-1]] + paragraphs[-1:]
+    merged = TextStatsAccumulator()
+    for part in parts:
+        merged.merge(TextStatsAccumulator.from_text(part))
+
+    corpus = "".join(parts)
+    assert merged.text_statistics() == analyze_text_statistics(corpus)
+    assert merged.readability_metrics() == calculate_readability_metrics(corpus)
+    print("✓ Merged accumulators match corpus statistics")
+
+
+def test_syllable_batch_counts():
+    """Batch and total syllable counts agree with per-word counting."""
+    from src.utils.text_processing import (
+        TextFeatures, count_syllables, count_syllables_batch, total_syllables
+    )
+
+    assert count_syllables("the") == 1
+    assert count_syllables("make") == 1
+    assert count_syllables("beautiful") == 3
+    assert count_syllables("rhythm") == 1
+    assert count_syllables("") == 1
+
+    tokens = SAMPLE_TEXT.split() * 3
+    batch = count_syllables_batch(tokens)
+    assert set(batch) == set(tokens)
+    assert all(batch[word] == count_syllables(word) for word in tokens)
+    assert total_syllables(tokens) == sum(count_syllables(word) for word in tokens)
+    assert TextFeatures(SAMPLE_TEXT).syllable_count == total_syllables(SAMPLE_TEXT.split())
+    print("✓ Syllable batch counting works")
+
+
+def test_corpus_batch_matches_scalar_functions():
+    """Batch corpus metrics equal the per-document scalar functions."""
+    from src.analysis import metrics
+
+    documents = [SAMPLE_TEXT, "", "   ", "...", "One. Two? Three!", SAMPLE_TEXT.upper(), None,
+                 "Mr.Smith left.Then ... he ran?!", "? leading", "Trailing .", "a.b.c d"]
+
+    def check():
+        results = metrics.analyze_corpus_batch(documents)
+        assert len(results) == len(documents)
+        for document, result in zip(documents, results):
+            stats = metrics.analyze_text_statistics(document)
+            for key in ('word_count', 'sentence_count', 'character_count',
+                        'avg_words_per_sentence', 'unique_words', 'lexical_diversity'):
+                assert result[key] == stats[key], key
+            assert result['readability_metrics'] == metrics.calculate_readability_metrics(document)
+
+    check()
+    # The pure-Python fallback must give the same results without NumPy
+    numpy_module = metrics.np
+    metrics.np = None
+    try:
+        check()
+    finally:
+        metrics.np = numpy_module
+    print("✓ Batch corpus metrics match scalar functions")
+
+
+def test_streaming_reader_matches_full_read():
+    """Chunked streaming yields the same text and statistics as a full read."""
+    from src.utils.text_processing import read_text_file, iter_text_chunks
+    from src.analysis.metrics import (
+        TextStatsAccumulator, calculate_readability_metrics, analyze_text_statistics
+    )
+
+    raw = (SAMPLE_TEXT.replace("\n", "\r\n") + "\r\n\r\n").encode("utf-8") * 1000
+    with tempfile.NamedTemporaryFile("wb", suffix=".txt", delete=False) as handle:
+        handle.write(raw)
+        path = handle.name
+
+    try:
+        content = read_text_file(path)
+        chunks = list(iter_text_chunks(path, chunk_size=4096))
+        assert len(chunks) > 1
+        assert "".join(chunks) == content
+        assert "\r" not in content
+
+        accumulator = TextStatsAccumulator.from_file(path, chunk_size=4096)
+        assert accumulator.text_statistics() == analyze_text_statistics(content)
+        assert accumulator.readability_metrics() == calculate_readability_metrics(content)
+    finally:
+        os.remove(path)
+    print("✓ Streaming reader matches full read")
+
+
+def test_read_text_file_encoding_fallback():
+    """Files that are not valid UTF-8 fall back to latin-1."""
+    from src.utils.text_processing import read_text_file, iter_text_chunks
+
+    with tempfile.NamedTemporaryFile("wb", suffix=".txt", delete=False) as handle:
+        handle.write("Caf\u00e9 ol\u00e9.\n\n".encode("latin-1") * 10)
+        path = handle.name
+
+    try:
+        content = read_text_file(path)
+        assert content.startswith("Caf\u00e9")
+        assert "".join(iter_text_chunks(path, chunk_size=16)) == content
+    finally:
+        os.remove(path)
+
+    # Valid UTF-8 throughout the detection prefix, then a latin-1 byte: the stream
+    # stays UTF-8 and replaces the stray byte instead of switching encodings
+    from src.utils import text_processing
+
+    with tempfile.NamedTemporaryFile("wb", suffix=".txt", delete=False) as handle:
+        handle.write("Na\u00efve text.\n\n".encode("utf-8") * 50 + "Caf\u00e9.\n".encode("latin-1"))
+        path = handle.name
+
+    original_prefix = text_processing.ENCODING_DETECTION_BYTES
+    text_processing.ENCODING_DETECTION_BYTES = 64
+    try:
+        streamed = "".join(iter_text_chunks(path, chunk_size=16))
+        assert streamed.startswith("Na\u00efve")
+        assert streamed.endswith("Caf\ufffd.\n")
+    finally:
+        text_processing.ENCODING_DETECTION_BYTES = original_prefix
+        os.remove(path)
+    print("✓ Encoding fallback works")
+
+
+def test_summarize_file_streams_statistics():
+    """Summaries without text stream the file and match the full-read statistics."""
+    from src.analysis.ingestion import summarize_file
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as handle:
+        handle.write((SAMPLE_TEXT + "\n\n") * 200)
+        path = handle.name
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as handle:
+        handle.write("  \n\n ")
+        empty_path = handle.name
+
+    try:
+        full = summarize_file(path, keep_text=True)
+        streamed = summarize_file(path)
+        assert 'text' not in streamed
+        assert streamed['word_count'] == full['word_count']
+        assert streamed['character_count'] == full['character_count']
+        assert streamed['statistics'].text_statistics() == full['statistics'].text_statistics()
+        assert "empty" in summarize_file(empty_path)['error']
+        assert "not found" in summarize_file(path + ".missing")['error']
+    finally:
+        os.remove(path)
+        os.remove(empty_path)
+    print("✓ File summaries stream their statistics")
+
+
+def test_parallel_ingestion_matches_serial():
+    """Process-pool ingestion yields the same summaries and corpus totals as serial."""
+    from src.analysis.ingestion import ingest_files
+
+    paths = []
+    for index in range(4):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as handle:
+            handle.write(SAMPLE_TEXT * (index + 1))
+            paths.append(handle.name)
+    paths.append(os.path.join(tempfile.gettempdir(), "missing_style_sample.txt"))
+
+    try:
+        serial_totals, serial_summaries = ingest_files(paths, parallel=False)
+        parallel_totals, parallel_summaries = ingest_files(paths, parallel=True, max_workers=2, chunksize=2)
+
+        assert [s['filename'] for s in parallel_summaries] == paths
+        assert 'error' in parallel_summaries[-1]
+        for serial, parallel in zip(serial_summaries, parallel_summaries):
+            assert 'text' not in parallel
+            assert serial.get('word_count') == parallel.get('word_count')
+        assert parallel_totals.text_statistics() == serial_totals.text_statistics()
+        assert parallel_totals.readability_metrics() == serial_totals.readability_metrics()
+    finally:
+        for path in paths[:-1]:
+            os.remove(path)
+    print("✓ Parallel ingestion matches serial ingestion")
+
+
+def main():
+    """Run all metric tests."""
+    tests = [
+        test_text_features_counts,
+        test_metrics_accept_features,
+        test_empty_text_metrics,
+        test_accumulator_matches_scalar_functions,
+        test_accumulator_merge,
+        test_syllable_batch_counts,
+        test_corpus_batch_matches_scalar_functions,
+        test_streaming_reader_matches_full_read,
+        test_read_text_file_encoding_fallback,
+        test_summarize_file_streams_statistics,
+        test_parallel_ingestion_matches_serial
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Results: {passed}/{len(tests)} tests passed ===")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
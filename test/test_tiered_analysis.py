@@ -0,0 +1,168 @@
+"""
+Tests for tiered (draft-then-refine) analysis and draft confidence scoring.
+Model calls are answered by the simulated small and large models.
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+import _thread
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+SAMPLE_TEXT = (
+    "Honestly? I rewrite every opening line three times. The first draft is for me; "
+    "the second, for the reader; the third, for the editor who will cut it anyway.\n\n"
+) * 12
+
+
+def _write_samples(count):
+    sample_dir = tempfile.mkdtemp()
+    paths = []
+    for index in range(count):
+        path = os.path.join(sample_dir, f"sample_{index}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(SAMPLE_TEXT)
+        paths.append(path)
+    return paths
+
+
+def test_confidence_scoring_finds_weak_parts():
+    """Parts are split by heading (or by point number) and vague parts score low."""
+    from src.analysis.confidence import split_analysis_parts, join_analysis_parts, score_part, score_analysis
+    from src.benchmarks.tiered import simulated_analysis
+
+    draft = "Overview of the writer.\n\n" + simulated_analysis(range(1, 8), detailed_parts=[1, 2, 3])
+    preamble, parts = split_analysis_parts(draft)
+    assert preamble == "Overview of the writer." and sorted(parts) == list(range(1, 8))
+    assert join_analysis_parts(preamble, parts).split() == draft.split()
+
+    scores = score_analysis(draft)
+    assert all(scores[part] == 1.0 for part in (1, 2, 3))
+    assert all(scores[part] < 0.7 for part in (4, 5, 6, 7))
+
+    # Without PART headings the parts start at their first point
+    plain = "1. Sentences average 14.2 words.\n2. Clauses\n5. Vocabulary is plain.\n25. Signature: \"you know\""
+    _, parts = split_analysis_parts(plain)
+    assert sorted(parts) == [1, 2, 7] and parts[2].startswith("5.")
+    assert score_part(1, parts[1]) < score_part(7, parts[7])
+    assert score_analysis("No structure at all") == {part: 0.0 for part in range(1, 8)}
+    print("✓ Draft confidence is scored per part")
+
+
+def test_tiered_profile_refines_only_weak_parts():
+    """The small model drafts every file; the large model only rewrites the weak parts."""
+    from src.analysis import analyzer
+    from src.benchmarks.tiered import ModelUsageMeter, TieredSimulator
+
+    meter = ModelUsageMeter(TieredSimulator("gpt-oss:20b", draft_detailed_parts=5, time_scale=0))
+    original_generate_text = analyzer.generate_text
+    analyzer.generate_text = meter
+    try:
+        profile = analyzer.create_tiered_style_profile(
+            _write_samples(3), "gemma3:1b", "gpt-oss:20b", refine_scope="sections",
+            user_profile={'name': "Tiered"}, confidence_threshold=0.7
+        )
+        tiered = profile['metadata']['tiered']
+        assert profile['profile_created'] and tiered['refined_parts'] == [6, 7]
+        assert tiered['draft_confidence'][6] < 0.7 and all(score == 1.0 for score in tiered['confidence'].values())
+        # Three drafts and their consolidation on the small model; one call per weak part
+        # and the style fields of the refined analysis on the large one
+        assert meter.calls == {"gemma3:1b": 4, "gpt-oss:20b": 3}
+        assert profile['style_fields']['voice']['person'] == "first"
+        assert "**PART 6: STRUCTURAL GENIUS**" in profile['consolidated_analysis']
+        assert profile['metadata']['model_used'] == "gemma3:1b + gpt-oss:20b"
+
+        meter.reset()
+        profile = analyzer.create_tiered_style_profile(
+            _write_samples(2), "gemma3:1b", "gpt-oss:20b", refine_scope="profile", user_profile={'name': "Tiered"}
+        )
+        assert meter.calls == {"gemma3:1b": 2, "gpt-oss:20b": 2}
+        assert profile['metadata']['tiered']['draft_confidence'] is None
+    finally:
+        analyzer.generate_text = original_generate_text
+    print("✓ Tiered analysis refines only the low-confidence parts")
+
+
+def test_ctrl_c_stops_refinements_in_progress():
+    """Ctrl+C during refinement stops the running refinements; the queued one still runs."""
+    from src.analysis import analyzer
+    from src.benchmarks.tiered import simulated_analysis
+
+    started = threading.Event()
+
+    def fake_generate(prompt, *args, cancel_event=None, **kwargs):
+        started.set()
+        if "REFINE PART 7:" in prompt:
+            return "**PART 7: REFINED**\nFull refinement." if not cancel_event.is_set() else "cancelled too early"
+        # Stand-in for a stream that stops at the next chunk once cancelled
+        return "**PART ?: PARTIAL**\nPartial refinement." if cancel_event.wait(5) else "never cancelled"
+
+    def press_ctrl_c():
+        started.wait(5)
+        time.sleep(0.05)
+        _thread.interrupt_main()
+
+    draft = simulated_analysis(range(1, 8), detailed_parts=[1, 2, 3, 4])
+    cancel_event = threading.Event()
+    original = (analyzer.generate_text, analyzer.backend_capacity)
+    analyzer.generate_text = fake_generate
+    analyzer.backend_capacity = lambda backend: 2
+    threading.Thread(target=press_ctrl_c, daemon=True).start()
+    try:
+        analysis, _, refined_parts = analyzer.refine_low_confidence_parts(
+            draft, SAMPLE_TEXT, {}, {}, "gpt-oss:20b", confidence_threshold=0.7, cancel_event=cancel_event
+        )
+    finally:
+        analyzer.generate_text, analyzer.backend_capacity = original
+
+    assert refined_parts == [5, 6, 7] and not cancel_event.is_set()
+    assert analysis.count("Partial refinement.") == 2 and "Full refinement." in analysis
+    print("✓ Ctrl+C stops the refinements in progress and keeps their partial output")
+
+
+def test_tiered_benchmark_compares_modes():
+    """The benchmark reports every mode, and tiered runs need less of the large model."""
+    from src.benchmarks.tiered import run_tiered_benchmark, format_tiered_report, TieredSimulator
+
+    results = run_tiered_benchmark(_write_samples(2), generate=TieredSimulator(time_scale=0))
+    assert list(results) == ["small", "large", "tiered:profile", "tiered:sections"]
+    assert all(usage['error'] is None for usage in results.values())
+    assert results['small']['confidence'] < results['tiered:sections']['confidence'] == results['large']['confidence']
+
+    large_tokens = {mode: usage['output_tokens'].get("gpt-oss:20b", 0) for mode, usage in results.items()}
+    assert large_tokens['small'] == 0
+    assert large_tokens['tiered:sections'] < large_tokens['tiered:profile'] < large_tokens['large']
+
+    report = format_tiered_report(results)
+    assert "tiered:sections" in report and "Confidence" in report
+    print("✓ The tiered benchmark compares small, large and tiered analysis")
+
+
+def main():
+    """Run all tiered analysis tests."""
+    tests = [
+        test_confidence_scoring_finds_weak_parts,
+        test_tiered_profile_refines_only_weak_parts,
+        test_ctrl_c_stops_refinements_in_progress,
+        test_tiered_benchmark_compares_modes
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Results: {passed}/{len(tests)} tests passed ===")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
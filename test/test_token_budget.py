@@ -0,0 +1,176 @@
+"""
+Tests for token budgeting of model requests.
+Backends are replaced by fakes so no network call is made.
+"""
+
+import sys
+import os
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+
+def test_plan_scales_with_prompt():
+    """Output budget, context and timeout follow the prompt size and model limits."""
+    from src.models.token_budget import plan_request, get_model_limits
+    from src.config.settings import PROCESSING_MODES, MIN_OUTPUT_TOKENS
+
+    small = plan_request("Describe this text. " * 10, "ollama", "gemma3:1b")
+    assert small['fits']
+    assert small['num_predict'] == PROCESSING_MODES["enhanced"]["gemma_tokens"]
+    assert small['num_ctx'] == 4096
+
+    few_sections = plan_request("Describe this text.", "ollama", "gemma3:1b", sections=3)
+    assert few_sections['num_predict'] < small['num_predict']
+
+    context_window = get_model_limits("ollama", "gemma3:1b")['context_window']
+    large = plan_request("word " * (context_window * 4 // 5 - 1000), "ollama", "gemma3:1b")
+    assert large['fits'] and MIN_OUTPUT_TOKENS <= large['num_predict'] < small['num_predict']
+    assert large['num_ctx'] == context_window
+    # Local requests keep the processing mode's timeout as a floor
+    assert large['timeout'] >= small['timeout'] >= PROCESSING_MODES["enhanced"]["timeout"]
+    cloud_window = get_model_limits("openai")['context_window']
+    cloud_small = plan_request("Describe this text.", "openai")
+    cloud_large = plan_request("word " * (cloud_window // 2), "openai")
+    assert cloud_large['timeout'] > cloud_small['timeout']
+
+    too_large = plan_request("word " * context_window, "ollama", "gemma3:1b")
+    assert not too_large['fits']
+
+    unknown = plan_request("hello", "ollama", "some-new-model:7b")
+    assert unknown['context_window'] == 8192
+    assert plan_request("hello", "openai")['num_predict'] <= 3000
+    print("✓ Request plans scale with prompt size and model context")
+
+
+def test_timeout_allows_model_load():
+    """Timeouts include the model's load allowance, so slow local models keep their time."""
+    from src.models.token_budget import plan_request, get_model_limits
+    from src.config.settings import PROCESSING_MODES
+
+    slow = plan_request("Describe this text.", "ollama", "gpt-oss:20b")
+    limits = get_model_limits("ollama", "gpt-oss:20b")
+    assert limits['load_seconds'] > 0
+    assert slow['timeout'] > PROCESSING_MODES["enhanced"]["timeout"]
+    assert slow['timeout'] >= slow['num_predict'] / limits['decode_tokens_per_second'] + limits['load_seconds']
+
+    assert plan_request("hello", "ollama", "some-new-model:7b")['timeout'] >= PROCESSING_MODES["enhanced"]["timeout"]
+    statistical = plan_request("hello", "ollama", "gemma3:1b", processing_mode="statistical")
+    assert statistical['timeout'] >= PROCESSING_MODES["statistical"]["timeout"]
+    print("✓ Request timeouts allow for model load")
+
+
+def test_dispatch_rejects_before_network():
+    """Oversized prompts return a budget error without reaching the backend."""
+    from src.models import dispatch
+
+    calls = []
+
+    def fake_ollama(prompt, model_name, processing_mode="enhanced", on_token=None, cancel_event=None, budget=None):
+        calls.append(budget)
+        return "analysis"
+
+    original_ollama = dispatch.analyze_with_ollama
+    dispatch.analyze_with_ollama = fake_ollama
+    try:
+        response = dispatch.generate_text("word " * 40000, True, "gemma3:1b", use_cache=False)
+        assert response.startswith("Token Budget Error")
+        assert dispatch.is_error_response(response)
+        assert calls == []
+
+        assert dispatch.generate_text("Short prompt", True, "gemma3:1b", use_cache=False, sections=5) == "analysis"
+        assert calls[0]['num_predict'] == 500
+        assert calls[0]['fits']
+    finally:
+        dispatch.analyze_with_ollama = original_ollama
+    print("✓ Dispatch rejects prompts that cannot fit before any network call")
+
+
+def test_analysis_auto_chunks_to_context():
+    """Analyses of texts too large for a small context are chunked to fit it."""
+    from src.analysis import analyzer
+    from src.models.token_budget import plan_request
+
+    prompts = []
+
+    def fake_generate_text(prompt, *args, **kwargs):
+        prompts.append(prompt)
+        return "partial analysis"
+
+    original_generate_text = analyzer.generate_text
+    analyzer.generate_text = fake_generate_text
+    try:
+        # Unlisted models get the 8192-token default context, far below the configured chunk size
+        text = "\n\n".join(["The writer favours short, plain sentences."] * 2000)
+        analyzer.analyze_style(text, True, "some-new-model:7b")
+    finally:
+        analyzer.generate_text = original_generate_text
+
+    assert len(prompts) > 2
+    assert all(plan_request(prompt, "ollama", "some-new-model:7b")['fits'] for prompt in prompts)
+    print("✓ Analysis auto-chunks to the model's context window")
+
+
+def test_generation_budget_follows_requested_length():
+    """Generation and style transfer size their output from the text they are asked to write."""
+    from src.models import dispatch
+    from src.generation.content_generator import ContentGenerator
+    from src.generation.style_transfer import StyleTransfer
+    from src.config.settings import CLOUD_MAX_OUTPUT_TOKENS
+
+    requested = []
+
+    def fake_openai(api_client, prompt, max_tokens=3000, **kwargs):
+        requested.append(max_tokens)
+        return "Generated text. " * 20
+
+    original_openai = dispatch.analyze_with_openai
+    original_cache = dispatch.get_response_cache
+    dispatch.analyze_with_openai = fake_openai
+    dispatch.get_response_cache = lambda: None
+    try:
+        generator = ContentGenerator()
+        for target_length in (200, 1000, 5000):
+            result = generator.generate_content(
+                {}, "article", "Budgets", target_length=target_length, use_local=False,
+                api_type="openai", api_client=object()
+            )
+            assert 'error' not in result, result
+        StyleTransfer().transfer_style("Short source text. " * 40, {}, use_local=False,
+                                       api_type="openai", api_client=object())
+    finally:
+        dispatch.analyze_with_openai = original_openai
+        dispatch.get_response_cache = original_cache
+
+    # 200 words need about 420 tokens; 1000 words 2100; 5000 words hit the cloud cap
+    assert requested[:3] == [500, 2100, CLOUD_MAX_OUTPUT_TOKENS], requested
+    # The source is about 190 tokens
+    assert requested[3] == 300
+    print("✓ Generation and style transfer budget output by requested length")
+
+
+def main():
+    """Run all token budget tests."""
+    tests = [
+        test_plan_scales_with_prompt,
+        test_timeout_allows_model_load,
+        test_dispatch_rejects_before_network,
+        test_analysis_auto_chunks_to_context,
+        test_generation_budget_follows_requested_length
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Results: {passed}/{len(tests)} tests passed ===")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)